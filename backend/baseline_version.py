@@ -0,0 +1,37 @@
+# baseline_version.py
+"""
+Version stamp for the HBOM baseline data.
+
+HBOM trees are cached per process (hbom/tree_cache.py) and built from
+``hbom_baseline`` and ``fragility_db``, which only change when a load script
+runs. Scripts that write those collections call bump_baseline_version() when
+they finish; a cached tree is rebuilt once the stored version no longer
+matches the one it was built from.
+"""
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+VERSION_COLLECTION = "data_versions"
+BASELINE_VERSION_ID = "hbom_baseline"
+
+
+async def get_baseline_version(db) -> int:
+    """Current baseline version (0 if it was never bumped)"""
+    doc = await db[VERSION_COLLECTION].find_one({"_id": BASELINE_VERSION_ID})
+    return doc.get("version", 0) if doc else 0
+
+
+async def bump_baseline_version(db, reason: str = "") -> int:
+    """Mark the baseline as changed; returns the new version"""
+    from pymongo import ReturnDocument
+
+    doc = await db[VERSION_COLLECTION].find_one_and_update(
+        {"_id": BASELINE_VERSION_ID},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow(), "reason": reason}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    logger.info(f"HBOM baseline version bumped to {doc['version']} ({reason})")
+    return doc["version"]
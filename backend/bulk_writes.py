@@ -0,0 +1,163 @@
+# bulk_writes.py
+"""
+Batched, unordered bulk writes for loaders.
+
+Loaders used to await one replace_one/update_one per document - a network
+round trip each. bulk_write() sends pymongo write models in unordered
+batches bounded by operation count and encoded BSON size, and returns
+counters that map onto the loaders' existing stats dicts:
+
+- upserted: new documents
+- matched / modified: existing documents hit / actually changed
+  (matched - modified = replaced with identical content)
+- collapsed: operations dropped because a later one targets the same key
+  (bulk_replace only; with one-at-a-time writes they were overwrites)
+- upserted_ids: _id of each new document
+
+Unordered batches do not stop at the first failed operation; failures are
+counted and the first few error messages kept.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Batch bounds (operations per batch / encoded MB per batch; server limit is 48MB)
+BULK_WRITE_BATCH_ROWS = 5000
+BULK_WRITE_BATCH_MB = 8
+
+# Write errors kept per call
+BULK_WRITE_ERRORS_KEPT = 20
+
+
+@dataclass
+class BulkWriteStats:
+    upserted: int = 0
+    matched: int = 0
+    modified: int = 0
+    collapsed: int = 0
+    failed: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    errors: List[str] = field(default_factory=list)
+    upserted_ids: List[Any] = field(default_factory=list)
+
+    @property
+    def unchanged(self) -> int:
+        return self.matched - self.modified
+
+
+# ---------- public API ----------------------------------------------------
+async def bulk_write(
+    collection,
+    operations: Iterable[Any],
+    batch_rows: int = BULK_WRITE_BATCH_ROWS,
+    batch_mb: float = BULK_WRITE_BATCH_MB,
+) -> BulkWriteStats:
+    """
+    Run pymongo write models (ReplaceOne, UpdateOne, ...) in unordered batches.
+
+    Operations in one batch may be applied in any order: callers must not
+    send two operations on the same document (see bulk_replace()).
+    """
+    stats = BulkWriteStats()
+    for batch in _batches(operations, batch_rows, batch_mb * 1024 * 1024):
+        await _write_batch(collection, batch, stats)
+
+    if stats.failed:
+        logger.warning(
+            f"{collection.name}: {stats.failed} writes failed in {stats.failed_batches} "
+            f"of {stats.batches} batches (first: {stats.errors[0]})"
+        )
+    return stats
+
+
+async def bulk_replace(
+    collection,
+    documents: Iterable[Dict[str, Any]],
+    key: Sequence[str],
+    upsert: bool = True,
+    **batching,
+) -> BulkWriteStats:
+    """
+    Replace (upsert) documents matched on the `key` fields.
+
+    Documents sharing a key are collapsed to the last one, which is what
+    replacing them one at a time would leave behind.
+    """
+    from pymongo import ReplaceOne
+
+    latest: Dict[tuple, Dict[str, Any]] = {}
+    total = 0
+    for doc in documents:
+        total += 1
+        latest[tuple(_hashable(doc.get(k)) for k in key)] = doc
+
+    operations = (
+        ReplaceOne({k: doc.get(k) for k in key}, doc, upsert=upsert)
+        for doc in latest.values()
+    )
+    stats = await bulk_write(collection, operations, **batching)
+    stats.collapsed = total - len(latest)
+    return stats
+
+
+# ---------- helpers -------------------------------------------------------
+def _hashable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+def _op_size(operation: Any) -> int:
+    """Approximate encoded size of a write model (filter + document/update)"""
+    from bson import encode
+
+    size = 0
+    for attr in ("_filter", "_doc"):
+        part = getattr(operation, attr, None)
+        if isinstance(part, dict):
+            size += len(encode(part))
+        elif isinstance(part, list):  # Pipeline updates
+            size += sum(len(encode(stage)) for stage in part)
+    return size
+
+
+def _batches(operations: Iterable[Any], max_rows: int, max_bytes: float):
+    batch = []
+    batch_bytes = 0
+    for operation in operations:
+        op_bytes = _op_size(operation)
+        if batch and (len(batch) >= max_rows or batch_bytes + op_bytes > max_bytes):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(operation)
+        batch_bytes += op_bytes
+    if batch:
+        yield batch
+
+
+async def _write_batch(collection, batch: List[Any], stats: BulkWriteStats) -> None:
+    from pymongo.errors import BulkWriteError
+
+    try:
+        result = await collection.bulk_write(batch, ordered=False)
+        details = result.bulk_api_result
+    except BulkWriteError as e:
+        # Unordered: every other operation in the batch was still applied
+        details = e.details
+
+    write_errors = details.get("writeErrors", [])
+    stats.batches += 1
+    stats.upserted += details.get("nUpserted", 0)
+    stats.upserted_ids.extend(u["_id"] for u in details.get("upserted", []))
+    stats.matched += details.get("nMatched", 0)
+    stats.modified += details.get("nModified", 0)
+    stats.failed += len(write_errors)
+    if write_errors:
+        stats.failed_batches += 1
+        room = BULK_WRITE_ERRORS_KEPT - len(stats.errors)
+        stats.errors.extend(e.get("errmsg", "write failed") for e in write_errors[:max(room, 0)])
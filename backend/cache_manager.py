@@ -68,6 +68,12 @@ class CacheManager:
         self.mem[h] = obj
         self._dump(obj, self._fname(h))
 
+    def delete(self, kind: str, key_tuple: tuple):
+        """Drop one entry from both tiers (no-op if absent)."""
+        h = self._hash_key(kind, key_tuple)
+        self.mem.pop(h, None)
+        self._fname(h).unlink(missing_ok=True)
+
     def clear(self):
         """Flush both tiers"""
         self.mem.clear()
@@ -1,47 +1,95 @@
 # censusData.py
-import requests
+import asyncio
+import concurrent.futures
 import pandas as pd
 import numpy as np
 from fastapi import HTTPException
-from typing import List, Dict
+from typing import Awaitable, Callable, List, Dict, Optional, TypeVar
 import logging
 import datetime
 from functools import lru_cache
 
 from config import settings
 from cache_manager import cache  # ← Use the disk-backed cache
+from census_tracts import get_tract_index
+from census_warehouse import ACS_VARS, get_acs_warehouse
+from census_client import CensusClient, get_census_client
 
 logger = logging.getLogger(__name__)
 
 ACS_MIN_YEAR = 2009  # earliest ACS 5-year vintage generally available
+ACS_PROBE_WINDOW = 3  # years probed concurrently, newest first
 
-@lru_cache(maxsize=1)
-def discover_latest_acs5_year(max_year: int | None = None) -> int:
+T = TypeVar("T")
+
+_latest_acs5_year: Dict[int, int] = {}
+
+
+def _run_sync(call: Callable[[CensusClient], Awaitable[T]]) -> T:
+    """
+    Run an async census call from synchronous code.
+    Uses a fork of the shared client (aiohttp sessions belong to one loop).
+    """
+    async def run():
+        client = get_census_client().fork()
+        try:
+            return await call(client)
+        finally:
+            await client.close()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run())
+    # Called from a thread running a loop: use a private loop on a worker thread
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, run()).result()
+
+
+async def discover_latest_acs5_year_async(
+    max_year: int | None = None,
+    client: Optional[CensusClient] = None,
+) -> int:
     """
     Find the newest ACS 5-year *data* year that actually responds.
-    Cached in-memory since it rarely changes.
+    Candidate years are probed newest first, ACS_PROBE_WINDOW at a time,
+    stopping at the first window with a hit; cached in-memory since it
+    rarely changes.
     """
     if max_year is None:
         max_year = datetime.datetime.utcnow().year
-    for y in range(int(max_year), ACS_MIN_YEAR - 1, -1):
-        try:
-            url = ACS_ENDPOINT_TEMPLATE.format(year=y)
-            resp = requests.get(
-                url,
-                params={"get": "NAME", "for": "us:1"},
-                timeout=10,
-            )
-            if resp.ok:
-                return y
-        except requests.RequestException:
-            continue
-    return 2023 
+    max_year = int(max_year)
+    if max_year in _latest_acs5_year:
+        return _latest_acs5_year[max_year]
 
-TIGER_ENDPOINT = "https://tigerweb.geo.census.gov/arcgis/rest/services/TIGERweb/Tracts_Blocks/MapServer/5/query"
-ACS_ENDPOINT_TEMPLATE = "https://api.census.gov/data/{year}/acs/acs5"
+    client = client or get_census_client()
+    candidates = list(range(max_year, ACS_MIN_YEAR - 1, -1))
+    latest = 2023
+    for start in range(0, len(candidates), ACS_PROBE_WINDOW):
+        window = candidates[start:start + ACS_PROBE_WINDOW]
+        available = await asyncio.gather(*(client.acs_probe(y) for y in window))
+        found = next((y for y, ok in zip(window, available) if ok), None)
+        if found is not None:
+            latest = found
+            break
+
+    _latest_acs5_year[max_year] = latest
+    return latest
+
+
+@lru_cache(maxsize=1)
+def discover_latest_acs5_year(max_year: int | None = None) -> int:
+    """Synchronous discover_latest_acs5_year_async()"""
+    return _run_sync(lambda client: discover_latest_acs5_year_async(max_year, client))
 
 
-def _get_bbox_tracts(min_lat: float, max_lat: float, min_lon: float, max_lon: float):
+async def _get_bbox_tracts(
+    min_lat: float,
+    max_lat: float,
+    min_lon: float,
+    max_lon: float,
+    client: Optional[CensusClient] = None,
+):
     """
     Return (tract_ids, state_counties) using TIGERweb for the given bbox.
     CACHED on disk since tract boundaries are stable.
@@ -50,6 +98,12 @@ def _get_bbox_tracts(min_lat: float, max_lat: float, min_lon: float, max_lon: fl
         logger.error("Census API key is missing!")
         raise HTTPException(status_code=500, detail="Census API key not configured.")
     
+    # Local tract layer: in-process STRtree query, no network
+    index = get_tract_index()
+    if index is not None:
+        selection = index.query_bbox(min_lat, max_lat, min_lon, max_lon)
+        return selection.tract_ids, selection.state_counties
+    
     # Build cache key (rounded to avoid float precision issues)
     bbox_key = (
         round(min_lat, 6),
@@ -77,12 +131,12 @@ def _get_bbox_tracts(min_lat: float, max_lat: float, min_lon: float, max_lon: fl
         "f": "json",
     }
     
-    r = requests.get(TIGER_ENDPOINT, params=params, timeout=30)
+    r = await (client or get_census_client()).tiger_query(params)
     if not r.ok:
-        logger.error("TIGER request failed %s: %s", r.status_code, r.text)
+        logger.error("TIGER request failed %s: %s", r.status, r.text)
         raise HTTPException(status_code=502, detail="Error querying TIGERweb")
 
-    feats = (r.json() or {}).get("features", [])
+    feats = (r.data or {}).get("features", [])
     if not feats:
         result = ([], set())
         cache.set("census_tracts", bbox_key, result)
@@ -107,17 +161,102 @@ def _get_bbox_tracts(min_lat: float, max_lat: float, min_lon: float, max_lon: fl
     return result
 
 
-def get_demographics_timeseries_for_bbox(
+def _bbox_tract_weights(min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> Optional[Dict[str, float]]:
+    """
+    Share of each intersecting tract's area inside the bbox, from the local
+    tract layer (None without it: tracts then count in full).
+    """
+    index = get_tract_index()
+    if index is None:
+        logger.warning("AOI apportionment needs the local tract layer; counting whole tracts")
+        return None
+    return index.query_bbox(min_lat, max_lat, min_lon, max_lon).weight_map()
+
+
+async def _fetch_tract_values(
+    client: CensusClient,
+    tract_ids: List[str],
+    state_counties,
+    years: List[int],
+) -> np.ndarray:
+    """
+    Tract values [years, tracts, ACS_VARS] from the ACS API, NaN where missing.
+    Every (year, county) download runs at once (bounded by the client).
+    """
+    counties = sorted(state_counties)
+    downloads = [(y, st, co) for y in years for (st, co) in counties]
+    responses = await asyncio.gather(*(
+        client.acs_county_tracts(y, st, co, ACS_VARS, settings.CENSUS_API_KEY)
+        for (y, st, co) in downloads
+    ))
+
+    frames = []
+    for (y, _, _), rows in zip(downloads, responses):
+        if not rows or len(rows) < 2:
+            continue
+        df = pd.DataFrame(rows[1:], columns=rows[0])
+        df["TRACT_ID"] = (
+            df["state"].astype(str).str.zfill(2)
+            + df["county"].astype(str).str.zfill(3)
+            + df["tract"].astype(str).str.zfill(6)
+        )
+        df["year"] = y
+        frames.append(df[["year", "TRACT_ID", *ACS_VARS]])
+
+    if not frames:
+        return np.full((len(years), len(tract_ids), len(ACS_VARS)), np.nan)
+
+    long = pd.concat(frames, ignore_index=True).drop_duplicates(["year", "TRACT_ID"])
+    for col in ACS_VARS:
+        long[col] = pd.to_numeric(long[col], errors="coerce")
+
+    # Join on (year, tract); tracts outside the AOI drop out
+    wanted = pd.MultiIndex.from_product([years, tract_ids])
+    values = long.set_index(["year", "TRACT_ID"])[ACS_VARS].reindex(wanted).to_numpy(dtype=float)
+    return values.reshape(len(years), len(tract_ids), len(ACS_VARS))
+
+
+def _reduce_demographics(cube: np.ndarray, weights: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Per-year AOI totals from tract values [years, tracts, ACS_VARS]:
+    summed population and households, household-weighted median income and
+    population-weighted per-capita income. Missing values are skipped;
+    weights (per tract) scale population and households.
+    """
+    pop_t, hh_t, hhi_t, pci_t = (cube[..., i] for i in range(len(ACS_VARS)))
+    if weights is not None:
+        pop_t = pop_t * weights
+        hh_t = hh_t * weights
+
+    pop = np.nansum(pop_t, axis=1)
+    hh = np.nansum(hh_t, axis=1)
+    hhi_num = np.nansum(hhi_t * hh_t, axis=1)
+    pci_num = np.nansum(pci_t * pop_t, axis=1)
+
+    return {
+        "pop": pop,
+        "hh": hh,
+        "hhi_wmean": np.divide(hhi_num, hh, out=np.zeros_like(hh), where=hh > 0),
+        "pci_wmean": np.divide(pci_num, pop, out=np.zeros_like(pop), where=pop > 0),
+    }
+
+
+async def get_demographics_timeseries_for_bbox_async(
     min_lat: float,
     max_lat: float,
     min_lon: float,
     max_lon: float,
     years: list[int],
     fill: str = "ffill",
+    client: Optional[CensusClient] = None,
+    apportion: bool = False,
 ) -> dict:
     """
     For an AOI (bbox), return time series aligned to `years`.
-    CACHED on disk by (bbox, years tuple).
+    CACHED on disk by (bbox, years tuple); county downloads for all years
+    run concurrently and are cached per (year, state, county).
+    With apportion=True, tract totals are weighted by the share of each
+    tract's area inside the bbox (local tract layer only).
     """
     if not years:
         return {
@@ -136,7 +275,7 @@ def get_demographics_timeseries_for_bbox(
         round(max_lon, 6)
     )
     years_key = tuple(sorted(set(int(y) for y in years)))
-    demo_cache_key = (bbox_key, years_key, fill)
+    demo_cache_key = (bbox_key, years_key, fill) + (("apportion",) if apportion else ())
     
     # Check cache
     cached = cache.get("census_demographics", demo_cache_key)
@@ -146,7 +285,8 @@ def get_demographics_timeseries_for_bbox(
     
     logger.info(f"Fetching demographics from Census API for {len(years)} years")
     
-    tract_ids, state_counties = _get_bbox_tracts(min_lat, max_lat, min_lon, max_lon)
+    client = client or get_census_client()
+    tract_ids, state_counties = await _get_bbox_tracts(min_lat, max_lat, min_lon, max_lon, client)
     
     if not tract_ids:
         zeros = [0] * len(years)
@@ -161,48 +301,27 @@ def get_demographics_timeseries_for_bbox(
         return result
 
     want_years = sorted(set(int(y) for y in years))
-    by_year = {}
-    VARS = ["B01003_001E", "B11001_001E", "B19013_001E", "B19301_001E"]
-
-    for y in want_years:
-        dfs = []
-        for (st, co) in state_counties:
-            params = {
-                "get": ",".join(VARS),
-                "for": "tract:*",
-                "in": f"state:{st} county:{co}",
-                "key": settings.CENSUS_API_KEY,
-            }
-            endpoint = ACS_ENDPOINT_TEMPLATE.format(year=y)
-            resp = requests.get(endpoint, params=params, timeout=30)
-            if not resp.ok:
-                logger.warning("ACS failed (y=%s %s-%s): %s", y, st, co, resp.text)
-                continue
-            rows = resp.json()
-            if len(rows) < 2:
-                continue
-            df = pd.DataFrame(rows[1:], columns=rows[0])
-            df["TRACT_ID"] = (
-                df["state"].astype(str).str.zfill(2)
-                + df["county"].astype(str).str.zfill(3)
-                + df["tract"].astype(str).str.zfill(6)
-            )
-            for col in VARS:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
-            df = df[df["TRACT_ID"].isin(tract_ids)]
-            if not df.empty:
-                dfs.append(df)
-
-        if not dfs:
-            by_year[y] = {"pop": 0.0, "hh": 0.0, "hhi_wmean": 0.0, "pci_wmean": 0.0}
-            continue
+    tract_ids = list(dict.fromkeys(tract_ids))
+    weight_map = _bbox_tract_weights(min_lat, max_lat, min_lon, max_lon) if apportion else None
+    weights = np.array([weight_map.get(t, 1.0) for t in tract_ids]) if weight_map is not None else None
+
+    # Tract values [years, tracts, ACS_VARS]: preloaded years from the local
+    # warehouse, the rest from the ACS API
+    warehouse = get_acs_warehouse()
+    local_years = [y for y in want_years if warehouse is not None and warehouse.has_year(y)]
+    remote_years = [y for y in want_years if y not in local_years]
+    year_pos = {y: i for i, y in enumerate(want_years)}
+
+    cube = np.full((len(want_years), len(tract_ids), len(ACS_VARS)), np.nan)
+    if local_years:
+        cube[[year_pos[y] for y in local_years]] = warehouse.lookup(tract_ids, local_years)
+    if remote_years:
+        cube[[year_pos[y] for y in remote_years]] = await _fetch_tract_values(
+            client, tract_ids, state_counties, remote_years
+        )
 
-        all_df = pd.concat(dfs, ignore_index=True)
-        pop = float(all_df["B01003_001E"].sum(numeric_only=True))
-        hh  = float(all_df["B11001_001E"].sum(numeric_only=True))
-        hhi_wmean = float((all_df["B19013_001E"] * all_df["B11001_001E"]).sum()) / hh if hh > 0 else 0.0
-        pci_wmean = float((all_df["B19301_001E"] * all_df["B01003_001E"]).sum()) / pop if pop > 0 else 0.0
-        by_year[y] = {"pop": pop, "hh": hh, "hhi_wmean": hhi_wmean, "pci_wmean": pci_wmean}
+    totals = _reduce_demographics(cube, weights)
+    by_year = {y: {k: float(v[year_pos[y]]) for k, v in totals.items()} for y in want_years}
 
     known = sorted(by_year.keys())
     def _fill(y: int):
@@ -237,7 +356,22 @@ def get_demographics_timeseries_for_bbox(
     return result
 
 
-def get_demographics_timeseries_with_projection_for_bbox(
+def get_demographics_timeseries_for_bbox(
+    min_lat: float,
+    max_lat: float,
+    min_lon: float,
+    max_lon: float,
+    years: list[int],
+    fill: str = "ffill",
+    apportion: bool = False,
+) -> dict:
+    """Synchronous get_demographics_timeseries_for_bbox_async()"""
+    return _run_sync(lambda client: get_demographics_timeseries_for_bbox_async(
+        min_lat, max_lat, min_lon, max_lon, years, fill, client=client, apportion=apportion
+    ))
+
+
+async def get_demographics_timeseries_with_projection_for_bbox_async(
     *,
     min_lat: float,
     max_lat: float,
@@ -248,6 +382,8 @@ def get_demographics_timeseries_with_projection_for_bbox(
     project: bool = True,
     method: str = "cagr",
     window: int = 5,
+    client: Optional[CensusClient] = None,
+    apportion: bool = False,
 ) -> Dict[str, List[float]]:
     """
     Returns demographics with future projections.
@@ -270,7 +406,7 @@ def get_demographics_timeseries_with_projection_for_bbox(
         round(max_lon, 6)
     )
     years_key = tuple(sorted(set(int(y) for y in years)))
-    proj_cache_key = (bbox_key, years_key, fill, project, method, window)
+    proj_cache_key = (bbox_key, years_key, fill, project, method, window) + (("apportion",) if apportion else ())
     
     # Check cache
     cached = cache.get("census_projected", proj_cache_key)
@@ -284,8 +420,9 @@ def get_demographics_timeseries_with_projection_for_bbox(
     yrs = sorted({int(y) for y in years})
 
     # Determine latest ACS year
+    client = client or get_census_client()
     try:
-        latest_acs = discover_latest_acs5_year()
+        latest_acs = await discover_latest_acs5_year_async(client=client)
     except Exception:
         latest_acs = max([y for y in yrs if y <= (np.datetime64("today").astype(object).year - 2)], default=2022)
 
@@ -294,107 +431,81 @@ def get_demographics_timeseries_with_projection_for_bbox(
 
     # Fetch historical ACS series
     if hist_years:
-        hist = get_demographics_timeseries_for_bbox(
+        hist = await get_demographics_timeseries_for_bbox_async(
             min_lat=min_lat, max_lat=max_lat,
             min_lon=min_lon, max_lon=max_lon,
             years=hist_years,
+            client=client,
+            apportion=apportion,
         )
     else:
         # Seed with latest available year
-        hist = get_demographics_timeseries_for_bbox(
+        hist = await get_demographics_timeseries_for_bbox_async(
             min_lat=min_lat, max_lat=max_lat,
             min_lon=min_lon, max_lon=max_lon,
             years=[latest_acs],
+            client=client,
+            apportion=apportion,
         )
         hist_years = [latest_acs]
 
-    # Extract series
-    pop_hist = np.array(hist.get("population", []), dtype=float)
-    hh_hist  = np.array(hist.get("households", []), dtype=float)
-    hhi_hist = np.array(hist.get("median_household_income_proxy", []), dtype=float)
-    hhi_hist = np.array(hist.get("median_household_income_proxy", []), dtype=float)
-    pci_hist = np.array(hist.get("per_capita_income", []), dtype=float)
-
-    out = {
-        "population": np.array(pop_hist, dtype=float),
-        "households": np.array(hh_hist, dtype=float),
-        "median_household_income_proxy": np.array(hhi_hist, dtype=float),
-        "per_capita_income": np.array(pci_hist, dtype=float),
-    }
-
-    # Helper for projection params
-    def _window_params(arr: np.ndarray):
-        n_hist = len(hist_years)
-        if n_hist == 0:
-            return 0.0, 0.0, 1
+    # Series as rows: population, households, median HHI, per-capita income
+    hist_matrix = np.array([
+        hist.get("population", []),
+        hist.get("households", []),
+        hist.get("median_household_income_proxy", []),
+        hist.get("per_capita_income", []),
+    ], dtype=float)
+    n_hist = len(hist_years)
+    last = hist_matrix[:, -1] if hist_matrix.shape[1] else np.zeros(len(hist_matrix))
+
+    # Projection params for every series at once, over the trailing window
+    if n_hist and hist_matrix.shape[1]:
         first_idx = max(0, n_hist - max(2, int(window)))
-        first = float(arr[first_idx]) if arr.size else 0.0
-        base  = float(arr[n_hist - 1]) if arr.size else 0.0
+        first = hist_matrix[:, first_idx]
+        base  = hist_matrix[:, n_hist - 1]
         span  = max(1, hist_years[-1] - hist_years[first_idx])
-        return first, base, span
-
-    # Pre-compute rates/slopes
-    f_pop, b_pop, s_pop = _window_params(out["population"])
-    f_hh,  b_hh,  s_hh  = _window_params(out["households"])
-    f_hhi, b_hhi, s_hhi = _window_params(out["median_household_income_proxy"])
-    f_pci, b_pci, s_pci = _window_params(out["per_capita_income"])
-
-    def _cagr(first, base, span):
-        if first > 0.0 and base > 0.0 and span > 0:
-            try:
-                return (base / first) ** (1.0 / span) - 1.0
-            except Exception:
-                return 0.0
-        return 0.0
-
-    def _slope(first, base, span):
-        return (base - first) / span if span > 0 else 0.0
-
-    pop_cagr = _cagr(f_pop, b_pop, s_pop)
-    hh_cagr  = _cagr(f_hh,  b_hh,  s_hh)
-    hhi_slp  = _slope(f_hhi, b_hhi, s_hhi)
-    pci_slp  = _slope(f_pci, b_pci, s_pci)
+    else:
+        first = base = np.zeros(len(hist_matrix))
+        span  = 1
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        cagr = np.where((first > 0.0) & (base > 0.0), (base / first) ** (1.0 / span) - 1.0, 0.0)
+    cagr  = np.where(np.isfinite(cagr), cagr, 0.0)
+    slope = (base - first) / span
+
+    pop_cagr, hh_cagr = float(cagr[0]), float(cagr[1])
+    hhi_slp,  pci_slp = float(slope[2]), float(slope[3])
 
     # Project future years if needed
     if project and fut_years:
-        n_hist = len(hist_years)
-
-        def _project(arr: np.ndarray, mode: str, rate: float, slope: float) -> np.ndarray:
-            base = float(arr[-1]) if arr.size else 0.0
-            if mode == "linear":
-                incr = slope
-                proj = []
-                curr = base
-                for _ in fut_years:
-                    curr = max(0.0, curr + incr)
-                    proj.append(curr)
-            else:
-                r = float(np.clip(rate, -0.2, 0.2))
-                proj = []
-                curr = base
-                for _ in fut_years:
-                    curr = max(0.0, curr * (1.0 + r))
-                    proj.append(curr)
-            return np.concatenate([arr, np.array(proj, dtype=float)]) if n_hist else np.array(proj, dtype=float)
-
-        out["population"] = _project(out["population"], "cagr" if method == "cagr" else "linear", pop_cagr, hhi_slp)
-        out["households"] = _project(out["households"], "cagr" if method == "cagr" else "linear", hh_cagr,  hhi_slp)
-        out["median_household_income_proxy"] = _project(out["median_household_income_proxy"], "linear", 0.0, hhi_slp)
-        out["per_capita_income"] = _project(out["per_capita_income"], "linear", 0.0, pci_slp)
+        steps = np.arange(1, len(fut_years) + 1)
+
+        # Population and households grow by CAGR (or linearly, with the HHI
+        # slope as before); income series always linearly
+        use_rate = np.array([method == "cagr", method == "cagr", False, False])
+        rates    = np.clip(np.array([pop_cagr, hh_cagr, 0.0, 0.0]), -0.2, 0.2)
+        slopes   = np.array([hhi_slp, hhi_slp, hhi_slp, pci_slp])
+
+        # Both floored at 0 every year: compounding stays at 0 once there;
+        # a positive slope keeps growing from the first (floored) step
+        by_rate  = np.maximum(0.0, last[:, None] * (1.0 + rates[:, None]) ** steps)
+        by_slope = np.where(
+            slopes[:, None] >= 0.0,
+            np.maximum(0.0, last + slopes)[:, None] + (steps - 1) * slopes[:, None],
+            np.maximum(0.0, last[:, None] + steps * slopes[:, None]),
+        )
+        proj   = np.where(use_rate[:, None], by_rate, by_slope)
+        matrix = np.concatenate([hist_matrix, proj], axis=1) if n_hist else proj
     else:
         # No projection: repeat last value
-        need = len(yrs) - len(hist_years)
+        need   = len(yrs) - len(hist_years)
+        matrix = hist_matrix
         if need > 0:
-            for k in list(out.keys()):
-                last = float(out[k][-1]) if out[k].size else 0.0
-                pad  = np.full((need,), last, dtype=float)
-                out[k] = np.concatenate([out[k], pad]) if out[k].size else pad
+            matrix = np.concatenate([hist_matrix, np.repeat(last[:, None], need, axis=1)], axis=1)
 
     # Convert to lists
-    pop_series = [float(x) for x in out["population"]]
-    hh_series  = [float(x) for x in out["households"]]
-    hhi_series = [float(x) for x in out["median_household_income_proxy"]]
-    pci_series = [float(x) for x in out["per_capita_income"]]
+    pop_series, hh_series, hhi_series, pci_series = (row.tolist() for row in matrix)
 
     # Build model metadata
     last_hist_year = int(max(hist_years)) if hist_years else None
@@ -439,4 +550,11 @@ def get_demographics_timeseries_with_projection_for_bbox(
     cache.set("census_projected", proj_cache_key, result)
     logger.info(f"✓ Cached projected demographics for {len(years)} years")
     
-    return result
\ No newline at end of file
+    return result
+
+
+def get_demographics_timeseries_with_projection_for_bbox(**kwargs) -> Dict[str, List[float]]:
+    """Synchronous get_demographics_timeseries_with_projection_for_bbox_async()"""
+    return _run_sync(lambda client: get_demographics_timeseries_with_projection_for_bbox_async(
+        **kwargs, client=client
+    ))
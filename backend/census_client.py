@@ -0,0 +1,197 @@
+# census_client.py
+"""
+Async HTTP access to the Census ACS API and TIGERweb.
+
+censusData used to call ``requests.get`` once per (year, state, county) -
+often 50-200 sequential, blocking calls inside async handlers. CensusClient
+keeps one pooled aiohttp session and bounds concurrent requests with a
+semaphore, so callers can ``asyncio.gather`` all their downloads.
+
+ACS county tables are cached per (year, state, county, variables) in the
+disk-backed cache and de-duplicated while in flight, so overlapping AOIs
+share downloads.
+
+The network layer is pluggable:
+- endpoints come from CENSUS_ACS_ENDPOINT / CENSUS_TIGER_ENDPOINT (defaults:
+  the public Census services), so tests can point at a local stub server
+- set_census_client() swaps the process-wide client (e.g. for a subclass
+  overriding get_json())
+"""
+import asyncio
+import copy
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from cache_manager import cache
+
+logger = logging.getLogger(__name__)
+
+ACS_ENDPOINT_TEMPLATE = os.getenv("CENSUS_ACS_ENDPOINT", "https://api.census.gov/data/{year}/acs/acs5")
+TIGER_ENDPOINT = os.getenv(
+    "CENSUS_TIGER_ENDPOINT",
+    "https://tigerweb.geo.census.gov/arcgis/rest/services/TIGERweb/Tracts_Blocks/MapServer/5/query",
+)
+
+# Concurrent requests per client (the Census API throttles bursts) and pool size
+MAX_CONCURRENT_REQUESTS = 8
+MAX_CONNECTIONS = 16
+
+# Seconds per request
+REQUEST_TIMEOUT = 30
+
+
+@dataclass
+class CensusResponse:
+    status: Optional[int]  # None when the request itself failed
+    data: Any              # Decoded JSON (None on failure)
+    text: str              # Body or error message, for logging
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and 200 <= self.status < 300 and self.data is not None
+
+
+class CensusClient:
+    """Pooled, concurrency-bounded client for ACS and TIGERweb"""
+
+    def __init__(
+        self,
+        acs_endpoint_template: str = ACS_ENDPOINT_TEMPLATE,
+        tiger_endpoint: str = TIGER_ENDPOINT,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+    ):
+        self.acs_endpoint_template = acs_endpoint_template
+        self.tiger_endpoint = tiger_endpoint
+        self.max_concurrent_requests = max_concurrent_requests
+
+        # Bound to the event loop that created them (see _state())
+        self._loop = None
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+
+    # ---------- transport -------------------------------------------------
+    async def get_json(self, url: str, params: Dict[str, Any], timeout: float = REQUEST_TIMEOUT) -> CensusResponse:
+        """GET url and decode JSON; never raises for HTTP or network errors"""
+        import aiohttp
+
+        session, semaphore = self._state()
+        async with semaphore:
+            try:
+                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                    text = await resp.text()
+                    if resp.status >= 400:
+                        return CensusResponse(resp.status, None, text)
+                    try:
+                        return CensusResponse(resp.status, json.loads(text) if text else None, text)
+                    except ValueError:
+                        return CensusResponse(resp.status, None, text)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                return CensusResponse(None, None, repr(e))
+
+    def _state(self):
+        """Session and semaphore for the running loop (recreated if the loop changed)"""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS))
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._inflight = {}
+            self._loop = loop
+        return self._session, self._semaphore
+
+    def fork(self) -> "CensusClient":
+        """Same configuration with its own session (for use on another event loop)"""
+        clone = copy.copy(self)
+        clone._loop = clone._session = clone._semaphore = None
+        clone._inflight = {}
+        return clone
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    # ---------- ACS -------------------------------------------------------
+    async def acs_probe(self, year: int) -> bool:
+        """Whether the ACS 5-year endpoint serves `year`"""
+        resp = await self.get_json(
+            self.acs_endpoint_template.format(year=year),
+            {"get": "NAME", "for": "us:1"},
+            timeout=10,
+        )
+        return resp.ok
+
+    async def acs_county_tracts(
+        self,
+        year: int,
+        state: str,
+        county: str,
+        variables: List[str],
+        api_key: Optional[str],
+    ) -> Optional[List[List[str]]]:
+        """
+        ACS rows (header first) for every tract in a county, or None on failure.
+        Cached per (year, state, county, variables); failures are not cached.
+        """
+        key = (int(year), state, county, tuple(variables))
+        cached = cache.get("acs_county", key)
+        if cached is not None:
+            return cached
+
+        self._state()
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_county(key, api_key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_county(self, key: Tuple, api_key: Optional[str]) -> Optional[List[List[str]]]:
+        year, state, county, variables = key
+        params = {
+            "get": ",".join(variables),
+            "for": "tract:*",
+            "in": f"state:{state} county:{county}",
+        }
+        if api_key:
+            params["key"] = api_key
+
+        resp = await self.get_json(self.acs_endpoint_template.format(year=year), params)
+        if not resp.ok:
+            logger.warning("ACS failed (y=%s %s-%s): %s", year, state, county, resp.text[:200])
+            return None
+
+        rows = resp.data if isinstance(resp.data, list) else []
+        cache.set("acs_county", key, rows)
+        return rows
+
+    # ---------- TIGERweb --------------------------------------------------
+    async def tiger_query(self, params: Dict[str, Any]) -> CensusResponse:
+        return await self.get_json(self.tiger_endpoint, params)
+
+
+_client: Optional[CensusClient] = None
+
+
+def get_census_client() -> CensusClient:
+    """Process-wide client (created on first use)"""
+    global _client
+    if _client is None:
+        _client = CensusClient()
+    return _client
+
+
+def set_census_client(client: Optional[CensusClient]) -> None:
+    """Replace the process-wide client (None: default client on next use)"""
+    global _client
+    _client = client
+
+
+async def close_census_client() -> None:
+    if _client is not None:
+        await _client.close()
@@ -0,0 +1,120 @@
+# census_tracts.py
+"""
+Local census tract geometry index.
+
+Tract lookups used to query TIGERweb for every new AOI (results were only
+cached per exact bbox). The tract layer is now a GeoParquet file built once
+by scripts/load_tract_layer.py; it is loaded on first use and indexed with a
+shapely STRtree, so any bbox resolves in-process:
+
+- tract ids and (state, county) pairs intersecting the AOI
+- per-tract weights: share of the tract's area inside the AOI, for
+  apportioning tract totals (population, households) to the exact AOI
+
+Without the layer file get_tract_index() returns None and censusData falls
+back to TIGERweb.
+
+Layer: $CENSUS_TRACT_LAYER (default: ./census_data/tracts.parquet), EPSG:4326,
+columns GEOID (11-digit state+county+tract), STATEFP, COUNTYFP, geometry.
+"""
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TRACT_LAYER_PATH = Path(os.getenv("CENSUS_TRACT_LAYER", "census_data/tracts.parquet"))
+TRACT_COLUMNS = ["GEOID", "STATEFP", "COUNTYFP", "geometry"]
+
+
+@dataclass
+class TractSelection:
+    """Tracts intersecting an AOI"""
+    tract_ids: List[str]
+    weights: np.ndarray        # Share of each tract's area inside the AOI (0-1]
+    indices: np.ndarray        # Positions in the TractIndex
+
+    @property
+    def state_counties(self) -> Set[Tuple[str, str]]:
+        return {(t[:2], t[2:5]) for t in self.tract_ids}
+
+    def weight_map(self) -> dict:
+        return dict(zip(self.tract_ids, self.weights.tolist()))
+
+
+class TractIndex:
+    """STRtree over tract polygons, with areas precomputed"""
+
+    def __init__(self, tracts):
+        import shapely
+
+        self.geoids = tracts["GEOID"].astype(str).to_numpy()
+        self.geometries = tracts.geometry.to_numpy()
+        self.areas = shapely.area(self.geometries)
+        self.tree = shapely.STRtree(self.geometries)
+
+    def __len__(self) -> int:
+        return len(self.geoids)
+
+    def query_bbox(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> TractSelection:
+        """Tracts intersecting the bbox (same predicate as the TIGERweb query)"""
+        import shapely
+
+        return self.query_geometry(shapely.box(min_lon, min_lat, max_lon, max_lat))
+
+    def query_geometry(self, aoi) -> TractSelection:
+        import shapely
+
+        idx = np.sort(self.tree.query(aoi, predicate="intersects"))
+        overlap = shapely.area(shapely.intersection(self.geometries[idx], aoi))
+        areas = self.areas[idx]
+        weights = np.divide(overlap, areas, out=np.ones_like(overlap), where=areas > 0)
+
+        return TractSelection(
+            tract_ids=self.geoids[idx].tolist(),
+            weights=np.clip(weights, 0.0, 1.0),
+            indices=idx,
+        )
+
+
+_index: Optional[TractIndex] = None
+_index_checked = False
+_lock = threading.Lock()
+
+
+def get_tract_index(path: Path = None) -> Optional[TractIndex]:
+    """Process-wide tract index (loaded on first use), or None without a layer file"""
+    global _index, _index_checked
+
+    if _index_checked and path is None:
+        return _index
+
+    with _lock:
+        if _index_checked and path is None:
+            return _index
+
+        layer = path or TRACT_LAYER_PATH
+        index = None
+        if layer.exists():
+            import geopandas as gpd
+
+            tracts = gpd.read_parquet(layer, columns=TRACT_COLUMNS)
+            index = TractIndex(tracts)
+            logger.info(f"Loaded tract index: {len(index)} tracts from {layer}")
+        else:
+            logger.warning(f"No tract layer at {layer}; tract lookups use TIGERweb")
+
+        _index, _index_checked = index, True
+        return _index
+
+
+def reset_tract_index() -> None:
+    """Reload the layer on next use (after scripts/load_tract_layer.py)"""
+    global _index, _index_checked
+    with _lock:
+        _index, _index_checked = None, False
@@ -0,0 +1,121 @@
+# census_warehouse.py
+"""
+Local columnar store of ACS 5-year tract variables by year.
+
+AOI demographics used to download every intersecting county per year and
+filter the concatenated frames with isin(). The warehouse keeps the tract
+variables of preloaded years (scripts/load_acs_warehouse.py) as one dense
+array [years, tracts, variables] with tract ids sorted, so an AOI is a
+searchsorted join plus a weighted reduction over all years at once.
+
+Years missing from the warehouse are still fetched from the ACS API.
+
+Layout:
+    <root>/acs5_<year>.parquet     # columns: tract_id, <ACS_VARS>
+
+Root: $CENSUS_WAREHOUSE_DIR (default: ./census_data/acs5)
+"""
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WAREHOUSE_DIR = Path(os.getenv("CENSUS_WAREHOUSE_DIR", "census_data/acs5"))
+
+# Total population, households, median household income, per-capita income
+ACS_VARS = ["B01003_001E", "B11001_001E", "B19013_001E", "B19301_001E"]
+
+_FILE_PATTERN = re.compile(r"acs5_(\d{4})\.parquet$")
+
+
+def year_path(root: Path, year: int) -> Path:
+    return root / f"acs5_{int(year)}.parquet"
+
+
+class ACSWarehouse:
+    """Dense [years, tracts, ACS_VARS] array, NaN where a tract has no row"""
+
+    def __init__(self, root: Path):
+        import pandas as pd
+
+        files = sorted(
+            (int(m.group(1)), f)
+            for f in root.glob("acs5_*.parquet")
+            if (m := _FILE_PATTERN.search(f.name))
+        )
+        frames = {year: pd.read_parquet(f, columns=["tract_id", *ACS_VARS]) for year, f in files}
+
+        self.root = root
+        self.years: List[int] = [year for year, _ in files]
+        self._year_pos = {year: i for i, year in enumerate(self.years)}
+
+        all_ids = [frame["tract_id"].astype(str).to_numpy() for frame in frames.values()]
+        self.tract_ids = np.unique(np.concatenate(all_ids)) if all_ids else np.array([], dtype=str)
+
+        self.values = np.full((len(self.years), len(self.tract_ids), len(ACS_VARS)), np.nan)
+        for i, frame in enumerate(frames.values()):
+            pos = np.searchsorted(self.tract_ids, frame["tract_id"].astype(str).to_numpy())
+            self.values[i, pos, :] = frame[ACS_VARS].to_numpy(dtype=float)
+
+    def has_year(self, year: int) -> bool:
+        return int(year) in self._year_pos
+
+    def lookup(self, tract_ids: Iterable[str], years: Iterable[int]) -> np.ndarray:
+        """
+        Values for tracts x years: [len(years), len(tract_ids), len(ACS_VARS)],
+        NaN for tracts (or years) not in the warehouse
+        """
+        ids = np.asarray(list(tract_ids), dtype=str)
+        year_pos = np.array([self._year_pos.get(int(y), -1) for y in years], dtype=int)
+
+        if len(self.tract_ids):
+            pos = np.minimum(np.searchsorted(self.tract_ids, ids), len(self.tract_ids) - 1)
+            found = self.tract_ids[pos] == ids
+        else:
+            pos = np.zeros(len(ids), dtype=int)
+            found = np.zeros(len(ids), dtype=bool)
+
+        out = np.full((len(year_pos), len(ids), len(ACS_VARS)), np.nan)
+        rows = np.flatnonzero(year_pos >= 0)
+        cols = np.flatnonzero(found)
+        if rows.size and cols.size:
+            out[np.ix_(rows, cols)] = self.values[np.ix_(year_pos[rows], pos[cols])]
+        return out
+
+
+_warehouse: Optional[ACSWarehouse] = None
+_checked = False
+_lock = threading.Lock()
+
+
+def get_acs_warehouse() -> Optional[ACSWarehouse]:
+    """Process-wide warehouse (loaded on first use), or None if nothing was preloaded"""
+    global _warehouse, _checked
+
+    if _checked:
+        return _warehouse
+
+    with _lock:
+        if not _checked:
+            warehouse = ACSWarehouse(WAREHOUSE_DIR) if WAREHOUSE_DIR.exists() else None
+            if warehouse is not None and not warehouse.years:
+                warehouse = None
+            if warehouse is not None:
+                logger.info(
+                    f"Loaded ACS warehouse: {len(warehouse.tract_ids)} tracts, years {warehouse.years}"
+                )
+            _warehouse, _checked = warehouse, True
+        return _warehouse
+
+
+def reset_acs_warehouse() -> None:
+    """Reload on next use (after scripts/load_acs_warehouse.py)"""
+    global _warehouse, _checked
+    with _lock:
+        _warehouse, _checked = None, False
@@ -91,17 +91,8 @@ class ClimateAnalyzer:
             logger.warning(f"No time data available for {variable}")
             return []
         
-        # Parse times
-        times = pd.to_datetime(times_str, errors='coerce').dropna()
-        
-        # Check for duplicate times
-        if times.duplicated().any():
-            logger.warning("Duplicate timestamps detected, dropping duplicates")
-            _, unique_idx = np.unique(times, return_index=True)
-            times = times[np.sort(unique_idx)]
-        
+        times = self.parse_times(times_str)
         if len(times) == 0:
-            logger.warning("No valid timestamps after parsing")
             return []
         
         analysis_results = []
@@ -120,6 +111,49 @@ class ClimateAnalyzer:
         
         return analysis_results
     
+    def parse_times(self, times_str: List[str]) -> pd.DatetimeIndex:
+        """Parse ISO time strings, dropping unparseable and duplicate entries"""
+        times = pd.to_datetime(times_str, errors='coerce').dropna()
+        
+        # Check for duplicate times
+        if times.duplicated().any():
+            logger.warning("Duplicate timestamps detected, dropping duplicates")
+            _, unique_idx = np.unique(times, return_index=True)
+            times = times[np.sort(unique_idx)]
+        
+        if len(times) == 0:
+            logger.warning("No valid timestamps after parsing")
+        
+        return times
+    
+    def analyze_cell(
+        self,
+        grid_point: Dict[str, Any],
+        variables: List[str],
+        times: pd.DatetimeIndex
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze every variable of one prepared grid cell.
+        
+        Used when cells are streamed and never collected into a full response.
+        
+        Returns:
+            Dict of variable -> analysis result (variables that fail are omitted)
+        """
+        results = {}
+        grid_index = grid_point.get('grid_index', 0)
+        
+        for var in variables:
+            try:
+                result = self._analyze_grid_cell(grid_point, var, times, grid_index)
+            except Exception as e:
+                logger.debug(f"Failed to analyze grid {grid_index} for {var}: {e}")
+                continue
+            if result:
+                results[var] = result
+        
+        return results
+    
     def _analyze_grid_cell(
         self,
         grid_point: Dict[str, Any],
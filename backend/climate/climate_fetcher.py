@@ -3,77 +3,166 @@ Main orchestrator for climate data fetching pipeline.
 FIXED: Removed redundant spatial subsetting (now handled by data source)
 """
 import logging
-from typing import Dict, Any
+from contextlib import nullcontext
+from typing import Dict, Any, Optional, Tuple
 import datetime
 
 from .data_sources.base import ClimateDataSource
 from models import DataRequest
 from .climate_hazards import get_hazard
 from .climate_processors import ClimateProcessor
+from .composites.registry import get_composite_spec
 from .climate_preparers import FrontendPreparer
+from .tile_store import ClimateTileStore
 
 logger = logging.getLogger(__name__)
 
 
+def _stage(progress, name: str):
+    """progress.stage(name) when reporting progress, otherwise a no-op"""
+    if progress is None:
+        return nullcontext({})
+    return progress.stage(name)
+
+
+def request_ranges(request: DataRequest) -> Tuple[Tuple[float, float], Tuple[float, float], Tuple[str, str]]:
+    """
+    Resolve a request into (lat_range, lon_range, time_range).
+    
+    Time range is relative to the current year; spatial range is the bbox
+    itself or a buffer of num_cells grid cells around the point.
+    """
+    # 2. Calculate time range
+    now_year = datetime.datetime.now().year
+    start_year = now_year - (request.prior_years or 1)
+    end_year = now_year + (request.future_years or 1)
+    time_range = (f"{start_year}-01-01", f"{end_year}-12-31")
+    
+    # 3. Calculate spatial range
+    cell_degrees = 0.22  # Approximate NA-CORDEX grid resolution
+    
+    # Determine if using point or bbox mode
+    using_bbox = all(v is not None for v in [request.min_lat, request.max_lat, request.min_lon, request.max_lon])
+    
+    if using_bbox:
+        # Bbox mode: use provided bounds directly
+        logger.info(f"Using bounding box mode: [{request.min_lat}, {request.max_lat}] x [{request.min_lon}, {request.max_lon}]")
+        lat_range = (request.min_lat, request.max_lat)
+        lon_range = (request.min_lon, request.max_lon)
+    else:
+        # Point mode: calculate buffer around center point
+        logger.info(f"Using point mode: ({request.lat}, {request.lon}) with {request.num_cells} cells")
+        buffer = cell_degrees * (request.num_cells or 0)
+        lat_range = (request.lat - buffer, request.lat + buffer)
+        lon_range = (request.lon - buffer, request.lon + buffer)
+    
+    return lat_range, lon_range, time_range
+
+
 class ClimateFetcher:
     """Orchestrates the climate data pipeline"""
     
-    def __init__(self, data_source: ClimateDataSource):
+    def __init__(self, data_source: ClimateDataSource, tile_store: Optional[ClimateTileStore] = None):
         self.data_source = data_source
+        self.tile_store = tile_store
         self.processor = ClimateProcessor()
         self.preparer = FrontendPreparer()
     
-    def fetch_for_request(self, request: DataRequest) -> Dict[str, Any]:
+    def fetch_for_request(self, request: DataRequest, progress=None) -> Dict[str, Any]:
         """
         Main entry point: fetch, process, and format climate data.
         
         Args:
             request: DataRequest Pydantic model from API
+            progress: Optional jobs.JobProgress to report stage timings to
             
         Returns:
             Dict ready for ClimateData Pydantic model
         """
+        processed = self.process_request(request, progress)
+        
+        # 10. Format for frontend
+        logger.info("Preparing data for frontend")
+        with _stage(progress, "formatting"):
+            response = self.preparer.prepare(**processed, run_analysis=False)
+        
+        if response.get("data"):
+            with _stage(progress, "analysis"):
+                response["climate_analysis"] = self.preparer.analyze(response, processed["variables"])
+        
+        logger.info("Climate data pipeline complete")
+        return response
+    
+    def process_request(self, request: DataRequest, progress=None) -> Dict[str, Any]:
+        """
+        Run the fetch/process steps of the pipeline, stopping before formatting.
+        
+        Args:
+            request: DataRequest Pydantic model from API
+            progress: Optional jobs.JobProgress; when given, the fetched data is
+                loaded eagerly so the S3 transfer is attributed to the fetch stage
+        
+        Returns:
+            Keyword arguments for FrontendPreparer.prepare() / stream():
+            ds, variables, variable_metadata, aggregate_over_members
+        """
         # 1. Get hazard definition
         hazard = get_hazard(request.hazard.value)
         logger.info(f"Fetching data for hazard: {hazard.name}")
         
-        # 2. Calculate time range
-        now_year = datetime.datetime.now().year
-        start_year = now_year - (request.prior_years or 1)
-        end_year = now_year + (request.future_years or 1)
-        time_range = (f"{start_year}-01-01", f"{end_year}-12-31")
-        
-        # 3. Calculate spatial range
-        cell_degrees = 0.22  # Approximate NA-CORDEX grid resolution
-        
-        # Determine if using point or bbox mode
-        using_bbox = all(v is not None for v in [request.min_lat, request.max_lat, request.min_lon, request.max_lon])
-        
-        if using_bbox:
-            # Bbox mode: use provided bounds directly
-            logger.info(f"Using bounding box mode: [{request.min_lat}, {request.max_lat}] x [{request.min_lon}, {request.max_lon}]")
-            lat_range = (request.min_lat, request.max_lat)
-            lon_range = (request.min_lon, request.max_lon)
-        else:
-            # Point mode: calculate buffer around center point
-            logger.info(f"Using point mode: ({request.lat}, {request.lon}) with {request.num_cells} cells")
-            buffer = cell_degrees * (request.num_cells or 0)
-            lat_range = (request.lat - buffer, request.lat + buffer)
-            lon_range = (request.lon - buffer, request.lon + buffer)
-        
-        # 4. Fetch base variables only
+        # 2-3. Calculate time and spatial range
+        lat_range, lon_range, time_range = request_ranges(request)
+        
+        # Needed for the tile lookup as well as step 6
+        needs_aggregation = (
+            request.aggregate_over_member_id and
+            request.climate_model in ("all", "aggregate")
+        )
+        
+        # 3b. Serve from a precomputed tile if one covers the request
+        if self.tile_store is not None:
+            tile = self.tile_store.find(
+                hazard=request.hazard.value,
+                scenario=request.scenario.value,
+                domain=request.domain,
+                climate_model=request.climate_model,
+                aggregate_over_members=needs_aggregation,
+                aggregation_method=request.aggregation_method.value,
+                aggregation_q=request.aggregation_q,
+                lat_range=lat_range,
+                lon_range=lon_range,
+                time_range=time_range
+            )
+            if tile is not None:
+                logger.info(f"Using precomputed climate tile: {tile.tile_id}")
+                with _stage(progress, "tile_load") as st:
+                    processed_data = self.tile_store.load(tile, lat_range, lon_range, time_range)
+                    st["bytes"] = int(processed_data.nbytes)
+                return {
+                    "ds": processed_data,
+                    "variables": hazard.all_variables(),
+                    "variable_metadata": tile.variable_metadata,
+                    "aggregate_over_members": needs_aggregation,
+                }
+        
+        # 4. Fetch base variables only (displayed ones plus composite inputs)
         # NOTE: The data source (na_cordex.py) now handles spatial subsetting
         # using intersection-based selection, so we get the correct cells here.
-        logger.info(f"Fetching base variables: {hazard.base_variables}")
-        raw_data = self.data_source.fetch_variables(
-            variables=hazard.base_variables,
-            scenario=request.scenario.value,
-            domain=request.domain,
-            lat_range=lat_range,
-            lon_range=lon_range,
-            time_range=time_range,
-            climate_model=request.climate_model
-        )
+        plan = hazard.fetch_plan()
+        logger.info(f"Fetching base variables: {plan.base_variables}")
+        with _stage(progress, "fetch") as st:
+            raw_data = self.data_source.fetch_variables(
+                variables=plan.base_variables,
+                scenario=request.scenario.value,
+                domain=request.domain,
+                lat_range=lat_range,
+                lon_range=lon_range,
+                time_range=time_range,
+                climate_model=request.climate_model
+            )
+            if progress is not None:
+                raw_data = raw_data.load()
+            st["bytes"] = int(raw_data.nbytes)
         
         # 5. Verify we got data
         lat_coord = [c for c in raw_data.coords if 'lat' in c.lower()][0]
@@ -89,30 +178,28 @@ class ClimateFetcher:
             )
         
         # 6. Aggregate members if requested
-        needs_aggregation = (
-            request.aggregate_over_member_id and
-            request.climate_model in ("all", "aggregate")
-        )
-        
         if needs_aggregation:
             logger.info(f"Aggregating members using {request.aggregation_method}")
             agg_kwargs = {}
             if request.aggregation_method.value == "percentile":
                 agg_kwargs["q"] = request.aggregation_q
             
-            raw_data = self.processor.aggregate_members(
-                raw_data,
-                method=request.aggregation_method.value,
-                **agg_kwargs
-            )
+            with _stage(progress, "aggregation") as st:
+                raw_data = self.processor.aggregate_members(
+                    raw_data,
+                    method=request.aggregation_method.value,
+                    **agg_kwargs
+                )
+                st["bytes"] = int(raw_data.nbytes)
         
         # 7. Compute composites
         if hazard.composite_variables:
-            logger.info(f"Computing composites: {hazard.composite_variables}")
-            raw_data = self.processor.compute_composites(
-                raw_data,
-                hazard.composite_variables
-            )
+            logger.info(f"Computing composites: {plan.evaluation_order}")
+            with _stage(progress, "composites"):
+                raw_data = self.processor.compute_composites(
+                    raw_data,
+                    hazard.composite_variables
+                )
         
         # 8. Convert units
         all_vars = hazard.all_variables()
@@ -124,22 +211,18 @@ class ClimateFetcher:
             var: self.data_source.get_variable_metadata(var)
             for var in hazard.base_variables
         }
-        # Add composite metadata
+        # Add composite metadata from the registry declarations
         for comp_var in hazard.composite_variables:
             if comp_var in processed_data.data_vars:
+                spec = get_composite_spec(comp_var)
                 variable_metadata[comp_var] = {
-                    "units": processed_data[comp_var].attrs.get("units", ""),
-                    "long_name": processed_data[comp_var].attrs.get("long_name", comp_var)
+                    "units": spec.units or processed_data[comp_var].attrs.get("units", ""),
+                    "long_name": spec.long_name
                 }
         
-        # 10. Format for frontend
-        logger.info("Preparing data for frontend")
-        response = self.preparer.prepare(
-            processed_data,
-            all_vars,
-            variable_metadata,
-            aggregate_over_members=needs_aggregation
-        )
-        
-        logger.info("Climate data pipeline complete")
-        return response
\ No newline at end of file
+        return {
+            "ds": processed_data,
+            "variables": all_vars,
+            "variable_metadata": variable_metadata,
+            "aggregate_over_members": needs_aggregation,
+        }
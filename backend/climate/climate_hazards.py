@@ -5,6 +5,9 @@ Adding a new hazard = add one definition here.
 from typing import List
 from dataclasses import dataclass
 from models import HazardEnum
+from .composites.planner import CompositePlan, plan_composites
+
+
 @dataclass
 class HazardDefinition:
     """Defines what variables a hazard needs and how to compute them"""
@@ -18,9 +21,13 @@ class HazardDefinition:
         """All variables this hazard provides"""
         return self.base_variables + self.composite_variables
     
+    def fetch_plan(self) -> CompositePlan:
+        """Resolve composite dependencies into a fetch/evaluation plan"""
+        return plan_composites(self.composite_variables, self.base_variables)
+    
     def needs_fetching(self) -> List[str]:
-        """Only base variables need to be fetched"""
-        return self.base_variables
+        """Base variables to fetch, including inputs required by composites"""
+        return self.fetch_plan().base_variables
 
 
 # Hazard Registry
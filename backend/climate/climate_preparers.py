@@ -4,7 +4,7 @@ Formats xarray.Dataset into the structure expected by Pinia store.
 UPDATED: Now runs climate analysis automatically
 """
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Any, Dict, Iterator, List, Optional
 import numpy as np
 import xarray as xr
 
@@ -47,49 +47,94 @@ class FrontendPreparer:
             "climate_analysis": {...}  # ← Added automatically
         }
         """
-        # Extract times
-        times = self._extract_times(ds)
+        response = self.prepare_header(ds, variables, variable_metadata)
         
-        # Extract spatial bounds
-        bounding_box = self._extract_bounding_box(ds)
+        # Format data
+        if aggregate_over_members or "member_id" not in ds.dims:
+            response["data"] = self._format_aggregated_data(ds, variables)
+        else:
+            response["members"] = self._format_member_data(ds, variables)
+            response["data"] = self._format_grid_data(ds, variables)
+        
+        # Run climate analysis automatically
+        if run_analysis and response.get("data"):
+            response["climate_analysis"] = self.analyze(response, variables)
+        
+        return response
+    
+    def analyze(self, response: Dict[str, Any], variables: List[str]) -> Dict[str, Any]:
+        """Run trend analysis on a prepared response (never raises)"""
+        if not response.get("data"):
+            return {"analysis_results": {}}
         
-        # Variable long names
+        try:
+            logger.info("Running climate trend analysis...")
+            analysis_result = self.analyzer.analyze_all_variables(
+                response,  # Pass the prepared data structure
+                variables
+            )
+            logger.info("✓ Climate analysis complete")
+            return analysis_result
+        except Exception as e:
+            logger.error(f"Climate analysis failed: {e}")
+            # Don't fail the whole request, just skip analysis
+            return {"analysis_results": {}}
+    
+    def prepare_header(
+        self,
+        ds: xr.Dataset,
+        variables: List[str],
+        variable_metadata: Dict[str, Dict]
+    ) -> Dict[str, Any]:
+        """Build the metadata part of the response (everything except cells)"""
         variable_long_names = [
             variable_metadata.get(v, {}).get("long_name", v)
             for v in variables
         ]
         
-        # Build base response
-        response = {
+        return {
             "variables": variables,
             "variable_long_names": variable_long_names,
-            "times": times,
-            "bounding_box": bounding_box,
+            "times": self._extract_times(ds),
+            "bounding_box": self._extract_bounding_box(ds),
         }
+    
+    def stream(
+        self,
+        ds: xr.Dataset,
+        variables: List[str],
+        variable_metadata: Dict[str, Dict],
+        aggregate_over_members: bool = True,
+        run_analysis: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Incremental counterpart of prepare().
         
-        # Format data
-        if aggregate_over_members or "member_id" not in ds.dims:
-            response["data"] = self._format_aggregated_data(ds, variables)
-        else:
-            response["members"] = self._format_member_data(ds, variables)
-            response["data"] = self._format_grid_data(ds, variables)
+        Yields records in order: one "header", one "cell" per grid cell,
+        optionally one "members", then "analysis" and "end". Cells are
+        analyzed as they are emitted so the full grid is never held in memory.
+        """
+        header = self.prepare_header(ds, variables, variable_metadata)
+        yield {"type": "header", **header}
         
-        # Run climate analysis automatically
-        if run_analysis and response.get("data"):
-            try:
-                logger.info("Running climate trend analysis...")
-                analysis_result = self.analyzer.analyze_all_variables(
-                    response,  # Pass the prepared data structure
-                    variables
-                )
-                response["climate_analysis"] = analysis_result
-                logger.info("✓ Climate analysis complete")
-            except Exception as e:
-                logger.error(f"Climate analysis failed: {e}")
-                # Don't fail the whole request, just skip analysis
-                response["climate_analysis"] = {"analysis_results": {}}
+        times = self.analyzer.parse_times(header["times"]) if run_analysis else None
+        analysis_results: Dict[str, List[Dict]] = {var: [] for var in variables}
         
-        return response
+        for cell in self.iter_grid_cells(ds, variables):
+            yield {"type": "cell", "cell": cell}
+            
+            if times is not None and len(times) > 0:
+                for var, result in self.analyzer.analyze_cell(cell, variables, times).items():
+                    analysis_results[var].append(result)
+        
+        if not aggregate_over_members and "member_id" in ds.dims:
+            yield {"type": "members", "members": self._format_member_data(ds, variables)}
+        
+        if run_analysis:
+            analysis = {var: res for var, res in analysis_results.items() if res}
+            yield {"type": "analysis", "climate_analysis": {"analysis_results": analysis}}
+        
+        yield {"type": "end"}
     
     def _extract_times(self, ds: xr.Dataset) -> List[str]:
         """Extract time coordinates as ISO strings"""
@@ -128,12 +173,20 @@ class FrontendPreparer:
         variables: List[str]
     ) -> List[Dict]:
         """Format aggregated (single value per timestep) data"""
+        return list(self.iter_grid_cells(ds, variables))
+    
+    def iter_grid_cells(
+        self,
+        ds: xr.Dataset,
+        variables: List[str]
+    ) -> Iterator[Dict]:
+        """Yield one formatted grid cell at a time, row-major over lat/lon"""
         lat_coords = [c for c in ds.coords if 'lat' in c.lower()]
         lon_coords = [c for c in ds.coords if 'lon' in c.lower()]
         
         if not lat_coords or not lon_coords:
             logger.error("Cannot format data: missing lat/lon coordinates")
-            return []
+            return
         
         lat_name = lat_coords[0]
         lon_name = lon_coords[0]
@@ -144,8 +197,14 @@ class FrontendPreparer:
         lat_offset = abs(lats[1] - lats[0]) / 2 if len(lats) > 1 else 0.125
         lon_offset = abs(lons[1] - lons[0]) / 2 if len(lons) > 1 else 0.125
         
-        grid_data = []
+        # Materialize each variable once rather than once per cell
+        arrays = {
+            var: ds[var].values
+            for var in variables
+            if var in ds.data_vars
+        }
         
+        grid_index = 0
         for i, lat in enumerate(lats):
             for j, lon in enumerate(lons):
                 bounds = {
@@ -158,13 +217,12 @@ class FrontendPreparer:
                 # Extract timeseries for each variable at this grid point
                 climate_data = {}
                 for var in variables:
-                    if var not in ds.data_vars:
+                    if var not in arrays:
                         climate_data[var] = None
                         continue
                     
-                    arr = ds[var].values
                     # Shape: (time, lat, lon)
-                    timeseries = arr[:, i, j].tolist()
+                    timeseries = arrays[var][:, i, j].tolist()
                     # Convert NaN/Inf to None
                     climate_data[var] = [
                         None if (isinstance(v, float) and (np.isnan(v) or np.isinf(v)))
@@ -172,13 +230,12 @@ class FrontendPreparer:
                         for v in timeseries
                     ]
                 
-                grid_data.append({
-                    "grid_index": len(grid_data),
+                yield {
+                    "grid_index": grid_index,
                     "bounds": bounds,
                     "climate": climate_data
-                })
-        
-        return grid_data
+                }
+                grid_index += 1
     
     def _format_member_data(
         self,
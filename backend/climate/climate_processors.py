@@ -2,11 +2,13 @@
 Process raw climate data: unit conversions, aggregations, composites.
 """
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 import numpy as np
 import xarray as xr
 
-from .composites.registry import get_composite_function, has_composite
+from .composites.registry import get_composite_spec
+from .composites.planner import plan_composites
+from .ensemble import aggregate_ensemble, stat_name
 
 logger = logging.getLogger(__name__)
 
@@ -55,26 +57,33 @@ class ClimateProcessor:
         
         Args:
             ds: Dataset with member_id dimension
-            method: 'mean', 'max', 'min', or 'percentile'
+            method: 'mean', 'median', 'max', 'min', or 'percentile'
             q: Quantile (0-100) if method='percentile'
         """
         if "member_id" not in ds.dims:
             return ds
         
-        logger.info(f"Aggregating {len(ds.member_id)} members using {method}")
-        
-        if method == "mean":
-            return ds.mean(dim="member_id", skipna=True)
-        elif method == "max":
-            return ds.max(dim="member_id", skipna=True)
-        elif method == "min":
-            return ds.min(dim="member_id", skipna=True)
-        elif method == "percentile":
-            if q is None:
-                raise ValueError("Must provide 'q' for percentile aggregation")
-            return ds.quantile(q / 100, dim="member_id", skipna=True)
-        else:
-            raise ValueError(f"Unknown aggregation method: {method}")
+        stat = stat_name(method, q)
+        logger.info(f"Aggregating {len(ds.member_id)} members using {stat}")
+        return aggregate_ensemble(ds, [stat])[stat]
+    
+    def aggregate_members_multi(
+        self,
+        ds: xr.Dataset,
+        stats: List[str]
+    ) -> Dict[str, xr.Dataset]:
+        """
+        Compute several ensemble aggregates in one pass over the data.
+        
+        Args:
+            ds: Dataset with member_id dimension
+            stats: Statistic names: 'mean', 'min', 'max', 'median', 'p<q>'
+        
+        Returns:
+            Dict of statistic name -> aggregated Dataset
+        """
+        logger.info(f"Aggregating members into {stats}")
+        return aggregate_ensemble(ds, stats)
     
     def compute_composites(
         self,
@@ -84,6 +93,10 @@ class ClimateProcessor:
         """
         Compute composite variables and add to dataset.
         
+        Composites are evaluated in dependency order so composites built on
+        other composites see their inputs, and each intermediate is computed
+        once. Intermediates that were not requested are dropped afterwards.
+        
         Args:
             ds: Dataset with base variables
             composite_vars: List of composite variable names to compute
@@ -93,19 +106,28 @@ class ClimateProcessor:
         """
         ds = ds.copy()
         
-        for comp_var in composite_vars:
-            if not has_composite(comp_var):
-                logger.warning(f"No composite function registered for '{comp_var}'")
+        plan = plan_composites(composite_vars)  # Skips (and logs) unknown composites
+        
+        for comp_var in plan.evaluation_order:
+            spec = get_composite_spec(comp_var)
+            missing = [v for v in spec.inputs if v not in ds.data_vars]
+            if missing:
+                logger.warning(
+                    f"Skipping composite '{comp_var}': missing inputs {missing}"
+                )
                 continue
             
             try:
-                comp_func = get_composite_function(comp_var)
                 logger.info(f"Computing composite: {comp_var}")
-                ds[comp_var] = comp_func(ds)
+                ds[comp_var] = spec.func(ds)
             except Exception as e:
                 logger.error(f"Failed to compute composite '{comp_var}': {e}")
                 continue
         
+        intermediates = [v for v in plan.intermediates() if v in ds.data_vars]
+        if intermediates:
+            ds = ds.drop_vars(intermediates)
+        
         return ds
     
     def compute_grid_around_point(
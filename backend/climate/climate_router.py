@@ -2,21 +2,26 @@
 FastAPI router for climate endpoints.
 FIXED: Cache key now correctly handles both point and bbox modes
 """
+import json
 import logging
 from fastapi import APIRouter, HTTPException, Query
-from typing import List
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Iterator, List
 
 from models import DataRequest, ClimateData, ScenarioEnum
 from cache_manager import cache
+from jobs import jobs, job_topic, JobProgress
 from .data_sources.na_cordex import NACordexDataSource
 from .climate_fetcher import ClimateFetcher
+from .tile_store import default_tile_store
 from .climate_hazards import get_hazard, list_hazards
 
 logger = logging.getLogger(__name__)
 
 # Initialize pipeline components
 data_source = NACordexDataSource()
-fetcher = ClimateFetcher(data_source)
+fetcher = ClimateFetcher(data_source, tile_store=default_tile_store())
 
 # Create router
 router = APIRouter(prefix="/api", tags=["climate"])
@@ -34,7 +39,8 @@ async def list_climate_models(
     hazard: str = Query(..., description="Hazard name")
 ):
     """
-    List ensemble member IDs available for ALL base variables of the hazard.
+    List ensemble member IDs available for ALL variables the hazard fetches
+    (base variables plus composite inputs).
     """
     try:
         hazard_def = get_hazard(hazard)
@@ -43,7 +49,7 @@ async def list_climate_models(
     
     try:
         models = data_source.list_available_models(
-            variables=hazard_def.base_variables,
+            variables=hazard_def.needs_fetching(),
             scenario=scenario.value,
             domain=domain
         )
@@ -53,6 +59,81 @@ async def list_climate_models(
         raise HTTPException(status_code=500, detail="Failed to list climate models")
 
 
+def _climate_cache_key(request: DataRequest, hazard_def) -> tuple:
+    """Build the cache key for a climate request (point and bbox modes)"""
+    # Determine spatial mode and build appropriate key
+    using_bbox = all(v is not None for v in [
+        request.min_lat, request.max_lat, request.min_lon, request.max_lon
+    ])
+    
+    if using_bbox:
+        # Bbox mode: use bbox coordinates (rounded to avoid float precision issues)
+        spatial_key = (
+            "bbox",
+            round(request.min_lat, 6),
+            round(request.max_lat, 6),
+            round(request.min_lon, 6),
+            round(request.max_lon, 6)
+        )
+    else:
+        # Point mode: use center point + num_cells
+        spatial_key = (
+            "point",
+            round(request.lat, 6),
+            round(request.lon, 6),
+            request.num_cells
+        )
+    
+    return (
+        spatial_key,  
+        tuple(hazard_def.all_variables()),
+        request.scenario.value,
+        request.domain,
+        request.prior_years,
+        request.future_years,
+        request.aggregation_method.value,
+        request.aggregation_q,
+        request.aggregate_over_member_id,
+        request.climate_model,
+        data_source.source_name,
+    )
+
+
+def _cache_climate_response(request: DataRequest, cache_key: tuple, response: Dict[str, Any]):
+    """Cache a fresh response under its full key and the hazard-only key"""
+    # Cache response with full key
+    cache.set("climate", cache_key, response)
+
+    # Also cache with simple hazard-only key for downstream modules
+    cache.set("climate_latest", (request.hazard.value,), response)
+
+    logger.info("Climate data cached successfully")
+
+
+def _records_from_response(response: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Replay a fully built (cached) response as stream records"""
+    yield {
+        "type": "header",
+        "variables": response["variables"],
+        "variable_long_names": response["variable_long_names"],
+        "times": response["times"],
+        "bounding_box": response["bounding_box"],
+    }
+    for cell in response.get("data") or []:
+        yield {"type": "cell", "cell": cell}
+    if response.get("members") is not None:
+        yield {"type": "members", "members": response["members"]}
+    if response.get("climate_analysis") is not None:
+        yield {"type": "analysis", "climate_analysis": response["climate_analysis"]}
+    yield {"type": "end"}
+
+
+def _encode_ndjson(records: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    """Encode records one JSON document per line"""
+    for record in records:
+        yield (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+
 @router.post("/get-climate", response_model=ClimateData)
 async def get_climate(request: DataRequest):
     """
@@ -64,42 +145,7 @@ async def get_climate(request: DataRequest):
         # Build cache key
         hazard_def = get_hazard(request.hazard.value)
         
-        # Determine spatial mode and build appropriate key
-        using_bbox = all(v is not None for v in [
-            request.min_lat, request.max_lat, request.min_lon, request.max_lon
-        ])
-        
-        if using_bbox:
-            # Bbox mode: use bbox coordinates (rounded to avoid float precision issues)
-            spatial_key = (
-                "bbox",
-                round(request.min_lat, 6),
-                round(request.max_lat, 6),
-                round(request.min_lon, 6),
-                round(request.max_lon, 6)
-            )
-        else:
-            # Point mode: use center point + num_cells
-            spatial_key = (
-                "point",
-                round(request.lat, 6),
-                round(request.lon, 6),
-                request.num_cells
-            )
-        
-        cache_key = (
-            spatial_key,  
-            tuple(hazard_def.all_variables()),
-            request.scenario.value,
-            request.domain,
-            request.prior_years,
-            request.future_years,
-            request.aggregation_method.value,
-            request.aggregation_q,
-            request.aggregate_over_member_id,
-            request.climate_model,
-            data_source.source_name,
-        )
+        cache_key = _climate_cache_key(request, hazard_def)
         
         # Check cache
         cached = cache.get("climate", cache_key)
@@ -111,13 +157,7 @@ async def get_climate(request: DataRequest):
         logger.info(f"Fetching fresh climate data for {request.hazard.value}")
         response = fetcher.fetch_for_request(request)
         
-        # Cache response with full key
-        cache.set("climate", cache_key, response)
-
-        # Also cache with simple hazard-only key for downstream modules
-        cache.set("climate_latest", (request.hazard.value,), response)
-
-        logger.info("Climate data cached successfully")
+        _cache_climate_response(request, cache_key, response)
 
         return ClimateData(**response)
         
@@ -126,4 +166,76 @@ async def get_climate(request: DataRequest):
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.exception(f"Error fetching climate data: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch climate data")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to fetch climate data")
+
+
+@router.post("/get-climate/stream")
+async def stream_climate(request: DataRequest):
+    """
+    Streaming variant of /get-climate.
+    
+    Responds with NDJSON (one record per line): a "header" record with
+    variables, times and bounding box, one "cell" record per grid cell,
+    an optional "members" record, an "analysis" record and a final "end".
+    
+    Freshly fetched results are not cached, so server memory stays flat;
+    previously cached results are replayed from the cache.
+    """
+    try:
+        hazard_def = get_hazard(request.hazard.value)
+        cache_key = _climate_cache_key(request, hazard_def)
+        
+        cached = cache.get("climate", cache_key)
+        if cached:
+            logger.info("Streaming cached climate data")
+            records = _records_from_response(cached)
+        else:
+            # Fetch/process up front so errors surface as HTTP status codes
+            logger.info(f"Fetching fresh climate data for {request.hazard.value} (streaming)")
+            processed = await run_in_threadpool(fetcher.process_request, request)
+            records = fetcher.preparer.stream(**processed)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.exception(f"Error fetching climate data: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch climate data")
+    
+    return StreamingResponse(
+        _encode_ndjson(records),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post("/get-climate/jobs", status_code=202)
+async def submit_climate_job(request: DataRequest):
+    """
+    Job-based variant of /get-climate.
+    
+    Returns a job id immediately. Stage progress (fetch, aggregation,
+    composites, formatting, analysis, serialization) is published to the
+    PubSub topic ``jobs/<job_id>`` on /ws; the final event carries the
+    result URL. Status can also be polled at /api/jobs/<job_id>.
+    """
+    try:
+        hazard_def = get_hazard(request.hazard.value)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    cache_key = _climate_cache_key(request, hazard_def)
+    
+    async def run(progress: JobProgress) -> bytes:
+        response = cache.get("climate", cache_key)
+        if response:
+            progress.publish({"event": "cache_hit"})
+        else:
+            response = await run_in_threadpool(fetcher.fetch_for_request, request, progress)
+            _cache_climate_response(request, cache_key, response)
+        
+        with progress.stage("serialization") as st:
+            payload = ClimateData(**response).model_dump_json().encode("utf-8")
+            st["bytes"] = len(payload)
+        return payload
+    
+    job_id = jobs.submit("climate", run)
+    return {"job_id": job_id, "topic": job_topic(job_id)}
@@ -3,21 +3,28 @@ Composite variable calculations.
 Import all composite modules to register them.
 """
 from .registry import (
+    CompositeSpec,
     register_composite,
+    get_composite_spec,
     get_composite_function,
     list_composites,
     has_composite,
     compute_composite
 )
+from .planner import CompositePlan, plan_composites
 
 # Import composite modules to trigger registration
 from . import heat_index
 
 __all__ = [
+    "CompositeSpec",
     "register_composite",
+    "get_composite_spec",
     "get_composite_function",
     "list_composites",
     "has_composite",
     "compute_composite",
-    heat_index,
-]
\ No newline at end of file
+    "CompositePlan",
+    "plan_composites",
+    "heat_index",
+]
@@ -6,7 +6,12 @@ import xarray as xr
 from .registry import register_composite
 
 
-@register_composite("hi")
+@register_composite(
+    "hi",
+    inputs=["tas", "hurs"],
+    units="°F",
+    long_name="Heat Index"
+)
 def compute_heat_index(ds: xr.Dataset) -> xr.DataArray:
     """
     Compute Heat Index from temperature and relative humidity.
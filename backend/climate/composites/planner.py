@@ -0,0 +1,88 @@
+"""
+Fetch/evaluation planner for composite variables.
+Walks the composite dependency graph to find the minimal set of base
+variables to fetch and a topological order in which to compute composites.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+from .registry import get_composite_spec, has_composite
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompositePlan:
+    """What to fetch from the data source and how to evaluate composites"""
+    base_variables: List[str] = field(default_factory=list)     # Fetched from data source
+    evaluation_order: List[str] = field(default_factory=list)   # Composites, dependencies first
+    requested: List[str] = field(default_factory=list)          # Composites the caller asked for
+    unknown: List[str] = field(default_factory=list)            # Requested but not registered (skipped)
+
+    def intermediates(self) -> List[str]:
+        """Composites computed only because another composite needs them"""
+        return [c for c in self.evaluation_order if c not in self.requested]
+
+
+def _visit(
+    name: str,
+    plan: CompositePlan,
+    state: Dict[str, str],
+    stack: List[str]
+) -> None:
+    """Depth-first post-order visit; state is 'visiting' or 'done'"""
+    if state.get(name) == "done":
+        return
+    if state.get(name) == "visiting":
+        cycle = " -> ".join(stack[stack.index(name):] + [name])
+        raise ValueError(f"Cyclic composite dependency: {cycle}")
+
+    state[name] = "visiting"
+    stack.append(name)
+
+    for dep in get_composite_spec(name).inputs:
+        if has_composite(dep):
+            _visit(dep, plan, state, stack)
+        elif dep not in plan.base_variables:
+            plan.base_variables.append(dep)
+
+    stack.pop()
+    state[name] = "done"
+    plan.evaluation_order.append(name)
+
+
+def plan_composites(
+    composites: Iterable[str],
+    base_variables: Iterable[str] = ()
+) -> CompositePlan:
+    """
+    Build a plan for the given composites.
+
+    Args:
+        composites: Composite names to compute
+        base_variables: Base variables wanted in the output regardless of composites
+
+    Returns:
+        CompositePlan with deduplicated base variables and a topological order.
+        Unregistered composites are skipped with a warning (see plan.unknown);
+        a dependency cycle raises ValueError.
+    """
+    plan = CompositePlan()
+    state: Dict[str, str] = {}
+
+    for var in base_variables:
+        if var not in plan.base_variables:
+            plan.base_variables.append(var)
+
+    for comp in composites:
+        if not has_composite(comp):
+            if comp not in plan.unknown:
+                logger.warning(f"No composite function registered for '{comp}'")
+                plan.unknown.append(comp)
+            continue
+        if comp not in plan.requested:
+            plan.requested.append(comp)
+        _visit(comp, plan, state, [])
+
+    return plan
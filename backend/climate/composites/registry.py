@@ -1,32 +1,62 @@
 """
 Registry for composite variable calculations.
 Each composite is a function that takes xr.Dataset and returns xr.DataArray.
+Composites declare the variables they read (base variables or other
+composites) so the planner can work out what to fetch and in which order.
 """
-from typing import Dict, Callable
+from dataclasses import dataclass, field
+from typing import Dict, Callable, List, Optional
 import xarray as xr
 
 # Type alias
 CompositeFunction = Callable[[xr.Dataset], xr.DataArray]
 
+
+@dataclass(frozen=True)
+class CompositeSpec:
+    """Declares a composite's inputs and output metadata"""
+    name: str
+    func: CompositeFunction
+    inputs: List[str] = field(default_factory=list)  # Base variables or other composites
+    units: str = ""
+    long_name: str = ""
+
+
 # Global registry
-_COMPOSITES: Dict[str, CompositeFunction] = {}
+_COMPOSITES: Dict[str, CompositeSpec] = {}
 
 
-def register_composite(name: str):
-    """Decorator to register a composite function"""
+def register_composite(
+    name: str,
+    inputs: Optional[List[str]] = None,
+    units: str = "",
+    long_name: str = ""
+):
+    """Decorator to register a composite function with its declared inputs"""
     def decorator(func: CompositeFunction) -> CompositeFunction:
-        _COMPOSITES[name] = func
+        _COMPOSITES[name] = CompositeSpec(
+            name=name,
+            func=func,
+            inputs=list(inputs or []),
+            units=units,
+            long_name=long_name or name
+        )
         return func
     return decorator
 
 
-def get_composite_function(name: str) -> CompositeFunction:
-    """Get a registered composite function"""
+def get_composite_spec(name: str) -> CompositeSpec:
+    """Get the full registration (inputs, units) for a composite"""
     if name not in _COMPOSITES:
         raise ValueError(f"Unknown composite variable: {name}")
     return _COMPOSITES[name]
 
 
+def get_composite_function(name: str) -> CompositeFunction:
+    """Get a registered composite function"""
+    return get_composite_spec(name).func
+
+
 def list_composites() -> list[str]:
     """List all registered composite variables"""
     return list(_COMPOSITES.keys())
@@ -39,13 +69,13 @@ def has_composite(name: str) -> bool:
 def compute_composite(name: str, ds: xr.Dataset) -> xr.DataArray:
     """
     Compute a composite variable.
-    
+
     Args:
         name: Composite variable name
         ds: Dataset containing required base variables
-        
+
     Returns:
         DataArray with computed composite values
     """
     func = get_composite_function(name)
-    return func(ds)
\ No newline at end of file
+    return func(ds)
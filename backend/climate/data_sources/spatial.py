@@ -0,0 +1,100 @@
+"""
+Spatial helpers shared by climate data sources and the tile store.
+"""
+import logging
+from typing import Tuple
+import numpy as np
+import xarray as xr
+
+logger = logging.getLogger(__name__)
+
+
+def subset_intersecting(
+    ds: xr.Dataset,
+    lat_range: Tuple[float, float],
+    lon_range: Tuple[float, float]
+) -> xr.Dataset:
+    """
+    Subset dataset to include ANY grid cell that INTERSECTS the bounding box.
+
+    Previously: Only selected cells whose CENTER fell within bbox.
+    Now: Selects cells whose EXTENT overlaps with bbox.
+
+    This ensures small drawn boxes capture at least some data.
+    """
+    lat_coords = [c for c in ds.coords if 'lat' in c.lower()]
+    lon_coords = [c for c in ds.coords if 'lon' in c.lower()]
+
+    if not lat_coords or not lon_coords:
+        logger.warning("Could not find lat/lon coordinates for subsetting")
+        return ds
+
+    lat_name = lat_coords[0]
+    lon_name = lon_coords[0]
+
+    min_lat, max_lat = lat_range
+    min_lon, max_lon = lon_range
+
+    # Get coordinate arrays (these are cell CENTERS)
+    lats = ds[lat_name].values
+    lons = ds[lon_name].values
+
+    # Calculate grid cell size (approximate, assumes regular grid)
+    if len(lats) > 1:
+        lat_spacing = abs(lats[1] - lats[0])
+    else:
+        lat_spacing = 0.22  # NA-CORDEX NAM-22i default
+
+    if len(lons) > 1:
+        lon_spacing = abs(lons[1] - lons[0])
+    else:
+        lon_spacing = 0.22  # NA-CORDEX NAM-22i default
+
+    # Half-width of each grid cell
+    lat_half = lat_spacing / 2
+    lon_half = lon_spacing / 2
+
+    logger.debug(f"Grid spacing: lat={lat_spacing:.4f}°, lon={lon_spacing:.4f}°")
+
+    # Handle longitude wrapping (0-360 vs -180 to 180)
+    if lons.min() >= 0 and min_lon < 0:
+        logger.info("Converting longitude from -180:180 to 0:360 format")
+        min_lon = min_lon % 360
+        max_lon = max_lon % 360
+
+    # INTERSECTION TEST: A cell intersects if:
+    # cell_max >= bbox_min AND cell_min <= bbox_max
+    lat_intersects = (lats + lat_half >= min_lat) & (lats - lat_half <= max_lat)
+    lon_intersects = (lons + lon_half >= min_lon) & (lons - lon_half <= max_lon)
+
+    lat_indices = np.where(lat_intersects)[0]
+    lon_indices = np.where(lon_intersects)[0]
+
+    # Diagnostics
+    logger.info(f"Dataset lat range: [{lats.min():.4f}, {lats.max():.4f}]")
+    logger.info(f"Dataset lon range: [{lons.min():.4f}, {lons.max():.4f}]")
+    logger.info(f"Requested bbox: [{min_lat:.4f}, {max_lat:.4f}] x [{min_lon:.4f}, {max_lon:.4f}]")
+    logger.info(f"Cells intersecting bbox: {len(lat_indices)} lat × {len(lon_indices)} lon")
+
+    if len(lat_indices) == 0 or len(lon_indices) == 0:
+        logger.error(
+            f"NO GRID CELLS INTERSECT BOUNDING BOX!\n"
+            f"  Bbox: [{min_lat:.4f}, {max_lat:.4f}] x [{min_lon:.4f}, {max_lon:.4f}]\n"
+            f"  Dataset coverage: [{lats.min():.4f}, {lats.max():.4f}] x [{lons.min():.4f}, {lons.max():.4f}]\n"
+            f"  Grid spacing: ~{lat_spacing:.4f}° × {lon_spacing:.4f}°\n"
+            f"  Possible causes:\n"
+            f"    - Bbox outside dataset coverage\n"
+            f"    - Longitude format mismatch (check if dataset uses 0-360)"
+        )
+        # Return empty dataset rather than crash
+        return ds.isel({lat_name: slice(0, 0), lon_name: slice(0, 0)})
+
+    # Use isel (index selection) instead of sel (label selection)
+    subset = ds.isel({
+        lat_name: lat_indices,
+        lon_name: lon_indices
+    })
+
+    logger.info(f"Successfully subset to {len(lat_indices)}×{len(lon_indices)} cells")
+
+    return subset
@@ -0,0 +1,173 @@
+"""
+Single-pass ensemble statistics over member_id.
+
+Computes any mix of mean/min/max/median/percentiles for every variable in
+one traversal of the data. Percentiles use partial selection
+(np.partition) instead of a full sort; chunks that contain NaNs fall back
+to a sort along the (short) member axis with per-element interpolation.
+Results match xarray's quantile(..., method="linear", skipna=True).
+
+Statistic names: "mean", "min", "max", "median", or "p<q>" (e.g. "p90",
+"p2.5") for the q-th percentile.
+"""
+import logging
+from typing import Dict, List, Sequence
+
+import numpy as np
+import xarray as xr
+
+logger = logging.getLogger(__name__)
+
+MEMBER_DIM = "member_id"
+
+
+def stat_name(method: str, q: float = None) -> str:
+    """Map an AggregationEnum value (+ q) to a statistic name"""
+    if method == "percentile":
+        if q is None:
+            raise ValueError("Must provide 'q' for percentile aggregation")
+        return f"p{q:g}"
+    if method in ("mean", "min", "max", "median"):
+        return method
+    raise ValueError(f"Unknown aggregation method: {method}")
+
+
+def _stat_quantile(stat: str) -> float:
+    """Quantile (0-1) for median/pXX statistics"""
+    if stat == "median":
+        return 0.5
+    if stat.startswith("p"):
+        try:
+            q = float(stat[1:])
+        except ValueError:
+            raise ValueError(f"Unknown ensemble statistic: {stat}")
+        if not 0 <= q <= 100:
+            raise ValueError(f"Percentile out of range: {stat}")
+        return q / 100
+    raise ValueError(f"Unknown ensemble statistic: {stat}")
+
+
+def _ensemble_kernel(arr: np.ndarray, stats: Sequence[str]) -> np.ndarray:
+    """
+    Compute all statistics over the last axis of one block.
+
+    Returns:
+        Array of shape arr.shape[:-1] + (len(stats),)
+    """
+    n = arr.shape[-1]
+    out = np.empty(arr.shape[:-1] + (len(stats),), dtype=np.result_type(arr.dtype, np.float32))
+    quantiles = {s: _stat_quantile(s) for s in stats if s not in ("mean", "min", "max")}
+
+    if n == 0:
+        out[...] = np.nan
+        return out
+
+    has_nan = np.isnan(arr).any()
+
+    if not has_nan:
+        # Fixed member count: partial selection on the few ranks we need
+        ranks = {0, n - 1}
+        for q in quantiles.values():
+            pos = q * (n - 1)
+            ranks.update((int(np.floor(pos)), int(np.ceil(pos))))
+        part = np.partition(arr, sorted(ranks), axis=-1)
+
+        for i, stat in enumerate(stats):
+            if stat == "mean":
+                out[..., i] = arr.mean(axis=-1)
+            elif stat == "min":
+                out[..., i] = part[..., 0]
+            elif stat == "max":
+                out[..., i] = part[..., n - 1]
+            else:
+                pos = quantiles[stat] * (n - 1)
+                lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+                frac = pos - lo
+                out[..., i] = part[..., lo] + (part[..., hi] - part[..., lo]) * frac
+        return out
+
+    # NaNs present: per-element valid counts; sort pushes NaNs to the end
+    valid = np.count_nonzero(~np.isnan(arr), axis=-1)
+    empty = valid == 0
+    srt = np.sort(arr, axis=-1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for i, stat in enumerate(stats):
+            if stat == "mean":
+                total = np.where(np.isnan(arr), 0, arr).sum(axis=-1)
+                out[..., i] = np.where(empty, np.nan, total / np.maximum(valid, 1))
+            elif stat == "min":
+                out[..., i] = srt[..., 0]
+            elif stat == "max":
+                last = np.maximum(valid - 1, 0)[..., None]
+                out[..., i] = np.take_along_axis(srt, last, axis=-1)[..., 0]
+            else:
+                pos = quantiles[stat] * np.maximum(valid - 1, 0)
+                lo = np.floor(pos).astype(np.intp)
+                hi = np.ceil(pos).astype(np.intp)
+                v_lo = np.take_along_axis(srt, lo[..., None], axis=-1)[..., 0]
+                v_hi = np.take_along_axis(srt, hi[..., None], axis=-1)[..., 0]
+                out[..., i] = v_lo + (v_hi - v_lo) * (pos - lo)
+            out[..., i][empty] = np.nan
+
+    return out
+
+
+def aggregate_ensemble(
+    ds: xr.Dataset,
+    stats: List[str],
+    dim: str = MEMBER_DIM
+) -> Dict[str, xr.Dataset]:
+    """
+    Compute several ensemble statistics in a single pass.
+
+    Works on numpy- and dask-backed data; with dask the computation stays
+    lazy and runs chunk by chunk (member_id is merged into one chunk).
+
+    Args:
+        ds: Dataset with a member dimension
+        stats: Statistic names, e.g. ["mean", "p10", "p90"]
+        dim: Member dimension name
+
+    Returns:
+        Dict of statistic name -> Dataset without the member dimension
+    """
+    stats = list(dict.fromkeys(stats))
+    for stat in stats:
+        if stat not in ("mean", "min", "max"):
+            _stat_quantile(stat)    # Validate early
+
+    if dim not in ds.dims:
+        return {stat: ds for stat in stats}
+
+    if ds.chunks:
+        ds = ds.chunk({dim: -1})
+
+    results: Dict[str, Dict[str, xr.DataArray]] = {stat: {} for stat in stats}
+    passthrough = {}
+
+    for var, da in ds.data_vars.items():
+        if dim not in da.dims:
+            passthrough[var] = da
+            continue
+
+        stacked = xr.apply_ufunc(
+            _ensemble_kernel,
+            da,
+            kwargs={"stats": stats},
+            input_core_dims=[[dim]],
+            output_core_dims=[["ensemble_stat"]],
+            dask="parallelized",
+            output_dtypes=[np.result_type(da.dtype, np.float32)],
+            dask_gufunc_kwargs={"output_sizes": {"ensemble_stat": len(stats)}},
+            keep_attrs=True,
+        )
+        for i, stat in enumerate(stats):
+            results[stat][var] = stacked.isel(ensemble_stat=i, drop=True)
+
+    coords = {k: v for k, v in ds.coords.items() if dim not in v.dims}
+
+    return {
+        stat: xr.Dataset({**passthrough, **arrays}, coords=coords, attrs=ds.attrs)
+        for stat, arrays in results.items()
+    }
@@ -0,0 +1,108 @@
+"""
+Composite Planner Test - Fetch plans and evaluation order from declared inputs
+Registers throwaway composites in an isolated copy of the registry
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import xarray as xr
+
+# Add backend root to path
+# tests/ -> climate/ -> backend/ (need to go up 2 levels)
+backend_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_root))
+
+from climate.composites import registry
+from climate.composites.planner import plan_composites
+from climate.climate_processors import ClimateProcessor
+from climate.climate_hazards import HazardDefinition
+
+
+@pytest.fixture
+def composites(monkeypatch):
+    """Empty registry; returns a helper registering name -> inputs (value = sum of inputs)"""
+    monkeypatch.setattr(registry, "_COMPOSITES", {})
+
+    def add(name, inputs):
+        registry.register_composite(name, inputs=inputs)(
+            lambda ds: sum(ds[v] for v in inputs)
+        )
+    return add
+
+
+def test_dependencies_come_first(composites):
+    composites("a", ["tas", "b"])
+    composites("b", ["c", "hurs"])
+    composites("c", ["tas"])
+
+    plan = plan_composites(["a"], ["pr"])
+
+    assert plan.evaluation_order == ["c", "b", "a"]
+    assert plan.base_variables == ["pr", "tas", "hurs"]
+    assert plan.requested == ["a"]
+    assert plan.intermediates() == ["c", "b"]
+
+
+def test_shared_dependency_evaluated_once(composites):
+    composites("x", ["tas"])
+    composites("y", ["x"])
+    composites("z", ["x", "tas"])
+
+    plan = plan_composites(["y", "z", "y"])
+
+    assert plan.evaluation_order == ["x", "y", "z"]
+    assert plan.requested == ["y", "z"]
+    assert plan.base_variables == ["tas"]
+    assert plan.intermediates() == ["x"]
+
+
+def test_requested_dependency_is_not_an_intermediate(composites):
+    composites("x", ["tas"])
+    composites("y", ["x"])
+
+    assert plan_composites(["y", "x"]).intermediates() == []
+
+
+def test_cycle_raises(composites):
+    composites("a", ["b"])
+    composites("b", ["c"])
+    composites("c", ["a"])
+
+    with pytest.raises(ValueError, match="a -> b -> c -> a"):
+        plan_composites(["a"])
+
+
+def test_unknown_composite_is_skipped(composites, caplog):
+    composites("a", ["tas"])
+
+    with caplog.at_level(logging.WARNING):
+        plan = plan_composites(["nope", "a", "nope"], ["pr"])
+
+    assert plan.unknown == ["nope"]
+    assert plan.requested == ["a"]
+    assert plan.evaluation_order == ["a"]
+    assert plan.base_variables == ["pr", "tas"]
+    assert "nope" in caplog.text
+
+
+def test_fetch_plan_and_compute_agree_on_unknown(composites):
+    composites("a", ["tas"])
+    composites("b", ["a", "hurs"])
+    hazard = HazardDefinition(
+        name="Test", display_name="Test",
+        base_variables=["pr"], composite_variables=["b", "nope"],
+        description=""
+    )
+
+    assert hazard.needs_fetching() == ["pr", "tas", "hurs"]
+
+    ds = xr.Dataset({v: ("t", np.arange(3.0)) for v in ("pr", "tas", "hurs")})
+    out = ClimateProcessor().compute_composites(ds, hazard.composite_variables)
+
+    # Intermediate "a" is dropped, unknown "nope" skipped
+    assert set(out.data_vars) == {"pr", "tas", "hurs", "b"}
+    np.testing.assert_array_equal(out["b"].values, 2 * np.arange(3.0))
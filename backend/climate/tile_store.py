@@ -0,0 +1,196 @@
+"""
+Local store of precomputed climate tiles.
+
+A tile is the fully processed dataset for one region/hazard/scenario/window
+(members aggregated, composites computed, units converted), written as a
+chunked Zarr store. Tiles are built by scripts/precompute_climate_tiles.py
+and read by ClimateFetcher, which serves any request a tile fully covers
+without touching S3.
+
+Layout:
+    <root>/manifest.json        # list of tile records (see TileRecord)
+    <root>/<tile_id>.zarr       # one Zarr store per tile
+
+Location: backend/climate/tile_store.py
+"""
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import xarray as xr
+
+from .data_sources.spatial import subset_intersecting
+
+logger = logging.getLogger(__name__)
+
+# Chunking used when writing tiles: one year of days per chunk, small spatial blocks
+TILE_CHUNKS = {"time": 365, "lat": 32, "lon": 32}
+
+
+@dataclass
+class TileRecord:
+    """Manifest entry describing what a tile contains"""
+    tile_id: str
+    region: str
+    hazard: str
+    scenario: str
+    domain: str
+    climate_model: str
+    aggregate_over_members: bool
+    aggregation_method: str
+    aggregation_q: Optional[int]
+    bbox: Dict[str, float]                  # Requested region (min/max lat/lon)
+    time_range: Tuple[str, str]             # ISO dates
+    variables: List[str]
+    variable_metadata: Dict[str, Dict] = field(default_factory=dict)
+    created_at: str = ""
+
+    def covers(
+        self,
+        lat_range: Tuple[float, float],
+        lon_range: Tuple[float, float],
+        time_range: Tuple[str, str]
+    ) -> bool:
+        """True if the tile holds every cell and day the request needs"""
+        return (
+            self.bbox["min_lat"] <= lat_range[0]
+            and self.bbox["max_lat"] >= lat_range[1]
+            and self.bbox["min_lon"] <= lon_range[0]
+            and self.bbox["max_lon"] >= lon_range[1]
+            and self.time_range[0] <= time_range[0]
+            and self.time_range[1] >= time_range[1]
+        )
+
+
+class ClimateTileStore:
+    """Reads and writes precomputed tiles under a local directory"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._records: List[TileRecord] = []
+        self._manifest_mtime: Optional[float] = None
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / "manifest.json"
+
+    # ---------- reading -------------------------------------------------
+    def records(self) -> List[TileRecord]:
+        """Current manifest entries (re-read when the file changes on disk)"""
+        try:
+            mtime = self.manifest_path.stat().st_mtime
+        except FileNotFoundError:
+            self._records, self._manifest_mtime = [], None
+            return self._records
+
+        if mtime != self._manifest_mtime:
+            with open(self.manifest_path, "r") as f:
+                raw = json.load(f)
+            self._records = [
+                TileRecord(**{**r, "time_range": tuple(r["time_range"])})
+                for r in raw.get("tiles", [])
+            ]
+            self._manifest_mtime = mtime
+            logger.info(f"Loaded {len(self._records)} climate tiles from {self.manifest_path}")
+
+        return self._records
+
+    def find(
+        self,
+        hazard: str,
+        scenario: str,
+        domain: str,
+        climate_model: str,
+        aggregate_over_members: bool,
+        aggregation_method: str,
+        aggregation_q: Optional[int],
+        lat_range: Tuple[float, float],
+        lon_range: Tuple[float, float],
+        time_range: Tuple[str, str]
+    ) -> Optional[TileRecord]:
+        """Find a tile built with the same settings that covers the request"""
+        for record in self.records():
+            if (
+                record.hazard == hazard
+                and record.scenario == scenario
+                and record.domain == domain
+                and record.climate_model == climate_model
+                and record.aggregate_over_members == aggregate_over_members
+                and record.aggregation_method == aggregation_method
+                and record.aggregation_q == aggregation_q
+                and record.covers(lat_range, lon_range, time_range)
+            ):
+                return record
+        return None
+
+    def load(
+        self,
+        record: TileRecord,
+        lat_range: Tuple[float, float],
+        lon_range: Tuple[float, float],
+        time_range: Tuple[str, str]
+    ) -> xr.Dataset:
+        """Open a tile and cut out the requested cells and days (loaded eagerly)"""
+        ds = xr.open_zarr(self.root / f"{record.tile_id}.zarr", consolidated=True, chunks=None)
+        ds = ds.sel(time=slice(time_range[0], time_range[1]))
+        ds = subset_intersecting(ds, lat_range, lon_range)
+        return ds.load()
+
+    # ---------- writing -------------------------------------------------
+    def write(self, record: TileRecord, ds: xr.Dataset) -> Path:
+        """Write a tile and add (or replace) its manifest entry"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"{record.tile_id}.zarr"
+        if path.exists():
+            shutil.rmtree(path)
+
+        # Drop encodings inherited from the source stores (their chunking no longer applies)
+        ds = ds.copy()
+        for variable in ds.variables.values():
+            variable.encoding = {}
+        
+        encoding = {
+            var: {"chunks": tuple(
+                min(TILE_CHUNKS.get(dim, size), size)
+                for dim, size in zip(ds[var].dims, ds[var].shape)
+            )}
+            for var in ds.data_vars
+        }
+        ds.to_zarr(path, mode="w", consolidated=True, encoding=encoding)
+
+        record.created_at = datetime.utcnow().isoformat()
+        records = [r for r in self.records() if r.tile_id != record.tile_id]
+        records.append(record)
+        self._write_manifest(records)
+        return path
+
+    def _write_manifest(self, records: List[TileRecord]):
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"tiles": [asdict(r) for r in records]}, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+        self._records = records
+        self._manifest_mtime = self.manifest_path.stat().st_mtime
+
+
+def tile_id_for(
+    region: str,
+    hazard: str,
+    scenario: str,
+    climate_model: str,
+    aggregation: str,
+    time_range: Tuple[str, str]
+) -> str:
+    """Readable, filesystem-safe id for a tile"""
+    parts = [region, hazard, scenario, climate_model, aggregation, time_range[0][:4], time_range[1][:4]]
+    return "_".join(str(p).replace(" ", "-").replace("/", "-") for p in parts)
+
+
+def default_tile_store() -> ClimateTileStore:
+    """Tile store at $CLIMATE_TILE_DIR (default: ./climate_tiles)"""
+    return ClimateTileStore(Path(os.getenv("CLIMATE_TILE_DIR", "climate_tiles")))
@@ -0,0 +1,177 @@
+# collection_stats.py
+"""
+Materialized per-collection infrastructure statistics.
+
+Stats (total count, counts by component type and state, geographic bounds)
+don't depend on the query bbox, so they are computed once per collection
+with a single $facet aggregation and stored in the ``collection_stats``
+collection. Imports update them incrementally with $inc/$min/$max; bulk
+loaders that rewrite data call invalidate_collection_stats() instead.
+
+A short-lived in-process copy avoids a round trip on every request while
+still picking up updates made by other workers.
+"""
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATS_COLLECTION = "collection_stats"
+
+# Seconds the in-process copy is trusted before re-reading the stats document
+LOCAL_TTL = 60
+
+_local: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+
+
+# ---------- key encoding --------------------------------------------------
+# Map keys come from data (component types, states) and may contain '.' or
+# a leading '$', which MongoDB does not allow in field names.
+def _encode_key(key: Any) -> str:
+    return str(key).replace(".", "．").replace("$", "＄") if key is not None else "∅"
+
+
+def _decode_key(key: str) -> Any:
+    if key == "∅":
+        return None
+    return key.replace("．", ".").replace("＄", "$")
+
+
+# ---------- public API ----------------------------------------------------
+async def get_collection_stats(db, collection_name: str) -> Dict[str, Any]:
+    """
+    Stats for a collection, computing and storing them on first use.
+
+    Returns:
+        {'total_assets', 'component_types', 'states', 'geographic_bounds', 'computed_at'}
+    """
+    local_key = (db.name, collection_name)
+    hit = _local.get(local_key)
+    if hit and time.monotonic() - hit[0] < LOCAL_TTL:
+        return hit[1]
+
+    doc = await db[STATS_COLLECTION].find_one({"_id": collection_name})
+    if doc is None:
+        doc = await rebuild_collection_stats(db, collection_name)
+
+    stats = _from_document(doc)
+    _local[local_key] = (time.monotonic(), stats)
+    return stats
+
+
+async def rebuild_collection_stats(db, collection_name: str) -> Dict[str, Any]:
+    """Recompute stats with one pass over the collection and store them"""
+    logger.info(f"Materializing stats for {collection_name}")
+
+    pipeline = [
+        {
+            "$facet": {
+                "total": [{"$count": "n"}],
+                "component_types": [
+                    {"$group": {"_id": "$component_type", "count": {"$sum": 1}}}
+                ],
+                "states": [
+                    {"$group": {"_id": "$state", "count": {"$sum": 1}}}
+                ],
+                "bounds": [
+                    {
+                        "$group": {
+                            "_id": None,
+                            "min_lat": {"$min": "$latitude"},
+                            "max_lat": {"$max": "$latitude"},
+                            "min_lon": {"$min": "$longitude"},
+                            "max_lon": {"$max": "$longitude"}
+                        }
+                    }
+                ]
+            }
+        }
+    ]
+
+    result = await db[collection_name].aggregate(pipeline).to_list(length=1)
+    facets = result[0] if result else {}
+
+    total = facets.get("total") or [{"n": 0}]
+    bounds = (facets.get("bounds") or [{}])[0]
+
+    doc = {
+        "_id": collection_name,
+        "total_assets": total[0]["n"],
+        "component_types": {
+            _encode_key(item["_id"]): item["count"]
+            for item in facets.get("component_types", [])
+        },
+        "states": {
+            _encode_key(item["_id"]): item["count"]
+            for item in facets.get("states", [])
+        },
+        "bounds": {
+            "min_lat": bounds.get("min_lat"),
+            "max_lat": bounds.get("max_lat"),
+            "min_lon": bounds.get("min_lon"),
+            "max_lon": bounds.get("max_lon")
+        },
+        "computed_at": datetime.utcnow()
+    }
+
+    await db[STATS_COLLECTION].replace_one({"_id": collection_name}, doc, upsert=True)
+    _local.pop((db.name, collection_name), None)
+    return doc
+
+
+async def apply_insert_to_stats(db, collection_name: str, rows: List[Dict[str, Any]]) -> None:
+    """
+    Fold newly inserted rows into the stored stats.
+
+    If no stats document exists yet nothing is written; the next read
+    materializes stats from the collection, which already includes the rows.
+    """
+    if not rows:
+        return
+
+    inc: Dict[str, int] = {"total_assets": len(rows)}
+    lats = [r["latitude"] for r in rows if isinstance(r.get("latitude"), (int, float))]
+    lons = [r["longitude"] for r in rows if isinstance(r.get("longitude"), (int, float))]
+
+    for row in rows:
+        ct = f"component_types.{_encode_key(row.get('component_type'))}"
+        inc[ct] = inc.get(ct, 0) + 1
+        st = f"states.{_encode_key(row.get('state'))}"
+        inc[st] = inc.get(st, 0) + 1
+
+    update: Dict[str, Any] = {"$inc": inc}
+    if lats and lons:
+        update["$min"] = {"bounds.min_lat": min(lats), "bounds.min_lon": min(lons)}
+        update["$max"] = {"bounds.max_lat": max(lats), "bounds.max_lon": max(lons)}
+
+    # upsert=False: a missing document means stats were never materialized
+    await db[STATS_COLLECTION].update_one({"_id": collection_name}, update, upsert=False)
+    _local.pop((db.name, collection_name), None)
+
+
+async def invalidate_collection_stats(db, collection_name: str) -> None:
+    """Drop stored stats so the next read recomputes them"""
+    await db[STATS_COLLECTION].delete_one({"_id": collection_name})
+    _local.pop((db.name, collection_name), None)
+    logger.info(f"Invalidated stats for {collection_name}")
+
+
+# ---------- helpers ------------------------------------------------------
+def _from_document(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode a stats document into the shape get_stats() returns"""
+    component_types = {
+        _decode_key(k): v for k, v in doc.get("component_types", {}).items()
+    }
+    states = {_decode_key(k): v for k, v in doc.get("states", {}).items()}
+
+    return {
+        "total_assets": doc.get("total_assets", 0),
+        "component_types": dict(
+            sorted(component_types.items(), key=lambda kv: kv[1], reverse=True)
+        ),
+        "states": dict(sorted(states.items(), key=lambda kv: kv[1], reverse=True)),
+        "geographic_bounds": doc.get("bounds", {}),
+        "computed_at": doc.get("computed_at"),
+    }
@@ -0,0 +1,155 @@
+# component_library.py
+"""
+Process-wide snapshot of the component library.
+
+The ``component_library`` collection is small and changes rarely, but it was
+read in full by every AssetImporter (through its ComponentMapper) and by every
+HBOM tree fetch. A snapshot is loaded once per database and shared by all
+requests, with the lookup structures built up front:
+
+- components: canonical_name (lowercase) -> document   (exact matching)
+- aliases: alias (lowercase) -> canonical_name          (alias matching)
+- canonical_registry: component_type -> document with a canonical_uuid
+
+Consumers attach their own structures with ``snapshot.derive()`` (e.g.
+ComponentMapper's fuzzy-match candidates); they are built once per snapshot.
+
+A snapshot is reloaded when it is older than SNAPSHOT_TTL, or as soon as the
+change-stream watcher (started at app startup) sees a write to the
+collection. Change streams need a replica set; without one the TTL alone
+bounds staleness. Snapshot contents are shared - treat them as read-only.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+COMPONENT_LIBRARY_COLLECTION = "component_library"
+
+# Seconds a snapshot is trusted without a change notification
+SNAPSHOT_TTL = 300
+
+# Seconds to wait before reopening a failed change stream
+WATCH_RETRY_SECONDS = 30
+
+
+@dataclass
+class ComponentLibrarySnapshot:
+    """Immutable view of the component library at one point in time"""
+    version: int
+    loaded_at: float
+    documents: List[Dict[str, Any]]
+    components: Dict[str, Dict[str, Any]]
+    aliases: Dict[str, str]
+    canonical_registry: Dict[str, Dict[str, Any]]
+    stale: bool = False
+    _derived: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def expired(self) -> bool:
+        return self.stale or time.monotonic() - self.loaded_at >= SNAPSHOT_TTL
+
+    def derive(self, key: str, build: Callable[["ComponentLibrarySnapshot"], Any]) -> Any:
+        """Structure built from this snapshot, memoized under `key`"""
+        if key not in self._derived:
+            self._derived[key] = build(self)
+        return self._derived[key]
+
+
+_snapshots: Dict[str, ComponentLibrarySnapshot] = {}
+_locks: Dict[str, asyncio.Lock] = {}
+_version = 0
+
+
+# ---------- public API ----------------------------------------------------
+async def get_component_library(db) -> ComponentLibrarySnapshot:
+    """Current snapshot for a database, loading it on first use or expiry"""
+    snapshot = _snapshots.get(db.name)
+    if snapshot is not None and not snapshot.expired():
+        return snapshot
+
+    lock = _locks.setdefault(db.name, asyncio.Lock())
+    async with lock:
+        # Another request may have reloaded while we waited
+        snapshot = _snapshots.get(db.name)
+        if snapshot is not None and not snapshot.expired():
+            return snapshot
+
+        snapshot = await _load_snapshot(db)
+        _snapshots[db.name] = snapshot
+        return snapshot
+
+
+def invalidate_component_library(db_name: str = None) -> None:
+    """Mark snapshots stale (all databases if db_name is None)"""
+    for name, snapshot in _snapshots.items():
+        if db_name is None or name == db_name:
+            snapshot.stale = True
+
+
+async def watch_component_library(db) -> None:
+    """
+    Invalidate the snapshot whenever the collection changes.
+
+    Runs until cancelled; start it as a background task at app startup.
+    """
+    collection = db[COMPONENT_LIBRARY_COLLECTION]
+    while True:
+        watching = False
+        try:
+            async with collection.watch() as stream:
+                watching = True
+                logger.info("Watching component library for changes")
+                async for change in stream:
+                    logger.info(f"Component library changed ({change.get('operationType')}), invalidating snapshot")
+                    invalidate_component_library(db.name)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Standalone servers have no change streams: the TTL still applies
+            logger.warning(f"Component library change stream unavailable ({e}), relying on {SNAPSHOT_TTL}s TTL")
+            if watching:
+                # Changes made while the stream is down would be missed
+                invalidate_component_library(db.name)
+            await asyncio.sleep(WATCH_RETRY_SECONDS if watching else SNAPSHOT_TTL)
+
+
+# ---------- helpers -------------------------------------------------------
+async def _load_snapshot(db) -> ComponentLibrarySnapshot:
+    global _version
+
+    documents = await db[COMPONENT_LIBRARY_COLLECTION].find({}).to_list(length=None)
+
+    components = {}
+    aliases = {}
+    canonical_registry = {}
+
+    for doc in documents:
+        if "canonical_uuid" in doc:
+            canonical_registry[doc.get("component_type")] = doc
+
+        canonical_name = doc.get("canonical_name", "")
+        if not canonical_name:
+            continue
+
+        components[canonical_name.lower()] = doc
+        for alias in doc.get("aliases", []):
+            if alias:
+                aliases[alias.lower()] = canonical_name
+
+    _version += 1
+    logger.info(
+        f"Loaded component library snapshot v{_version} from {db.name}: "
+        f"{len(components)} components, {len(aliases)} aliases"
+    )
+
+    return ComponentLibrarySnapshot(
+        version=_version,
+        loaded_at=time.monotonic(),
+        documents=documents,
+        components=components,
+        aliases=aliases,
+        canonical_registry=canonical_registry,
+    )
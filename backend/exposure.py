@@ -0,0 +1,235 @@
+# exposure.py
+"""
+Assets and population exposed to a climate threshold, per grid cell and year.
+
+/api/get-climate, /api/get-infrastructure and /api/get-census-population
+used to be joined in the frontend, which meant shipping all three payloads.
+compute_exposure() joins them server-side on spatial indexes:
+
+- cell index: STRtree over the climate grid cell boxes (FrontendPreparer cell
+  bounds), built once per grid and kept in a small LRU. Assets are located
+  with one vectorized point query.
+- cell x tract overlaps: the cell boxes queried against the local tract
+  index (census_tracts), with each pair weighted by the share of the tract
+  inside the cell. Tract population (census_warehouse) is apportioned to
+  cells with one bincount per ACS year.
+
+A cell is exposed in a year when any timestep of the variable exceeds the
+threshold. Results are compact per-cell arrays indexed like "grid_index".
+Population needs both the tract layer and the ACS warehouse; without them
+it is reported as None.
+"""
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from cachetools import LRUCache
+
+from census_tracts import get_tract_index
+from census_warehouse import ACS_VARS, get_acs_warehouse
+
+logger = logging.getLogger(__name__)
+
+POPULATION_VAR = ACS_VARS.index("B01003_001E")
+
+# Cell indexes kept (one per distinct climate grid)
+CELL_INDEX_CACHE_SIZE = 16
+
+_cell_indexes: LRUCache = LRUCache(maxsize=CELL_INDEX_CACHE_SIZE)
+_lock = threading.Lock()
+
+
+@dataclass
+class CellIndex:
+    """Spatial index over one climate grid"""
+    grid_index: np.ndarray          # grid_index of each cell, in response order
+    boxes: np.ndarray               # Cell polygons
+    tree: Any                       # shapely STRtree over boxes
+    tract_ids: Optional[np.ndarray] = None      # Per (cell, tract) overlap pair
+    pair_cells: Optional[np.ndarray] = None
+    pair_weights: Optional[np.ndarray] = None   # Share of the tract inside the cell
+
+    @property
+    def num_cells(self) -> int:
+        return len(self.grid_index)
+
+    def locate(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Cell position of each point (-1 outside the grid; first cell on shared edges)"""
+        import shapely
+
+        out = np.full(len(lats), -1, dtype=np.int64)
+        if not len(lats):
+            return out
+        point_idx, cell_idx = self.tree.query(shapely.points(lons, lats), predicate="intersects")
+        first_points, first = np.unique(point_idx, return_index=True)
+        out[first_points] = cell_idx[first]
+        return out
+
+
+def get_cell_index(cells: List[Dict[str, Any]]) -> CellIndex:
+    """Cell index for prepared climate cells, cached per grid (and tract layer)"""
+    import shapely
+
+    bounds = np.array(
+        [[c["bounds"][k] for k in ("min_lon", "min_lat", "max_lon", "max_lat")] for c in cells],
+        dtype=float,
+    ).reshape(-1, 4)
+    tracts = get_tract_index()
+    key = (hashlib.sha1(bounds.tobytes()).hexdigest(), id(tracts))
+
+    with _lock:
+        index = _cell_indexes.get(key)
+    if index is not None:
+        return index
+
+    boxes = shapely.box(bounds[:, 0], bounds[:, 1], bounds[:, 2], bounds[:, 3])
+    index = CellIndex(
+        grid_index=np.array([c.get("grid_index", i) for i, c in enumerate(cells)]),
+        boxes=boxes,
+        tree=shapely.STRtree(boxes),
+    )
+
+    if tracts is not None and len(boxes):
+        pair_cells, pair_tracts = tracts.tree.query(boxes, predicate="intersects")
+        overlap = shapely.area(shapely.intersection(boxes[pair_cells], tracts.geometries[pair_tracts]))
+        areas = tracts.areas[pair_tracts]
+        index.tract_ids = tracts.geoids[pair_tracts]
+        index.pair_cells = pair_cells
+        weights = np.divide(overlap, areas, out=np.zeros_like(overlap), where=areas > 0)
+        index.pair_weights = np.clip(weights, 0.0, 1.0)
+
+    logger.info(
+        f"Built cell index: {index.num_cells} cells, "
+        f"{0 if index.pair_cells is None else len(index.pair_cells)} cell-tract overlaps"
+    )
+
+    with _lock:
+        _cell_indexes[key] = index
+    return index
+
+
+# ---------- public API ----------------------------------------------------
+def compute_exposure(
+    prepared_data: Dict[str, Any],
+    variable: str,
+    threshold: float,
+    assets: Sequence[Tuple[Optional[float], Optional[float], Optional[str]]],
+    years: Optional[List[int]] = None,
+) -> Dict[str, Any]:
+    """
+    Per-cell, per-year exposure of assets and population
+
+    Args:
+        prepared_data: Prepared climate response (times, data cells with bounds)
+        variable: Climate variable compared with the threshold
+        threshold: Exceedance threshold, in the variable's units
+        assets: (latitude, longitude, component_type) per asset
+        years: Optional subset of the climate years
+
+    Returns:
+        {"years", "grid_index", "assets", "population", "exceedance_steps",
+         "totals": {...}, "exposed_assets_by_type", "population_years"} -
+        per-year arrays are [years][cells]
+    """
+    cells = prepared_data.get("data") or []
+    times = prepared_data.get("times") or []
+    index = get_cell_index(cells)
+
+    # Exceedance: timesteps above threshold per cell and year
+    time_years = np.array([int(str(t)[:4]) for t in times], dtype=int)
+    out_years = np.unique(time_years)
+    if years:
+        out_years = out_years[np.isin(out_years, years)]
+    steps = _exceedance_steps(cells, variable, threshold, time_years, out_years)   # [Y, C]
+    exposed = steps > 0
+
+    # Assets per cell (and per component type)
+    lats = np.array([a[0] if a[0] is not None else np.nan for a in assets], dtype=float)
+    lons = np.array([a[1] if a[1] is not None else np.nan for a in assets], dtype=float)
+    valid = np.isfinite(lats) & np.isfinite(lons)
+    asset_cells = np.full(len(assets), -1, dtype=np.int64)
+    asset_cells[valid] = index.locate(lats[valid], lons[valid])
+    located = asset_cells >= 0
+
+    asset_counts = np.bincount(asset_cells[located], minlength=index.num_cells)
+    types, type_ids = np.unique(
+        np.array([a[2] or "unknown" for a in assets], dtype=object)[located].astype(str),
+        return_inverse=True,
+    )
+    type_counts = np.zeros((len(types), index.num_cells))
+    np.add.at(type_counts, (type_ids, asset_cells[located]), 1)
+
+    # Population per cell and year (tract-area weighted)
+    population, population_years = _cell_population(index, out_years)
+
+    return {
+        "variable": variable,
+        "threshold": threshold,
+        "years": out_years.tolist(),
+        "grid_index": index.grid_index.tolist(),
+        "assets": asset_counts.tolist(),
+        "population": population.round().tolist() if population is not None else None,
+        "exceedance_steps": steps.tolist(),
+        "totals": {
+            "exposed_cells": exposed.sum(axis=1).tolist(),
+            "exposed_assets": (exposed @ asset_counts).tolist(),
+            "exposed_population": (
+                (exposed * population).sum(axis=1).round().tolist() if population is not None else None
+            ),
+        },
+        "exposed_assets_by_type": {
+            t: (exposed @ type_counts[k]).astype(int).tolist() for k, t in enumerate(types.tolist())
+        },
+        "population_years": population_years,
+        "unlocated_assets": int((~located).sum()),
+    }
+
+
+# ---------- helpers -------------------------------------------------------
+def _exceedance_steps(
+    cells: List[Dict[str, Any]],
+    variable: str,
+    threshold: float,
+    time_years: np.ndarray,
+    out_years: np.ndarray,
+) -> np.ndarray:
+    """Timesteps above threshold, [years, cells]"""
+    values = np.full((len(cells), len(time_years)), np.nan)
+    for i, cell in enumerate(cells):
+        series = (cell.get("climate") or {}).get(variable) or []
+        series = np.array(series[:len(time_years)], dtype=float)
+        values[i, :len(series)] = series
+
+    above = (values > threshold).astype(np.int64)                       # NaN compares False
+    by_year = (time_years[:, None] == out_years[None, :]).astype(np.int64)  # [T, Y]
+    return (above @ by_year).T
+
+
+def _cell_population(index: CellIndex, years: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[List[int]]]:
+    """
+    Population per cell for each year, [years, cells], from the ACS year at
+    or before it (the first ACS year before the warehouse starts, the latest
+    one after it ends)
+    """
+    warehouse = get_acs_warehouse()
+    if warehouse is None or index.pair_cells is None:
+        return None, None
+
+    acs_years = np.array(warehouse.years)
+    pos = np.clip(np.searchsorted(acs_years, years, side="right") - 1, 0, len(acs_years) - 1)
+    used = np.unique(pos)
+
+    tract_pop = warehouse.lookup(index.tract_ids, acs_years[used])[..., POPULATION_VAR]   # [U, pairs]
+    weighted = np.nan_to_num(tract_pop) * index.pair_weights
+
+    by_acs_year = np.stack([
+        np.bincount(index.pair_cells, weights=row, minlength=index.num_cells)
+        for row in weighted
+    ]) if len(used) else np.zeros((0, index.num_cells))
+
+    row_of = {p: i for i, p in enumerate(used.tolist())}
+    population = by_acs_year[[row_of[p] for p in pos.tolist()]] if len(years) else np.zeros((0, index.num_cells))
+    return population, acs_years[pos].tolist()
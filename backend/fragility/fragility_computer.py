@@ -7,11 +7,13 @@ Location: backend/fragility/fragility_computer.py
 
 import logging
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from math import prod
 from scipy.stats import norm, weibull_min
 from scipy.special import expit
 
+from hbom.flat_tree import FlatHBOMTree
+
 logger = logging.getLogger(__name__)
 
 
@@ -179,6 +181,18 @@ class FragilityComputer:
         Returns:
             Probability of failure values (0-1) for each timestep
         """
+        return list(self._distribution_values(model_name, params, climate_array))
+    
+    def _distribution_values(
+        self,
+        model_name: str,
+        params: Dict[str, float],
+        climate_array
+    ) -> np.ndarray:
+        """
+        _compute_distribution_curve() as an array, for any array shape
+        (a 2-D grids x timesteps array computes every grid at once)
+        """
         arr = np.array(climate_array, dtype=float)
         
         if model_name == "lognormal":
@@ -196,21 +210,21 @@ class FragilityComputer:
                 log_med = np.log(median)
                 z = (log_vals - log_med) / dispersion
             
-            return list(norm.cdf(z))
+            return norm.cdf(z)
         
         elif model_name == "weibull":
             shape = params.get("shape", 2.0)
             scale = params.get("scale", 100.0)
-            return list(weibull_min.cdf(arr, shape, scale=scale))
+            return weibull_min.cdf(arr, shape, scale=scale)
         
         elif model_name == "logistic":
             mid_pt = params.get("mid_point", 50.0)
             slope = params.get("slope", 0.5)
-            return list(expit(slope * (arr - mid_pt)))
+            return expit(slope * (arr - mid_pt))
         
         else:
             logger.warning(f"Unknown fragility model: {model_name}")
-            return [0.0] * len(arr)
+            return np.zeros(arr.shape)
     
     def compute_timeseries(
         self,
@@ -266,4 +280,226 @@ class FragilityComputer:
         
         logger.info(f"Extracted time series for {len(frag_ts)} components")
         
-        return frag_ts
\ No newline at end of file
+        return frag_ts
+    
+    # ------------------------------------------------------------------
+    # Flat (array-backed) trees
+    # ------------------------------------------------------------------
+    
+    def compute_for_flat_tree(
+        self,
+        tree: FlatHBOMTree,
+        hazard: str,
+        prepared_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        compute_for_tree() for a FlatHBOMTree.
+        
+        Each distinct curve is computed once (all grids at a time where the
+        climate series line up) and PoF is aggregated bottom-up one depth
+        level at a time with array operations. The nested tree is only
+        built for the response.
+        
+        Args:
+            tree: Flat HBOM tree built for the hazard (not mutated)
+            hazard: Hazard type to compute
+            prepared_data: Climate data with variables, times, grid cells
+        
+        Returns:
+            Same structure as compute_for_tree() on the equivalent nested tree
+        """
+        curves_by_id, pof, present = self._compute_flat(tree, hazard, prepared_data)
+        climate_vars = prepared_data.get("variables", [])
+        
+        def decorate(i: int, node: Dict[str, Any]):
+            curve_id = int(tree.curve_ids[i])
+            if curve_id in curves_by_id:
+                node["hazards"][hazard]["fragility_curves"] = curves_by_id[curve_id][0]
+            
+            pof_by_var = {
+                var_name: float(pof[i, v])
+                for v, var_name in enumerate(climate_vars)
+                if present[i, v]
+            }
+            node["pof_by_var"] = pof_by_var
+            node["pof"] = max(pof_by_var.values()) if pof_by_var else 0.0
+        
+        return tree.to_nested(decorate)
+    
+    def compute_timeseries_flat(
+        self,
+        tree: FlatHBOMTree,
+        hazard: str,
+        prepared_data: Dict[str, Any]
+    ) -> Dict[str, Dict[str, List[float]]]:
+        """
+        compute_timeseries() for a FlatHBOMTree: series are built once per
+        distinct curve and shared by every component using it.
+        
+        Returns:
+            {uuid: {var: [pof_t0, pof_t1, ...]}}
+        """
+        curves_by_id = self._compute_flat_curves(tree, hazard, prepared_data)
+        n_times = len(prepared_data.get("times", []))
+        
+        series_by_id = {}
+        for curve_id, (curves, _) in curves_by_id.items():
+            if not curves:
+                continue
+            
+            # Max across grids at each timestep (missing timesteps count as 0)
+            series = {}
+            for var, grids in curves.items():
+                padded = np.zeros((max(len(grids), 1), n_times))
+                for g, detail in enumerate(grids.values()):
+                    values = detail["fc_values"][:n_times]
+                    padded[g, :len(values)] = values
+                series[var] = padded.max(axis=0).tolist()
+            series_by_id[curve_id] = series
+        
+        # Same key order as compute_timeseries()' depth-first walk
+        frag_ts = {}
+        for i in tree.preorder().tolist():
+            curve_id = int(tree.curve_ids[i])
+            if curve_id in series_by_id:
+                frag_ts[tree.uuids[i]] = series_by_id[curve_id]
+        
+        logger.info(f"Extracted time series for {len(frag_ts)} components")
+        
+        return frag_ts
+    
+    def _compute_flat(
+        self,
+        tree: FlatHBOMTree,
+        hazard: str,
+        prepared_data: Dict[str, Any]
+    ):
+        """
+        Curves per distinct curve id, plus combined PoF per node and variable
+        
+        Returns:
+            (curves_by_id, pof [nodes x vars], present [nodes x vars])
+        """
+        climate_vars = prepared_data.get("variables", [])
+        var_index = {var_name: v for v, var_name in enumerate(climate_vars)}
+        
+        curves_by_id = self._compute_flat_curves(tree, hazard, prepared_data)
+        
+        own = np.zeros((tree.num_nodes, len(climate_vars)))
+        present = np.zeros((tree.num_nodes, len(climate_vars)), dtype=bool)
+        
+        for curve_id, (_, pof_by_var) in curves_by_id.items():
+            nodes = np.flatnonzero(tree.curve_ids == curve_id)
+            for var_name, max_pof in pof_by_var.items():
+                own[nodes, var_index[var_name]] = max_pof
+                present[nodes, var_index[var_name]] = True
+        
+        # Series failure, bottom-up: survival = (1-own) × ∏ child survival
+        survival = 1.0 - own
+        for nodes in reversed(tree.depth_levels()[1:]):
+            parents = tree.parent[nodes]
+            np.multiply.at(survival, parents, survival[nodes])
+            np.logical_or.at(present, parents, present[nodes])
+        
+        return curves_by_id, 1.0 - survival, present
+    
+    def _compute_flat_curves(
+        self,
+        tree: FlatHBOMTree,
+        hazard: str,
+        prepared_data: Dict[str, Any]
+    ) -> Dict[int, tuple]:
+        """
+        Fragility curves for every distinct curve used by a reachable node
+        
+        Returns:
+            {curve_id: (curves_by_var, pof_by_var)} shaped like the per-node
+            values compute_for_tree() stores
+        """
+        if hazard != tree.hazard:
+            return {}
+        
+        climate_vars = prepared_data.get("variables", [])
+        all_grid_data = prepared_data.get("data", [])
+        
+        logger.info(f"Computing fragility for hazard={hazard}, {len(climate_vars)} vars, {len(all_grid_data)} grids")
+        
+        reachable = tree.curve_ids[tree.postorder]
+        used = np.unique(reachable[reachable >= 0])
+        
+        matrices = {}
+        curves_by_id = {}
+        
+        for curve_id in used.tolist():
+            hazard_data = tree.curve_table[curve_id]
+            model_name = hazard_data.get("fragility_model")
+            if not model_name or model_name == "inherit":
+                continue
+            
+            params = hazard_data.get("fragility_params", {})
+            target_climate_var = hazard_data.get("climate_variable")
+            curves_by_var = {}
+            pof_by_var = {}
+            
+            for var_name in climate_vars:
+                # Only compute if this curve applies to this variable
+                if target_climate_var and var_name != target_climate_var:
+                    continue
+                
+                if var_name not in matrices:
+                    matrices[var_name] = self._climate_matrix(all_grid_data, var_name)
+                matrix = matrices[var_name]
+                
+                if matrix is not None:
+                    fc_matrix = self._distribution_values(model_name, params, matrix)
+                    grids = {
+                        g_idx: {
+                            "x_values": grid_obj["climate"][var_name],
+                            "fc_values": list(fc_matrix[g_idx]),
+                            "final_pof": float(fc_matrix[g_idx, -1])
+                        }
+                        for g_idx, grid_obj in enumerate(all_grid_data)
+                    }
+                else:
+                    grids = {}
+                    for g_idx, grid_obj in enumerate(all_grid_data):
+                        climate_array = grid_obj.get("climate", {}).get(var_name, [])
+                        
+                        if not climate_array:
+                            fc_values = [0.0]
+                            x_vals = [0.0]
+                        else:
+                            fc_values = self._compute_distribution_curve(
+                                model_name, params, climate_array
+                            )
+                            x_vals = climate_array
+                        
+                        grids[g_idx] = {
+                            "x_values": x_vals,
+                            "fc_values": fc_values,
+                            "final_pof": float(fc_values[-1]) if fc_values else 0.0
+                        }
+                
+                curves_by_var[var_name] = grids
+                
+                # Max PoF across all grids for this variable
+                pof_by_var[var_name] = max(
+                    detail["final_pof"] for detail in grids.values()
+                ) if grids else 0.0
+            
+            curves_by_id[curve_id] = (curves_by_var, pof_by_var)
+        
+        logger.info(f"Computed {len(curves_by_id)} distinct curves for {int((reachable >= 0).sum())} components")
+        
+        return curves_by_id
+    
+    def _climate_matrix(
+        self,
+        all_grid_data: List[Dict[str, Any]],
+        var_name: str
+    ) -> Optional[np.ndarray]:
+        """Grids x timesteps array for a variable, or None if the series are empty or ragged"""
+        arrays = [grid_obj.get("climate", {}).get(var_name, []) for grid_obj in all_grid_data]
+        if not arrays or not all(arrays) or len({len(a) for a in arrays}) != 1:
+            return None
+        return np.array(arrays, dtype=float)
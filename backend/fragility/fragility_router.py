@@ -5,14 +5,16 @@ FastAPI endpoints for fragility curve computation and analysis
 Location: backend/fragility/fragility_router.py
 """
 
+import json
 import logging
-import copy
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
 from .fragility_computer import FragilityComputer
 from hbom import HBOMFetcher
 from cache_manager import cache
+from jobs import jobs, job_topic, JobProgress
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +39,30 @@ def _json_safe(obj):
     return obj
 
 
+def _find_climate_data():
+    """
+    Find any prepared climate response in the cache (RAM first, then disk).
+    
+    We need to find ANY climate cache entry since we don't know the full key.
+    """
+    # Search cache for climate data
+    for hash_key in list(cache.mem.keys()):
+        obj = cache.mem[hash_key]
+        if isinstance(obj, dict) and "variables" in obj and "data" in obj:
+            return obj
+    
+    # If not in RAM, check disk
+    for cache_file in cache.dir.glob("*.pkl.gz"):
+        try:
+            obj = cache._load(cache_file)
+            if isinstance(obj, dict) and "variables" in obj and "data" in obj:
+                return obj
+        except:
+            continue
+    
+    return None
+
+
 @router.get("/compute/{sector}/{hazard}")
 async def compute_fragility(sector: str, hazard: str):
     """
@@ -54,27 +80,8 @@ async def compute_fragility(sector: str, hazard: str):
     try:
         logger.info(f"Fragility computation request: sector={sector}, hazard={hazard}")
         
-        # 1. Get climate data from cache using the SAME complex key structure
-        # We need to find ANY climate cache entry since we don't know the full key
-        prepared_data = None
-        
-        # Search cache for climate data
-        for hash_key in list(cache.mem.keys()):
-            obj = cache.mem[hash_key]
-            if isinstance(obj, dict) and "variables" in obj and "data" in obj:
-                prepared_data = obj
-                break
-        
-        # If not in RAM, check disk
-        if not prepared_data:
-            for cache_file in cache.dir.glob("*.pkl.gz"):
-                try:
-                    obj = cache._load(cache_file)
-                    if isinstance(obj, dict) and "variables" in obj and "data" in obj:
-                        prepared_data = obj
-                        break
-                except:
-                    continue
+        # 1. Get climate data from cache
+        prepared_data = _find_climate_data()
         
         if not prepared_data:
             raise HTTPException(
@@ -82,18 +89,18 @@ async def compute_fragility(sector: str, hazard: str):
                 detail="Climate data not loaded. Call /api/get-climate first."
             )
         
-        # 2. Get HBOM tree from hbom module
-        hbom_tree = await hbom_fetcher.fetch_hbom_tree(sector, hazard)
+        # 2. Get HBOM tree from hbom module (array-backed, shared - not mutated)
+        hbom_tree = await hbom_fetcher.fetch_flat_tree(sector, hazard)
         
-        if not hbom_tree.get("components"):
+        if hbom_tree.num_roots == 0:
             raise HTTPException(
                 status_code=404,
                 detail=f"No HBOM components found for sector: {sector}"
             )
         
-        # 3. Compute fragility curves (mutates tree in-place)
-        result = computer.compute_for_tree(
-            copy.deepcopy(hbom_tree),  # Don't mutate original
+        # 3. Compute fragility curves (returns a new nested tree)
+        result = computer.compute_for_flat_tree(
+            hbom_tree,
             hazard,
             prepared_data
         )
@@ -139,17 +146,17 @@ async def fragility_timeseries(sector: str, hazard: str):
             )
         
         # 2. Get HBOM tree
-        hbom_tree = await hbom_fetcher.fetch_hbom_tree(sector, hazard)
+        hbom_tree = await hbom_fetcher.fetch_flat_tree(sector, hazard)
         
-        if not hbom_tree.get("components"):
+        if hbom_tree.num_roots == 0:
             raise HTTPException(
                 status_code=404,
                 detail=f"No HBOM components found for sector: {sector}"
             )
         
         # 3. Compute time series
-        frag_ts = computer.compute_timeseries(
-            copy.deepcopy(hbom_tree),
+        frag_ts = computer.compute_timeseries_flat(
+            hbom_tree,
             hazard,
             prepared_data
         )
@@ -165,4 +172,44 @@ async def fragility_timeseries(sector: str, hazard: str):
         raise
     except Exception as e:
         logger.exception(f"Error computing timeseries: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/jobs/compute/{sector}/{hazard}", status_code=202)
+async def submit_fragility_job(sector: str, hazard: str):
+    """
+    Job-based variant of /compute/{sector}/{hazard}.
+    
+    Returns a job id immediately; stage progress (hbom fetch, compute,
+    serialization) is published to the PubSub topic ``jobs/<job_id>`` and
+    the final event carries the result URL.
+    """
+    prepared_data = _find_climate_data()
+    if not prepared_data:
+        raise HTTPException(
+            status_code=400,
+            detail="Climate data not loaded. Call /api/get-climate first."
+        )
+    
+    async def run(progress: JobProgress) -> bytes:
+        with progress.stage("hbom_fetch"):
+            hbom_tree = await hbom_fetcher.fetch_flat_tree(sector, hazard)
+        
+        if hbom_tree.num_roots == 0:
+            raise ValueError(f"No HBOM components found for sector: {sector}")
+        
+        with progress.stage("compute"):
+            result = await run_in_threadpool(
+                computer.compute_for_flat_tree,
+                hbom_tree,
+                hazard,
+                prepared_data
+            )
+        
+        with progress.stage("serialization") as st:
+            payload = json.dumps(_json_safe(result)).encode("utf-8")
+            st["bytes"] = len(payload)
+        return payload
+    
+    job_id = jobs.submit("fragility", run)
+    return {"job_id": job_id, "topic": job_topic(job_id)}
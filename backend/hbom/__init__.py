@@ -5,15 +5,19 @@ Modular HBOM and fragility data retrieval system
 Public exports:
 - router: FastAPI router for HBOM endpoints
 - HBOMFetcher: Main pipeline orchestrator
+- FlatHBOMTree / build_flat_tree: Array-backed tree for compute paths
 """
 
 from .hbom_router import router
 from .hbom_fetcher import HBOMFetcher
 from .hbom_preparers import reconstruct_tree, prepare_for_frontend
+from .flat_tree import FlatHBOMTree, build_flat_tree
 
 __all__ = [
     "router",
     "HBOMFetcher",
     "reconstruct_tree",
     "prepare_for_frontend",
+    "FlatHBOMTree",
+    "build_flat_tree",
 ]
\ No newline at end of file
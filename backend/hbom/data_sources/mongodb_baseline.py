@@ -6,6 +6,7 @@ Location: backend/hbom/data_sources/mongodb_baseline.py
 """
 
 import logging
+from collections import deque
 from typing import List, Dict, Any, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
@@ -114,34 +115,82 @@ class MongoDBBaselineSource(HBOMDataSource):
         """
         Fetch all descendants of a component (recursive children).
         
+        One $graphLookup round trip over the parent_uuid index, whatever the
+        depth; results are ordered by depth (breadth-first). Falls back to
+        walking an in-memory parent index if the aggregation fails.
+        
         Args:
             parent_uuid: UUID of parent component
         
         Returns:
             List of all descendant nodes
         """
-        # We need to recursively find all children
-        # Start with direct children
-        all_descendants = []
-        to_process = [parent_uuid]
+        pipeline = [
+            {"$match": {"uuid": parent_uuid}},
+            {"$limit": 1},
+            {"$graphLookup": {
+                "from": self.hbom_baseline.name,
+                "startWith": "$uuid",
+                "connectFromField": "uuid",
+                "connectToField": "parent_uuid",
+                "as": "descendants",
+                "depthField": "_depth",
+            }},
+            {"$unwind": "$descendants"},
+            {"$replaceRoot": {"newRoot": "$descendants"}},
+            {"$sort": {"_depth": 1}},
+            {"$unset": "_depth"},
+        ]
         
-        while to_process:
-            current_uuid = to_process.pop(0)
-            
-            # Find children of current node
-            cursor = self.hbom_baseline.find({"parent_uuid": current_uuid})
-            children = await cursor.to_list(None)
-            
-            for child in children:
-                if '_id' in child:
-                    child['_id'] = str(child['_id'])
-                all_descendants.append(child)
-                to_process.append(child["uuid"])
+        try:
+            cursor = self.hbom_baseline.aggregate(pipeline, allowDiskUse=True)
+            all_descendants = await cursor.to_list(None)
+        except Exception as e:
+            logger.warning(f"$graphLookup subtree fetch failed ({e}), walking locally")
+            all_descendants = await self._fetch_descendants_local(parent_uuid)
+        
+        for node in all_descendants:
+            if '_id' in node:
+                node['_id'] = str(node['_id'])
         
         logger.info(f"Found {len(all_descendants)} descendants for {parent_uuid}")
         
         return all_descendants
     
+    async def _fetch_descendants_local(
+        self,
+        parent_uuid: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Subtree walk without $graphLookup: two round trips whatever the depth
+        
+        Reads the (uuid, parent_uuid) pairs of the whole baseline, walks
+        them breadth-first in memory, then fetches the subtree's nodes.
+        """
+        cursor = self.hbom_baseline.find({}, {"_id": 0, "uuid": 1, "parent_uuid": 1})
+        links = await cursor.to_list(None)
+        
+        children_by_parent: Dict[str, List[str]] = {}
+        for link in links:
+            children_by_parent.setdefault(link.get("parent_uuid"), []).append(link["uuid"])
+        
+        order: Dict[str, int] = {}
+        to_process = deque([parent_uuid])
+        while to_process:
+            for child_uuid in children_by_parent.get(to_process.popleft(), []):
+                if child_uuid not in order:  # Guards against cycles
+                    order[child_uuid] = len(order)
+                    to_process.append(child_uuid)
+        
+        if not order:
+            return []
+        
+        cursor = self.hbom_baseline.find({"uuid": {"$in": list(order)}})
+        nodes = await cursor.to_list(None)
+        nodes.sort(key=lambda node: order[node["uuid"]])
+        
+        return nodes
+    
     async def fetch_fragilities_by_hazard(
         self,
         hazard: str,
@@ -0,0 +1,310 @@
+"""
+Flat HBOM Tree
+Array-backed HBOM tree for compute paths
+
+reconstruct_tree() builds one nested dict per node and every later stage
+(hazard filtering, fragility computation, sanitizing) walks it recursively.
+FlatHBOMTree keeps the same tree as arrays indexed by node:
+
+- parent / depth / postorder: structure for bottom-up aggregation
+- child_offsets / child_index: children in children_uuids order (CSR)
+- type, canonical type and label ids into interned string tables
+- curve_ids: the node's fragility curve for the tree's hazard (-1 for none),
+  into a table of distinct curves, so identical curves are computed once
+
+Nested dicts are only produced at the API boundary by to_nested(), which
+returns exactly what reconstruct_tree() + prepare_for_frontend() would.
+The baseline is a tree: a node listed as a child by several parents is
+nested under each, but aggregates into the first one only.
+
+Location: backend/hbom/flat_tree.py
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .hbom_preparers import _json_safe
+
+logger = logging.getLogger(__name__)
+
+
+class _Interner:
+    """Assigns consecutive ids to distinct values"""
+
+    def __init__(self):
+        self.table: List[Any] = []
+        self._ids: Dict[Any, int] = {}
+
+    def __call__(self, value: Any) -> int:
+        # Type in the key: 1, 1.0 and True must stay distinct
+        key = (type(value).__name__, value if isinstance(value, (str, int, float, type(None))) else repr(value))
+        if key not in self._ids:
+            self._ids[key] = len(self.table)
+            self.table.append(value)
+        return self._ids[key]
+
+
+@dataclass
+class FlatHBOMTree:
+    """One sector's HBOM tree (for one hazard) as arrays"""
+    sector: str
+    hazard: Optional[str]
+    uuids: List[str]
+    parent: np.ndarray                      # int32, -1 for roots and unreachable nodes
+    depth: np.ndarray                       # int32, -1 for unreachable nodes
+    postorder: np.ndarray                   # Reachable nodes, each after all its descendants
+    roots: np.ndarray                       # Root nodes, in output order
+    child_offsets: np.ndarray               # Children of i: child_index[child_offsets[i]:child_offsets[i+1]]
+    child_index: np.ndarray
+    type_table: List[str]
+    type_ids: np.ndarray
+    canonical_table: List[Optional[str]]
+    canonical_ids: np.ndarray
+    label_table: List[str]
+    label_ids: np.ndarray
+    levels: List[Any]                       # Node 'level' values
+    node_paths: List[str]
+    curve_table: List[Dict[str, Any]]       # Distinct hazard entries (fragility model, params, ...)
+    curve_ids: np.ndarray                   # int32, -1 where the node has no curve for the hazard
+    metadata: Dict[int, Any] = field(default_factory=dict)
+    root_aliases: Dict[int, Any] = field(default_factory=dict)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.uuids)
+
+    @property
+    def num_roots(self) -> int:
+        return len(self.roots)
+
+    def children(self, i: int) -> np.ndarray:
+        return self.child_index[self.child_offsets[i]:self.child_offsets[i + 1]]
+
+    def preorder(self) -> np.ndarray:
+        """Reachable nodes in nested (depth-first, parent first) order, each once"""
+        order = []
+        visited = np.zeros(self.num_nodes, dtype=bool)
+        stack = self.roots.tolist()[::-1]
+        while stack:
+            i = stack.pop()
+            if visited[i]:
+                continue
+            visited[i] = True
+            order.append(i)
+            stack.extend(self.children(i).tolist()[::-1])
+        return np.array(order, dtype=np.int32)
+
+    def depth_levels(self) -> List[np.ndarray]:
+        """Reachable nodes grouped by depth (index 0 = roots)"""
+        reachable = np.flatnonzero(self.depth >= 0)
+        if reachable.size == 0:
+            return []
+        order = reachable[np.argsort(self.depth[reachable], kind="stable")]
+        bounds = np.searchsorted(self.depth[order], np.arange(self.depth.max() + 2))
+        return [order[bounds[d]:bounds[d + 1]] for d in range(len(bounds) - 1)]
+
+    def to_nested(
+        self,
+        decorate: Optional[Callable[[int, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Frontend payload: {"sector", "components": nested roots}
+
+        Args:
+            decorate: Optional callback(node_index, node_dict) run on every
+                      node after it is fully built (used to attach results)
+        """
+        nodes: Dict[int, Dict[str, Any]] = {}
+
+        for i in self.postorder.tolist():
+            node = {
+                "uuid": self.uuids[i],
+                "label": self.label_table[self.label_ids[i]],
+                "component_type": self.type_table[self.type_ids[i]],
+                "canonical_component_type": self.canonical_table[self.canonical_ids[i]],
+                "level": self.levels[i],
+                "node_path": self.node_paths[i],
+                "hazards": {},
+            }
+            curve_id = self.curve_ids[i]
+            if curve_id >= 0:
+                node["hazards"][self.hazard] = dict(self.curve_table[curve_id])
+            if i in self.metadata:
+                node["metadata"] = self.metadata[i]
+            # Post-order: children are already built
+            node["subcomponents"] = [nodes[c] for c in self.children(i).tolist()]
+            nodes[i] = node
+
+        for i in self.roots.tolist():
+            if i in self.root_aliases:
+                nodes[i]["aliases"] = self.root_aliases[i]
+
+        if decorate is not None:
+            for i, node in nodes.items():
+                decorate(i, node)
+
+        return {
+            "sector": self.sector,
+            "components": [nodes[i] for i in self.roots.tolist()]
+        }
+
+
+def build_flat_tree(
+    flat_nodes: List[Dict[str, Any]],
+    fragility_curves: Optional[List[Dict[str, Any]]],
+    sector: str,
+    hazard: Optional[str] = None,
+    canonical_registry: Optional[Dict[str, Any]] = None
+) -> FlatHBOMTree:
+    """
+    Build the array tree from hbom_baseline rows and fragility_db curves
+
+    Same inputs and semantics as reconstruct_tree() followed by
+    prepare_for_frontend(): roots are nodes without parent_uuid, children
+    come from children_uuids, the first curve per node for the hazard is
+    kept, and values are JSON-safe.
+
+    Args:
+        flat_nodes: Flat component nodes from hbom_baseline
+        fragility_curves: Optional curves from fragility_db
+        sector: Sector identifier
+        hazard: Hazard the tree is built for (None: no fragilities)
+        canonical_registry: Optional dict mapping canonical type -> canonical entry
+    """
+    n = len(flat_nodes)
+    index = {node["uuid"]: i for i, node in enumerate(flat_nodes)}
+    # Duplicate uuids: the last row wins, in the first row's position
+    # (like reconstruct_tree's node map)
+    live = list(index.values())
+    rows = [None] * n
+    for i in live:
+        rows[i] = flat_nodes[i]
+
+    types, canonicals, labels = _Interner(), _Interner(), _Interner()
+    type_ids = np.zeros(n, dtype=np.int32)
+    canonical_ids = np.zeros(n, dtype=np.int32)
+    label_ids = np.zeros(n, dtype=np.int32)
+    levels: List[Any] = [None] * n
+    node_paths: List[str] = [""] * n
+    metadata: Dict[int, Any] = {}
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    children: List[List[int]] = [[] for _ in range(n)]
+    roots = []
+
+    for i in live:
+        row = rows[i]
+        type_ids[i] = types(_json_safe(row.get("asset_type", "unknown")))
+        canonical_ids[i] = canonicals(_json_safe(row.get("canonical_component_type")))
+        label_ids[i] = labels(_json_safe(row["label"]))
+        levels[i] = _json_safe(row.get("level"))
+        node_paths[i] = row.get("node_path", "")
+        if "metadata" in row:
+            metadata[i] = _json_safe(row["metadata"])
+        children[i] = [index[c] for c in row.get("children_uuids", []) or [] if c in index]
+        if row.get("parent_uuid") is None:
+            roots.append(i)
+
+    for i in range(n):
+        offsets[i + 1] = offsets[i] + len(children[i])
+    child_index = np.array([c for cs in children for c in cs], dtype=np.int32)
+
+    # Structure: breadth-first from the roots (first parent wins), then post-order
+    parent = np.full(n, -1, dtype=np.int32)
+    depth = np.full(n, -1, dtype=np.int32)
+    frontier = list(roots)
+    for r in roots:
+        depth[r] = 0
+    while frontier:
+        next_frontier = []
+        for p in frontier:
+            for c in children[p]:
+                if depth[c] < 0:
+                    depth[c] = depth[p] + 1
+                    parent[c] = p
+                    next_frontier.append(c)
+        frontier = next_frontier
+
+    postorder = _postorder(roots, children, n)
+
+    # Curves: first per node for the hazard, interned by content
+    curves = _Interner()
+    curve_ids = np.full(n, -1, dtype=np.int32)
+    if hazard and fragility_curves:
+        for curve in fragility_curves:
+            i = index.get(curve.get("component_uuid"))
+            if i is None or curve_ids[i] >= 0 or curve.get("hazard", "Unknown") != hazard:
+                continue
+            entry = _json_safe({
+                "fragility_model": curve.get("model"),
+                "fragility_params": curve.get("parameters", {}),
+                "climate_variable": curve.get("climate_variable"),
+                "conditions": curve.get("conditions", {}),
+                "priority": curve.get("priority", 0),
+                "source": curve.get("provenance", {}).get("source", "Unknown"),
+            })
+            curve_ids[i] = curves(entry)
+
+    root_aliases = {}
+    if canonical_registry:
+        for r in roots:
+            canonical_type = canonicals.table[canonical_ids[r]]
+            if canonical_type and canonical_type in canonical_registry:
+                root_aliases[r] = _json_safe(canonical_registry[canonical_type].get("aliases", []))
+
+    tree = FlatHBOMTree(
+        sector=sector,
+        hazard=hazard,
+        uuids=[row["uuid"] if row is not None else None for row in rows],
+        parent=parent,
+        depth=depth,
+        postorder=postorder,
+        roots=np.array(roots, dtype=np.int32),
+        child_offsets=offsets,
+        child_index=child_index,
+        type_table=types.table,
+        type_ids=type_ids,
+        canonical_table=canonicals.table,
+        canonical_ids=canonical_ids,
+        label_table=labels.table,
+        label_ids=label_ids,
+        levels=levels,
+        node_paths=node_paths,
+        curve_table=curves.table,
+        curve_ids=curve_ids,
+        metadata=metadata,
+        root_aliases=root_aliases,
+    )
+
+    logger.info(
+        f"Built flat tree: {len(roots)} roots, {len(live)} nodes, "
+        f"{len(curves.table)} distinct curves, {len(types.table)} types"
+    )
+
+    return tree
+
+
+def _postorder(roots: List[int], children: List[List[int]], n: int) -> np.ndarray:
+    """Iterative post-order over every node reachable from the roots (each once)"""
+    order = []
+    visited = np.zeros(n, dtype=bool)
+    for root in roots:
+        if visited[root]:
+            continue
+        visited[root] = True
+        stack = [(root, iter(children[root]))]
+        while stack:
+            node, remaining = stack[-1]
+            child = next(remaining, None)
+            while child is not None and visited[child]:
+                child = next(remaining, None)
+            if child is None:
+                stack.pop()
+                order.append(node)
+            else:
+                visited[child] = True
+                stack.append((child, iter(children[child])))
+    return np.array(order, dtype=np.int32)
@@ -8,10 +8,12 @@ Location: backend/hbom/hbom_fetcher.py
 import logging
 from typing import Dict, Any, List, Optional
 
+from component_library import get_component_library
 from .data_sources.mongodb_baseline import MongoDBBaselineSource
+from .tree_cache import CachedTree, hbom_tree_cache
+from .flat_tree import FlatHBOMTree, build_flat_tree
 from .hbom_preparers import (
     reconstruct_tree,
-    prepare_for_frontend,
     get_roots_for_sector
 )
 
@@ -47,8 +49,74 @@ class HBOMFetcher:
         """
         Fetch complete HBOM tree for a sector with optional hazard filtering.
         
-        This is the main entry point for getting HBOM data.
+        This is the main entry point for getting HBOM data. Trees come from
+        the process-wide cache (see tree_cache.py) and are shared between
+        requests: do not mutate the result.
         """
+        entry = await self._cached_tree(sector, hazard)
+        return entry.payload
+    
+    async def fetch_hbom_tree_json(
+        self,
+        sector: str,
+        hazard: Optional[str] = None
+    ) -> bytes:
+        """fetch_hbom_tree() rendered as a JSON response body (cached with the tree)"""
+        entry = await self._cached_tree(sector, hazard)
+        return entry.json_bytes()
+    
+    async def fetch_flat_tree(
+        self,
+        sector: str,
+        hazard: Optional[str] = None
+    ) -> FlatHBOMTree:
+        """
+        Array-backed tree for compute paths (see flat_tree.py), cached like
+        fetch_hbom_tree(). Read-only; fetch_hbom_tree() is its to_nested().
+        """
+        stamp, library = await self._versions()
+        entry = await hbom_tree_cache.get_or_build(
+            ("flat", sector, hazard),
+            stamp,
+            lambda: self._build_flat_tree(sector, hazard, library.canonical_registry)
+        )
+        return entry.payload
+    
+    async def _versions(self):
+        """(baseline version, component library version) stamp and the library snapshot"""
+        db = self.data_source.client[self.data_source.database_name]
+        library = await get_component_library(db)
+        return (await hbom_tree_cache.baseline_version(db), library.version), library
+    
+    async def _cached_tree(self, sector: str, hazard: Optional[str]) -> CachedTree:
+        """Cached nested tree for the current baseline and component library versions"""
+        stamp, _ = await self._versions()
+        return await hbom_tree_cache.get_or_build(
+            (sector, hazard),
+            stamp,
+            lambda: self._build_hbom_tree(sector, hazard)
+        )
+    
+    async def _build_hbom_tree(
+        self,
+        sector: str,
+        hazard: Optional[str]
+    ) -> Dict[str, Any]:
+        """Nested frontend payload, expanded from the (cached) flat tree"""
+        flat = await self.fetch_flat_tree(sector, hazard)
+        response = flat.to_nested()
+        
+        logger.info(f"Prepared {flat.num_roots} root components for frontend")
+        
+        return response
+    
+    async def _build_flat_tree(
+        self,
+        sector: str,
+        hazard: Optional[str],
+        canonical_map: Dict[str, Any]
+    ) -> FlatHBOMTree:
+        """Read the baseline and build the array tree (cache miss path)"""
         logger.info(f"Fetching HBOM tree for sector={sector}, hazard={hazard}")
         
         # 1. Validate connection
@@ -60,34 +128,20 @@ class HBOMFetcher:
         
         if not flat_nodes:
             logger.warning(f"No components found for sector: {sector}")
-            return {"sector": sector, "components": []}
-        
-        logger.info(f"Fetched {len(flat_nodes)} flat nodes for sector")
+        else:
+            logger.info(f"Fetched {len(flat_nodes)} flat nodes for sector")
         
         # 3. Fetch fragility curves (optional)
         fragility_curves = None
-        if hazard:
+        if hazard and flat_nodes:
             fragility_curves = await self.data_source.fetch_fragilities_by_hazard(
                 hazard=hazard,
                 component_uuids=[node["uuid"] for node in flat_nodes]
             )
             logger.info(f"Fetched {len(fragility_curves) if fragility_curves else 0} fragility curves")
         
-        # 4. Reconstruct nested tree structure
-        roots = reconstruct_tree(flat_nodes, fragility_curves)
-        
-        # 5. Load canonical registry for aliases
-        comp_lib = self.data_source.client[self.data_source.database_name]['component_library']
-        canonical_cursor = comp_lib.find({"canonical_uuid": {"$exists": True}})
-        canonical_list = await canonical_cursor.to_list(length=None)
-        canonical_map = {c["component_type"]: c for c in canonical_list}
-        
-        # 6. Format for frontend
-        response = await prepare_for_frontend(roots, sector, hazard, canonical_map)
-        
-        logger.info(f"Prepared {len(roots)} root components for frontend")
-        
-        return response
+        # 4. Build arrays (canonical registry from the shared component library snapshot)
+        return build_flat_tree(flat_nodes, fragility_curves, sector, hazard, canonical_map)
     
     async def fetch_component_by_uuid(
         self,
@@ -7,9 +7,8 @@ Location: backend/hbom/hbom_router.py
 
 import logging
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import json
-import math
 
 from .hbom_fetcher import HBOMFetcher
 from models import HBOMDefinition
@@ -22,19 +21,6 @@ router = APIRouter(prefix="/api/hbom", tags=["hbom"])
 fetcher = HBOMFetcher()
 
 
-def _json_safe(obj):
-    """Replace NaN/Inf with None for JSON serialization"""
-    if isinstance(obj, dict):
-        return {k: _json_safe(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [_json_safe(item) for item in obj]
-    elif isinstance(obj, float):
-        if math.isnan(obj) or math.isinf(obj):
-            return None
-        return obj
-    return obj
-
-
 @router.get("/tree/{sector}/{hazard}")
 async def get_hbom_tree(sector: str, hazard: str):
     """
@@ -53,19 +39,19 @@ async def get_hbom_tree(sector: str, hazard: str):
     try:
         logger.info(f"HBOM tree request: sector={sector}, hazard={hazard}")
         
-        # Fetch and reconstruct tree
+        # Cached tree, already sanitized and rendered
         result = await fetcher.fetch_hbom_tree(sector=sector, hazard=hazard)
         
         if not result.get("components"):
             logger.warning(f"No components found for sector={sector}")
             return JSONResponse(content={"sector": sector, "components": []})
         
-        # Sanitize before returning
-        result = _json_safe(result)
-        
         logger.info(f"Returning {len(result['components'])} root components")
         
-        return JSONResponse(content=result)
+        return Response(
+            content=await fetcher.fetch_hbom_tree_json(sector=sector, hazard=hazard),
+            media_type="application/json"
+        )
         
     except Exception as e:
         logger.exception(f"Error fetching HBOM tree: {e}")
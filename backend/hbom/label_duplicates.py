@@ -0,0 +1,95 @@
+"""
+Label Duplicates
+Fuzzy label matching between an incoming HBOM and the stored one
+
+label_duplicates() returns every (incoming, existing) label pair with
+fuzz.ratio >= DUPLICATE_SIMILARITY, without scoring every pair.
+
+Blocking is lossless for the threshold. A pair scoring >= 79.5 (which
+rounds to 80) has indel distance d <= 0.205 * (len_a + len_b), so:
+  - lengths must satisfy 2 * min / (len_a + len_b) >= 0.795
+  - each edit breaks at most 3 trigrams, so the labels share at least
+    |trigrams(a)| - 3 * d distinct trigrams (counted via an inverted index)
+Surviving pairs are scored in one vectorized rapidfuzz call.
+
+Location: backend/hbom/label_duplicates.py
+"""
+
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process as rf_process
+
+DUPLICATE_SIMILARITY = 80
+_CUTOFF = DUPLICATE_SIMILARITY - 0.5
+
+
+def _trigrams(label: str) -> Set[str]:
+    return {label[i:i + 3] for i in range(len(label) - 2)}
+
+
+def label_duplicates(inc_labels: List[str], ex_labels: List[str]) -> List[Tuple[int, int, int]]:
+    """(incoming index, existing index, similarity) for every pair >= threshold, in input order"""
+    if not inc_labels or not ex_labels:
+        return []
+
+    inc = [lbl.lower() for lbl in inc_labels]
+    ex = [lbl.lower() for lbl in ex_labels]
+    max_dist_ratio = 1 - _CUTOFF / 100
+
+    # Inverted index: trigram -> existing indices
+    ex_lens = np.array([len(lbl) for lbl in ex])
+    postings: Dict[str, List[int]] = {}
+    for j, lbl in enumerate(ex):
+        for gram in _trigrams(lbl):
+            postings.setdefault(gram, []).append(j)
+
+    pair_inc: List[np.ndarray] = []
+    pair_ex: List[np.ndarray] = []
+    ex_empty = np.flatnonzero(ex_lens == 0)
+    for i, lbl in enumerate(inc):
+        la = len(lbl)
+        if not la:
+            # fuzz.ratio scores two empty labels 100 (and empty vs non-empty 0)
+            if ex_empty.size:
+                pair_inc.append(np.full(ex_empty.size, i))
+                pair_ex.append(ex_empty)
+            continue
+        grams = _trigrams(lbl)
+
+        shared = np.zeros(len(ex), dtype=np.int64)
+        for gram in grams:
+            hits = postings.get(gram)
+            if hits:
+                shared[hits] += 1
+
+        total = la + ex_lens
+        max_dist = np.floor(max_dist_ratio * total + 1e-9)
+        keep = (
+            (ex_lens > 0)
+            & (2 * np.minimum(la, ex_lens) >= (_CUTOFF / 100) * total - 1e-9)
+            & (shared >= len(grams) - 3 * max_dist)
+        )
+        cand = np.flatnonzero(keep)
+        if cand.size:
+            pair_inc.append(np.full(cand.size, i))
+            pair_ex.append(cand)
+
+    if not pair_inc:
+        return []
+
+    rows = np.concatenate(pair_inc)
+    cols = np.concatenate(pair_ex)
+    scores = rf_process.cpdist(
+        [inc[i] for i in rows],
+        [ex[j] for j in cols],
+        scorer=fuzz.ratio,
+        score_cutoff=_CUTOFF,
+        workers=-1,
+    )
+
+    return [
+        (int(i), int(j), int(round(float(sim))))
+        for i, j, sim in zip(rows, cols, scores)
+        if round(float(sim)) >= DUPLICATE_SIMILARITY
+    ]
@@ -0,0 +1,99 @@
+"""
+Flat Tree Test - FlatHBOMTree against the nested reconstruct/prepare/compute path
+Uses the processed hbom_baseline and fragility_database fixtures
+"""
+
+import asyncio
+import copy
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add backend root to path
+# tests/ -> hbom/ -> backend/ (need to go up 2 levels)
+backend_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_root))
+
+from hbom.flat_tree import build_flat_tree
+from hbom.hbom_preparers import reconstruct_tree, prepare_for_frontend
+from fragility.fragility_computer import FragilityComputer
+
+PROCESSED = backend_root / "fragility_data" / "processed"
+SECTOR = "energy_grid"
+HAZARDS = [None, "Wind", "Flood", "Heat", "Snow", "Drought"]
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    """
+    Fixture nodes and curves, plus a canonical type, NaN and an orphan row
+    for coverage. The two files were generated separately and share no
+    uuids, so curves are spread over the nodes (several per node, on leaves
+    and parents alike).
+    """
+    nodes = json.loads((PROCESSED / "hbom_baseline.json").read_text())["nodes"]
+    curves = json.loads((PROCESSED / "fragility_database.json").read_text())["fragility_curves"]
+    for k, curve in enumerate(curves):
+        curve["component_uuid"] = nodes[(k * 7) % len(nodes)]["uuid"]
+    curves[1]["model"] = "inherit"
+
+    nodes[0]["canonical_component_type"] = "wind_farm"
+    nodes[1]["level"] = float("nan")
+    nodes.append({"uuid": "orphan", "asset_type": "x", "label": "Orphan", "parent_uuid": nodes[0]["uuid"]})
+    curves[0]["parameters"] = dict(curves[0]["parameters"], extra=float("inf"))
+
+    registry = {"wind_farm": {"aliases": ["Wind Plant", float("nan")]}}
+    return nodes, curves, registry
+
+
+def _prepared_data(times: int, ragged: bool = False):
+    """Climate grids for the fixture variables; ragged grids take the per-grid path"""
+    rng = np.random.default_rng(7)
+    variables = ["sfcWind", "tas", "flood_depth", "ice_thickness"]
+    data = []
+    for g in range(3):
+        n = times - g if ragged else times
+        data.append({
+            "grid_index": g,
+            "climate": {v: (rng.random(n) * 150).tolist() for v in variables},
+        })
+    data[0]["climate"]["ice_thickness"] = []
+    return {
+        "variables": variables,
+        "times": [f"{2030 + t}-01-01" for t in range(times)],
+        "data": data,
+    }
+
+
+def _nested(nodes, curves, registry, hazard):
+    roots = reconstruct_tree(copy.deepcopy(nodes), copy.deepcopy(curves) if hazard else None)
+    return asyncio.run(prepare_for_frontend(roots, SECTOR, hazard, registry))
+
+
+@pytest.mark.parametrize("hazard", HAZARDS)
+def test_to_nested_matches_reconstruct(baseline, hazard):
+    nodes, curves, registry = baseline
+
+    # No hazard: the fetcher reads no curves
+    flat = build_flat_tree(nodes, curves if hazard else None, SECTOR, hazard, registry)
+
+    assert json.dumps(flat.to_nested()) == json.dumps(_nested(nodes, curves, registry, hazard))
+
+
+@pytest.mark.parametrize("ragged", [False, True])
+@pytest.mark.parametrize("hazard", ["Wind", "Flood", "Snow"])
+def test_flat_compute_matches_nested(baseline, hazard, ragged):
+    nodes, curves, registry = baseline
+    prepared = _prepared_data(12, ragged)
+    computer = FragilityComputer()
+
+    flat = build_flat_tree(nodes, curves, SECTOR, hazard, registry)
+
+    expected = computer.compute_for_tree(_nested(nodes, curves, registry, hazard), hazard, prepared)
+    assert json.dumps(computer.compute_for_flat_tree(flat, hazard, prepared)) == json.dumps(expected)
+
+    expected_ts = computer.compute_timeseries(_nested(nodes, curves, registry, hazard), hazard, prepared)
+    assert json.dumps(computer.compute_timeseries_flat(flat, hazard, prepared)) == json.dumps(expected_ts)
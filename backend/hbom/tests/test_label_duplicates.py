@@ -0,0 +1,59 @@
+"""
+Label Duplicates Test - Blocked matching against brute-force fuzz.ratio
+Random labels over a small alphabet so near-duplicates are common
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+from rapidfuzz import fuzz
+
+# Add backend root to path
+# tests/ -> hbom/ -> backend/ (need to go up 2 levels)
+backend_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_root))
+
+from hbom.label_duplicates import DUPLICATE_SIMILARITY, label_duplicates
+
+
+def _brute_force(inc_labels, ex_labels):
+    pairs = []
+    for i, a in enumerate(inc_labels):
+        for j, b in enumerate(ex_labels):
+            sim = round(fuzz.ratio(a.lower(), b.lower()))
+            if sim >= DUPLICATE_SIMILARITY:
+                pairs.append((i, j, sim))
+    return pairs
+
+
+def _mutate(rng, label):
+    """A few random edits, so some variants stay above the threshold"""
+    chars = list(label)
+    for _ in range(rng.randint(0, 3)):
+        op = rng.choice("ids")
+        pos = rng.randint(0, len(chars))
+        if op == "i" or not chars:
+            chars.insert(pos, rng.choice("abcXY "))
+        elif op == "d":
+            del chars[min(pos, len(chars) - 1)]
+        else:
+            chars[min(pos, len(chars) - 1)] = rng.choice("abcXY ")
+    return "".join(chars)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    base = ["".join(rng.choice("abcXY ") for _ in range(rng.randint(0, 14))) for _ in range(25)]
+    ex_labels = [_mutate(rng, rng.choice(base)) for _ in range(60)] + ["", "A"]
+    inc_labels = [_mutate(rng, rng.choice(base)) for _ in range(40)] + ["", "a", "ab"]
+
+    assert label_duplicates(inc_labels, ex_labels) == _brute_force(inc_labels, ex_labels)
+
+
+def test_empty_labels():
+    assert label_duplicates(["", "pump"], ["", "", "Pump"]) == [(0, 0, 100), (0, 1, 100), (1, 2, 100)]
+    assert label_duplicates(["", "pump"], ["pumps"]) == [(1, 0, 89)]
+    assert label_duplicates([], ["pump"]) == []
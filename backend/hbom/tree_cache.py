@@ -0,0 +1,153 @@
+"""
+HBOM Tree Cache
+Process-wide cache of frontend-ready HBOM trees
+
+Building a tree reads every canonical node, their fragility curves and the
+canonical registry, then reconstructs and sanitizes the nested structure -
+for data that only changes when a load script runs. Trees are cached per
+(sector, hazard) and stamped with the baseline version (baseline_version.py)
+and component library snapshot version they were built from; a stamp
+mismatch rebuilds the tree.
+
+Invalidation:
+- the version document is re-read at most every VERSION_CHECK_INTERVAL seconds
+- watch() (started at app startup) drops all trees as soon as a change
+  stream reports a write to the baseline collections, where supported
+
+Entries are either nested frontend payloads or FlatHBOMTree arrays (keyed
+("flat", sector, hazard)). Both are shared by all requests and must be
+treated as read-only.
+
+Location: backend/hbom/tree_cache.py
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from baseline_version import VERSION_COLLECTION, get_baseline_version
+
+logger = logging.getLogger(__name__)
+
+# Collections whose writes change cached trees
+WATCHED_COLLECTIONS = ["hbom_baseline", "fragility_db", VERSION_COLLECTION]
+
+# Seconds between reads of the baseline version document
+VERSION_CHECK_INTERVAL = 10
+
+# Seconds to wait before reopening a dropped change stream / retrying one that never opened
+WATCH_RETRY_SECONDS = 30
+WATCH_UNAVAILABLE_RETRY_SECONDS = 300
+
+
+@dataclass
+class CachedTree:
+    """A built tree and the versions it was built from"""
+    stamp: Tuple[int, int]
+    payload: Any                            # Nested dict or FlatHBOMTree
+    _body: Optional[bytes] = field(default=None, repr=False)
+
+    def json_bytes(self) -> bytes:
+        """Payload rendered like JSONResponse, rendered once per tree"""
+        if self._body is None:
+            self._body = json.dumps(
+                self.payload,
+                ensure_ascii=False,
+                allow_nan=False,
+                indent=None,
+                separators=(",", ":"),
+            ).encode("utf-8")
+        return self._body
+
+
+class HBOMTreeCache:
+    """Versioned (sector, hazard) -> tree cache"""
+
+    def __init__(self):
+        self._entries: Dict[Hashable, CachedTree] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._version: Optional[int] = None
+        self._version_checked_at = 0.0
+        self._generation = 0  # Bumped by invalidate()
+
+    async def baseline_version(self, db) -> int:
+        """Baseline version, re-read at most every VERSION_CHECK_INTERVAL seconds"""
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked_at >= VERSION_CHECK_INTERVAL:
+            self._version = await get_baseline_version(db)
+            self._version_checked_at = now
+        return self._version
+
+    async def get_or_build(
+        self,
+        key: Hashable,
+        stamp: Tuple[int, int],
+        build: Callable[[], Awaitable[Any]]
+    ) -> CachedTree:
+        """
+        Cached tree for key if built from stamp, else build (once) and cache it
+
+        Args:
+            key: (sector, hazard), or ("flat", sector, hazard)
+            stamp: (baseline version, component library version)
+            build: Coroutine function producing the payload
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.stamp == stamp:
+            return entry
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another request may have built it while we waited
+            entry = self._entries.get(key)
+            if entry is not None and entry.stamp == stamp:
+                return entry
+
+            generation = self._generation
+            start = time.perf_counter()
+            entry = CachedTree(stamp=stamp, payload=await build())
+            # Not cached if invalidated mid-build: it may hold pre-change data
+            if generation == self._generation:
+                self._entries[key] = entry
+            logger.info(f"Built HBOM tree {key} for version {stamp} in {time.perf_counter() - start:.2f}s")
+            return entry
+
+    def invalidate(self):
+        """Drop all trees and re-read the baseline version on next use"""
+        self._entries.clear()
+        self._version = None
+        self._generation += 1
+        logger.info("HBOM tree cache invalidated")
+
+    async def watch(self, db):
+        """
+        Invalidate on writes to the baseline collections
+
+        Runs until cancelled; start it as a background task at app startup.
+        """
+        pipeline = [{"$match": {"ns.coll": {"$in": WATCHED_COLLECTIONS}}}]
+        while True:
+            watching = False
+            try:
+                async with db.watch(pipeline) as stream:
+                    watching = True
+                    logger.info("Watching HBOM baseline collections for changes")
+                    async for change in stream:
+                        logger.info(f"HBOM data changed ({change['ns']['coll']}: {change.get('operationType')})")
+                        self.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Standalone servers have no change streams: the version document still applies
+                logger.warning(f"HBOM change stream unavailable ({e}), relying on baseline version checks")
+                if watching:
+                    # Changes made while the stream is down would be missed
+                    self.invalidate()
+                await asyncio.sleep(WATCH_RETRY_SECONDS if watching else WATCH_UNAVAILABLE_RETRY_SECONDS)
+
+
+# Shared by every HBOMFetcher in the process
+hbom_tree_cache = HBOMTreeCache()
@@ -0,0 +1,97 @@
+"""
+Infrastructure Clustering
+Zoom-aware grid clustering so regional views return a bounded number of
+clusters instead of every asset in the bounding box
+
+Cells are aligned to a global lat/lon grid whose size follows the map zoom
+(a few cells per 256px web-map tile), so cluster ids are stable while panning.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Return individual assets when the bbox holds at most this many
+DEFAULT_CLUSTER_THRESHOLD = 2000
+
+# Cluster cells per web-map tile edge (4 -> 64px cells on 256px tiles)
+CELLS_PER_TILE = 4
+
+
+def cell_size_for_zoom(zoom: int) -> float:
+    """Grid cell size in degrees for a web-map zoom level"""
+    return 360.0 / (2 ** zoom) / CELLS_PER_TILE
+
+
+def grid_cell(lat: float, lon: float, cell_size: float) -> Tuple[int, int]:
+    """(row, col) of the grid cell containing a point"""
+    return math.floor(lat / cell_size), math.floor(lon / cell_size)
+
+
+def make_cluster(
+    row: int,
+    col: int,
+    cell_size: float,
+    count: int,
+    lat_sum: float,
+    lon_sum: float,
+    component_types: Dict[str, int]
+) -> Dict[str, Any]:
+    """
+    Build a cluster record
+
+    The marker position is the mean of the member assets, not the cell
+    centre, so single-asset and tight clusters sit where the assets are.
+    """
+    return {
+        'id': f"{row}:{col}",
+        'latitude': lat_sum / count,
+        'longitude': lon_sum / count,
+        'count': count,
+        'component_types': dict(
+            sorted(component_types.items(), key=lambda kv: kv[1], reverse=True)
+        ),
+        'bounds': {
+            'min_lat': row * cell_size,
+            'max_lat': (row + 1) * cell_size,
+            'min_lon': col * cell_size,
+            'max_lon': (col + 1) * cell_size
+        }
+    }
+
+
+def cluster_assets(
+    assets: Iterable[Dict[str, Any]],
+    cell_size: float
+) -> List[Dict[str, Any]]:
+    """
+    Cluster in-memory assets on the grid
+
+    Args:
+        assets: Asset dicts with 'latitude', 'longitude' and 'component_type'
+        cell_size: Grid cell size in degrees
+
+    Returns:
+        List of cluster records (see make_cluster)
+    """
+    cells: Dict[Tuple[int, int], List[Any]] = {}
+
+    for asset in assets:
+        lat, lon = asset.get('latitude'), asset.get('longitude')
+        if lat is None or lon is None:
+            continue
+
+        key = grid_cell(lat, lon, cell_size)
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = [0, 0.0, 0.0, {}]    # count, lat sum, lon sum, types
+
+        cell[0] += 1
+        cell[1] += lat
+        cell[2] += lon
+        component_type = str(asset.get('component_type') or 'Unknown')
+        cell[3][component_type] = cell[3].get(component_type, 0) + 1
+
+    return [
+        make_cluster(row, col, cell_size, *values)
+        for (row, col), values in cells.items()
+    ]
@@ -4,10 +4,48 @@ Defines the interface that all infrastructure providers must implement
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from pydantic import BaseModel
 
 
+# Field sets returned per projection profile (None = every field)
+PROJECTION_PROFILES: Dict[str, Optional[List[str]]] = {
+    # Just enough to draw a map marker
+    'marker': [
+        'uuid', 'name', 'component_type', 'facilityTypeName',
+        'latitude', 'longitude',
+    ],
+    # Marker plus what list/tooltip views show
+    'summary': [
+        'uuid', 'name', 'component_type', 'facilityTypeName',
+        'latitude', 'longitude', 'sector', 'state', 'county', 'owner',
+        'balancingauthority', 'eia_plant_id', 'lines', 'min_voltage', 'max_voltage',
+    ],
+    'full': None,
+}
+
+
+def projection_fields(profile: str) -> Optional[List[str]]:
+    """
+    Resolve a projection profile name to its field list
+    
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile not in PROJECTION_PROFILES:
+        available = ', '.join(PROJECTION_PROFILES.keys())
+        raise ValueError(f"Unknown projection profile: '{profile}'. Available: {available}")
+    return PROJECTION_PROFILES[profile]
+
+
+def project_asset(asset: Dict[str, Any], profile: str) -> Dict[str, Any]:
+    """Apply a projection profile to an in-memory asset dict"""
+    fields = projection_fields(profile)
+    if fields is None:
+        return asset
+    return {k: asset[k] for k in fields if k in asset}
+
+
 class BoundingBox(BaseModel):
     """Geographic bounding box for spatial queries"""
     min_lat: float
@@ -53,6 +91,127 @@ class InfrastructureDataSource(ABC):
         """
         pass
     
+    async def iter_assets(
+        self,
+        bbox: BoundingBox,
+        sector: str,
+        filters: Optional[Dict[str, Any]] = None,
+        projection: str = 'full',
+        batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream assets within bounding box one at a time
+        
+        Default implementation wraps fetch(); sources backed by a database
+        should override it to stream from a cursor.
+        
+        Args:
+            bbox: Geographic bounding box to query
+            sector: Infrastructure sector
+            filters: Additional filters
+            projection: Projection profile ('marker', 'summary', 'full')
+            batch_size: Hint for how many documents to pull per round trip
+        """
+        projection_fields(projection)
+        for asset in await self.fetch(bbox, sector, filters):
+            yield project_asset(asset, projection)
+    
+    async def fetch_page(
+        self,
+        bbox: BoundingBox,
+        sector: str,
+        filters: Optional[Dict[str, Any]] = None,
+        projection: str = 'full',
+        page_size: int = 1000,
+        resume_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch one page of assets within bounding box
+        
+        Default implementation slices fetch() by offset; sources backed by a
+        database should override it with a cursor-based resume token.
+        
+        Args:
+            bbox: Geographic bounding box to query
+            sector: Infrastructure sector
+            filters: Additional filters
+            projection: Projection profile ('marker', 'summary', 'full')
+            page_size: Maximum assets in this page
+            resume_token: Token from the previous page (None for the first page)
+        
+        Returns:
+            Dictionary with 'assets' and 'next_token' (None on the last page)
+        """
+        projection_fields(projection)
+        try:
+            offset = int(resume_token) if resume_token else 0
+        except ValueError:
+            raise ValueError(f"Invalid resume token: {resume_token}")
+        
+        assets = await self.fetch(bbox, sector, filters)
+        page = assets[offset:offset + page_size]
+        next_offset = offset + len(page)
+        
+        return {
+            'assets': [project_asset(a, projection) for a in page],
+            'next_token': str(next_offset) if next_offset < len(assets) else None
+        }
+    
+    async def count_assets(
+        self,
+        bbox: BoundingBox,
+        sector: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None
+    ) -> int:
+        """
+        Count assets within bounding box
+        
+        Args:
+            bbox: Geographic bounding box to query
+            sector: Infrastructure sector
+            filters: Additional filters
+            limit: Stop counting once this many are found (None = exact count)
+        
+        Returns:
+            Number of matching assets (capped at limit)
+        """
+        count = 0
+        async for _ in self.iter_assets(bbox, sector, filters, projection='marker'):
+            count += 1
+            if limit is not None and count >= limit:
+                break
+        return count
+    
+    async def cluster_assets(
+        self,
+        bbox: BoundingBox,
+        sector: str,
+        cell_size: float,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate assets within bounding box into grid clusters
+        
+        Default implementation clusters the 'marker' projection in process;
+        sources backed by a database should override it to group server-side.
+        
+        Args:
+            bbox: Geographic bounding box to query
+            sector: Infrastructure sector
+            cell_size: Grid cell size in degrees
+            filters: Additional filters
+        
+        Returns:
+            List of cluster records (see infrastructure.clustering.make_cluster)
+        """
+        from ..clustering import cluster_assets
+        
+        assets = [
+            asset async for asset in self.iter_assets(bbox, sector, filters, projection='marker')
+        ]
+        return cluster_assets(assets, cell_size)
+    
     @abstractmethod
     async def get_stats(self, sector: str) -> Dict[str, Any]:
         """
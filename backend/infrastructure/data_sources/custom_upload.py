@@ -1,11 +1,12 @@
 """
 Custom Upload Data Source
 Handles user-uploaded CSV/Excel files for infrastructure data
-Supports in-memory processing, cache persistence, and optional MongoDB persistence
+Supports in-memory processing, Arrow file persistence, and optional MongoDB persistence
 """
 
 import logging
 import io
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 import polars as pl
 import pandas as pd
@@ -13,17 +14,23 @@ from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorClient
 from database import mongo_uri
 from .base import InfrastructureDataSource, BoundingBox
+from .spatial_index import GridIndex
+from .upload_store import UploadStore, UploadRecord
 
 logger = logging.getLogger(__name__)
 
+# Rows converted to dicts and inserted per MongoDB round trip
+MONGO_INSERT_BATCH = 10000
+
 
 class CustomUploadSource(InfrastructureDataSource):
     """
     In-memory data source for user-uploaded infrastructure files
     
     Supports CSV and Excel (XLSX) formats
-    Filters by bounding box in-memory using Polars for performance
-    Can persist to cache or MongoDB for later sessions
+    Bbox, radius and nearest-N queries go through a grid spatial index
+    built once per upload (persisted alongside the data)
+    Can persist to an UploadStore (Arrow IPC) or MongoDB for later sessions
     """
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -32,7 +39,9 @@ class CustomUploadSource(InfrastructureDataSource):
         
         Args:
             config: Optional config with:
-                - cache_manager: CacheManager instance for persistence
+                - upload_store: UploadStore uploads are persisted to
+                - cache_manager: CacheManager holding uploads persisted
+                  before the upload store (read-only)
                 - mongo_uri: MongoDB connection string (if persisting to DB)
                 - database: MongoDB database name
                 - persist_to_mongo: Whether to save uploads to MongoDB
@@ -41,10 +50,12 @@ class CustomUploadSource(InfrastructureDataSource):
         
         # In-memory storage for uploaded data
         self._data: Optional[pl.DataFrame] = None
+        self._index: Optional[GridIndex] = None
         self._source_filename: Optional[str] = None
         self._upload_id: Optional[str] = None
         
-        # Cache manager for persistence
+        # Arrow file store for persistence (cache manager: legacy entries only)
+        self.upload_store: Optional[UploadStore] = self.config.get('upload_store')
         self.cache_manager = self.config.get('cache_manager')
         
         # MongoDB settings (optional)
@@ -94,7 +105,7 @@ class CustomUploadSource(InfrastructureDataSource):
             file_content: Raw file bytes
             filename: Original filename (for format detection)
             required_columns: Columns that must be present
-            persist: Whether to persist to cache/MongoDB
+            persist: Whether to persist to the upload store/MongoDB
             upload_id: Optional ID for this upload (generated if not provided)
         
         Returns:
@@ -144,31 +155,28 @@ class CustomUploadSource(InfrastructureDataSource):
                 logger.warning(f"Found {invalid_count} rows with invalid coordinates")
                 df = df.filter(valid_coords)
             
-            # Store in memory
-            self._data = df
+            # Store in memory and index coordinates
+            self._set_data(df)
             self._source_filename = filename
             
             # Persist if requested
             persisted_to = []
             
             if persist:
-                # Always persist to cache if available
-                if self.cache_manager:
+                # Persist data and index as memory-mappable Arrow files
+                if self.upload_store:
                     try:
-                        cache_key = ('custom_upload', upload_id)
-                        cache_data = {
-                            'dataframe': df.to_dicts(),
-                            'filename': filename,
-                            'upload_id': upload_id,
-                            'uploaded_at': datetime.now().isoformat(),
-                            'row_count': len(df),
-                            'columns': df.columns
-                        }
-                        self.cache_manager.set('custom_upload', cache_key, cache_data)
-                        persisted_to.append('cache')
-                        logger.info(f"Persisted upload {upload_id} to cache")
+                        record = UploadRecord(
+                            upload_id=upload_id,
+                            filename=filename,
+                            uploaded_at=datetime.now().isoformat(),
+                            row_count=len(df)
+                        )
+                        self.upload_store.save(record, df, self._index)
+                        persisted_to.append('arrow')
+                        logger.info(f"Persisted upload {upload_id} to upload store")
                     except Exception as e:
-                        logger.error(f"Failed to persist to cache: {e}")
+                        logger.error(f"Failed to persist to upload store: {e}")
                 
                 # Optionally persist to MongoDB
                 if self.persist_to_mongo:
@@ -199,9 +207,131 @@ class CustomUploadSource(InfrastructureDataSource):
                 'error': str(e)
             }
     
+    async def load_path(
+        self,
+        file_path: Path,
+        filename: str,
+        required_columns: Optional[List[str]] = None,
+        persist: bool = True,
+        upload_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Load and validate an uploaded file spooled to disk
+        
+        CSV files are scanned lazily and streamed through coordinate
+        validation straight into the upload store, so peak memory does not
+        grow with file size. Other formats are read whole via load_file().
+        
+        Args:
+            file_path: Path of the spooled upload
+            filename: Original filename (for format detection)
+            required_columns: Columns that must be present
+            persist: Whether to persist to the upload store/MongoDB
+            upload_id: Optional ID for this upload (generated if not provided)
+        
+        Returns:
+            Dictionary with load results, same shape as load_file()
+        """
+        if not filename.lower().endswith('.csv'):
+            return await self.load_file(
+                Path(file_path).read_bytes(), filename, required_columns, persist, upload_id
+            )
+        
+        try:
+            logger.info(f"Streaming custom file: {filename}")
+            
+            if upload_id is None:
+                upload_id = f"upload_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}"
+            
+            self._upload_id = upload_id
+            
+            lf = pl.scan_csv(
+                file_path,
+                infer_schema_length=1000,
+                ignore_errors=True,
+                encoding='utf8-lossy'
+            )
+            columns = lf.collect_schema().names()
+            
+            # Validate required columns
+            required_cols = required_columns or ['latitude', 'longitude', 'name']
+            missing_cols = [col for col in required_cols if col not in columns]
+            
+            if missing_cols:
+                return {
+                    'success': False,
+                    'error': f"Missing required columns: {', '.join(missing_cols)}",
+                    'found_columns': columns,
+                    'required_columns': required_cols
+                }
+            
+            # Validate coordinates while streaming
+            valid = lf.filter(
+                (pl.col('latitude') >= -90) & (pl.col('latitude') <= 90) &
+                (pl.col('longitude') >= -180) & (pl.col('longitude') <= 180)
+            )
+            total_rows = lf.select(pl.len()).collect().item()
+            
+            persisted_to = []
+            record = None
+            
+            if persist and self.upload_store:
+                record = UploadRecord(
+                    upload_id=upload_id,
+                    filename=filename,
+                    uploaded_at=datetime.now().isoformat(),
+                    row_count=0
+                )
+                df = self.upload_store.sink(record, valid)
+                persisted_to.append('arrow')
+            else:
+                df = valid.collect()
+            
+            invalid_count = total_rows - len(df)
+            if invalid_count > 0:
+                logger.warning(f"Found {invalid_count} rows with invalid coordinates")
+            
+            # Activate (memory-mapped when stored) and index coordinates
+            self._set_data(df)
+            self._source_filename = filename
+            
+            if record is not None:
+                self.upload_store.save_index(record, self._index)
+                logger.info(f"Persisted upload {upload_id} to upload store")
+            
+            if persist and self.persist_to_mongo:
+                try:
+                    await self._persist_to_mongodb(df, filename, upload_id)
+                    persisted_to.append('mongodb')
+                    logger.info(f"Persisted upload {upload_id} to MongoDB")
+                except Exception as e:
+                    logger.error(f"Failed to persist to MongoDB: {e}")
+            
+            return {
+                'success': True,
+                'upload_id': upload_id,
+                'filename': filename,
+                'total_rows': len(df),
+                'invalid_coords_removed': invalid_count,
+                'columns': df.columns,
+                'preview': df.head(5).to_dicts(),
+                'persisted_to': persisted_to
+            }
+            
+        except Exception as e:
+            logger.error(f"Error loading file {filename}: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     async def load_from_cache(self, upload_id: str) -> bool:
         """
-        Load previously uploaded data from cache
+        Load previously uploaded data from the upload store
+        
+        The Arrow file is memory-mapped and the persisted spatial index
+        reused, so this is fast regardless of upload size. Uploads cached
+        as row dicts before the upload store existed are still readable.
         
         Args:
             upload_id: ID of the upload to retrieve
@@ -209,30 +339,47 @@ class CustomUploadSource(InfrastructureDataSource):
         Returns:
             True if successfully loaded, False otherwise
         """
-        if not self.cache_manager:
-            logger.warning("No cache manager available")
-            return False
-        
         try:
-            cache_key = ('custom_upload', upload_id)
-            cached_data = self.cache_manager.get('custom_upload', cache_key)
+            stored = self.upload_store.load(upload_id) if self.upload_store else None
             
-            if cached_data:
-                # Reconstruct DataFrame
-                self._data = pl.DataFrame(cached_data['dataframe'])
-                self._source_filename = cached_data['filename']
+            if stored:
+                record, df, index = stored
+                self._set_data(df, index)
+                self._source_filename = record.filename
                 self._upload_id = upload_id
                 
-                logger.info(f"Loaded upload {upload_id} from cache ({len(self._data)} rows)")
+                logger.info(f"Loaded upload {upload_id} from upload store ({len(df)} rows)")
                 return True
-            else:
-                logger.warning(f"Upload {upload_id} not found in cache")
-                return False
+            
+            return self._load_legacy_cache_entry(upload_id)
                 
         except Exception as e:
             logger.error(f"Error loading from cache: {e}")
             return False
     
+    def _load_legacy_cache_entry(self, upload_id: str) -> bool:
+        """Load an upload cached as row dicts through the CacheManager"""
+        if not self.cache_manager:
+            logger.warning(f"Upload {upload_id} not found in upload store")
+            return False
+        
+        cache_key = ('custom_upload', upload_id)
+        cached_data = self.cache_manager.get('custom_upload', cache_key)
+        
+        if not cached_data:
+            logger.warning(f"Upload {upload_id} not found in cache")
+            return False
+        
+        index = None
+        if 'spatial_index' in cached_data:
+            index = GridIndex.from_arrays(cached_data['spatial_index'])
+        self._set_data(pl.DataFrame(cached_data['dataframe']), index)
+        self._source_filename = cached_data['filename']
+        self._upload_id = upload_id
+        
+        logger.info(f"Loaded upload {upload_id} from legacy cache ({len(self._data)} rows)")
+        return True
+    
     async def load_from_mongodb(self, upload_id: str) -> bool:
         """
         Load previously uploaded data from MongoDB
@@ -262,7 +409,7 @@ class CustomUploadSource(InfrastructureDataSource):
                 if '_id' in asset:
                     del asset['_id']
             
-            self._data = pl.DataFrame(assets)
+            self._set_data(pl.DataFrame(assets))
             self._upload_id = upload_id
             self._source_filename = assets[0].get('source_filename', upload_id)
             
@@ -273,6 +420,24 @@ class CustomUploadSource(InfrastructureDataSource):
             logger.error(f"Error loading from MongoDB: {e}")
             return False
     
+    def _set_data(self, df: pl.DataFrame, index: Optional[GridIndex] = None):
+        """
+        Make a DataFrame the active upload
+        
+        Args:
+            df: Upload data with 'latitude' and 'longitude' columns
+            index: Previously built index for this exact data (built if None)
+        """
+        if index is None:
+            index = GridIndex.build(
+                df['latitude'].cast(pl.Float64).to_numpy(),
+                df['longitude'].cast(pl.Float64).to_numpy()
+            )
+            logger.info(f"Built spatial index: {len(index)} points, {index.shape[0]}x{index.shape[1]} cells")
+        
+        self._data = df
+        self._index = index
+    
     async def _persist_to_mongodb(
         self,
         df: pl.DataFrame,
@@ -287,34 +452,38 @@ class CustomUploadSource(InfrastructureDataSource):
             filename: Original filename
             upload_id: Upload identifier
         """
-        # Convert to list of dicts
-        records = df.to_dicts()
-        
-        # Add metadata to each record
-        for record in records:
-            record['upload_id'] = upload_id
-            record['source_filename'] = filename
-            record['uploaded_at'] = datetime.now().isoformat()
-            
-            # Create GeoJSON location for geospatial queries
-            if 'latitude' in record and 'longitude' in record:
-                record['location'] = {
-                    'type': 'Point',
-                    'coordinates': [record['longitude'], record['latitude']]
-                }
-        
         # Delete existing records with this upload_id (replace)
         await self.collection.delete_many({'upload_id': upload_id})
         
-        # Insert new records
-        if records:
-            await self.collection.insert_many(records)
+        uploaded_at = datetime.now().isoformat()
+        inserted = 0
+        
+        # Convert and insert a slice at a time to bound memory
+        for chunk in df.iter_slices(n_rows=MONGO_INSERT_BATCH):
+            records = chunk.to_dicts()
+            
+            # Add metadata to each record
+            for record in records:
+                record['upload_id'] = upload_id
+                record['source_filename'] = filename
+                record['uploaded_at'] = uploaded_at
+                
+                # Create GeoJSON location for geospatial queries
+                if 'latitude' in record and 'longitude' in record:
+                    record['location'] = {
+                        'type': 'Point',
+                        'coordinates': [record['longitude'], record['latitude']]
+                    }
+            
+            if records:
+                await self.collection.insert_many(records, ordered=False)
+                inserted += len(records)
         
         # Create indexes
         await self.collection.create_index('upload_id')
         await self.collection.create_index('location', name='geo_index')
         
-        logger.info(f"Persisted {len(records)} records to MongoDB")
+        logger.info(f"Persisted {inserted} records to MongoDB")
     
     def _load_csv(self, file_content: bytes) -> pl.DataFrame:
         """Load CSV file using Polars"""
@@ -376,19 +545,9 @@ class CustomUploadSource(InfrastructureDataSource):
             return []
         
         try:
-            # Apply bounding box filter
-            filtered = self._data.filter(
-                (pl.col('latitude') >= bbox.min_lat) &
-                (pl.col('latitude') <= bbox.max_lat) &
-                (pl.col('longitude') >= bbox.min_lon) &
-                (pl.col('longitude') <= bbox.max_lon)
-            )
-            
-            # Apply additional filters if provided
-            if filters:
-                for column, value in filters.items():
-                    if column in filtered.columns:
-                        filtered = filtered.filter(pl.col(column) == value)
+            # Bounding box filter via the spatial index
+            rows = self._index.query_bbox(bbox.min_lat, bbox.max_lat, bbox.min_lon, bbox.max_lon)
+            filtered = self._apply_filters(self._data[rows], filters)
             
             logger.info(f"Custom upload filtered: {len(filtered)} assets in bbox")
             
@@ -399,6 +558,69 @@ class CustomUploadSource(InfrastructureDataSource):
             logger.error(f"Error filtering custom upload data: {e}")
             raise
     
+    async def fetch_nearest(
+        self,
+        lat: float,
+        lon: float,
+        n: int = 10,
+        max_radius_km: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch the n assets nearest to a point
+        
+        Args:
+            lat, lon: Query point
+            n: Number of assets to return
+            max_radius_km: Ignore assets farther than this
+        
+        Returns:
+            Asset dictionaries, nearest first, each with 'distance_km'
+        """
+        if self._data is None:
+            logger.warning("No data loaded for custom upload")
+            return []
+        
+        rows, dist = self._index.query_nearest(lat, lon, n, max_radius_km)
+        return self._data[rows].with_columns(pl.Series('distance_km', dist)).to_dicts()
+    
+    async def fetch_within_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch assets within a great-circle radius of a point
+        
+        Args:
+            lat, lon: Query point
+            radius_km: Search radius in km
+            filters: Additional column filters
+        
+        Returns:
+            Asset dictionaries, nearest first, each with 'distance_km'
+        """
+        if self._data is None:
+            logger.warning("No data loaded for custom upload")
+            return []
+        
+        rows, dist = self._index.query_radius(lat, lon, radius_km)
+        matched = self._data[rows].with_columns(pl.Series('distance_km', dist))
+        return self._apply_filters(matched, filters).to_dicts()
+    
+    def _apply_filters(
+        self,
+        df: pl.DataFrame,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> pl.DataFrame:
+        """Apply equality filters on columns that exist"""
+        if filters:
+            for column, value in filters.items():
+                if column in df.columns:
+                    df = df.filter(pl.col(column) == value)
+        return df
+    
     async def _fetch_from_mongodb(
         self,
         bbox: BoundingBox,
@@ -486,6 +708,7 @@ class CustomUploadSource(InfrastructureDataSource):
     def clear(self):
         """Clear loaded data from memory (does not affect persisted data)"""
         self._data = None
+        self._index = None
         self._source_filename = None
         self._upload_id = None
         logger.info("Custom upload data cleared from memory")
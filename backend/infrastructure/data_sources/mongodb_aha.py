@@ -4,10 +4,14 @@ Fetches infrastructure from MongoDB collections loaded from AHA Core workbooks
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
+from bson import ObjectId
+from bson.errors import InvalidId
 from motor.motor_asyncio import AsyncIOMotorClient
 from database import mongo_uri
-from .base import InfrastructureDataSource, BoundingBox
+from collection_stats import get_collection_stats
+from .base import InfrastructureDataSource, BoundingBox, projection_fields
+from ..clustering import make_cluster
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +66,8 @@ class MongoDBahaSource(InfrastructureDataSource):
         self,
         bbox: BoundingBox,
         sector: str,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        projection: str = 'full'
     ) -> List[Dict[str, Any]]:
         """
         Fetch infrastructure assets within bounding box
@@ -73,50 +78,207 @@ class MongoDBahaSource(InfrastructureDataSource):
             bbox: Geographic bounding box
             sector: Infrastructure sector (not used if collection is sector-specific)
             filters: Additional MongoDB query filters
+            projection: Projection profile ('marker', 'summary', 'full')
         
         Returns:
             List of matching asset documents
         """
         try:
-            # Build geospatial query
-            query = {
-                "location": {
-                    "$geoWithin": {
-                        "$box": [
-                            [bbox.min_lon, bbox.min_lat],  # Southwest corner
-                            [bbox.max_lon, bbox.max_lat]   # Northeast corner
-                        ]
-                    }
-                }
-            }
-            
-            # Add additional filters
-            if filters:
-                query.update(filters)
-            
-            logger.info(f"Querying MongoDB: {query}")
-            
-            # Execute query
-            cursor = self.collection.find(query)
-            assets = await cursor.to_list(length=None)
+            assets = [
+                asset async for asset in self.iter_assets(bbox, sector, filters, projection)
+            ]
             
             logger.info(f"Found {len(assets)} assets in bbox")
             
-            # Clean MongoDB _id fields for JSON serialization
-            for asset in assets:
-                if '_id' in asset:
-                    asset['_id'] = str(asset['_id'])
-            
             return assets
             
         except Exception as e:
             logger.error(f"MongoDB fetch error: {e}")
             raise
     
+    async def iter_assets(
+        self,
+        bbox: BoundingBox,
+        sector: str,
+        filters: Optional[Dict[str, Any]] = None,
+        projection: str = 'full',
+        batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream assets within bounding box straight from the cursor
+        
+        Only the fields of the projection profile leave the server, and
+        documents are yielded as each batch arrives.
+        """
+        query = self._build_query(bbox, filters)
+        logger.info(f"Querying MongoDB ({projection}): {query}")
+        
+        cursor = self.collection.find(
+            query,
+            self._build_projection(projection),
+            batch_size=batch_size
+        )
+        
+        async for asset in cursor:
+            asset['_id'] = str(asset['_id'])
+            yield asset
+    
+    async def fetch_page(
+        self,
+        bbox: BoundingBox,
+        sector: str,
+        filters: Optional[Dict[str, Any]] = None,
+        projection: str = 'full',
+        page_size: int = 1000,
+        resume_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch one page of assets ordered by _id
+        
+        The resume token encodes the last _id of the previous page, so each
+        page is an index range scan rather than a skip over earlier pages.
+        
+        Returns:
+            Dictionary with 'assets' and 'next_token' (None on the last page)
+        """
+        query = self._build_query(bbox, filters)
+        if resume_token:
+            query['_id'] = {'$gt': _decode_resume_token(resume_token)}
+        
+        # Ask for one extra document to know whether another page exists
+        cursor = (
+            self.collection.find(query, self._build_projection(projection))
+            .sort('_id', 1)
+            .limit(page_size + 1)
+        )
+        docs = await cursor.to_list(length=page_size + 1)
+        
+        has_more = len(docs) > page_size
+        docs = docs[:page_size]
+        next_token = _encode_resume_token(docs[-1]['_id']) if has_more and docs else None
+        
+        for doc in docs:
+            doc['_id'] = str(doc['_id'])
+        
+        logger.info(f"Fetched page of {len(docs)} assets (more: {has_more})")
+        
+        return {'assets': docs, 'next_token': next_token}
+    
+    async def count_assets(
+        self,
+        bbox: BoundingBox,
+        sector: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None
+    ) -> int:
+        """Count assets in bbox; with a limit the server stops scanning early"""
+        query = self._build_query(bbox, filters)
+        if limit is not None:
+            return await self.collection.count_documents(query, limit=limit)
+        return await self.collection.count_documents(query)
+    
+    async def cluster_assets(
+        self,
+        bbox: BoundingBox,
+        sector: str,
+        cell_size: float,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate assets into grid clusters with a $group pipeline
+        
+        Only one record per occupied cell and component type leaves the
+        server, regardless of how many assets the bbox holds.
+        """
+        pipeline = [
+            {'$match': self._build_query(bbox, filters)},
+            {
+                '$project': {
+                    'row': {'$floor': {'$divide': ['$latitude', cell_size]}},
+                    'col': {'$floor': {'$divide': ['$longitude', cell_size]}},
+                    'latitude': 1,
+                    'longitude': 1,
+                    'component_type': {'$ifNull': ['$component_type', 'Unknown']}
+                }
+            },
+            {
+                '$group': {
+                    '_id': {'row': '$row', 'col': '$col', 'component_type': '$component_type'},
+                    'count': {'$sum': 1},
+                    'lat_sum': {'$sum': '$latitude'},
+                    'lon_sum': {'$sum': '$longitude'}
+                }
+            },
+            {
+                '$group': {
+                    '_id': {'row': '$_id.row', 'col': '$_id.col'},
+                    'count': {'$sum': '$count'},
+                    'lat_sum': {'$sum': '$lat_sum'},
+                    'lon_sum': {'$sum': '$lon_sum'},
+                    'component_types': {
+                        '$push': {'type': '$_id.component_type', 'count': '$count'}
+                    }
+                }
+            }
+        ]
+        
+        cells = await self.collection.aggregate(pipeline, allowDiskUse=True).to_list(length=None)
+        
+        clusters = [
+            make_cluster(
+                int(cell['_id']['row']),
+                int(cell['_id']['col']),
+                cell_size,
+                cell['count'],
+                cell['lat_sum'],
+                cell['lon_sum'],
+                {str(t['type']): t['count'] for t in cell['component_types']}
+            )
+            for cell in cells
+            if cell['_id']['row'] is not None and cell['_id']['col'] is not None
+        ]
+        
+        logger.info(f"Clustered assets into {len(clusters)} cells ({cell_size:.4f} deg)")
+        
+        return clusters
+    
+    def _build_query(
+        self,
+        bbox: BoundingBox,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the geospatial query plus any extra filters"""
+        query = {
+            "location": {
+                "$geoWithin": {
+                    "$box": [
+                        [bbox.min_lon, bbox.min_lat],  # Southwest corner
+                        [bbox.max_lon, bbox.max_lat]   # Northeast corner
+                    ]
+                }
+            }
+        }
+        
+        # Add additional filters
+        if filters:
+            query.update(filters)
+        
+        return query
+    
+    def _build_projection(self, profile: str) -> Optional[Dict[str, int]]:
+        """MongoDB projection document for a profile (None = all fields)"""
+        fields = projection_fields(profile)
+        if fields is None:
+            return None
+        return {field: 1 for field in fields}
+    
     async def get_stats(self, sector: str) -> Dict[str, Any]:
         """
         Get collection statistics
         
+        Stats are materialized once per collection (see collection_stats)
+        and kept current by imports, so this does not scan the collection.
+        
         Args:
             sector: Infrastructure sector (ignored - collection is sector-specific)
         
@@ -124,70 +286,15 @@ class MongoDBahaSource(InfrastructureDataSource):
             Statistics including total count, component types, geographic bounds
         """
         try:
-            # Total count
-            total_count = await self.collection.count_documents({})
-            
-            # Count by component type
-            pipeline = [
-                {
-                    '$group': {
-                        '_id': '$component_type',
-                        'count': {'$sum': 1}
-                    }
-                },
-                {'$sort': {'count': -1}}
-            ]
-            
-            component_counts = await self.collection.aggregate(pipeline).to_list(length=None)
-            
-            # Geographic bounds (if we want to show coverage area)
-            bounds_pipeline = [
-                {
-                    '$group': {
-                        '_id': None,
-                        'min_lat': {'$min': '$latitude'},
-                        'max_lat': {'$max': '$latitude'},
-                        'min_lon': {'$min': '$longitude'},
-                        'max_lon': {'$max': '$longitude'}
-                    }
-                }
-            ]
-            
-            bounds_result = await self.collection.aggregate(bounds_pipeline).to_list(length=1)
-            bounds = bounds_result[0] if bounds_result else {}
-            
-            # Count by state
-            state_pipeline = [
-                {
-                    '$group': {
-                        '_id': '$state',
-                        'count': {'$sum': 1}
-                    }
-                },
-                {'$sort': {'count': -1}},
-                {'$limit': 10}
-            ]
-            
-            state_counts = await self.collection.aggregate(state_pipeline).to_list(length=10)
+            stats = await get_collection_stats(self.db, self.collection_name)
             
             return {
                 'source': self.source_name,
                 'collection': self.collection_name,
-                'total_assets': total_count,
-                'component_types': {
-                    item['_id']: item['count'] 
-                    for item in component_counts
-                },
-                'geographic_bounds': {
-                    'min_lat': bounds.get('min_lat'),
-                    'max_lat': bounds.get('max_lat'),
-                    'min_lon': bounds.get('min_lon'),
-                    'max_lon': bounds.get('max_lon')
-                },
-                'top_states': {
-                    item['_id']: item['count']
-                    for item in state_counts
-                }
+                'total_assets': stats['total_assets'],
+                'component_types': stats['component_types'],
+                'geographic_bounds': stats['geographic_bounds'],
+                'top_states': dict(list(stats['states'].items())[:10])
             }
             
         except Exception as e:
@@ -255,4 +362,29 @@ class MongoDBahaSource(InfrastructureDataSource):
     async def close(self):
         """Close MongoDB connection"""
         self.client.close()
-        logger.info("MongoDB connection closed")
\ No newline at end of file
+        logger.info("MongoDB connection closed")
+
+
+def _encode_resume_token(last_id: Any) -> str:
+    """Encode the last _id of a page as an opaque resume token"""
+    if isinstance(last_id, ObjectId):
+        return f"oid:{last_id}"
+    return f"str:{last_id}"
+
+
+def _decode_resume_token(token: str) -> Any:
+    """
+    Decode a resume token back to an _id value
+    
+    Raises:
+        ValueError: If the token is malformed
+    """
+    kind, _, value = token.partition(':')
+    if kind == 'oid':
+        try:
+            return ObjectId(value)
+        except InvalidId:
+            pass
+    elif kind == 'str' and value:
+        return value
+    raise ValueError(f"Invalid resume token: {token}")
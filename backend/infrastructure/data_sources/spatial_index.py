@@ -0,0 +1,253 @@
+"""
+Grid Spatial Index
+Uniform lat/lon grid over point data for bounding box, radius and
+nearest-N queries without scanning every row
+
+Points are sorted by grid cell (CSR layout: one offsets array into the
+sorted row positions), so every cell, and every run of adjacent cells in a
+grid row, is a contiguous slice. A bbox query touches only the grid rows
+it overlaps and checks exact coordinates for the candidates in them.
+
+The index is plain numpy arrays: cheap to build once at upload time and
+to persist next to the data (to_arrays / from_arrays).
+"""
+
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Aim for about this many points per occupied cell
+TARGET_POINTS_PER_CELL = 64
+
+# Upper bound on grid edge length (cells) to keep the offsets array small
+MAX_GRID_DIM = 2048
+
+
+class GridIndex:
+    """
+    Uniform grid index over point coordinates
+
+    Query results are row positions into the arrays the index was built
+    from (e.g. DataFrame row numbers).
+    """
+
+    def __init__(
+        self,
+        origin: Tuple[float, float],
+        cell_size: float,
+        shape: Tuple[int, int],
+        offsets: np.ndarray,
+        rows: np.ndarray,
+        lats: np.ndarray,
+        lons: np.ndarray
+    ):
+        """
+        Use GridIndex.build() or GridIndex.from_arrays() instead
+
+        Args:
+            origin: (min_lat, min_lon) of the grid
+            cell_size: Cell edge in degrees
+            shape: (grid rows, grid cols)
+            offsets: Start of each cell in `rows` (length cells + 1)
+            rows: Row positions sorted by cell
+            lats, lons: Coordinates in the same (sorted) order as `rows`
+        """
+        self.origin = origin
+        self.cell_size = cell_size
+        self.shape = shape
+        self.offsets = offsets
+        self.rows = rows
+        self.lats = lats
+        self.lons = lons
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # ---------- construction --------------------------------------------
+    @classmethod
+    def build(cls, lats, lons) -> "GridIndex":
+        """
+        Build an index over coordinate arrays
+
+        Rows with missing or non-finite coordinates are left out.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        positions = np.flatnonzero(np.isfinite(lats) & np.isfinite(lons))
+        lats, lons = lats[positions], lons[positions]
+
+        if len(positions) == 0:
+            return cls((0.0, 0.0), 1.0, (1, 1), np.zeros(2, dtype=np.int64),
+                       positions.astype(np.int64), lats, lons)
+
+        min_lat, min_lon = float(lats.min()), float(lons.min())
+        extent = max(float(lats.max()) - min_lat, float(lons.max()) - min_lon, 1e-6)
+
+        # Square cells sized for ~TARGET_POINTS_PER_CELL points on average
+        cells_per_edge = math.sqrt(max(len(positions) / TARGET_POINTS_PER_CELL, 1))
+        cells_per_edge = min(max(int(math.ceil(cells_per_edge)), 1), MAX_GRID_DIM)
+        cell_size = extent / cells_per_edge
+
+        n_rows = int((float(lats.max()) - min_lat) // cell_size) + 1
+        n_cols = int((float(lons.max()) - min_lon) // cell_size) + 1
+
+        cell_ids = (
+            ((lats - min_lat) // cell_size).astype(np.int64) * n_cols
+            + ((lons - min_lon) // cell_size).astype(np.int64)
+        )
+        order = np.argsort(cell_ids, kind='stable')
+        offsets = np.searchsorted(cell_ids[order], np.arange(n_rows * n_cols + 1))
+
+        return cls(
+            (min_lat, min_lon),
+            cell_size,
+            (n_rows, n_cols),
+            offsets.astype(np.int64),
+            positions[order].astype(np.int64),
+            lats[order],
+            lons[order]
+        )
+
+    # ---------- persistence ---------------------------------------------
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays that fully describe the index (e.g. for np.savez)"""
+        return {
+            'meta': np.array([self.origin[0], self.origin[1], self.cell_size,
+                              self.shape[0], self.shape[1]], dtype=np.float64),
+            'offsets': self.offsets,
+            'rows': self.rows,
+            'lats': self.lats,
+            'lons': self.lons,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "GridIndex":
+        """Inverse of to_arrays()"""
+        meta = arrays['meta']
+        return cls(
+            (float(meta[0]), float(meta[1])),
+            float(meta[2]),
+            (int(meta[3]), int(meta[4])),
+            arrays['offsets'],
+            arrays['rows'],
+            arrays['lats'],
+            arrays['lons']
+        )
+
+    # ---------- queries -------------------------------------------------
+    def query_bbox(
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float
+    ) -> np.ndarray:
+        """Row positions of points inside the box (edges inclusive)"""
+        sorted_idx = self._bbox_candidates(min_lat, max_lat, min_lon, max_lon)
+        if len(sorted_idx) == 0:
+            return sorted_idx
+
+        lats, lons = self.lats[sorted_idx], self.lons[sorted_idx]
+        inside = (
+            (lats >= min_lat) & (lats <= max_lat) &
+            (lons >= min_lon) & (lons <= max_lon)
+        )
+        return np.sort(self.rows[sorted_idx[inside]])
+
+    def query_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Points within a great-circle distance, nearest first
+
+        Returns:
+            (row positions, distances in km)
+        """
+        d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        cos_lat = math.cos(math.radians(min(abs(lat) + d_lat, 90.0)))
+        d_lon = 180.0 if cos_lat < 1e-9 else min(d_lat / cos_lat, 180.0)
+
+        sorted_idx = self._bbox_candidates(lat - d_lat, lat + d_lat, lon - d_lon, lon + d_lon)
+        if len(sorted_idx) == 0:
+            return sorted_idx, np.empty(0)
+
+        dist = haversine_km(lat, lon, self.lats[sorted_idx], self.lons[sorted_idx])
+        keep = dist <= radius_km
+        sorted_idx, dist = sorted_idx[keep], dist[keep]
+
+        order = np.argsort(dist, kind='stable')
+        return self.rows[sorted_idx[order]], dist[order]
+
+    def query_nearest(
+        self,
+        lat: float,
+        lon: float,
+        n: int,
+        max_radius_km: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The n nearest points, nearest first
+
+        Searches a growing radius until it holds n points: once it does,
+        every closer point is inside it, so the result is exact.
+
+        Returns:
+            (row positions, distances in km)
+        """
+        if n <= 0 or len(self) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # Whole-earth distance bounds the search
+        limit = max_radius_km or math.pi * EARTH_RADIUS_KM
+        radius = min(max(self.cell_size * 111.0, 1.0), limit)
+
+        while True:
+            rows, dist = self.query_radius(lat, lon, radius)
+            if len(rows) >= n or radius >= limit:
+                return rows[:n], dist[:n]
+            radius = min(radius * 2, limit)
+
+    # ---------- internals -----------------------------------------------
+    def _bbox_candidates(
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float
+    ) -> np.ndarray:
+        """Positions (into the sorted arrays) of points in overlapping cells"""
+        n_rows, n_cols = self.shape
+        r0 = max(int((min_lat - self.origin[0]) // self.cell_size), 0)
+        r1 = min(int((max_lat - self.origin[0]) // self.cell_size), n_rows - 1)
+        c0 = max(int((min_lon - self.origin[1]) // self.cell_size), 0)
+        c1 = min(int((max_lon - self.origin[1]) // self.cell_size), n_cols - 1)
+
+        if r0 > r1 or c0 > c1:
+            return np.empty(0, dtype=np.int64)
+
+        # Cells c0..c1 of one grid row are one contiguous slice
+        starts = self.offsets[np.arange(r0, r1 + 1) * n_cols + c0]
+        ends = self.offsets[np.arange(r0, r1 + 1) * n_cols + c1 + 1]
+
+        if len(starts) == 1 or (starts[1:] == ends[:-1]).all():
+            return np.arange(starts[0], ends[-1])
+
+        return np.concatenate([np.arange(s, e) for s, e in zip(starts, ends) if e > s] or
+                              [np.empty(0, dtype=np.int64)])
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distance from one point to many, in km"""
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
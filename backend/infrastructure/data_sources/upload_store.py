@@ -0,0 +1,194 @@
+"""
+Custom Upload Store
+Persists custom uploads as Arrow IPC files with a small JSON manifest
+
+Uploads are written uncompressed so reloading memory-maps the file instead
+of parsing it: re-activating a large upload costs little more than opening
+it. The upload's spatial index is saved next to it so it is not rebuilt.
+
+Layout:
+    <root>/manifest.json            # {"uploads": [UploadRecord, ...]}
+    <root>/<file_stem>.arrow        # upload data (Arrow IPC)
+    <root>/<file_stem>.index.npz    # GridIndex arrays
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import polars as pl
+
+from .spatial_index import GridIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UploadRecord:
+    """Manifest entry for one persisted upload"""
+    upload_id: str
+    filename: str
+    uploaded_at: str
+    row_count: int
+    columns: List[str] = field(default_factory=list)
+    file_stem: str = ""
+
+
+class UploadStore:
+    """Reads and writes persisted custom uploads under a local directory"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._records: Dict[str, UploadRecord] = {}
+        self._manifest_mtime: Optional[float] = None
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / "manifest.json"
+
+    # ---------- reading -------------------------------------------------
+    def records(self) -> Dict[str, UploadRecord]:
+        """Manifest entries by upload_id (re-read when the file changes on disk)"""
+        try:
+            mtime = self.manifest_path.stat().st_mtime
+        except FileNotFoundError:
+            self._records, self._manifest_mtime = {}, None
+            return self._records
+
+        if mtime != self._manifest_mtime:
+            with open(self.manifest_path, "r") as f:
+                raw = json.load(f)
+            self._records = {r["upload_id"]: UploadRecord(**r) for r in raw.get("uploads", [])}
+            self._manifest_mtime = mtime
+
+        return self._records
+
+    def get(self, upload_id: str) -> Optional[UploadRecord]:
+        return self.records().get(upload_id)
+
+    def load(self, upload_id: str) -> Optional[Tuple[UploadRecord, pl.DataFrame, Optional[GridIndex]]]:
+        """
+        Open a persisted upload (memory-mapped)
+
+        Returns:
+            (record, data, spatial index or None if missing), or None if
+            the upload is not in the store
+        """
+        record = self.get(upload_id)
+        if record is None:
+            return None
+
+        # Uncompressed IPC files are memory-mapped by read_ipc by default
+        df = pl.read_ipc(self._data_path(record))
+
+        index = None
+        index_path = self._index_path(record)
+        if index_path.exists():
+            with np.load(index_path) as arrays:
+                index = GridIndex.from_arrays({k: arrays[k] for k in arrays.files})
+
+        return record, df, index
+
+    # ---------- writing -------------------------------------------------
+    def save(
+        self,
+        record: UploadRecord,
+        df: pl.DataFrame,
+        index: Optional[GridIndex] = None
+    ) -> Path:
+        """Write an upload (and its index) and add or replace its manifest entry"""
+        self._prepare(record)
+        path = self._data_path(record)
+        tmp = path.with_suffix(".arrow.tmp")
+        df.write_ipc(tmp, compression="uncompressed")
+        os.replace(tmp, path)
+
+        self._register(record, df)
+        if index is not None:
+            self.save_index(record, index)
+        return path
+
+    def sink(self, record: UploadRecord, lf: pl.LazyFrame) -> pl.DataFrame:
+        """
+        Stream a lazy query straight into the store
+
+        The query runs on polars' streaming engine and is written batch by
+        batch, so it never has to fit in memory.
+
+        Returns:
+            The stored upload, memory-mapped
+        """
+        self._prepare(record)
+        path = self._data_path(record)
+        tmp = path.with_suffix(".arrow.tmp")
+        # sink_ipc spells "uncompressed" as None
+        lf.sink_ipc(tmp, compression=None)
+        os.replace(tmp, path)
+
+        df = pl.read_ipc(path)
+        self._register(record, df)
+        return df
+
+    def save_index(self, record: UploadRecord, index: GridIndex):
+        """Write (or replace) the spatial index of a stored upload"""
+        tmp = self.root / f"{record.file_stem}.index.tmp.npz"
+        np.savez(tmp, **index.to_arrays())
+        os.replace(tmp, self._index_path(record))
+
+    def delete(self, upload_id: str) -> bool:
+        """Remove an upload's files and manifest entry"""
+        record = self.get(upload_id)
+        if record is None:
+            return False
+
+        for path in (self._data_path(record), self._index_path(record)):
+            path.unlink(missing_ok=True)
+
+        records = {k: v for k, v in self.records().items() if k != upload_id}
+        self._write_manifest(records)
+        return True
+
+    # ---------- internals -----------------------------------------------
+    def _prepare(self, record: UploadRecord):
+        self.root.mkdir(parents=True, exist_ok=True)
+        record.file_stem = record.file_stem or _file_stem(record.upload_id)
+
+    def _register(self, record: UploadRecord, df: pl.DataFrame):
+        """Add or replace the manifest entry for written data"""
+        record.row_count = len(df)
+        record.columns = list(df.columns)
+
+        records = dict(self.records())
+        records[record.upload_id] = record
+        self._write_manifest(records)
+
+        logger.info(f"Saved upload {record.upload_id} ({record.row_count} rows) to {self._data_path(record)}")
+
+    def _data_path(self, record: UploadRecord) -> Path:
+        return self.root / f"{record.file_stem}.arrow"
+
+    def _index_path(self, record: UploadRecord) -> Path:
+        return self.root / f"{record.file_stem}.index.npz"
+
+    def _write_manifest(self, records: Dict[str, UploadRecord]):
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"uploads": [asdict(r) for r in records.values()]}, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+        self._records = records
+        self._manifest_mtime = self.manifest_path.stat().st_mtime
+
+
+def _file_stem(upload_id: str) -> str:
+    """Filesystem-safe file name for an upload id"""
+    return re.sub(r"[^A-Za-z0-9_.-]", "-", upload_id)
+
+
+def default_upload_store() -> UploadStore:
+    """Upload store at $CUSTOM_UPLOAD_DIR (default: ./custom_uploads)"""
+    return UploadStore(Path(os.getenv("CUSTOM_UPLOAD_DIR", "custom_uploads")))
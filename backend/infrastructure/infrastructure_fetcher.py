@@ -4,10 +4,13 @@ Main orchestrator for retrieving infrastructure data from any registered source
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import List, Dict, Any, Optional, AsyncIterator
 
 from .data_sources.registry import get_source
 from .data_sources.base import BoundingBox
+from .data_sources.upload_store import default_upload_store
+from .clustering import DEFAULT_CLUSTER_THRESHOLD, cell_size_for_zoom
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +38,10 @@ class InfrastructureFetcher:
         bbox: BoundingBox,
         sector: str,
         source_name: Optional[str] = None,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        projection: str = 'full',
+        page_size: Optional[int] = None,
+        resume_token: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Fetch infrastructure assets from specified or default source
@@ -45,6 +51,9 @@ class InfrastructureFetcher:
             sector: Infrastructure sector (e.g., "Energy Grid")
             source_name: Which source to use (defaults to default_source)
             filters: Additional query filters
+            projection: Projection profile ('marker', 'summary', 'full')
+            page_size: If set, return a single page of at most this many assets
+            resume_token: Token from the previous page's 'next_token'
         
         Returns:
             Dictionary containing:
@@ -52,6 +61,7 @@ class InfrastructureFetcher:
                 - source: Name of data source used
                 - bbox: Bounding box queried
                 - count: Number of assets returned
+                - next_token: Resume token for the next page (None if done)
                 - stats: Additional metadata
         """
         # Determine which source to use
@@ -69,10 +79,24 @@ class InfrastructureFetcher:
             logger.info(f"Fetching from {source.source_name} for sector={sector}")
             
             # Fetch data
-            assets = await source.fetch(bbox, sector, filters)
+            next_token = None
+            if page_size:
+                page = await source.fetch_page(
+                    bbox, sector, filters,
+                    projection=projection,
+                    page_size=page_size,
+                    resume_token=resume_token
+                )
+                assets, next_token = page['assets'], page['next_token']
+            elif projection != 'full':
+                assets = [
+                    asset async for asset in source.iter_assets(bbox, sector, filters, projection)
+                ]
+            else:
+                assets = await source.fetch(bbox, sector, filters)
             
-            # Get source stats
-            stats = await source.get_stats(sector)
+            # Get source stats (first page only when paginating)
+            stats = await source.get_stats(sector) if not resume_token else {}
             
             result = {
                 'infrastructure': assets,
@@ -85,6 +109,8 @@ class InfrastructureFetcher:
                     'max_lon': bbox.max_lon
                 },
                 'count': len(assets),
+                'next_token': next_token,
+                'projection': projection,
                 'sector': sector,
                 'filters_applied': filters or {},
                 'stats': stats
@@ -98,6 +124,124 @@ class InfrastructureFetcher:
             logger.error(f"Error fetching infrastructure from {source_name}: {e}")
             raise
     
+    async def stream_infrastructure(
+        self,
+        bbox: BoundingBox,
+        sector: str,
+        source_name: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        projection: str = 'full',
+        batch_size: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream infrastructure assets one at a time from the source
+        
+        Args:
+            bbox: Geographic bounding box to query
+            sector: Infrastructure sector
+            source_name: Which source to use (defaults to default_source)
+            filters: Additional query filters
+            projection: Projection profile ('marker', 'summary', 'full')
+            batch_size: Documents per round trip to the source
+        
+        Yields:
+            Raw asset dictionaries
+        """
+        source_name = source_name or self.default_source
+        source = get_source(source_name)
+        self._active_source = source
+        
+        if not await source.validate_connection():
+            raise ConnectionError(f"Cannot connect to {source.source_name}")
+        
+        logger.info(f"Streaming from {source.source_name} for sector={sector} ({projection})")
+        
+        async for asset in source.iter_assets(bbox, sector, filters, projection, batch_size):
+            yield asset
+    
+    async def fetch_clusters(
+        self,
+        bbox: BoundingBox,
+        sector: str,
+        zoom: int,
+        source_name: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        threshold: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch zoom-dependent clusters when the bbox is too dense for assets
+        
+        Args:
+            bbox: Geographic bounding box to query
+            sector: Infrastructure sector
+            zoom: Web-map zoom level the bbox is viewed at
+            source_name: Which source to use (defaults to default_source)
+            filters: Additional query filters
+            threshold: Return None (individual assets) at or below this many
+                assets (defaults to DEFAULT_CLUSTER_THRESHOLD)
+        
+        Returns:
+            Dictionary with 'clusters', 'count' (assets), 'cell_size' and
+            'zoom', or None if the caller should fetch individual assets
+        """
+        source_name = source_name or self.default_source
+        threshold = threshold or DEFAULT_CLUSTER_THRESHOLD
+        
+        try:
+            source = get_source(source_name)
+            self._active_source = source
+            
+            if not await source.validate_connection():
+                raise ConnectionError(f"Cannot connect to {source.source_name}")
+            
+            # Only need to know whether the bbox exceeds the threshold
+            count = await source.count_assets(bbox, sector, filters, limit=threshold + 1)
+            if count <= threshold:
+                return None
+            
+            cell_size = cell_size_for_zoom(zoom)
+            clusters = await source.cluster_assets(bbox, sector, cell_size, filters)
+            
+            logger.info(f"Returning {len(clusters)} clusters at zoom {zoom} from {source.source_name}")
+            
+            return {
+                'clusters': clusters,
+                'count': sum(c['count'] for c in clusters),
+                'cell_size': cell_size,
+                'zoom': zoom,
+                'source': source.source_name,
+                'source_type': source_name,
+                'sector': sector
+            }
+            
+        except Exception as e:
+            logger.error(f"Error clustering infrastructure from {source_name}: {e}")
+            raise
+    
+    async def get_stats(
+        self,
+        sector: str,
+        source_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get source statistics without fetching any assets
+        
+        Args:
+            sector: Infrastructure sector
+            source_name: Which source to query (defaults to default_source)
+        
+        Returns:
+            Statistics dictionary from the source
+        """
+        source_name = source_name or self.default_source
+        
+        try:
+            source = get_source(source_name)
+            return await source.get_stats(sector)
+        except Exception as e:
+            logger.error(f"Error getting stats from {source_name}: {e}")
+            raise
+    
     async def fetch_by_uuid(
         self,
         uuid: str,
@@ -131,6 +275,44 @@ class InfrastructureFetcher:
             logger.error(f"Error fetching asset {uuid}: {e}")
             raise
     
+    async def fetch_nearby(
+        self,
+        lat: float,
+        lon: float,
+        n: int = 10,
+        radius_km: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch assets near a point from the active source
+        
+        Args:
+            lat, lon: Query point
+            n: Number of nearest assets (ignored when radius_km is set)
+            radius_km: Return every asset within this radius instead
+        
+        Returns:
+            Asset dictionaries, nearest first, each with 'distance_km'
+        """
+        source = self._active_source or get_source(self.default_source)
+        
+        try:
+            # Check if source supports proximity queries
+            if not hasattr(source, 'fetch_nearest'):
+                logger.warning(f"{source.source_name} does not support proximity queries")
+                return []
+            
+            if radius_km is not None:
+                assets = await source.fetch_within_radius(lat, lon, radius_km)
+            else:
+                assets = await source.fetch_nearest(lat, lon, n)
+            
+            logger.info(f"Found {len(assets)} assets near ({lat}, {lon})")
+            return assets
+            
+        except Exception as e:
+            logger.error(f"Error fetching assets near ({lat}, {lon}): {e}")
+            raise
+    
     async def search_by_name(
         self,
         name: str,
@@ -217,20 +399,14 @@ class InfrastructureFetcher:
             file_content: Raw file bytes
             filename: Original filename
             persist_to_mongo: Whether to save to MongoDB
-            persist_to_cache: Whether to save to cache
+            persist_to_cache: Whether to save to the upload store
             required_columns: Required column names
         
         Returns:
             Upload result with upload_id, stats, and any errors
         """
         try:
-            # Get or create custom upload source
-            config = {
-                'persist_to_mongo': persist_to_mongo,
-                'cache_manager': self._get_cache_manager() if persist_to_cache else None
-            }
-            
-            source = get_source('custom_upload', config=config)
+            source = self._custom_upload_source(persist_to_mongo, persist_to_cache)
             
             # Load the file
             result = await source.load_file(
@@ -240,14 +416,47 @@ class InfrastructureFetcher:
                 persist=persist_to_cache or persist_to_mongo
             )
             
-            if result['success']:
-                # Switch to this custom upload as active source
-                self._active_source = source
-                self.default_source = 'custom_upload'
-                
-                logger.info(f"Custom upload successful: {result['upload_id']}")
+            return self._activate_custom_upload(source, result)
             
-            return result
+        except Exception as e:
+            logger.error(f"Error uploading custom file: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def upload_custom_path(
+        self,
+        file_path: Path,
+        filename: str,
+        persist_to_mongo: bool = False,
+        persist_to_cache: bool = True,
+        required_columns: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Handle custom file upload spooled to disk (streams CSV files)
+        
+        Args:
+            file_path: Path of the spooled upload
+            filename: Original filename
+            persist_to_mongo: Whether to save to MongoDB
+            persist_to_cache: Whether to save to the upload store
+            required_columns: Required column names
+        
+        Returns:
+            Upload result with upload_id, stats, and any errors
+        """
+        try:
+            source = self._custom_upload_source(persist_to_mongo, persist_to_cache)
+            
+            result = await source.load_path(
+                file_path,
+                filename,
+                required_columns=required_columns,
+                persist=persist_to_cache or persist_to_mongo
+            )
+            
+            return self._activate_custom_upload(source, result)
             
         except Exception as e:
             logger.error(f"Error uploading custom file: {e}")
@@ -256,6 +465,25 @@ class InfrastructureFetcher:
                 'error': str(e)
             }
     
+    def _custom_upload_source(self, persist_to_mongo: bool, persist_to_cache: bool):
+        """Create a custom upload source for a new upload"""
+        config = {
+            'persist_to_mongo': persist_to_mongo,
+            'upload_store': default_upload_store() if persist_to_cache else None,
+            'cache_manager': self._get_cache_manager()
+        }
+        return get_source('custom_upload', config=config)
+    
+    def _activate_custom_upload(self, source, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Switch to a successfully loaded custom upload as active source"""
+        if result['success']:
+            self._active_source = source
+            self.default_source = 'custom_upload'
+            
+            logger.info(f"Custom upload successful: {result['upload_id']}")
+        
+        return result
+    
     def _get_cache_manager(self):
         """Get cache manager instance (imported from app context)"""
         try:
@@ -4,7 +4,7 @@ Formats raw infrastructure data for frontend visualization and analysis
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +53,59 @@ def prepare_for_frontend(
         raise
 
 
+async def prepare_asset_stream(
+    assets: AsyncIterator[Dict[str, Any]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Prepare assets one at a time as they arrive from the source
+    
+    Args:
+        assets: Async iterator of raw asset dictionaries
+    
+    Yields:
+        Assets formatted like prepare_for_frontend()['infrastructure'] items
+    """
+    async for asset in assets:
+        prepared = _prepare_single_asset(asset)
+        if prepared:
+            yield prepared
+
+
+def prepare_clusters_for_frontend(
+    clustered: Dict[str, Any],
+    bbox: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Prepare clustered infrastructure for frontend consumption
+    
+    Args:
+        clustered: Result of InfrastructureFetcher.fetch_clusters()
+        bbox: Bounding box used for query
+    
+    Returns:
+        Response with 'mode': 'clusters', the cluster list and the
+        component type totals across all clusters
+    """
+    component_types: Dict[str, int] = {}
+    for cluster in clustered['clusters']:
+        for comp_type, count in cluster['component_types'].items():
+            component_types[comp_type] = component_types.get(comp_type, 0) + count
+    
+    return {
+        'mode': 'clusters',
+        'clusters': clustered['clusters'],
+        'cluster_count': len(clustered['clusters']),
+        'count': clustered['count'],
+        'bounding_box': bbox,
+        'source': clustered.get('source', 'Unknown'),
+        'metadata': {
+            'component_types': component_types,
+            'zoom': clustered['zoom'],
+            'cell_size_deg': clustered['cell_size'],
+        }
+    }
+
+
 def _prepare_single_asset(asset: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Prepare single asset for frontend"""
     try:
@@ -3,14 +3,19 @@ Infrastructure Router
 FastAPI endpoints for infrastructure data retrieval and management
 """
 
+import json
 import logging
+import tempfile
+from pathlib import Path
 from typing import Optional
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from .infrastructure_fetcher import InfrastructureFetcher
 from .infrastructure_preparers import (
     prepare_for_frontend,
+    prepare_asset_stream,
+    prepare_clusters_for_frontend,
     prepare_upload_response,
     prepare_stats_response
 )
@@ -24,6 +29,9 @@ router = APIRouter(prefix="/api", tags=["infrastructure"])
 # Initialize fetcher (will use configured default source)
 fetcher = InfrastructureFetcher(default_source='mongodb_aha')
 
+# Bytes read from an upload per chunk while spooling it to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 @router.post("/get-infrastructure")
 async def get_infrastructure(req: InfrastructureRequest):
@@ -32,74 +40,152 @@ async def get_infrastructure(req: InfrastructureRequest):
     Filtered by bounding box and sector
     
     This endpoint uses MongoDB as the data source (AHA Core workflow)
+    
+    With 'zoom' set (and no page_size), dense regions come back as grid
+    clusters ('mode': 'clusters') with counts and component-type
+    histograms; individual assets ('mode': 'assets') are only returned
+    once the bbox holds at most 'cluster_threshold' assets.
     """
     try:
         logger.info(f"Infrastructure request: sector={req.sector}, hazard={req.hazard}")
         
-        # Build bounding box from request or climate cache
-        bbox = None
-        use_explicit_bounds = all(
-            v is not None 
-            for v in [req.min_lat, req.max_lat, req.min_lon, req.max_lon]
-        )
+        bbox = _resolve_bbox(req)
+        bbox_dict = {
+            'min_lat': bbox.min_lat,
+            'max_lat': bbox.max_lat,
+            'min_lon': bbox.min_lon,
+            'max_lon': bbox.max_lon
+        }
         
-        if use_explicit_bounds:
-            bbox = BoundingBox(
-                min_lat=req.min_lat,
-                max_lat=req.max_lat,
-                min_lon=req.min_lon,
-                max_lon=req.max_lon
-            )
-        else:
-            # Try to get from cached climate data
-            from cache_manager import cache
-            prepared_data = cache.get("prepared", (req.hazard,))
-            
-            if not prepared_data or "bounding_box" not in prepared_data:
-                raise HTTPException(
-                    status_code=400,
-                    detail="No bounding box provided and no climate data cached. "
-                           "Either provide explicit bounds or run /api/get-climate first."
-                )
-            
-            bbox_dict = prepared_data["bounding_box"]
-            bbox = BoundingBox(
-                min_lat=bbox_dict["min_lat"],
-                max_lat=bbox_dict["max_lat"],
-                min_lon=bbox_dict["min_lon"],
-                max_lon=bbox_dict["max_lon"]
+        # Zoom-aware mode: clusters until the bbox is sparse enough for assets
+        if req.zoom is not None and not req.page_size:
+            clustered = await fetcher.fetch_clusters(
+                bbox=bbox,
+                sector=req.sector,
+                zoom=req.zoom,
+                source_name='mongodb_aha',
+                threshold=req.cluster_threshold
             )
+            if clustered is not None:
+                prepared = prepare_clusters_for_frontend(clustered, bbox=bbox_dict)
+                logger.info(f"Returning {prepared['cluster_count']} clusters for {prepared['count']} assets")
+                return JSONResponse(content=prepared)
         
         # Fetch from MongoDB AHA source
         result = await fetcher.fetch_infrastructure(
             bbox=bbox,
             sector=req.sector,
-            source_name='mongodb_aha'  # Explicitly use MongoDB
+            source_name='mongodb_aha',  # Explicitly use MongoDB
+            projection=req.projection,
+            page_size=req.page_size,
+            resume_token=req.resume_token
         )
         
         # Prepare for frontend
         prepared = prepare_for_frontend(
             assets=result['infrastructure'],
-            bbox={
-                'min_lat': bbox.min_lat,
-                'max_lat': bbox.max_lat,
-                'min_lon': bbox.min_lon,
-                'max_lon': bbox.max_lon
-            },
+            bbox=bbox_dict,
             source_info=result
         )
         
+        prepared['mode'] = 'assets'
+        prepared['next_token'] = result.get('next_token')
+        
         logger.info(f"Returning {prepared['count']} infrastructure assets")
         
         return JSONResponse(content=prepared)
         
     except HTTPException:
         raise
+    except ValueError as e:
+        # Bad projection profile or resume token
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_infrastructure: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/get-infrastructure/stream")
+async def stream_infrastructure(req: InfrastructureRequest):
+    """
+    Streaming variant of /get-infrastructure
+    
+    Responds with NDJSON: a "header" record, one "asset" record per asset as
+    it comes off the database cursor, and a final "end" record with the count.
+    Pagination fields on the request are ignored.
+    """
+    bbox = _resolve_bbox(req)
+    bbox_dict = {
+        'min_lat': bbox.min_lat,
+        'max_lat': bbox.max_lat,
+        'min_lon': bbox.min_lon,
+        'max_lon': bbox.max_lon
+    }
+    
+    async def records():
+        yield {'type': 'header', 'bounding_box': bbox_dict, 'projection': req.projection}
+        
+        count = 0
+        assets = fetcher.stream_infrastructure(
+            bbox=bbox,
+            sector=req.sector,
+            source_name='mongodb_aha',
+            projection=req.projection
+        )
+        try:
+            async for asset in prepare_asset_stream(assets):
+                count += 1
+                yield {'type': 'asset', 'asset': asset}
+        except Exception as e:
+            logger.error(f"Error streaming infrastructure: {e}")
+            yield {'type': 'error', 'detail': str(e)}
+            return
+        
+        logger.info(f"Streamed {count} infrastructure assets")
+        yield {'type': 'end', 'count': count}
+    
+    async def encode():
+        async for record in records():
+            yield (json.dumps(record, default=str, separators=(",", ":")) + "\n").encode("utf-8")
+    
+    return StreamingResponse(encode(), media_type="application/x-ndjson")
+
+
+def _resolve_bbox(req: InfrastructureRequest) -> BoundingBox:
+    """Bounding box from the request, or from cached climate data"""
+    use_explicit_bounds = all(
+        v is not None 
+        for v in [req.min_lat, req.max_lat, req.min_lon, req.max_lon]
+    )
+    
+    if use_explicit_bounds:
+        return BoundingBox(
+            min_lat=req.min_lat,
+            max_lat=req.max_lat,
+            min_lon=req.min_lon,
+            max_lon=req.max_lon
+        )
+    
+    # Try to get from cached climate data
+    from cache_manager import cache
+    prepared_data = cache.get("prepared", (req.hazard,))
+    
+    if not prepared_data or "bounding_box" not in prepared_data:
+        raise HTTPException(
+            status_code=400,
+            detail="No bounding box provided and no climate data cached. "
+                   "Either provide explicit bounds or run /api/get-climate first."
+        )
+    
+    bbox_dict = prepared_data["bounding_box"]
+    return BoundingBox(
+        min_lat=bbox_dict["min_lat"],
+        max_lat=bbox_dict["max_lat"],
+        min_lon=bbox_dict["min_lon"],
+        max_lon=bbox_dict["max_lon"]
+    )
+
+
 @router.post("/upload")
 async def upload_custom_infrastructure(
     file: UploadFile = File(...),
@@ -124,15 +210,16 @@ async def upload_custom_infrastructure(
     Returns:
         Upload result with preview and filtered assets
     """
+    file_path = None
     try:
         logger.info(f"Custom upload: {file.filename}")
         
-        # Read file content
-        file_content = await file.read()
+        # Spool to disk in chunks; CSVs are then streamed, never read whole
+        file_path = await _spool_upload(file)
         
         # Upload via fetcher
-        upload_result = await fetcher.upload_custom_file(
-            file_content=file_content,
+        upload_result = await fetcher.upload_custom_path(
+            file_path=file_path,
             filename=file.filename,
             persist_to_mongo=persist_to_mongo,
             persist_to_cache=persist_to_cache,
@@ -177,6 +264,20 @@ async def upload_custom_infrastructure(
     except Exception as e:
         logger.error(f"Error uploading file: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if file_path is not None:
+            file_path.unlink(missing_ok=True)
+
+
+async def _spool_upload(file: UploadFile) -> Path:
+    """Copy an upload to a temporary file in UPLOAD_CHUNK_SIZE chunks"""
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename or '').suffix)
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            tmp.write(chunk)
+    finally:
+        tmp.close()
+    return Path(tmp.name)
 
 
 @router.get("/infrastructure-stats/{sector}")
@@ -195,14 +296,7 @@ async def get_infrastructure_stats(
         Statistics including total count, component types, geographic coverage
     """
     try:
-        # Use current fetcher's active source or specify one
-        result = await fetcher.fetch_infrastructure(
-            bbox=BoundingBox(min_lat=-90, max_lat=90, min_lon=-180, max_lon=180),
-            sector=sector,
-            source_name=source
-        )
-        
-        stats = result.get('stats', {})
+        stats = await fetcher.get_stats(sector, source_name=source)
         
         response = prepare_stats_response(stats)
         
@@ -243,6 +337,37 @@ async def get_infrastructure_by_uuid(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/infrastructure-nearby")
+async def get_infrastructure_nearby(
+    lat: float,
+    lon: float,
+    n: int = 10,
+    radius_km: Optional[float] = None
+):
+    """
+    Get assets of the active custom upload near a point
+    
+    Args:
+        lat, lon: Query point
+        n: Number of nearest assets to return
+        radius_km: Return every asset within this radius instead of n nearest
+    
+    Returns:
+        Assets nearest first, each with 'distance_km'
+    """
+    try:
+        assets = await fetcher.fetch_nearby(lat, lon, n=n, radius_km=radius_km)
+        
+        return JSONResponse(content={
+            'infrastructure': assets,
+            'count': len(assets)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error fetching nearby assets: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/infrastructure-sources")
 async def list_infrastructure_sources():
     """
@@ -0,0 +1,112 @@
+"""
+Bulk Writes Test - Batching, key collapsing and error counting in bulk_writes
+Uses an in-memory stand-in for an async (Motor) collection
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from bson import encode
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+
+# Add backend root to path
+# tests/ -> infrastructure/ -> backend/ (need to go up 2 levels)
+backend_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_root))
+
+import bulk_writes
+from bulk_writes import bulk_replace, bulk_write
+
+
+class FakeCollection:
+    """Applies ReplaceOne batches to a dict; documents with fail=True are rejected"""
+
+    name = "fake"
+
+    def __init__(self):
+        self.docs = {}
+        self.batches = []
+
+    async def bulk_write(self, batch, ordered=True):
+        assert ordered is False
+        self.batches.append(batch)
+        details = {"nUpserted": 0, "nMatched": 0, "nModified": 0, "upserted": [], "writeErrors": []}
+        for index, op in enumerate(batch):
+            key, doc = tuple(sorted(op._filter.items())), op._doc
+            if doc.get("fail"):
+                details["writeErrors"].append({"index": index, "code": 11000, "errmsg": f"E11000 {doc['_id']}"})
+            elif key in self.docs:
+                details["nMatched"] += 1
+                details["nModified"] += self.docs[key] != doc
+                self.docs[key] = doc
+            elif op._upsert:
+                details["nUpserted"] += 1
+                details["upserted"].append({"index": index, "_id": doc["_id"]})
+                self.docs[key] = doc
+        if details["writeErrors"]:
+            raise BulkWriteError(details)
+        return SimpleNamespace(bulk_api_result=details)
+
+
+def _doc(i, **extra):
+    return {"_id": f"id{i}", "uuid": f"u{i}", "payload": "x" * 100, **extra}
+
+
+def test_batches_split_at_byte_limit():
+    docs = [_doc(i) for i in range(10)]
+    op_bytes = bulk_writes._op_size(ReplaceOne({"uuid": "u0"}, docs[0]))
+    assert op_bytes == len(encode({"uuid": "u0"})) + len(encode(docs[0]))
+
+    collection = FakeCollection()
+    # Room for three operations per batch, not four
+    batch_mb = (3.5 * op_bytes) / (1024 * 1024)
+    operations = [ReplaceOne({"uuid": d["uuid"]}, d, upsert=True) for d in docs]
+    stats = asyncio.run(bulk_write(collection, operations, batch_rows=100, batch_mb=batch_mb))
+
+    assert [len(b) for b in collection.batches] == [3, 3, 3, 1]
+    assert stats.batches == 4
+    assert stats.upserted == 10
+    assert stats.upserted_ids == [d["_id"] for d in docs]
+
+
+def test_batches_split_at_row_limit():
+    collection = FakeCollection()
+    operations = [ReplaceOne({"uuid": f"u{i}"}, _doc(i), upsert=True) for i in range(5)]
+    asyncio.run(bulk_write(collection, operations, batch_rows=2))
+
+    assert [len(b) for b in collection.batches] == [2, 2, 1]
+
+
+def test_replace_collapses_duplicate_keys():
+    collection = FakeCollection()
+    collection.docs[(("uuid", "u1"),)] = _doc(1)
+    collection.docs[(("uuid", "u2"),)] = _doc(2)
+
+    docs = [_doc(0), _doc(1), _doc(0, payload="second"), _doc(2, payload="changed"), _doc(0, payload="last")]
+    stats = asyncio.run(bulk_replace(collection, docs, key=("uuid",)))
+
+    assert stats.collapsed == 2
+    assert stats.upserted == 1 and stats.upserted_ids == ["id0"]
+    assert stats.matched == 2 and stats.modified == 1 and stats.unchanged == 1
+    # One operation per key, the last document wins
+    assert [op._filter for op in collection.batches[0]] == [{"uuid": "u0"}, {"uuid": "u1"}, {"uuid": "u2"}]
+    assert collection.docs[(("uuid", "u0"),)]["payload"] == "last"
+
+
+def test_write_errors_are_counted(monkeypatch):
+    monkeypatch.setattr(bulk_writes, "BULK_WRITE_ERRORS_KEPT", 3)
+    collection = FakeCollection()
+    docs = [_doc(i, fail=i % 2 == 1) for i in range(10)]
+
+    stats = asyncio.run(bulk_replace(collection, docs, key=("uuid",), batch_rows=4))
+
+    # Unordered: the rest of a failing batch is still written
+    assert stats.batches == 3
+    assert stats.failed == 5
+    assert stats.failed_batches == 3
+    assert stats.upserted == 5
+    assert stats.upserted_ids == ["id0", "id2", "id4", "id6", "id8"]
+    assert stats.errors == ["E11000 id1", "E11000 id3", "E11000 id5"]
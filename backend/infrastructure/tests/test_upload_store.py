@@ -0,0 +1,49 @@
+"""
+Upload Store Test - Round-trips uploads through the Arrow IPC store
+Uses real polars frames and lazy queries in a temporary directory
+"""
+
+import sys
+from pathlib import Path
+
+import polars as pl
+
+# Add backend root to path
+# tests/ -> infrastructure/ -> backend/ (need to go up 2 levels)
+backend_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_root))
+
+from infrastructure.data_sources.upload_store import UploadStore, UploadRecord
+
+
+def _record(upload_id: str) -> UploadRecord:
+    return UploadRecord(upload_id=upload_id, filename="assets.csv", uploaded_at="2024-01-01T00:00:00", row_count=0)
+
+
+def test_sink_streams_lazy_query(tmp_path):
+    csv = tmp_path / "assets.csv"
+    csv.write_text("name,latitude,longitude\na,29.7,-95.3\nb,30.2,-97.7\nc,,\n")
+
+    store = UploadStore(tmp_path / "store")
+    lf = pl.scan_csv(csv).filter(pl.col("latitude").is_not_null())
+    df = store.sink(_record("upload/1"), lf)
+
+    assert df["name"].to_list() == ["a", "b"]
+    assert store.get("upload/1").row_count == 2
+    assert store.get("upload/1").columns == ["name", "latitude", "longitude"]
+
+    # A fresh store reads the manifest and data back from disk
+    record, loaded, index = UploadStore(tmp_path / "store").load("upload/1")
+    assert record.file_stem == "upload-1"
+    assert loaded.equals(df)
+    assert index is None
+
+
+def test_save_and_delete(tmp_path):
+    store = UploadStore(tmp_path)
+    store.save(_record("u1"), pl.DataFrame({"latitude": [1.0], "longitude": [2.0]}))
+
+    assert store.load("u1")[1].shape == (1, 2)
+    assert store.delete("u1")
+    assert store.load("u1") is None
+    assert not list(tmp_path.glob("*.arrow"))
@@ -0,0 +1,198 @@
+# jobs.py
+"""
+Background jobs with stage-level progress published over PubSub.
+
+A job runs an async callable in the background and returns its id
+immediately. Each stage the callable reports (fetch, aggregation, ...) is
+published to the topic ``jobs/<job_id>`` on the websocket PubSub endpoint,
+with its duration and, when known, a byte count. On completion the
+serialized result is stored in the cache and the final event carries a
+result handle (the URL to download it from).
+
+Usage
+-----
+async def run(progress: JobProgress):
+    with progress.stage("fetch") as st:
+        data = await run_in_threadpool(fetch)
+        st["bytes"] = data.nbytes
+    with progress.stage("serialization") as st:
+        payload = json.dumps(data).encode()
+        st["bytes"] = len(payload)
+    return payload
+
+job_id = jobs.submit("climate", run)
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from cache_manager import cache
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for status lookups before the oldest are dropped
+MAX_FINISHED_JOBS = 200
+
+
+def job_topic(job_id: str) -> str:
+    """PubSub topic a job publishes its events to"""
+    return f"jobs/{job_id}"
+
+
+@dataclass
+class JobRecord:
+    """Status of a background job"""
+    job_id: str
+    kind: str
+    status: str = "pending"                 # pending | running | done | failed
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    stages: List[Dict[str, Any]] = field(default_factory=list)
+    result_url: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["topic"] = job_topic(self.job_id)
+        return data
+
+
+class JobProgress:
+    """
+    Stage reporter handed to a job callable.
+
+    Safe to use from worker threads (e.g. inside run_in_threadpool): events
+    are queued on the event loop and published in order.
+    """
+
+    def __init__(self, record: JobRecord, loop: asyncio.AbstractEventLoop):
+        self._record = record
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time a stage and publish start/end events.
+
+        Yields a dict; set ``bytes`` (or any other JSON-safe key) on it to
+        include it in the end event.
+        """
+        info: Dict[str, Any] = {"stage": name}
+        self.publish({"event": "stage_started", "stage": name})
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            info["duration_s"] = round(time.perf_counter() - start, 3)
+            self._record.stages.append(info)
+            self.publish({"event": "stage_finished", **info})
+
+    def publish(self, data: Optional[Dict[str, Any]]) -> None:
+        """Queue an event for this job's topic (None closes the queue)"""
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, data)
+
+
+class JobManager:
+    """Tracks background jobs and publishes their progress"""
+
+    def __init__(self):
+        self.jobs: "OrderedDict[str, JobRecord]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._endpoint = None
+
+    def set_publisher(self, endpoint) -> None:
+        """Attach the PubSubEndpoint events are published through"""
+        self._endpoint = endpoint
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        return self.jobs.get(job_id)
+
+    def get_result(self, job_id: str) -> Optional[bytes]:
+        """Serialized result of a finished job, or None"""
+        return cache.get("job_result", (job_id,))
+
+    def submit(
+        self,
+        kind: str,
+        func: Callable[[JobProgress], Awaitable[bytes]],
+    ) -> str:
+        """
+        Start a job in the background and return its id.
+
+        Args:
+            kind: Short label ("climate", "fragility", ...)
+            func: Async callable taking a JobProgress and returning the
+                serialized (JSON) result as bytes
+
+        Returns:
+            Job id; progress is published on job_topic(job_id)
+        """
+        record = JobRecord(job_id=uuid.uuid4().hex, kind=kind)
+        self.jobs[record.job_id] = record
+        self._trim()
+
+        loop = asyncio.get_running_loop()
+        progress = JobProgress(record, loop)
+        self._tasks[record.job_id] = loop.create_task(self._run(record, func, progress))
+
+        logger.info(f"Submitted {kind} job {record.job_id}")
+        return record.job_id
+
+    # ---------- internals -----------------------------------------------
+    async def _run(self, record: JobRecord, func, progress: JobProgress):
+        publisher = asyncio.create_task(self._drain(record.job_id, progress._queue))
+        record.status = "running"
+        progress.publish({"event": "job_started", "kind": record.kind})
+
+        try:
+            payload = await func(progress)
+            cache.set("job_result", (record.job_id,), payload)
+            record.status = "done"
+            record.result_url = f"/api/jobs/{record.job_id}/result"
+            progress.publish({
+                "event": "job_finished",
+                "result_url": record.result_url,
+                "bytes": len(payload),
+            })
+        except Exception as e:
+            logger.exception(f"Job {record.job_id} failed: {e}")
+            record.status = "failed"
+            record.error = str(e)
+            progress.publish({"event": "job_failed", "error": record.error})
+        finally:
+            record.finished_at = time.time()
+            progress.publish(None)
+            await publisher
+            self._tasks.pop(record.job_id, None)
+
+    async def _drain(self, job_id: str, queue: asyncio.Queue):
+        """Publish queued events for one job in order until the None sentinel"""
+        while True:
+            data = await queue.get()
+            if data is None:
+                return
+            await self._publish(job_id, data)
+
+    async def _publish(self, job_id: str, data: Dict[str, Any]):
+        if self._endpoint is None:
+            return
+        try:
+            await self._endpoint.publish([job_topic(job_id)], {"job_id": job_id, **data})
+        except Exception as e:
+            logger.warning(f"Failed to publish event for job {job_id}: {e}")
+
+    def _trim(self):
+        """Drop the oldest finished jobs (and their stored results) beyond MAX_FINISHED_JOBS"""
+        finished = [j for j, r in self.jobs.items() if r.status in ("done", "failed")]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+            cache.delete("job_result", (job_id,))
+
+
+jobs = JobManager()
@@ -9,11 +9,13 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from collections import defaultdict
+import asyncio
 import logging
 import os
 
 # Routers
 from routers import data_collectors 
+from routers import jobs as jobs_router
 from climate import router as climate_router
 from infrastructure import router as infrastructure_router
 from hbom import router as hbom_router 
@@ -21,6 +23,7 @@ from fragility import router as fragility_router
 from user_asset_import import router as import_router
 from cache_manager import cache
 from database import mongo_uri
+from jobs import jobs
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
@@ -45,7 +48,10 @@ async def lifespan(app):
         'collection': 'energy_grid'
     })
 
+    from infrastructure.data_sources.upload_store import default_upload_store
+    
     configure_source('custom_upload', {
+        'upload_store': default_upload_store(),
         'cache_manager': cache,
         'persist_to_mongo': False,
         'mongo_uri': os.getenv('MONGO_URI', mongo_uri),
@@ -64,9 +70,43 @@ async def lifespan(app):
     
     logger.info("HBOM module configured")
     
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from component_library import watch_component_library
+    from user_asset_import.acclimate.importer import ensure_import_indexes
+    
+    mongo_client = AsyncIOMotorClient(os.getenv('MONGO_URI', mongo_uri))
+    
+    # Indexes for the default import collection (other collections: on first import)
+    try:
+        await ensure_import_indexes(mongo_client['acclimate_db'], 'energy_grid')
+    except Exception as e:
+        logger.warning(f"Could not ensure import indexes at startup: {e}")
+    
+    # Keep the shared component library snapshot and cached HBOM trees fresh
+    from hbom.tree_cache import hbom_tree_cache
+    
+    # Load the local census tract layer and ACS warehouse (if built) before the first AOI request
+    from census_tracts import get_tract_index
+    from census_warehouse import get_acs_warehouse
+    
+    for load_census_data in (get_tract_index, get_acs_warehouse):
+        try:
+            await asyncio.to_thread(load_census_data)
+        except Exception as e:
+            logger.warning(f"Could not load local census data ({load_census_data.__name__}): {e}")
+    
+    library_watcher = asyncio.create_task(watch_component_library(mongo_client['acclimate_db']))
+    hbom_watcher = asyncio.create_task(hbom_tree_cache.watch(mongo_client['acclimate_db']))
+    
     yield  # ----> application runs
     
     # SHUT-DOWN -------------------------------------------------------
+    library_watcher.cancel()
+    hbom_watcher.cancel()
+    
+    from census_client import close_census_client
+    await close_census_client()
+    mongo_client.close()
     items_by_uuid.clear()
     items_by_type.clear()
 
@@ -85,6 +125,7 @@ app.include_router(hbom_router)
 app.include_router(fragility_router)
 app.include_router(import_router)  # User asset import
 app.include_router(data_collectors.router)
+app.include_router(jobs_router.router)
 
 # Configure CORS
 origins = [
@@ -103,9 +144,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Set up PubSub endpoint
+# Set up PubSub endpoint (clients subscribe to jobs/<job_id> for progress)
 pubsub_endpoint = PubSubEndpoint()
-app.mount("/ws", pubsub_endpoint)
+pubsub_endpoint.register_route(app, "/ws")
+jobs.set_publisher(pubsub_endpoint)
 
 @app.get("/")
 async def root():
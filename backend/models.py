@@ -114,6 +114,11 @@ class InfrastructureRequest(BaseModel):
     min_lon: Optional[float] = None
     max_lon: Optional[float] = None
     hazard: str | None = None
+    projection: Literal["marker", "summary", "full"] = Field("full", description="Which asset fields to return")
+    page_size: Optional[int] = Field(None, ge=1, le=50000, description="Return one page of at most this many assets")
+    resume_token: Optional[str] = Field(None, description="next_token from the previous page")
+    zoom: Optional[int] = Field(None, ge=0, le=22, description="Map zoom level; enables server-side clustering")
+    cluster_threshold: Optional[int] = Field(None, ge=1, le=50000, description="Return individual assets at or below this many in the bbox")
 
     class Config:
         from_attributes = True
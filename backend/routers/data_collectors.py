@@ -1,11 +1,16 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import List, Literal
+from typing import List, Literal, Optional
 
 from models import GridBounds
+from cache_manager import cache
+from exposure import compute_exposure
+from infrastructure import BoundingBox, get_source
 from censusData import (
     get_demographics_timeseries_for_bbox,
-    get_demographics_timeseries_with_projection_for_bbox,
+    get_demographics_timeseries_with_projection_for_bbox_async,
     discover_latest_acs5_year,
 )
 
@@ -20,6 +25,8 @@ class CensusRequest(BaseModel):
     method: Literal["cagr", "linear"] = "cagr"
     window: int = 5
     fill: Literal["ffill", "nearest"] = "ffill"
+    # weight tracts by their area share inside the bbox (needs the local tract layer)
+    apportion: bool = False
 
 @router.post("/get-census-population")
 async def get_census_population(req: CensusRequest):
@@ -28,7 +35,7 @@ async def get_census_population(req: CensusRequest):
     The frontend will display Population at the current slider year directly from this series.
     """
     try:
-        demo = get_demographics_timeseries_with_projection_for_bbox(
+        demo = await get_demographics_timeseries_with_projection_for_bbox_async(
             min_lat=req.bbox.min_lat, max_lat=req.bbox.max_lat,
             min_lon=req.bbox.min_lon, max_lon=req.bbox.max_lon,
             years=req.years,
@@ -36,6 +43,7 @@ async def get_census_population(req: CensusRequest):
             project=req.project,
             method=req.method,
             window=req.window,
+            apportion=req.apportion,
         )
         return {
             "aoi_demographics": {
@@ -51,4 +59,54 @@ async def get_census_population(req: CensusRequest):
         raise
     except Exception as e:
         print(f"Error in get_census_population: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get census data")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to get census data")
+
+
+# Request model for the climate x assets x population overlay
+class ExposureRequest(BaseModel):
+    hazard: str
+    threshold: float
+    # defaults to the first variable of the loaded climate data
+    variable: Optional[str] = None
+    sector: str = "Energy Grid"
+    source: str = "mongodb_aha"
+    # subset of the climate years (default: all)
+    years: Optional[List[int]] = None
+
+@router.post("/get-exposure")
+async def get_exposure(req: ExposureRequest):
+    """
+    Per-cell, per-year assets and population exposed to the threshold, joined
+    server-side over the climate grid loaded by /api/get-climate (see exposure.py).
+    """
+    try:
+        prepared_data = cache.get("climate_latest", (req.hazard,))
+        if not prepared_data:
+            raise HTTPException(
+                status_code=400,
+                detail="Climate data not loaded. Call /api/get-climate first."
+            )
+
+        variables = prepared_data.get("variables") or []
+        variable = req.variable or (variables[0] if variables else None)
+        if variable not in variables:
+            raise HTTPException(status_code=422, detail=f"Unknown climate variable: {variable}")
+
+        bbox = BoundingBox(**prepared_data["bounding_box"])
+        source = get_source(req.source)
+        assets = [
+            (a.get("latitude"), a.get("longitude"), a.get("component_type"))
+            async for a in source.iter_assets(bbox, req.sector, projection="marker")
+        ]
+
+        result = await run_in_threadpool(
+            compute_exposure, prepared_data, variable, req.threshold, assets, req.years
+        )
+        result["hazard"] = req.hazard
+        result["sector"] = req.sector
+        return JSONResponse(content=result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in get_exposure: {e}")
+        raise HTTPException(status_code=500, detail="Failed to compute exposure")
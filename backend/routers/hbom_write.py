@@ -3,16 +3,17 @@
 import json
 import datetime
 import io
+import time
 
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
 from fastapi.responses import JSONResponse
 
-from models       import HBOMDefinition, HBOMComponent
+from models       import HBOMDefinition, HBOMComponent, FragilityDetails
 from hbomLoader   import parse_excel, diff, _compute_path, _build_parent_map, DuplicateItem
 from database     import hbom_components, hbom_fragilities, hbom_definitions
 from crud_hbom    import upsert_component, insert_definition
-
-from fuzzywuzzy import fuzz
+from bulk_writes  import bulk_replace
+from hbom.label_duplicates import label_duplicates
 
 router = APIRouter(prefix="/api/hbom", tags=["hbom"])
 
@@ -28,6 +29,69 @@ def _flatten(node: HBOMComponent, parent_uuid: str | None = None):
     for child in node.subcomponents or []:
         yield from _flatten(child, node.uuid)
 
+# ────────────────────────────────────────────────────────────────
+# Existing sector trees, cached per sector.
+# Roots come from our own collections, so models are built without
+# validation. An entry is reused while the definition's root_ids are
+# unchanged, for at most EXISTING_TREE_TTL seconds (other workers may
+# rewrite components); commit_hbom drops its sector's entry.
+EXISTING_TREE_TTL = 60
+
+class _ExistingTree:
+    def __init__(self, sector: str, root_ids: list[str], roots: list[HBOMComponent]):
+        self.root_ids   = root_ids
+        self.loaded_at  = time.monotonic()
+        self.definition = HBOMDefinition.model_construct(sector=sector, components=roots) if roots else None
+
+        # uuid -> node, parent map and flattened (uuid, label, parent_uuid) list
+        self.lookup: dict[str, HBOMComponent] = {}
+        self.nodes:  list[tuple[str, str, str | None]] = []
+        for root in roots:
+            self.nodes.extend(_flatten(root))
+        def index(node: HBOMComponent):
+            self.lookup[node.uuid] = node
+            for ch in node.subcomponents or []:
+                index(ch)
+        for root in roots:
+            index(root)
+        self.parent_map = _build_parent_map(roots) if roots else {}
+
+_existing_trees: dict[str, _ExistingTree] = {}
+
+def _component_from_doc(doc: dict) -> HBOMComponent:
+    """HBOMComponent (and nested subcomponents/hazards) without validation"""
+    fields = {k: v for k, v in doc.items() if k in HBOMComponent.model_fields}
+    fields["hazards"] = {
+        hz: FragilityDetails.model_construct(**det) if isinstance(det, dict) else det
+        for hz, det in (doc.get("hazards") or {}).items()
+    }
+    if doc.get("subcomponents") is not None:
+        fields["subcomponents"] = [_component_from_doc(ch) for ch in doc["subcomponents"]]
+    return HBOMComponent.model_construct(**fields)
+
+async def _root_ids(sector: str) -> list[str]:
+    def_doc = await hbom_definitions.find_one({"sector": sector}, {"root_ids": 1})
+    return list(def_doc.get("root_ids") or []) if def_doc else []
+
+async def _existing_tree(sector: str) -> _ExistingTree:
+    root_ids = await _root_ids(sector)
+
+    cached = _existing_trees.get(sector)
+    if (cached is not None and cached.root_ids == root_ids
+            and time.monotonic() - cached.loaded_at < EXISTING_TREE_TTL):
+        return cached
+
+    # one query for all roots, kept in root_ids order
+    docs_by_uuid: dict[str, dict] = {}
+    if root_ids:
+        async for doc in hbom_components.find({"uuid": {"$in": root_ids}}, {"_id": 0}):
+            docs_by_uuid.setdefault(doc["uuid"], doc)
+    roots = [_component_from_doc(docs_by_uuid[r]) for r in root_ids if r in docs_by_uuid]
+
+    tree = _ExistingTree(sector, root_ids, roots)
+    _existing_trees[sector] = tree
+    return tree
+
 # ────────────────────────────────────────────────────────────────
 # 1) PREVIEW
 # ────────────────────────────────────────────────────────────────
@@ -49,17 +113,9 @@ async def preview_hbom(
     except Exception as e:
         raise HTTPException(400, f"Failed to parse workbook: {e}")
 
-    # ── 1b) load the f root components for THIS sector ────────────────
-    def_doc = await hbom_definitions.find_one({"sector": sector})
-    existing: HBOMDefinition | None = None
-    if def_doc and def_doc.get("root_ids"):
-        roots: list[HBOMComponent] = []
-        for root_uuid in def_doc["root_ids"]:
-            comp_doc = await hbom_components.find_one({"uuid": root_uuid})
-            if comp_doc:
-                roots.append(HBOMComponent(**comp_doc))
-        if roots:
-            existing = HBOMDefinition(sector=sector, components=roots)
+    # ── 1b) load the root components for THIS sector (cached) ─────────
+    existing_tree = await _existing_tree(sector)
+    existing: HBOMDefinition | None = existing_tree.definition
 
     # 2) structural diff
     diff_result = diff(existing, incoming)
@@ -93,43 +149,42 @@ async def preview_hbom(
 
         parent_map_new = _build_parent_map(incoming.components)
 
-        # b) Index every existing node for path computation
-        existing_lookup: dict[str, HBOMComponent] = {}
-        def index_ex(node: HBOMComponent):
-            existing_lookup[node.uuid] = node
-            for ch in node.subcomponents or []:
-                index_ex(ch)
-        for root in existing.components:
-            index_ex(root)
-
-        existing_parent_map = _build_parent_map(existing.components)
+        # b) Existing nodes are indexed with the cached tree
+        existing_lookup     = existing_tree.lookup
+        existing_parent_map = existing_tree.parent_map
 
         # c) Flatten both trees into (uuid, label, parent_uuid) lists
         inc_nodes: list[tuple[str, str, str | None]] = []
         for root in incoming.components:
             inc_nodes.extend(_flatten(root))
 
-        ex_nodes: list[tuple[str, str, str | None]] = []
-        for root in existing.components:
-            ex_nodes.extend(_flatten(root))
-
-        # d) Cross‐compare every incoming label to every existing label
-        for inc_uuid, inc_lbl, _ in inc_nodes:
-            for ex_uuid, ex_lbl, _ in ex_nodes:
-                sim = fuzz.ratio(inc_lbl.lower(), ex_lbl.lower())
-                if sim >= 80:  # your similarity threshold
-                    # compute both paths
-                    incoming_path = _compute_path(inc_uuid, node_lookup, parent_map_new)
-                    existing_path = _compute_path(ex_uuid, existing_lookup, existing_parent_map)
-                    duplicates.append({
-                        "incomingPath":   incoming_path,
-                        "existingPath":   existing_path,
-                        "incomingUuid": inc_uuid,
-                        "originalUuid":   ex_uuid,
-                        "originalLabel":  ex_lbl,
-                        "candidateLabel": inc_lbl,
-                        "similarity":     sim,
-                    })
+        ex_nodes = existing_tree.nodes
+
+        # d) Compare incoming labels to existing labels (candidate pairs only)
+        matches = label_duplicates(
+            [lbl for _, lbl, _ in inc_nodes],
+            [lbl for _, lbl, _ in ex_nodes],
+        )
+
+        # e) Paths, computed once per node
+        incoming_paths: dict[str, str] = {}
+        existing_paths: dict[str, str] = {}
+        for i, j, sim in matches:
+            inc_uuid, inc_lbl, _ = inc_nodes[i]
+            ex_uuid,  ex_lbl,  _ = ex_nodes[j]
+            if inc_uuid not in incoming_paths:
+                incoming_paths[inc_uuid] = _compute_path(inc_uuid, node_lookup, parent_map_new)
+            if ex_uuid not in existing_paths:
+                existing_paths[ex_uuid] = _compute_path(ex_uuid, existing_lookup, existing_parent_map)
+            duplicates.append({
+                "incomingPath":   incoming_paths[inc_uuid],
+                "existingPath":   existing_paths[ex_uuid],
+                "incomingUuid": inc_uuid,
+                "originalUuid":   ex_uuid,
+                "originalLabel":  ex_lbl,
+                "candidateLabel": inc_lbl,
+                "similarity":     sim,
+            })
     catalog_matches: list[dict] = []
     if existing:
         for root in existing.components:
@@ -169,8 +224,7 @@ async def commit_hbom(
     )
 
     # existing roots for this sector (to decide if root is NEW)
-    def_doc = await hbom_definitions.find_one({"sector": sector})
-    existing_root_ids = set(def_doc.get("root_ids", [])) if def_doc else set()
+    existing_root_ids = set(await _root_ids(sector))
 
     # working root
     root = hbom.components[0]
@@ -225,7 +279,8 @@ async def commit_hbom(
             _walk(ch)
     _walk(root)
 
-    # Upsert fragilities using FINAL component UUIDs
+    # Upsert fragilities using FINAL component UUIDs (one bulk write)
+    fragility_docs: list[dict] = []
     for comp_uuid, hazard, details in haz_list_final:
         # normalize field names coming from the parser
         model  = (
@@ -248,14 +303,22 @@ async def commit_hbom(
             "added_by": user,
             "added_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
         }
-        await hbom_fragilities.replace_one(
-            {"component_uuid": comp_uuid, "hazard": hazard},
-            payload,
-            upsert=True,
+        fragility_docs.append(payload)
+
+    frag_stats = await bulk_replace(hbom_fragilities, fragility_docs, key=("component_uuid", "hazard"))
+    if frag_stats.failed:
+        # components are already written: don't serve the stale tree
+        _existing_trees.pop(sector, None)
+        raise HTTPException(
+            500,
+            f"{frag_stats.failed} fragility writes failed: {'; '.join(frag_stats.errors)}"
         )
 
     # 6) add root to definition only if it’s NEW for this sector
     if root.uuid not in existing_root_ids:
         await insert_definition(sector, [root.uuid], added_by=user)
 
+    # components changed: rebuild the sector's tree on next preview
+    _existing_trees.pop(sector, None)
+
     return {"status": "ok", "root_uuid": root.uuid}
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+Status and result endpoints for background jobs (see jobs.py).
+"""
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
+
+from jobs import jobs
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}")
+async def get_job_status(job_id: str):
+    """Job status, per-stage timings and, when done, the result URL"""
+    record = jobs.get(job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return record.to_dict()
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Serialized JSON result of a finished job"""
+    record = jobs.get(job_id)
+    if record is not None and record.status == "failed":
+        raise HTTPException(status_code=500, detail=record.error)
+    if record is not None and record.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {record.status}")
+
+    payload = jobs.get_result(job_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"No result for job: {job_id}")
+    return Response(content=payload, media_type="application/json")
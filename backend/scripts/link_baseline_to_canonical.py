@@ -12,8 +12,11 @@ Usage:
 
 import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
 from datetime import datetime
 from database import mongo_uri
+from baseline_version import bump_baseline_version
+from bulk_writes import bulk_write
 
 DB_NAME = "acclimate_db"
 
@@ -56,6 +59,7 @@ async def link_baseline():
     
     root_stats = {"updated": 0, "skipped": 0}
     root_mapping = {}  # uuid → canonical_component_type
+    root_updates = []
     
     for root in roots:
         label = root['label']
@@ -63,8 +67,8 @@ async def link_baseline():
         if label in canonical_map:
             canonical_type = canonical_map[label]
             
-            # Update this root node
-            await baseline.update_one(
+            # Update this root node (written in bulk below)
+            root_updates.append(UpdateOne(
                 {"uuid": root['uuid']},
                 {
                     "$set": {
@@ -72,7 +76,7 @@ async def link_baseline():
                         "updated_at": datetime.now().isoformat()
                     }
                 }
-            )
+            ))
             
             # Track for child propagation
             root_mapping[root['uuid']] = canonical_type
@@ -83,6 +87,10 @@ async def link_baseline():
             print(f"  SKIP: {label} (not in canonical registry)")
             root_stats["skipped"] += 1
     
+    result = await bulk_write(baseline, root_updates)
+    if result.failed:
+        print(f"  WARNING: {result.failed} root updates failed (first: {result.errors[0]})")
+    
     print(f"\n  Updated {root_stats['updated']} roots")
     print(f"  Skipped {root_stats['skipped']} roots (not canonical)")
     
@@ -111,6 +119,9 @@ async def link_baseline():
     
     print(f"  Updated {child_stats['updated']} child nodes")
     
+    # Cached HBOM trees in running backends pick up the new links
+    await bump_baseline_version(db, reason="link_baseline_to_canonical")
+    
     # Summary
     print("\n" + "=" * 80)
     print("SUMMARY")
@@ -131,19 +142,23 @@ async def link_baseline():
 
 
 async def get_all_descendants(collection, parent_uuid: str) -> list:
-    """Recursively get all descendant UUIDs"""
-    descendants = []
-    
-    cursor = collection.find({"parent_uuid": parent_uuid})
-    children = await cursor.to_list(length=None)
-    
-    for child in children:
-        descendants.append(child['uuid'])
-        # Recurse for grandchildren
-        grandchildren = await get_all_descendants(collection, child['uuid'])
-        descendants.extend(grandchildren)
-    
-    return descendants
+    """All descendant UUIDs, in one $graphLookup round trip"""
+    pipeline = [
+        {"$match": {"uuid": parent_uuid}},
+        {"$limit": 1},
+        {"$graphLookup": {
+            "from": collection.name,
+            "startWith": "$uuid",
+            "connectFromField": "uuid",
+            "connectToField": "parent_uuid",
+            "as": "descendants",
+        }},
+        {"$project": {"_id": 0, "uuids": "$descendants.uuid"}},
+    ]
+    
+    result = await collection.aggregate(pipeline).to_list(length=None)
+    
+    return result[0]["uuids"] if result else []
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Load ACS Warehouse
+Downloads ACS 5-year tract variables (census_warehouse.ACS_VARS) for whole
+states and writes one Parquet file per year to the local warehouse read by
+censusData (see census_warehouse.py).
+
+Usage:
+    python load_acs_warehouse.py <years> [<state FIPS> ...]
+
+    python load_acs_warehouse.py 2018-2023          # every state
+    python load_acs_warehouse.py 2022,2023 48 22    # Texas and Louisiana
+
+Existing years are replaced. Requests run concurrently through the shared
+census client; the API key comes from settings.CENSUS_API_KEY. Files go to
+$CENSUS_WAREHOUSE_DIR (default: ./census_data/acs5). Restart the backend to
+pick them up.
+"""
+
+import sys
+import time
+import asyncio
+
+import pandas as pd
+
+from config import settings
+from census_client import get_census_client
+from census_warehouse import ACS_VARS, WAREHOUSE_DIR, year_path
+
+# States, DC and Puerto Rico
+STATE_FIPS = [
+    "01", "02", "04", "05", "06", "08", "09", "10", "11", "12", "13", "15",
+    "16", "17", "18", "19", "20", "21", "22", "23", "24", "25", "26", "27",
+    "28", "29", "30", "31", "32", "33", "34", "35", "36", "37", "38", "39",
+    "40", "41", "42", "44", "45", "46", "47", "48", "49", "50", "51", "53",
+    "54", "55", "56", "72",
+]
+
+
+def parse_years(spec: str) -> list:
+    """'2018-2023' or '2019,2021'"""
+    years = set()
+    for part in spec.split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            years.update(range(int(start), int(end) + 1))
+        else:
+            years.add(int(part))
+    return sorted(years)
+
+
+async def fetch_state(client, year: int, state: str):
+    """One state's tract rows for a year (None on failure)"""
+    resp = await client.get_json(
+        client.acs_endpoint_template.format(year=year),
+        {
+            "get": ",".join(ACS_VARS),
+            "for": "tract:*",
+            "in": f"state:{state} county:*",
+            "key": settings.CENSUS_API_KEY,
+        },
+        timeout=120,
+    )
+    if not resp.ok or len(resp.data) < 2:
+        print(f"   ⚠️ {year} state {state}: {resp.status} {resp.text[:120]}")
+        return None
+
+    df = pd.DataFrame(resp.data[1:], columns=resp.data[0])
+    df["tract_id"] = (
+        df["state"].astype(str).str.zfill(2)
+        + df["county"].astype(str).str.zfill(3)
+        + df["tract"].astype(str).str.zfill(6)
+    )
+    for col in ACS_VARS:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df[["tract_id", *ACS_VARS]]
+
+
+async def load(years: list, states: list):
+    client = get_census_client()
+    stats = {'years': 0, 'tracts': 0, 'failed': 0}
+
+    try:
+        for year in years:
+            print(f"📥 {year}")
+            start = time.perf_counter()
+            frames = await asyncio.gather(*(fetch_state(client, year, st) for st in states))
+
+            stats['failed'] += sum(f is None for f in frames)
+            frames = [f for f in frames if f is not None]
+            if not frames:
+                print(f"   ❌ No data for {year}")
+                continue
+
+            table = pd.concat(frames, ignore_index=True).drop_duplicates("tract_id").sort_values("tract_id")
+            WAREHOUSE_DIR.mkdir(parents=True, exist_ok=True)
+            table.to_parquet(year_path(WAREHOUSE_DIR, year), index=False)
+
+            stats['years'] += 1
+            stats['tracts'] += len(table)
+            print(f"   ✓ {len(table)} tracts ({time.perf_counter() - start:.1f}s)")
+    finally:
+        await client.close()
+
+    return stats
+
+
+def main():
+    """Main entry point"""
+
+    if len(sys.argv) < 2:
+        print("Usage: python load_acs_warehouse.py <years> [<state FIPS> ...]")
+        sys.exit(1)
+
+    years = parse_years(sys.argv[1])
+    states = [s.zfill(2) for s in sys.argv[2:]] or STATE_FIPS
+
+    print("🚀 ACS Warehouse Load")
+    print(f"{'='*80}\n")
+
+    stats = asyncio.run(load(years, states))
+
+    print(f"\n{'='*80}")
+    print(f"✅ Years: {stats['years']}   Tract rows: {stats['tracts']}   ❌ Failed state downloads: {stats['failed']}")
+
+
+if __name__ == "__main__":
+    main()
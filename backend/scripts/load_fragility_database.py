@@ -15,6 +15,8 @@ from motor.motor_asyncio import AsyncIOMotorClient
 import os
 from datetime import datetime
 from database import mongo_uri
+from baseline_version import bump_baseline_version
+from bulk_writes import bulk_replace
 
 # Paths
 FRAGILITY_FILE = Path("backend/fragility_data/processed/fragility_database.json")
@@ -67,6 +69,9 @@ class FragilityLoader:
         print("\n[4/4] Creating indexes...")
         await self._create_indexes()
         
+        # Cached HBOM trees in running backends pick up the new curves
+        await bump_baseline_version(self.db, reason="load_fragility_database")
+        
         # 5. Report
         self._print_report()
         
@@ -91,6 +96,7 @@ class FragilityLoader:
         
         # Track what we've seen to detect duplicates within the JSON
         seen_keys = {}  # (component_uuid, hazard, conditions_str) → curve
+        docs = []
         
         for curve in curves:
             comp_uuid = curve.get("component_uuid")
@@ -148,18 +154,17 @@ class FragilityLoader:
                 "loaded_by": "load_script"
             }
             
-            # Upsert by curve UUID
-            result = await self.fragility_db.replace_one(
-                {"uuid": curve["uuid"]},
-                doc,
-                upsert=True
-            )
-            
-            if result.upserted_id:
-                self.stats["inserted"] += 1
-            else:
-                self.stats["updated"] += 1
+            docs.append(doc)
+        
+        # Upsert by curve UUID, in unordered batches
+        result = await bulk_replace(self.fragility_db, docs, key=("uuid",))
+        
+        self.stats["inserted"] += result.upserted
+        # Repeated curve UUIDs were overwrites of the earlier curve
+        self.stats["updated"] += result.matched + result.collapsed
         
+        if result.failed:
+            print(f"      ✗ Failed:   {result.failed} (first: {result.errors[0]})")
         print(f"      ✓ Inserted: {self.stats['inserted']}")
         print(f"      ✓ Updated:  {self.stats['updated']}")
         print(f"      ⊘ Skipped:  {self.stats['skipped']} (exact duplicates)")
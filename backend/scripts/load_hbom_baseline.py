@@ -13,6 +13,7 @@ from pathlib import Path
 from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime
 from database import mongo_uri
+from baseline_version import bump_baseline_version
 
 DB_NAME = "acclimate_db"
 BASELINE_FILE = Path("backend/fragility_data/processed/hbom_baseline.json")
@@ -90,6 +91,9 @@ async def load_baseline():
     await baseline.create_index("label")
     print("      Indexes created")
     
+    # Cached HBOM trees in running backends rebuild from the new baseline
+    await bump_baseline_version(db, reason="load_hbom_baseline")
+    
     # Summary
     print("\n" + "=" * 80)
     print("LOAD SUMMARY")
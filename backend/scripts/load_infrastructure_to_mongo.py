@@ -19,6 +19,8 @@ from pathlib import Path
 from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime
 from database import mongo_uri
+from collection_stats import invalidate_collection_stats
+from bulk_writes import bulk_replace
 
 # Configuration
 DB_NAME = "acclimate_db"
@@ -68,38 +70,42 @@ async def load_to_mongo(json_filename: str, collection_name: str):
     # Insert/Update asset instances (upsert by UUID to avoid duplicates)
     print(f"\n🔄 Upserting assets to '{collection_name}' collection...")
     
-    for asset in asset_instances:
-        result = await assets_collection.replace_one(
-            {'uuid': asset['uuid']},  # Match by UUID
+    result = await bulk_replace(
+        assets_collection,
+        (
             {
                 **asset,
                 'last_updated': datetime.now().isoformat()
-            },
-            upsert=True
-        )
-        
-        if result.upserted_id:
-            stats['inserted'] += 1
-        elif result.modified_count > 0:
-            stats['updated'] += 1
-        else:
-            stats['skipped'] += 1
+            }
+            for asset in asset_instances
+        ),
+        key=('uuid',)  # Match by UUID
+    )
+    
+    stats['inserted'] += result.upserted
+    # Repeated UUIDs in the file were overwrites of the earlier asset
+    stats['updated'] += result.modified + result.collapsed
+    stats['skipped'] += result.unchanged
+    
+    if result.failed:
+        print(f"   ⚠️ {result.failed} assets failed to write (first: {result.errors[0]})")
     
     # Insert/Update component library (shared reference)
     print(f"📚 Updating component library...")
     
-    for component in component_library:
-        result = await components_collection.replace_one(
-            {'component_type': component['component_type']},
+    result = await bulk_replace(
+        components_collection,
+        (
             {
                 **component,
                 'last_updated': datetime.now().isoformat()
-            },
-            upsert=True
-        )
-        
-        if result.upserted_id or result.modified_count > 0:
-            stats['components_added'] += 1
+            }
+            for component in component_library
+        ),
+        key=('component_type',)
+    )
+    
+    stats['components_added'] += result.upserted + result.modified + result.collapsed
     
     # Store load metadata
     metadata_collection = db['load_metadata']
@@ -111,6 +117,9 @@ async def load_to_mongo(json_filename: str, collection_name: str):
         'stats': stats
     })
     
+    # Upserts can change existing assets, so recompute stats on next read
+    await invalidate_collection_stats(db, collection_name)
+    
     # Create indexes for performance
     print(f"🔍 Creating indexes...")
     await assets_collection.create_index('uuid', unique=True)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Load Census Tract Layer
+Builds the local tract geometry layer used by census_tracts.TractIndex from
+Census cartographic boundary (or TIGER/Line) tract shapefiles.
+
+Usage:
+    python load_tract_layer.py <source> [<source> ...]
+
+Sources are shapefile paths, zip archives or URLs readable by geopandas, e.g.
+    https://www2.census.gov/geo/tiger/GENZ2023/shp/cb_2023_us_tract_500k.zip
+    tl_2023_48_tract.zip
+
+All sources are merged (later sources win on duplicate GEOIDs), reprojected
+to EPSG:4326 and written as GeoParquet to $CENSUS_TRACT_LAYER
+(default: ./census_data/tracts.parquet). Restart the backend to pick it up.
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from census_tracts import TRACT_COLUMNS, TRACT_LAYER_PATH
+
+
+def build_layer(sources: list):
+    """Read, normalize and merge tract shapefiles"""
+    import geopandas as gpd
+
+    frames = []
+    for source in sources:
+        print(f"📂 Reading: {source}")
+        start = time.perf_counter()
+        gdf = gpd.read_file(source)
+
+        if "GEOID" not in gdf.columns:
+            gdf["GEOID"] = (
+                gdf["STATEFP"].astype(str).str.zfill(2)
+                + gdf["COUNTYFP"].astype(str).str.zfill(3)
+                + gdf["TRACTCE"].astype(str).str.zfill(6)
+            )
+        gdf["GEOID"] = gdf["GEOID"].astype(str)
+        gdf["STATEFP"] = gdf["GEOID"].str[:2]
+        gdf["COUNTYFP"] = gdf["GEOID"].str[2:5]
+
+        gdf = gdf.to_crs(4326)[TRACT_COLUMNS]
+        frames.append(gdf)
+        print(f"   ✓ {len(gdf)} tracts ({time.perf_counter() - start:.1f}s)")
+
+    tracts = gpd.GeoDataFrame(pd.concat(frames, ignore_index=True), crs=4326)
+    tracts = tracts.drop_duplicates("GEOID", keep="last").sort_values("GEOID").reset_index(drop=True)
+    return tracts
+
+
+def main():
+    """Main entry point"""
+
+    if len(sys.argv) < 2:
+        print("Usage: python load_tract_layer.py <source> [<source> ...]")
+        sys.exit(1)
+
+    print("🚀 Census Tract Layer")
+    print(f"{'='*80}\n")
+
+    tracts = build_layer(sys.argv[1:])
+
+    TRACT_LAYER_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tracts.to_parquet(TRACT_LAYER_PATH)
+
+    print(f"\n{'='*80}")
+    print(f"✅ Wrote {len(tracts)} tracts in {tracts['STATEFP'].nunique()} states to {TRACT_LAYER_PATH}")
+
+
+if __name__ == "__main__":
+    main()
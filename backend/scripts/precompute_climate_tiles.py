@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Precompute Climate Tiles
+Builds aggregated, composite-complete, unit-converted climate tiles for hot
+regions into the local tile store (see climate/tile_store.py). ClimateFetcher
+serves any request a tile covers without going to S3.
+
+Usage:
+    python precompute_climate_tiles.py tiles.json
+
+Spec file (every combination of region x hazard x scenario x window is built):
+    {
+        "regions": [
+            {"name": "houston", "min_lat": 29.4, "max_lat": 30.2,
+             "min_lon": -95.9, "max_lon": -94.9}
+        ],
+        "hazards": ["Heat Stress", "Wind"],
+        "scenarios": ["rcp85", "rcp45"],
+        "windows": [{"prior_years": 1, "future_years": 5}],
+        "domain": "NAM-22i",                 # optional
+        "climate_model": "all",              # optional
+        "aggregation_method": "mean",        # optional
+        "aggregation_q": null                # optional, for "percentile"
+    }
+
+Windows are relative to the current year, exactly like DataRequest.
+Tiles are written to $CLIMATE_TILE_DIR (default: ./climate_tiles).
+"""
+
+import sys
+import json
+import time
+import itertools
+from pathlib import Path
+
+from models import DataRequest
+from climate.data_sources.na_cordex import NACordexDataSource
+from climate.climate_fetcher import ClimateFetcher, request_ranges
+from climate.tile_store import TileRecord, default_tile_store, tile_id_for
+
+
+def build_tiles(spec: dict):
+    """Build every tile described by the spec"""
+    store = default_tile_store()
+    # No tile store on the fetcher: always build from the source data
+    fetcher = ClimateFetcher(NACordexDataSource())
+
+    domain = spec.get("domain", "NAM-22i")
+    climate_model = spec.get("climate_model", "all")
+    aggregation_method = spec.get("aggregation_method", "mean")
+    aggregation_q = spec.get("aggregation_q")
+
+    stats = {'built': 0, 'failed': 0}
+
+    combos = itertools.product(
+        spec["regions"], spec["hazards"], spec["scenarios"], spec["windows"]
+    )
+
+    for region, hazard, scenario, window in combos:
+        request = DataRequest(
+            hazard=hazard,
+            scenario=scenario,
+            domain=domain,
+            min_lat=region["min_lat"],
+            max_lat=region["max_lat"],
+            min_lon=region["min_lon"],
+            max_lon=region["max_lon"],
+            prior_years=window.get("prior_years", 1),
+            future_years=window.get("future_years", 1),
+            climate_model=climate_model,
+            aggregate_over_member_id=True,
+            aggregation_method=aggregation_method,
+            aggregation_q=aggregation_q,
+        )
+        _, _, time_range = request_ranges(request)
+        aggregation = aggregation_method + (f"{aggregation_q}" if aggregation_q is not None else "")
+        tile_id = tile_id_for(region["name"], hazard, scenario, climate_model, aggregation, time_range)
+
+        print(f"🧱 {tile_id}")
+        start = time.perf_counter()
+
+        try:
+            processed = fetcher.process_request(request)
+            record = TileRecord(
+                tile_id=tile_id,
+                region=region["name"],
+                hazard=request.hazard.value,
+                scenario=request.scenario.value,
+                domain=domain,
+                climate_model=request.climate_model,
+                aggregate_over_members=processed["aggregate_over_members"],
+                aggregation_method=request.aggregation_method.value,
+                aggregation_q=aggregation_q,
+                bbox={k: region[k] for k in ("min_lat", "max_lat", "min_lon", "max_lon")},
+                time_range=time_range,
+                variables=processed["variables"],
+                variable_metadata=processed["variable_metadata"],
+            )
+            path = store.write(record, processed["ds"])
+            stats['built'] += 1
+            print(f"   ✓ {path} ({time.perf_counter() - start:.1f}s)")
+        except Exception as e:
+            stats['failed'] += 1
+            print(f"   ❌ Failed: {e}")
+
+    return stats
+
+
+def main():
+    """Main entry point"""
+
+    if len(sys.argv) != 2:
+        print("Usage: python precompute_climate_tiles.py <spec.json>")
+        sys.exit(1)
+
+    spec_file = Path(sys.argv[1])
+    if not spec_file.exists():
+        print(f"❌ File not found: {spec_file}")
+        sys.exit(1)
+
+    with open(spec_file, 'r') as f:
+        spec = json.load(f)
+
+    print("🚀 Climate Tile Precompute")
+    print(f"{'='*80}\n")
+
+    stats = build_tiles(spec)
+
+    print(f"\n{'='*80}")
+    print(f"✅ Built: {stats['built']}   ❌ Failed: {stats['failed']}")
+
+
+if __name__ == "__main__":
+    main()
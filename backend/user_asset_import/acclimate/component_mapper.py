@@ -3,10 +3,12 @@ Component Mapper - Map user component types to canonical component library
 Handles exact matching, alias matching, fuzzy matching, and common mappings
 """
 
+import hashlib
 import logging
 from typing import Dict, List, Optional, Tuple
+import numpy as np
 from motor.motor_asyncio import AsyncIOMotorClient
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process as rf_process
 import os
 
 from . import config
@@ -179,6 +181,95 @@ for canonical_name, variations in COMPONENT_VARIATIONS.items():
     for variation in variations:
         _COMPONENT_LOOKUP[variation.lower()] = canonical_name
 
+# Fuzzy matching: top choices considered per value, and values per cdist call
+FUZZY_MATCH_LIMIT = 20
+FUZZY_BATCH_SIZE = 5000
+
+# Match results shared by every ComponentMapper in the process, keyed by
+# (library version, sector, user value). Registers reuse the same type
+# strings across imports, so most values skip matching entirely.
+_MATCH_MEMO: Dict[Tuple[str, Optional[str], str], Dict[str, any]] = {}
+_MATCH_MEMO_MAX_SIZE = 100000
+
+
+def _remember(
+    library_version: str,
+    sector: Optional[str],
+    user_value: str,
+    result: Dict[str, any]
+) -> Dict[str, any]:
+    """Store a match result in the memo (cleared when full) and return it"""
+    if len(_MATCH_MEMO) >= _MATCH_MEMO_MAX_SIZE:
+        _MATCH_MEMO.clear()
+    _MATCH_MEMO[(library_version, sector, user_value)] = result
+    return result
+
+
+def _build_library_index(
+    component_cache: Dict[str, Dict],
+    aliases_cache: Dict[str, str]
+) -> Dict[str, any]:
+    """
+    Build the lookup structures ComponentMapper matches against
+    
+    Fuzzy choices are ALL possible terms: database names, aliases, AND
+    hardcoded variations (duplicates kept - each one counts towards
+    consensus). Every choice is resolved to its canonical component once,
+    here, instead of per match.
+    
+    Args:
+        component_cache: canonical_name (lowercase) -> component document
+        aliases_cache: alias (lowercase) -> canonical_name
+    
+    Returns:
+        ComponentMapper attribute name -> value
+    """
+    fuzzy_choices = (
+        list(component_cache.keys()) +      # Database canonical names
+        list(aliases_cache.keys()) +        # Database aliases
+        list(_COMPONENT_LOOKUP.keys())      # All COMPONENT_VARIATIONS terms
+    )
+    
+    fuzzy_canonicals = []
+    canonical_index = {}
+    choice_canonicals = []
+    
+    for choice in fuzzy_choices:
+        if choice in component_cache:
+            canonical_name = component_cache[choice]['canonical_name']
+        elif choice in aliases_cache:
+            canonical_name = aliases_cache[choice]
+        else:
+            canonical_name = _COMPONENT_LOOKUP[choice]
+        
+        if canonical_name not in canonical_index:
+            canonical_index[canonical_name] = len(fuzzy_canonicals)
+            fuzzy_canonicals.append(canonical_name)
+        choice_canonicals.append(canonical_index[canonical_name])
+    
+    # Match results depend only on the library contents (and the
+    # variations above), so memoized results are keyed by this digest
+    digest = hashlib.sha1()
+    for canonical_lower, comp in sorted(component_cache.items()):
+        digest.update(repr((canonical_lower, comp.get('canonical_name'), comp.get('sector'),
+                            comp.get('canonical_uuid'))).encode())
+    digest.update(repr(sorted(aliases_cache.items())).encode())
+    digest.update(repr(sorted(_COMPONENT_LOOKUP.items())).encode())
+    
+    return {
+        '_component_cache': component_cache,
+        '_aliases_cache': aliases_cache,
+        '_fuzzy_choices': fuzzy_choices,
+        '_fuzzy_canonicals': fuzzy_canonicals,
+        '_fuzzy_choice_canonicals': np.array(choice_canonicals, dtype=np.int64),
+        # Substring suggestions for no-match results
+        '_suggestion_candidates': [
+            (canonical_lower, comp['canonical_name'], comp.get('sector'))
+            for canonical_lower, comp in component_cache.items()
+        ],
+        '_library_version': digest.hexdigest(),
+    }
+
 
 class ComponentMapper:
     """
@@ -204,9 +295,10 @@ class ComponentMapper:
         self.db = None
         self.collection = None
         
-        # Cache for component library (loaded once)
+        # Cache for component library (loaded once, or per shared snapshot)
         self._component_cache = None
         self._aliases_cache = None
+        self._snapshot_version = None
     
     async def connect(self):
         """Connect to MongoDB"""
@@ -217,19 +309,40 @@ class ComponentMapper:
             logger.info("Connected to component library")
     
     async def load_component_library(self):
-        """Load component library into memory for fast lookups"""
-        if self._component_cache is not None:
-            return  # Already loaded
+        """
+        Load component library into memory for fast lookups
+        
+        Inside the backend this uses the process-wide snapshot (see
+        backend/component_library.py), so the collection is only read when
+        the snapshot refreshes. Standalone scripts read it directly, once.
+        """
+        try:
+            from component_library import get_component_library
+        except ImportError:
+            get_component_library = None
         
         await self.connect()
         
+        if get_component_library is not None:
+            snapshot = await get_component_library(self.db)
+            if snapshot.version != self._snapshot_version:
+                self._apply_library_index(snapshot.derive(
+                    'component_mapper',
+                    lambda s: _build_library_index(s.components, s.aliases)
+                ))
+                self._snapshot_version = snapshot.version
+            return
+        
+        if self._component_cache is not None:
+            return  # Already loaded
+        
         # Load all components
         cursor = self.collection.find({})
         components = await cursor.to_list(length=None)
         
         # Build lookup dictionaries
-        self._component_cache = {}
-        self._aliases_cache = {}
+        component_cache = {}
+        aliases_cache = {}
         
         for comp in components:
             canonical_name = comp.get('canonical_name', '')
@@ -238,17 +351,24 @@ class ComponentMapper:
             
             # Store by canonical name (lowercase for case-insensitive matching)
             canonical_lower = canonical_name.lower()
-            self._component_cache[canonical_lower] = comp
+            component_cache[canonical_lower] = comp
             
             # Also store by aliases
             aliases = comp.get('aliases', [])
             for alias in aliases:
                 if alias:
                     alias_lower = alias.lower()
-                    self._aliases_cache[alias_lower] = canonical_name
+                    aliases_cache[alias_lower] = canonical_name
+        
+        self._apply_library_index(_build_library_index(component_cache, aliases_cache))
         
         logger.info(f"Loaded {len(self._component_cache)} components with {len(self._aliases_cache)} aliases")
     
+    def _apply_library_index(self, index: Dict[str, any]):
+        """Point the lookup attributes at a prebuilt library index"""
+        for name, value in index.items():
+            setattr(self, name, value)
+    
     async def map_component(
         self,
         user_value: str,
@@ -270,8 +390,20 @@ class ComponentMapper:
                 - sector: str (matched component's sector)
                 - suggestions: List[str] (if no exact match)
         """
-        await self.load_component_library()
+        results = await self.batch_map_components([user_value], sector)
+        return results[user_value]
+    
+    def _match_direct(
+        self,
+        user_value: str,
+        sector: Optional[str] = None
+    ) -> Optional[Dict[str, any]]:
+        """
+        Match by lookup: exact canonical name, alias, then built-in variations
         
+        Returns:
+            Match result, or None if the value needs fuzzy matching
+        """
         if not user_value:
             return {
                 'matched': False,
@@ -291,7 +423,7 @@ class ComponentMapper:
             
             # If sector filter provided, check it matches
             if sector and comp_sector != sector:
-                return await self._no_match_result(user_value, sector)
+                return self._no_match_result(user_value, sector)
             
             return {
                 'matched': True,
@@ -310,7 +442,7 @@ class ComponentMapper:
             comp_sector = comp.get('sector', 'Energy Grid')
             
             if sector and comp_sector != sector:
-                return await self._no_match_result(user_value, sector)
+                return self._no_match_result(user_value, sector)
             
             return {
                 'matched': True,
@@ -346,7 +478,7 @@ class ComponentMapper:
                 comp_sector = comp.get('sector', 'Energy Grid')
                 
                 if sector and comp_sector != sector:
-                    return await self._no_match_result(user_value, sector)
+                    return self._no_match_result(user_value, sector)
                 
                 # Check if user value is exact match of canonical name (case-insensitive)
                 # If not, it's a known variation that should be tracked in aliases
@@ -362,85 +494,120 @@ class ComponentMapper:
                     'suggestions': []
                 }
         
-        # 4. Try consensus-based fuzzy matching (last resort)
-        # Match against ALL possible terms: database names, aliases, AND hardcoded variations
-        all_names = (
-            list(self._component_cache.keys()) +      # Database canonical names
-            list(self._aliases_cache.keys()) +        # Database aliases
-            list(_COMPONENT_LOOKUP.keys())            # All COMPONENT_VARIATIONS terms
-        )
-        
-        # Get fuzzy matches using config cutoff
-        from rapidfuzz import process as rf_process
-        fuzzy_results = rf_process.extract(
-            user_value_lower, 
-            all_names, 
-            scorer=fuzz.ratio,
-            score_cutoff=config.COMPONENT_FUZZY_CUTOFF,  # Use config value
-            limit=20  # Get top matches to find consensus
-        )
-        
-        if fuzzy_results:
+        return None
+    
+    def _match_fuzzy(
+        self,
+        user_values: List[str],
+        sector: Optional[str] = None
+    ) -> Dict[str, Dict[str, any]]:
+        """
+        Consensus-based fuzzy matching (last resort) for many values at once
+        
+        Scores every value against every choice in one rapidfuzz.cdist call,
+        keeps each value's top FUZZY_MATCH_LIMIT choices above the cutoff and
+        groups them per canonical component:
+        confidence = (best_match_score / 100) + (consensus_boost * extra_matches)
+        Components are ranked by confidence, then match count, then best
+        score, then first appearance - the same order as matching one value
+        at a time with process.extract.
+        
+        Args:
+            user_values: User component type values without a direct match
+            sector: Optional sector filter
+        
+        Returns:
+            Dictionary mapping user_value -> match_result
+        """
+        results = {}
+        if not user_values:
+            return results
+        
+        cutoff = config.COMPONENT_FUZZY_CUTOFF
+        limit = min(FUZZY_MATCH_LIMIT, len(self._fuzzy_choices))
+        n_canonicals = len(self._fuzzy_canonicals)
+        
+        # Filter by sector if specified
+        allowed = None
+        if sector:
+            allowed = np.array([
+                self._component_cache.get(name.lower(), {}).get('sector') == sector
+                for name in self._fuzzy_canonicals
+            ], dtype=bool)
+        
+        # Chunks bound the (values x choices) score matrix
+        for start in range(0, len(user_values), FUZZY_BATCH_SIZE):
+            chunk = user_values[start:start + FUZZY_BATCH_SIZE]
+            
+            if limit == 0:
+                for user_value in chunk:
+                    results[user_value] = self._no_match_result(user_value, sector)
+                continue
+            
+            scores = rf_process.cdist(
+                [user_value.lower().strip() for user_value in chunk],
+                self._fuzzy_choices,
+                scorer=fuzz.ratio,
+                score_cutoff=cutoff,
+                dtype=np.float64,
+                workers=-1
+            )
+            
+            # Top matches per value: best score first, ties in choice order
+            top = np.argsort(-scores, axis=1, kind='stable')[:, :limit]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            valid = top_scores >= cutoff
+            
+            rows = np.broadcast_to(np.arange(len(chunk))[:, None], top.shape)[valid]
+            ranks = np.broadcast_to(np.arange(limit), top.shape)[valid]
+            canonicals = self._fuzzy_choice_canonicals[top][valid]
+            top_scores = top_scores[valid]
+            
             # Group matches by canonical component
-            component_matches = {}  # canonical_name -> [(variation, score), ...]
+            shape = (len(chunk), n_canonicals)
+            match_count = np.zeros(shape, dtype=np.int64)
+            max_score = np.zeros(shape, dtype=np.float64)
+            first_rank = np.full(shape, limit, dtype=np.int64)
+            np.add.at(match_count, (rows, canonicals), 1)
+            np.maximum.at(max_score, (rows, canonicals), top_scores)
+            np.minimum.at(first_rank, (rows, canonicals), ranks)
             
-            for match_text, score, _ in fuzzy_results:
-                # Find which canonical component this match belongs to
-                canonical_name = None
-                
-                if match_text in self._component_cache:
-                    canonical_name = self._component_cache[match_text]['canonical_name']
-                elif match_text in self._aliases_cache:
-                    canonical_name = self._aliases_cache[match_text]
-                elif match_text in _COMPONENT_LOOKUP:
-                    canonical_name = _COMPONENT_LOOKUP[match_text]
-                
-                if canonical_name:
-                    if canonical_name not in component_matches:
-                        component_matches[canonical_name] = []
-                    component_matches[canonical_name].append((match_text, score))
+            if allowed is not None:
+                match_count[:, ~allowed] = 0
+            present = match_count > 0
             
-            # Filter by sector if specified
-            if sector:
-                component_matches = {
-                    name: matches for name, matches in component_matches.items()
-                    if self._component_cache.get(name.lower(), {}).get('sector') == sector
-                }
+            consensus_boost = np.minimum(
+                (match_count - 1) * config.COMPONENT_CONSENSUS_BOOST,
+                0.10  # Cap at 10% boost
+            )
+            confidence = np.minimum(max_score / 100 + consensus_boost, 1.0)
             
-            if component_matches:
-                # Calculate confidence for each component using simplified formula:
-                # confidence = (best_match_score / 100) + (consensus_boost * extra_matches)
-                component_scores = []
-                for canonical_name, matches in component_matches.items():
-                    match_count = len(matches)
-                    scores = [score for _, score in matches]
-                    max_score = max(scores)
-                    
-                    # Simple confidence calculation
-                    base_confidence = max_score / 100
-                    consensus_boost = min(
-                        (match_count - 1) * config.COMPONENT_CONSENSUS_BOOST,
-                        0.10  # Cap at 10% boost
-                    )
-                    confidence = min(base_confidence + consensus_boost, 1.0)
-                    
-                    # Log low confidence matches for monitoring
-                    if confidence < 0.75:
-                        logger.info(
-                            f"Low confidence component match: '{user_value}' → '{canonical_name}' "
-                            f"(confidence: {confidence:.2f}, best_score: {max_score}, matches: {match_count})"
-                        )
-                    
-                    component_scores.append((canonical_name, confidence, match_count, max_score, matches))
+            # Sort by confidence first, then by match count, then by max score
+            # (np.lexsort: last key is primary; absent components sort last)
+            ranking = np.lexsort(
+                (first_rank, -max_score, -match_count, -confidence, ~present),
+                axis=-1
+            )[:, :5]
+            
+            for i, user_value in enumerate(chunk):
+                if not present[i].any():
+                    results[user_value] = self._no_match_result(user_value, sector)
+                    continue
                 
-                # Sort by confidence first, then by match count, then by max score
-                component_scores.sort(key=lambda x: (x[1], x[2], x[3]), reverse=True)
+                # Get suggestions (top 5 unique components)
+                suggestions = [self._fuzzy_canonicals[c] for c in ranking[i] if present[i, c]]
                 
-                # Best match
-                best_component, best_confidence, best_count, best_max_score, best_matches = component_scores[0]
+                best = ranking[i, 0]
+                best_component = self._fuzzy_canonicals[best]
+                best_confidence = float(confidence[i, best])
                 
-                # Get suggestions (top 5 unique components)
-                suggestions = [name for name, _, _, _, _ in component_scores[:5]]
+                # Log low confidence matches for monitoring
+                if best_confidence < 0.75:
+                    logger.info(
+                        f"Low confidence component match: '{user_value}' → '{best_component}' "
+                        f"(confidence: {best_confidence:.2f}, best_score: {max_score[i, best]}, "
+                        f"matches: {match_count[i, best]})"
+                    )
                 
                 # If confidence is below threshold, return as Unknown with suggestions
                 if best_confidence < config.COMPONENT_CONFIDENCE_THRESHOLD:
@@ -449,7 +616,7 @@ class ComponentMapper:
                         f"(best match: '{best_component}' with {best_confidence:.2f}, "
                         f"threshold: {config.COMPONENT_CONFIDENCE_THRESHOLD})"
                     )
-                    return {
+                    results[user_value] = {
                         'matched': True,
                         'canonical_name': 'Unknown',
                         'match_type': 'low_confidence',
@@ -458,41 +625,36 @@ class ComponentMapper:
                         'canonical_uuid': None,
                         'suggestions': suggestions
                     }
+                    continue
                 
                 # Return best match
                 comp = self._component_cache.get(best_component.lower(), {})
-                return {
+                results[user_value] = {
                     'matched': True,
                     'canonical_name': best_component,
                     'match_type': 'fuzzy_consensus',
                     'confidence': best_confidence,
                     'sector': comp.get('sector', 'Energy Grid'),
                     'canonical_uuid': comp.get('canonical_uuid'),
-                    'suggestions': suggestions[1:] if len(suggestions) > 1 else []
+                    'suggestions': suggestions[1:]
                 }
         
-        # 5. No match found
-        return await self._no_match_result(user_value, sector)
+        return results
     
-    async def _no_match_result(
+    def _no_match_result(
         self,
         user_value: str,
         sector: Optional[str] = None
     ) -> Dict[str, any]:
         """Generate a 'no match' result with suggestions"""
         # Try to suggest based on partial string matching
-        suggestions = []
+        # (user value is substring of canonical or vice versa)
         user_lower = user_value.lower()
-        
-        for canonical_lower, comp in self._component_cache.items():
-            if sector and comp.get('sector') != sector:
-                continue
-            
-            # Check if user value is substring of canonical or vice versa
-            if user_lower in canonical_lower or canonical_lower in user_lower:
-                suggestions.append(comp['canonical_name'])
-                if len(suggestions) >= 5:
-                    break
+        suggestions = [
+            name for canonical_lower, name, comp_sector in self._suggestion_candidates
+            if (not sector or comp_sector == sector)
+            and (user_lower in canonical_lower or canonical_lower in user_lower)
+        ]
         
         return {
             'matched': False,
@@ -511,6 +673,9 @@ class ComponentMapper:
         """
         Map multiple component type values at once
         
+        Values are looked up in the process-wide memo first; the rest are
+        matched directly where possible and fuzzy-matched in one batch.
+        
         Args:
             user_values: List of unique user component type values
             sector: Optional sector filter
@@ -518,12 +683,37 @@ class ComponentMapper:
         Returns:
             Dictionary mapping user_value -> match_result
         """
+        await self.load_component_library()
+        
         results = {}
+        fuzzy_values = []
         
         for user_value in user_values:
-            results[user_value] = await self.map_component(user_value, sector)
+            if user_value in results:
+                continue
+            
+            memoized = _MATCH_MEMO.get((self._library_version, sector, user_value))
+            if memoized is not None:
+                results[user_value] = memoized
+                continue
+            
+            result = self._match_direct(user_value, sector)
+            if result is None:
+                results[user_value] = None  # Placeholder keeps input order
+                fuzzy_values.append(user_value)
+            else:
+                results[user_value] = _remember(self._library_version, sector, user_value, result)
         
-        return results
+        if fuzzy_values:
+            logger.info(f"Fuzzy matching {len(fuzzy_values)} component type values")
+            for user_value, result in self._match_fuzzy(fuzzy_values, sector).items():
+                results[user_value] = _remember(self._library_version, sector, user_value, result)
+        
+        # Callers get their own copies; the memo keeps the originals
+        return {
+            user_value: {**result, 'suggestions': list(result['suggestions'])}
+            for user_value, result in results.items()
+        }
     
     async def get_sector_from_component(self, canonical_name: str) -> Optional[str]:
         """
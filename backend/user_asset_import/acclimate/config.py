@@ -30,6 +30,12 @@ COMPONENT_LIBRARY_COLLECTION = "component_library"
 DEFAULT_SECTOR = "Energy Grid"  # Default sector for imported assets
 SAVE_TO_DATABASE_DEFAULT = False  # By default, just return data to client without saving
 
+# Streaming import (large CSV uploads are processed in batches, see AssetImporter.process_upload_stream)
+STREAMING_THRESHOLD_MB = 50  # Uploads larger than this are streamed
+STREAMING_BATCH_SIZE = 50000  # Rows parsed, enriched and saved per batch
+STREAMING_PREVIEW_ROWS = 100  # Enriched rows returned to the client when streaming
+STREAMING_ERRORS_KEPT = 20  # Write errors returned for a streamed import
+
 
 # ============================================================================
 # VALIDATION SETTINGS
@@ -4,6 +4,8 @@ Single endpoint POST /api/import/user_assets
 """
 
 import logging
+import tempfile
+from pathlib import Path
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import JSONResponse
 from typing import Optional
@@ -25,6 +27,9 @@ router = APIRouter(
     tags=["Asset Import"]
 )
 
+# Bytes read from an upload per chunk while spooling it to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 @router.post("/upload")
 async def import_user_assets(
@@ -35,7 +40,8 @@ async def import_user_assets(
     min_lat: Optional[float] = Form(None),
     max_lat: Optional[float] = Form(None),
     min_lon: Optional[float] = Form(None),
-    max_lon: Optional[float] = Form(None)
+    max_lon: Optional[float] = Form(None),
+    save_to_database: Optional[bool] = Form(None)
 ):
     """
     Import user-uploaded asset data
@@ -57,6 +63,11 @@ async def import_user_assets(
             System will auto-match other component types normally.
             e.g., '{"powerplant": "Natural Gas Generation Plant"}' - only fixes this one
         target_collection: MongoDB collection to import to (default: 'energy_grid')
+        save_to_database: Save to target_collection (default: config.SAVE_TO_DATABASE_DEFAULT)
+    
+    CSV files larger than config.STREAMING_THRESHOLD_MB are processed in
+    batches (see AssetImporter.process_upload_stream); the response then
+    holds a preview of the data ('data_truncated': true) rather than all of it.
     
     Returns:
         JSON response with:
@@ -66,12 +77,17 @@ async def import_user_assets(
         - If success=false: Error message
     """
     
+    file_path = None
     try:
-        # Read file content
-        file_content = await file.read()
+        # Spool to disk in chunks rather than reading the whole upload
+        file_path = await _spool_upload(file)
         filename = file.filename
+        file_size = file_path.stat().st_size
+        
+        logger.info(f"Received upload: {filename} ({file_size} bytes)")
         
-        logger.info(f"Received upload: {filename} ({len(file_content)} bytes)")
+        if save_to_database is None:
+            save_to_database = config.SAVE_TO_DATABASE_DEFAULT
         
         # Parse optional mappings
         parsed_column_mappings = None
@@ -109,15 +125,32 @@ async def import_user_assets(
                 }
                 logger.info(f"Filtering assets by bounding box: {bbox}")
             
-            result = await importer.process_upload(
-                file_content=file_content,
-                filename=filename,
-                column_mappings=parsed_column_mappings,
-                component_mappings=parsed_component_mappings,
-                target_collection=target_collection,
-                bounding_box=bbox
+            stream = (
+                filename.lower().endswith('.csv')
+                and file_size > config.STREAMING_THRESHOLD_MB * 1024 * 1024
             )
             
+            if stream:
+                result = await importer.process_upload_stream(
+                    file_path=file_path,
+                    filename=filename,
+                    column_mappings=parsed_column_mappings,
+                    component_mappings=parsed_component_mappings,
+                    save_to_database=save_to_database,
+                    target_collection=target_collection,
+                    bounding_box=bbox
+                )
+            else:
+                result = await importer.process_upload(
+                    file_content=file_path.read_bytes(),
+                    filename=filename,
+                    column_mappings=parsed_column_mappings,
+                    component_mappings=parsed_component_mappings,
+                    save_to_database=save_to_database,
+                    target_collection=target_collection,
+                    bounding_box=bbox
+                )
+            
             # Return appropriate status code
             if result.get('success'):
                 return JSONResponse(content=result, status_code=200)
@@ -136,6 +169,21 @@ async def import_user_assets(
     except Exception as e:
         logger.error(f"Unexpected error in import endpoint: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    
+    finally:
+        if file_path is not None:
+            file_path.unlink(missing_ok=True)
+
+
+async def _spool_upload(file: UploadFile) -> Path:
+    """Copy an upload to a temporary file in UPLOAD_CHUNK_SIZE chunks"""
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename or '').suffix)
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            tmp.write(chunk)
+    finally:
+        tmp.close()
+    return Path(tmp.name)
 
 
 @router.get("/user_assets/status")
@@ -5,9 +5,10 @@ Uses RapidFuzz for robust fuzzy matching to handle diverse naming conventions
 
 import logging
 from typing import Dict, List, Optional, Set, Tuple
+import polars as pl
 from rapidfuzz import process, fuzz
 
-from . import config
+from . import config, frames
 
 logger = logging.getLogger(__name__)
 
@@ -372,55 +373,65 @@ def validate_mapping(
 
 
 def apply_mapping(
-    row: Dict[str, any],
+    df: pl.DataFrame,
     mapping: Dict[str, Optional[Dict[str, any]]]
-) -> Dict[str, any]:
+) -> pl.DataFrame:
     """
-    Apply field mapping to transform a row
+    Apply field mapping to transform rows
     
     Args:
-        row: Original row with user's column names
+        df: Original rows with user's column names
         mapping: Field mapping with metadata from auto_map_fields()
     
     Returns:
-        Transformed row with standard field names and spec_overrides
+        DataFrame (same rows) of the mapped fields under their standard
+        names; a null value means the row has no value for that field
     """
-    transformed = {}
+    return df.select([
+        pl.col(mapping_info['mapped_to']).alias(model_field)
+        for model_field, mapping_info in mapping.items()
+        if mapping_info and mapping_info['mapped_to'] in df.columns
+    ])
+
+
+def unmapped_columns(
+    columns: List[str],
+    mapping: Dict[str, Optional[Dict[str, any]]]
+) -> Tuple[List[str], List[str]]:
+    """
+    Columns that were not mapped to a standard field, for spec_overrides
     
-    # Map known fields
-    for model_field, mapping_info in mapping.items():
-        if mapping_info and mapping_info['mapped_to'] in row:
-            user_column = mapping_info['mapped_to']
-            value = row[user_column]
-            # Only add if not None
-            if value is not None:
-                transformed[model_field] = value
-    
-    # Put unmapped fields in spec_overrides
+    Args:
+        columns: Column names from user's file
+        mapping: Field mapping with metadata from auto_map_fields()
+    
+    Returns:
+        Tuple of (unmapped columns, unmapped columns duplicating a mapped
+        field name case-insensitively, like "Latitude" when we already
+        have "latitude")
+    """
     # Exclude columns that were mapped to our standard fields
     mapped_columns = set(
         m['mapped_to'] for m in mapping.values() if m is not None
     )
     
     # Also track which field names we've already used (case-insensitive)
-    # to avoid duplicates like "Latitude" when we already have "latitude"
     used_field_names = set()
     for model_field, mapping_info in mapping.items():
         if mapping_info:
             used_field_names.add(model_field.lower())
     
-    spec_overrides = {}
-    
-    for col, value in row.items():
-        col_normalized = normalize_column_name(col)
-        # Skip if this column was mapped, or if it's a duplicate of a mapped field
-        if col not in mapped_columns and col_normalized not in used_field_names and value is not None:
-            spec_overrides[col] = value
-    
-    if spec_overrides:
-        transformed['spec_overrides'] = spec_overrides
+    unmapped = []
+    duplicates = []
+    for col in columns:
+        if col in mapped_columns:
+            continue
+        if normalize_column_name(col) in used_field_names:
+            duplicates.append(col)
+        else:
+            unmapped.append(col)
     
-    return transformed
+    return unmapped, duplicates
 
 
 def get_mapping_summary(mapping: Dict[str, Optional[Dict]]) -> Dict[str, any]:
@@ -455,7 +466,7 @@ def get_mapping_summary(mapping: Dict[str, Optional[Dict]]) -> Dict[str, any]:
 
 
 def validate_required_fields(
-    rows: List[Dict],
+    df: pl.DataFrame,
     mapping: Dict[str, Optional[Dict]]
 ) -> Tuple[bool, List[str]]:
     """
@@ -463,7 +474,7 @@ def validate_required_fields(
     Should be called after apply_mapping() transforms the rows
     
     Args:
-        rows: Transformed data rows (with standard field names)
+        df: Transformed data rows (with standard field names)
         mapping: Field mapping with metadata from auto_map_fields()
     
     Returns:
@@ -481,44 +492,61 @@ def validate_required_fields(
         errors.append(f"Required fields not found in data: {', '.join(missing_fields)}")
         return False, errors
     
-    # Validate actual data values using the actual field names from config
-    for i, row in enumerate(rows):
+    def field(name: str) -> pl.Series:
+        if name in df.columns:
+            return df[name]
+        return pl.Series(name, [None] * df.height)
+    
+    components = field('component_type')
+    lats, lons = field('latitude'), field('longitude')
+    lat_floats, lon_floats = frames.floats(lats), frames.floats(lons)
+    
+    # Flag invalid rows on the whole columns, then describe the first ones
+    invalid = (
+        ~frames.truthy(components)
+        | lat_floats.is_null()
+        | (lat_floats.is_not_nan() & ((lat_floats < lat_min) | (lat_floats > lat_max))).fill_null(False)
+        | lon_floats.is_null()
+        | (lon_floats.is_not_nan() & ((lon_floats < lon_min) | (lon_floats > lon_max))).fill_null(False)
+    )
+    # Each invalid row adds at least one error: 100 rows are enough
+    invalid_rows = invalid.arg_true().head(100).to_list()
+    values = pl.DataFrame({
+        'component_type': components,
+        'latitude': lats,
+        'longitude': lons,
+        'lat_float': lat_floats,
+        'lon_float': lon_floats
+    })[invalid_rows].rows()
+    
+    for i, (component_type, lat, lon, lat_float, lon_float) in zip(invalid_rows, values):
         row_num = i + 1
         
         # Check component_type
-        component_type = row.get('component_type')
         if not component_type or component_type == '':
             errors.append(f"Row {row_num}: component_type is missing or empty")
         
         # Check latitude (lowercase)
-        lat = row.get('latitude')
         if lat is None or lat == '':
             errors.append(f"Row {row_num}: latitude is missing or empty")
-        else:
-            try:
-                lat_float = float(lat)
-                if lat_float < lat_min or lat_float > lat_max:
-                    errors.append(
-                        f"Row {row_num}: latitude {lat_float} is out of valid range "
-                        f"({lat_min} to {lat_max})"
-                    )
-            except (ValueError, TypeError):
-                errors.append(f"Row {row_num}: latitude '{lat}' cannot be converted to a number")
+        elif lat_float is None:
+            errors.append(f"Row {row_num}: latitude '{lat}' cannot be converted to a number")
+        elif lat_float < lat_min or lat_float > lat_max:
+            errors.append(
+                f"Row {row_num}: latitude {lat_float} is out of valid range "
+                f"({lat_min} to {lat_max})"
+            )
         
         # Check longitude (lowercase)
-        lon = row.get('longitude')
         if lon is None or lon == '':
             errors.append(f"Row {row_num}: longitude is missing or empty")
-        else:
-            try:
-                lon_float = float(lon)
-                if lon_float < lon_min or lon_float > lon_max:
-                    errors.append(
-                        f"Row {row_num}: longitude {lon_float} is out of valid range "
-                        f"({lon_min} to {lon_max})"
-                    )
-            except (ValueError, TypeError):
-                errors.append(f"Row {row_num}: longitude '{lon}' cannot be converted to a number")
+        elif lon_float is None:
+            errors.append(f"Row {row_num}: longitude '{lon}' cannot be converted to a number")
+        elif lon_float < lon_min or lon_float > lon_max:
+            errors.append(
+                f"Row {row_num}: longitude {lon_float} is out of valid range "
+                f"({lon_min} to {lon_max})"
+            )
         
         # Stop after first 100 errors to avoid overwhelming output
         if len(errors) >= 100:
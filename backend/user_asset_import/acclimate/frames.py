@@ -0,0 +1,150 @@
+"""
+Frame Helpers - Python value semantics on polars columns
+The import pipeline runs on polars DataFrames; these helpers give the
+columns the meaning the row-wise code gave single values (truthiness,
+float(), str(), json.dumps), so outputs do not depend on the file format
+"""
+
+import json
+from typing import Any, Dict, List
+
+import polars as pl
+
+# Python types kept as native polars dtypes; anything else is an Object column
+_NATIVE_TYPES = (str, bool, int, float)
+
+# Strings json.dumps() returns as-is between quotes (printable ASCII, no quote or backslash)
+_JSON_SAFE = r'^[ !#-\[\]-~]*$'
+
+
+def frame_from_rows(rows: List[Dict[str, Any]]) -> pl.DataFrame:
+    """
+    DataFrame of parsed row dicts, columns in the order the rows list them
+    
+    A column whose values are all of one of str/bool/int/float (or None)
+    gets that native dtype; mixed or nested values (e.g. GeoJSON
+    geometries) become an Object column holding the values unchanged. A
+    key missing from a row is null, like a None value.
+    """
+    columns = []
+    seen = set()
+    for row in rows:
+        previous = None
+        for key in row:
+            if key not in seen:
+                # Right after the key it follows in this row, as the row orders them
+                columns.insert(columns.index(previous) + 1 if previous is not None else 0, key)
+                seen.add(key)
+            previous = key
+    
+    series = []
+    for column in columns:
+        values = [row.get(column) for row in rows]
+        value_types = {type(v) for v in values if v is not None}
+        dtype = pl.Object
+        if len(value_types) <= 1 and value_types <= set(_NATIVE_TYPES):
+            dtype = None    # All None: a Null column
+        try:
+            series.append(pl.Series(column, values, dtype=dtype, strict=True))
+        except (TypeError, ValueError, OverflowError, pl.exceptions.PolarsError):
+            # e.g. integers beyond 64 bits
+            series.append(pl.Series(column, values, dtype=pl.Object))
+    
+    return pl.DataFrame(series)
+
+
+def _python_map(s: pl.Series, func, dtype) -> pl.Series:
+    """func() of every non-null value of an Object column (None stays None)"""
+    return pl.Series(s.name, [None if v is None else func(v) for v in s.to_list()], dtype=dtype)
+
+
+def present(s: pl.Series) -> pl.Series:
+    """value is not None and value != ''"""
+    if s.dtype == pl.String:
+        return (s.is_not_null() & (s != '')).fill_null(False)
+    if s.dtype == pl.Object:
+        return pl.Series(s.name, [v is not None and v != '' for v in s.to_list()], dtype=pl.Boolean)
+    return s.is_not_null()
+
+
+def truthy(s: pl.Series) -> pl.Series:
+    """bool(value), None being False"""
+    if s.dtype == pl.String:
+        return (s.is_not_null() & (s != '')).fill_null(False)
+    if s.dtype == pl.Boolean:
+        return s.fill_null(False)
+    if s.dtype.is_numeric():
+        return (s != 0).fill_null(False)
+    if s.dtype == pl.Object:
+        return pl.Series(s.name, [bool(v) for v in s.to_list()], dtype=pl.Boolean)
+    return pl.Series(s.name, [False] * len(s), dtype=pl.Boolean)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def floats(s: pl.Series) -> pl.Series:
+    """float(value), null where it is None or float() fails"""
+    if s.dtype == pl.String:
+        result = s.cast(pl.Float64, strict=False)
+        # polars parses a subset of what float() accepts ('1_000', ' 1', ...)
+        failed = s.filter(s.is_not_null() & result.is_null()).unique()
+        retried = {v: _to_float(v) for v in failed.to_list()}
+        retried = {v: f for v, f in retried.items() if f is not None}
+        if retried:
+            result = pl.select(
+                pl.when(result.is_null())
+                .then(s.replace_strict(list(retried), list(retried.values()), default=None, return_dtype=pl.Float64))
+                .otherwise(result)
+            ).to_series().alias(s.name)
+        return result
+    if s.dtype == pl.Boolean or s.dtype.is_numeric():
+        return s.cast(pl.Float64)
+    if s.dtype == pl.Object:
+        return _python_map(s, _to_float, pl.Float64)
+    return pl.Series(s.name, [None] * len(s), dtype=pl.Float64)
+
+
+def strs(s: pl.Series) -> pl.Series:
+    """str(value), None staying null"""
+    if s.dtype == pl.String:
+        return s
+    if s.dtype == pl.Object:
+        return _python_map(s, str, pl.String)
+    if s.dtype == pl.Null:
+        return s.cast(pl.String)
+    # polars formats bools and some floats differently from str()
+    values = s.drop_nulls().unique().to_list()
+    return s.replace_strict(values, [str(v) for v in values], default=None, return_dtype=pl.String)
+
+
+def equals(a: pl.Series, b: pl.Series) -> pl.Series:
+    """a == b row by row (False where either is None), as Python compares values"""
+    if pl.Object in (a.dtype, b.dtype):
+        return pl.Series(a.name, [
+            x is not None and y is not None and x == y for x, y in zip(a.to_list(), b.to_list())
+        ], dtype=pl.Boolean)
+    if a.dtype == pl.String or b.dtype == pl.String:
+        if a.dtype != b.dtype:
+            return pl.Series(a.name, [False] * len(a), dtype=pl.Boolean)
+        return (a == b).fill_null(False)
+    a, b = floats(a), floats(b)
+    return ((a == b) & a.is_not_nan()).fill_null(False)
+
+
+def json_strings(s: pl.Series) -> pl.Series:
+    """json.dumps() of every string (None staying null)"""
+    safe = s.str.contains(_JSON_SAFE).fill_null(True)
+    escaped = s.filter(~safe).unique().to_list()
+    quoted = pl.select(pl.concat_str(pl.lit('"'), s, pl.lit('"'))).to_series()
+    if not escaped:
+        return quoted.alias(s.name)
+    return pl.select(
+        pl.when(safe)
+        .then(quoted)
+        .otherwise(s.replace_strict(escaped, [json.dumps(v) for v in escaped], default=None))
+    ).to_series().alias(s.name)
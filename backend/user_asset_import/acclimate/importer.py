@@ -3,17 +3,134 @@ ACCLIMATE Importer - Main orchestrator for asset import process
 Coordinates parsing, field mapping, component matching, validation, and persistence
 """
 
+import hashlib
+import json
 import logging
 import uuid
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
-from .parsers import parse_file, detect_file_format
+import numpy as np
+import polars as pl
+
+from .parsers import parse_file_frame, detect_file_format, csv_columns, csv_unique_values, iter_csv_frames
 from .component_mapper import ComponentMapper
-from . import config
+from . import config, frames
 
 logger = logging.getLogger(__name__)
 
+# Collections whose import indexes have been ensured by this process
+_indexed_collections = set()
+
+# Namespace of imported asset uuids (see asset_uuid)
+ASSET_UUID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'acclimate/user_upload')
+
+# Common ID column names in order of preference, for rows without a mapped _id
+ID_COLUMN_CANDIDATES = ['eia_plant_id', 'id', '_id', 'uuid', 'asset_id', 'facility_id', 'objectid', 'rec_id']
+
+
+async def ensure_import_indexes(db, collection_name: str = 'energy_grid'):
+    """
+    Create the indexes imported assets rely on, once per collection per process
+    
+    Called at app startup for the default collection; other target
+    collections get them on their first import.
+    
+    Args:
+        db: Motor database
+        collection_name: Asset collection
+    """
+    key = (db.name, collection_name)
+    if key in _indexed_collections:
+        return
+    
+    from pymongo.errors import OperationFailure
+    
+    collection = db[collection_name]
+    try:
+        await collection.create_index('uuid', unique=True)  # Upsert key
+    except OperationFailure as e:
+        # e.g. an older non-unique uuid index, or duplicate uuids already stored
+        logger.warning(f"Could not create unique uuid index on {collection_name}: {e}")
+    await collection.create_index('component_type')
+    await collection.create_index('location', name='geo_index')
+    
+    _indexed_collections.add(key)
+    logger.info(f"Ensured import indexes on {collection_name}")
+
+
+def asset_uuid(sector: str, source: str, original_row: Dict, id_column: Optional[str] = None) -> str:
+    """
+    Stable uuid of an imported asset, so re-importing a file replaces its assets
+    
+    Keyed on the sector, the source file and the user's own ID (column and
+    value); rows without an ID are keyed on their full original content, and
+    so are rows repeating an ID already seen in the upload (e.g. the same ID
+    on two sheets of a workbook, see AssetImporter._enrich_frame, which
+    computes the same uuids on whole columns).
+    
+    Args:
+        sector: Sector the asset is imported into
+        source: Original filename
+        original_row: Row before field mapping
+        id_column: Column holding the user's ID in this row, if any
+    """
+    if id_column:
+        identity = [id_column, str(original_row.get(id_column))]
+    else:
+        identity = sorted((k, str(v)) for k, v in original_row.items() if v is not None and v != '')
+    return str(uuid.uuid5(ASSET_UUID_NAMESPACE, json.dumps([sector, source, identity])))
+
+
+def _uuid5_strings(names: pl.Series) -> pl.Series:
+    """str(uuid.uuid5(ASSET_UUID_NAMESPACE, name)) of every name"""
+    namespace = ASSET_UUID_NAMESPACE.bytes
+    digests = b''.join(hashlib.sha1(namespace + name.encode()).digest()[:16] for name in names.to_list())
+    octets = np.frombuffer(digests, dtype=np.uint8).reshape(-1, 16).copy()
+    octets[:, 6] = (octets[:, 6] & 0x0F) | 0x50     # Version 5
+    octets[:, 8] = (octets[:, 8] & 0x3F) | 0x80     # RFC 4122 variant
+    hexes = pl.Series(np.frombuffer(octets.tobytes().hex().encode(), dtype='S32')).cast(pl.String)
+    return pl.select(pl.concat_str([
+        hexes.str.slice(0, 8), pl.lit('-'),
+        hexes.str.slice(8, 4), pl.lit('-'),
+        hexes.str.slice(12, 4), pl.lit('-'),
+        hexes.str.slice(16, 4), pl.lit('-'),
+        hexes.str.slice(20, 12)
+    ])).to_series().alias(names.name)
+
+
+class SeenIds:
+    """
+    User IDs seen so far in an upload, for enrichment in batches
+    
+    Keeps, for every (ID column, value) key, a fingerprint of the full
+    content of the first row that used it. Pass the same instance for
+    every batch of an upload.
+    """
+    
+    def __init__(self):
+        self._seen = pl.DataFrame(schema={'key': pl.String, 'fingerprint': pl.UInt64})
+    
+    def __len__(self) -> int:
+        return self._seen.height
+    
+    def first_fingerprints(self, keys: pl.Series, fingerprints: pl.Series) -> pl.Series:
+        """
+        Fingerprint of the first row with each row's key (null keys: none),
+        in earlier batches or earlier in this one; records the new keys
+        """
+        batch = pl.DataFrame({'key': keys, 'fingerprint': fingerprints})
+        first = batch.select(pl.col('fingerprint').first().over('key')).to_series()
+        
+        earlier = keys.replace_strict(
+            self._seen['key'], self._seen['fingerprint'], default=None, return_dtype=pl.UInt64
+        )
+        new = batch.filter(keys.is_not_null() & earlier.is_null())
+        self._seen = pl.concat([self._seen, new.unique('key', keep='first', maintain_order=True)])
+        
+        return earlier.fill_null(first).alias('fingerprint')
+
 
 class AssetImporter:
     """
@@ -26,7 +143,8 @@ class AssetImporter:
         
         Args:
             field_mapper_module: Module containing project-specific field mapping functions
-                                 Must have: auto_map_fields, apply_mapping, validate_mapping
+                                 Must have: auto_map_fields, apply_mapping, unmapped_columns,
+                                 validate_required_fields
             mongo_uri: MongoDB connection string
             database: Database name
         """
@@ -64,87 +182,37 @@ class AssetImporter:
         try:
             # Step 1: Parse file (parse_excel handles both single and multi-sheet automatically)
             logger.info(f"Step 1: Parsing file {filename}")
-            rows, columns, file_format = parse_file(file_content, filename)
+            df, columns, file_format = parse_file_frame(file_content, filename)
             
-            if not rows:
+            if df.height == 0:
                 return {
                     'success': False,
                     'error': 'No data rows found in file'
                 }
             
-            logger.info(f"Parsed {len(rows)} rows with {len(columns)} columns")
+            logger.info(f"Parsed {df.height} rows with {len(columns)} columns")
             
             # Step 2: Auto-detect field mappings (always run)
             logger.info("Step 2: Field mapping")
+            field_mapping, field_mapping_metadata, mapping_error = self._resolve_field_mapping(
+                columns, column_mappings
+            )
+            if mapping_error:
+                return mapping_error
             
-            # Always start with auto-detection
-            field_mapping = self.field_mapper.auto_map_fields(columns)
-            logger.info(f"Auto-detected field mappings: {field_mapping}")
-            
-            # If user provided overrides, merge them in
-            if column_mappings:
-                logger.info(f"Applying user field mapping overrides: {column_mappings}")
-                
-                # Validate user's column names exist in the file
-                for model_field, user_column in column_mappings.items():
-                    if user_column not in columns:
-                        return {
-                            'success': False,
-                            'error': f'Invalid column mapping: Column "{user_column}" not found in file',
-                            'available_columns': list(columns)
-                        }
-                
-                # Override auto-detected mappings with user's choices
-                for model_field, user_column in column_mappings.items():
-                    field_mapping[model_field] = {
-                        'mapped_to': user_column,
-                        'confidence': 1.0,
-                        'match_type': 'user_provided'
-                    }
-                
-                logger.info(f"Final field mappings (with user overrides): {field_mapping}")
-            
-            # Build field mapping metadata for response
-            field_mapping_metadata = {}
-            for model_field, mapping_info in field_mapping.items():
-                if mapping_info:
-                    field_mapping_metadata[model_field] = {
-                        'mapped_from': mapping_info['mapped_to'],
-                        'confidence': mapping_info['confidence'],
-                        'match_type': mapping_info['match_type']
-                    }
-            
-            # Step 3: Apply field mapping to transform rows
+            # Step 3: Apply field mapping to transform rows (the original
+            # frame is kept alongside for ID tracking)
             logger.info("Step 3: Transforming rows")
-            transformed_rows = []
-            original_rows = []  # Keep original rows for ID tracking
-            for row in rows:
-                original_rows.append(row.copy())  # Store original before transformation
-                transformed = self.field_mapper.apply_mapping(row, field_mapping)
-                transformed_rows.append(transformed)
+            transformed_rows = self.field_mapper.apply_mapping(df, field_mapping)
+            original_rows = df
             
             # Step 3a: Filter by bounding box if provided (before expensive operations)
             if bounding_box:
-                initial_count = len(transformed_rows)
-                filtered_transformed = []
-                filtered_original = []
-                for i, row in enumerate(transformed_rows):
-                    lat = row.get('latitude')
-                    lon = row.get('longitude')
-                    if (lat is not None and lon is not None):
-                        try:
-                            lat_float = float(lat)
-                            lon_float = float(lon)
-                            if (bounding_box['min_lat'] <= lat_float <= bounding_box['max_lat'] and
-                                bounding_box['min_lon'] <= lon_float <= bounding_box['max_lon']):
-                                filtered_transformed.append(row)
-                                filtered_original.append(original_rows[i])
-                        except (ValueError, TypeError):
-                            pass  # Skip rows with invalid coordinates
-                
-                transformed_rows = filtered_transformed
-                original_rows = filtered_original
-                filtered_count = len(transformed_rows)
+                initial_count = transformed_rows.height
+                transformed_rows, original_rows = self._filter_by_bbox(
+                    transformed_rows, original_rows, bounding_box
+                )
+                filtered_count = transformed_rows.height
                 logger.info(f"Filtered {initial_count} assets to {filtered_count} within bounding box (before enrichment)")
             
             # Step 3b: Validate required fields early (fail fast)
@@ -168,67 +236,25 @@ class AssetImporter:
             component_mapping_info = field_mapping.get('component_type')
             component_col = component_mapping_info['mapped_to'] if component_mapping_info else None
             unique_components = set()
-            for row in rows:
-                if component_col:
-                    comp_val = row.get(component_col)
-                    if comp_val:
-                        unique_components.add(str(comp_val))
+            if component_col:
+                comp_vals = df[component_col]
+                unique_components = set(frames.strs(comp_vals.filter(frames.truthy(comp_vals))).unique().to_list())
             
             logger.info(f"Found {len(unique_components)} unique component types")
             
-            # Match components
-            if component_mappings:
-                # User provided component mappings
-                component_matches = {}
-                for user_val, canonical in component_mappings.items():
-                    component_matches[user_val] = {
-                        'matched': True,
-                        'canonical_name': canonical,
-                        'match_type': 'user_provided',
-                        'confidence': 1.0
-                    }
-                logger.info("Using user-provided component mappings")
-            else:
-                # Auto-match components
-                component_matches = await self.component_mapper.batch_map_components(
-                    list(unique_components)
-                )
-            
-            # Build component mapping metadata
-            component_mapping_metadata = {}
-            for user_val, match_result in component_matches.items():
-                if match_result['matched']:
-                    component_mapping_metadata[user_val] = {
-                        'mapped_to': match_result['canonical_name'],
-                        'confidence': match_result['confidence'],
-                        'match_type': match_result['match_type'],
-                        'alternatives': match_result.get('suggestions', [])
-                    }
-                else:
-                    # For unmatched components, use "Unknown"
-                    component_mapping_metadata[user_val] = {
-                        'mapped_to': 'Unknown',
-                        'confidence': 0.0,
-                        'match_type': 'no_match',
-                        'alternatives': match_result.get('suggestions', [])
-                    }
-                    # Update the match result so enrichment works
-                    component_matches[user_val] = {
-                        'matched': True,
-                        'canonical_name': 'Unknown',
-                        'match_type': 'no_match',
-                        'confidence': 0.0,
-                        'sector': 'Energy Grid'
-                    }
+            component_matches, component_mapping_metadata = await self._match_components(
+                unique_components, component_mappings
+            )
             
             # Step 5: Enrich data with matched components and sector
             logger.info("Step 5: Enriching data")
-            enriched_rows = await self._enrich_rows(
+            enriched_rows = await self._enrich_frame(
                 transformed_rows,
                 original_rows,
                 field_mapping,
                 component_matches,
-                sector
+                sector,
+                filename
             )
             
             # Step 6: Optionally save to MongoDB
@@ -249,7 +275,7 @@ class AssetImporter:
                 'success': True,
                 'data': enriched_rows,  # Return the actual data to client
                 'metadata': {
-                    'total_rows': len(rows),
+                    'total_rows': df.height,
                     'valid_rows': len(enriched_rows),
                     'file_format': file_format,
                     'filename': filename,
@@ -274,309 +300,716 @@ class AssetImporter:
                 'error': f"Unexpected error: {str(e)}"
             }
     
-    def _parse_boolean(self, value) -> bool:
+    async def process_upload_stream(
+        self,
+        file_path: Path,
+        filename: str,
+        sector: str = config.DEFAULT_SECTOR,
+        column_mappings: Optional[Dict[str, str]] = None,
+        component_mappings: Optional[Dict[str, str]] = None,
+        save_to_database: bool = config.SAVE_TO_DATABASE_DEFAULT,
+        target_collection: str = 'energy_grid',
+        bounding_box: Optional[Dict[str, float]] = None,
+        batch_size: int = config.STREAMING_BATCH_SIZE
+    ) -> Dict:
         """
-        Parse various boolean representations to Python bool
-        Handles: true/false, yes/no, 1/0, t/f, y/n (case-insensitive)
+        Process a large CSV upload spooled to disk in bounded memory
+        
+        Same pipeline as process_upload(), but the file is parsed, mapped,
+        validated, enriched and saved one batch at a time. Component types
+        are collected in a separate column-only pass first, so matching
+        still sees every value. Non-CSV files fall back to process_upload().
+        
+        Because batches are saved as they complete, a validation error in
+        a later batch leaves earlier batches saved ('rows_saved' says how
+        many). The response carries a preview of the enriched rows instead
+        of all of them.
         
         Args:
-            value: Value to parse as boolean
+            file_path: Path of the spooled upload
+            filename: Original filename
+            (others as process_upload)
+            batch_size: Rows parsed and processed per batch
+        
+        Returns:
+            Dictionary with preview data, totals and mapping metadata
+        """
+        if not filename.lower().endswith('.csv'):
+            return await self.process_upload(
+                file_content=Path(file_path).read_bytes(),
+                filename=filename,
+                sector=sector,
+                column_mappings=column_mappings,
+                component_mappings=component_mappings,
+                save_to_database=save_to_database,
+                target_collection=target_collection,
+                bounding_box=bounding_box
+            )
+        
+        try:
+            # Step 1: Header and field mappings
+            logger.info(f"Step 1: Streaming file {filename}")
+            columns = csv_columns(file_path)
+            
+            field_mapping, field_mapping_metadata, mapping_error = self._resolve_field_mapping(
+                columns, column_mappings
+            )
+            if mapping_error:
+                return mapping_error
+            
+            # Step 2: Component matching over the whole component column
+            component_mapping_info = field_mapping.get('component_type')
+            component_col = component_mapping_info['mapped_to'] if component_mapping_info else None
+            unique_components = csv_unique_values(file_path, component_col) if component_col else []
+            logger.info(f"Found {len(unique_components)} unique component types")
+            
+            component_matches, component_mapping_metadata = await self._match_components(
+                unique_components, component_mappings
+            )
+            
+            # Step 3: Transform, filter, validate, enrich and save per batch
+            total_rows = 0
+            valid_rows = 0
+            rows_saved = 0
+            rows_inserted = rows_updated = rows_duplicates = rows_failed = failed_batches = 0
+            write_errors = []
+            seen_ids = SeenIds()  # User IDs across batches
+            batches = 0
+            preview = []
+            
+            for df in iter_csv_frames(file_path, batch_size):
+                batch_start = total_rows + 1
+                total_rows += df.height
+                batches += 1
+                
+                original_rows = df
+                transformed_rows = self.field_mapper.apply_mapping(df, field_mapping)
+                
+                if bounding_box:
+                    transformed_rows, original_rows = self._filter_by_bbox(
+                        transformed_rows, original_rows, bounding_box
+                    )
+                
+                is_valid, validation_errors = self.field_mapper.validate_required_fields(
+                    transformed_rows,
+                    field_mapping
+                )
+                
+                if not is_valid:
+                    return {
+                        'success': False,
+                        'error': f'Validation failed in batch starting at row {batch_start}',
+                        'validation_errors': validation_errors,
+                        'rows_saved': rows_saved
+                    }
+                
+                enriched_rows = await self._enrich_frame(
+                    transformed_rows,
+                    original_rows,
+                    field_mapping,
+                    component_matches,
+                    sector,
+                    filename,
+                    seen_ids=seen_ids
+                )
+                valid_rows += len(enriched_rows)
+                
+                if len(preview) < config.STREAMING_PREVIEW_ROWS:
+                    preview.extend(enriched_rows[:config.STREAMING_PREVIEW_ROWS - len(preview)])
+                
+                if save_to_database and enriched_rows:
+                    result = await self._import_to_mongo(enriched_rows, target_collection)
+                    rows_saved += result['inserted'] + result['updated']
+                    rows_inserted += result['inserted']
+                    rows_updated += result['updated']
+                    rows_duplicates += result['duplicates']
+                    rows_failed += result['failed']
+                    failed_batches += result['failed_batches']
+                    write_errors.extend(
+                        f"Batch {batches}: {error}"
+                        for error in result['errors'][:max(config.STREAMING_ERRORS_KEPT - len(write_errors), 0)]
+                    )
+                
+                logger.info(f"Batch {batches}: {len(enriched_rows)} rows processed ({total_rows} read)")
+            
+            if total_rows == 0:
+                return {
+                    'success': False,
+                    'error': 'No data rows found in file'
+                }
+            
+            return {
+                'success': True,
+                'data': preview,
+                'data_truncated': valid_rows > len(preview),
+                'metadata': {
+                    'total_rows': total_rows,
+                    'valid_rows': valid_rows,
+                    'batches': batches,
+                    'file_format': 'csv',
+                    'filename': filename,
+                    'field_mappings': field_mapping_metadata,
+                    'component_mappings': component_mapping_metadata
+                },
+                'saved_to_database': save_to_database,
+                'collection': target_collection if save_to_database else None,
+                'import_result': {
+                    'inserted': rows_inserted,
+                    'updated': rows_updated,
+                    'duplicates': rows_duplicates,
+                    'failed': rows_failed,
+                    'failed_batches': failed_batches,
+                    'errors': write_errors,
+                    'collection': target_collection
+                } if save_to_database else None
+            }
+            
+        except ValueError as e:
+            logger.error(f"Value error during streaming import: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error during streaming import: {e}", exc_info=True)
+            return {
+                'success': False,
+                'error': f"Unexpected error: {str(e)}"
+            }
+    
+    def _resolve_field_mapping(
+        self,
+        columns: List[str],
+        column_mappings: Optional[Dict[str, str]] = None
+    ) -> Tuple[Dict, Dict, Optional[Dict]]:
+        """
+        Auto-detect field mappings and apply user overrides
+        
+        Returns:
+            Tuple of (field_mapping, field_mapping_metadata, error response
+            or None)
+        """
+        # Always start with auto-detection
+        field_mapping = self.field_mapper.auto_map_fields(columns)
+        logger.info(f"Auto-detected field mappings: {field_mapping}")
+        
+        # If user provided overrides, merge them in
+        if column_mappings:
+            logger.info(f"Applying user field mapping overrides: {column_mappings}")
+            
+            # Validate user's column names exist in the file
+            for model_field, user_column in column_mappings.items():
+                if user_column not in columns:
+                    return field_mapping, {}, {
+                        'success': False,
+                        'error': f'Invalid column mapping: Column "{user_column}" not found in file',
+                        'available_columns': list(columns)
+                    }
+            
+            # Override auto-detected mappings with user's choices
+            for model_field, user_column in column_mappings.items():
+                field_mapping[model_field] = {
+                    'mapped_to': user_column,
+                    'confidence': 1.0,
+                    'match_type': 'user_provided'
+                }
             
+            logger.info(f"Final field mappings (with user overrides): {field_mapping}")
+        
+        # Build field mapping metadata for response
+        field_mapping_metadata = {}
+        for model_field, mapping_info in field_mapping.items():
+            if mapping_info:
+                field_mapping_metadata[model_field] = {
+                    'mapped_from': mapping_info['mapped_to'],
+                    'confidence': mapping_info['confidence'],
+                    'match_type': mapping_info['match_type']
+                }
+        
+        return field_mapping, field_mapping_metadata, None
+    
+    async def _match_components(
+        self,
+        unique_components,
+        component_mappings: Optional[Dict[str, str]] = None
+    ) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+        """
+        Match user component types to the canonical library
+        
         Returns:
-            Boolean value (defaults to False if cannot parse)
+            Tuple of (component_matches for enrichment, component mapping
+            metadata for the response)
         """
-        if value is None:
-            return False
+        if component_mappings:
+            # User provided component mappings
+            component_matches = {}
+            for user_val, canonical in component_mappings.items():
+                component_matches[user_val] = {
+                    'matched': True,
+                    'canonical_name': canonical,
+                    'match_type': 'user_provided',
+                    'confidence': 1.0
+                }
+            logger.info("Using user-provided component mappings")
+        else:
+            # Auto-match components
+            component_matches = await self.component_mapper.batch_map_components(
+                list(unique_components)
+            )
         
-        # If already a boolean, return it
-        if isinstance(value, bool):
-            return value
+        # Build component mapping metadata
+        component_mapping_metadata = {}
+        for user_val, match_result in component_matches.items():
+            if match_result['matched']:
+                component_mapping_metadata[user_val] = {
+                    'mapped_to': match_result['canonical_name'],
+                    'confidence': match_result['confidence'],
+                    'match_type': match_result['match_type'],
+                    'alternatives': match_result.get('suggestions', [])
+                }
+            else:
+                # For unmatched components, use "Unknown"
+                component_mapping_metadata[user_val] = {
+                    'mapped_to': 'Unknown',
+                    'confidence': 0.0,
+                    'match_type': 'no_match',
+                    'alternatives': match_result.get('suggestions', [])
+                }
+                # Update the match result so enrichment works
+                component_matches[user_val] = {
+                    'matched': True,
+                    'canonical_name': 'Unknown',
+                    'match_type': 'no_match',
+                    'confidence': 0.0,
+                    'sector': 'Energy Grid'
+                }
         
-        # Convert to string and normalize
-        str_value = str(value).lower().strip()
+        return component_matches, component_mapping_metadata
+    
+    def _filter_by_bbox(
+        self,
+        rows: pl.DataFrame,
+        original: pl.DataFrame,
+        bounding_box: Dict[str, float]
+    ) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        """Keep rows (and their originals) whose coordinates fall in the box"""
+        if 'latitude' not in rows.columns or 'longitude' not in rows.columns:
+            return rows.clear(), original.clear()
         
-        # True values
-        if str_value in ('true', 'yes', '1', 't', 'y', 'on'):
-            return True
+        # Rows with missing or invalid coordinates are null here, and dropped
+        lat = frames.floats(rows['latitude'])
+        lon = frames.floats(rows['longitude'])
+        inside = (
+            lat.is_not_nan() & lon.is_not_nan()
+            & (lat >= bounding_box['min_lat']) & (lat <= bounding_box['max_lat'])
+            & (lon >= bounding_box['min_lon']) & (lon <= bounding_box['max_lon'])
+        ).fill_null(False)
+        return rows.filter(inside), original.filter(inside)
+    
+    def _parse_boolean(self, values: pl.Series) -> pl.Series:
+        """
+        Parse various boolean representations to bool
+        Handles: true/false, yes/no, 1/0, t/f, y/n (case-insensitive)
         
-        # False values
-        if str_value in ('false', 'no', '0', 'f', 'n', 'off', ''):
-            return False
+        Args:
+            values: Values to parse as booleans
+            
+        Returns:
+            Booleans (False where a value cannot be parsed, null where it is missing)
+        """
+        # If already booleans, return them
+        if values.dtype == pl.Boolean:
+            return values
+        
+        # Convert to strings and normalize
+        str_values = frames.strs(values)
+        normalized = str_values.str.to_lowercase().str.strip_chars()
+        
+        true_values = ('true', 'yes', '1', 't', 'y', 'on')
+        false_values = ('false', 'no', '0', 'f', 'n', 'off', '')
         
         # Default to False for unparseable values
-        logger.warning(f"Could not parse boolean value '{value}', defaulting to False")
-        return False
+        unparseable = str_values.filter(
+            normalized.is_not_null() & ~normalized.is_in(true_values + false_values)
+        ).value_counts(sort=True)
+        for value, count in unparseable.rows():
+            logger.warning(f"Could not parse boolean value '{value}' ({count} rows), defaulting to False")
+        
+        return pl.select(
+            pl.when(normalized.is_not_null()).then(normalized.is_in(true_values))
+        ).to_series().alias(values.name)
     
-    async def _enrich_rows(
+    def _find_user_ids(
         self,
-        rows: List[Dict],
-        original_rows: List[Dict],
+        rows: pl.DataFrame,
+        original: pl.DataFrame,
+        field_mapping: Dict[str, Optional[Dict]]
+    ) -> List[Tuple[str, pl.Series, pl.Series]]:
+        """
+        The column holding the user's own ID, per row
+        
+        The mapped _id field if it has a value: the first original column
+        holding that value (for multi-sheet Excel, different sheets may have
+        different ID column names). Otherwise the first ID-like column
+        (ID_COLUMN_CANDIDATES) with a value.
+        
+        Returns:
+            (column, rows whose ID it holds, ID values) triples
+        """
+        found = []
+        
+        if '_id' in rows.columns:
+            user_ids = rows['_id']
+            has_user_id = frames.truthy(user_ids)
+            mapped_column = field_mapping['_id']['mapped_to']
+            
+            # Find which original column had this value
+            unmatched = has_user_id
+            for col_name in original.columns:
+                matched = unmatched & frames.equals(original[col_name], user_ids)
+                if matched.any():
+                    found.append((col_name, matched, user_ids))
+                    unmatched = unmatched & ~matched
+                if col_name == mapped_column or not unmatched.any():
+                    break
+            
+            remaining = ~has_user_id
+        else:
+            remaining = pl.Series([True] * rows.height)
+        
+        # No _id value: check the original row for any ID-like column
+        for col_candidate in ID_COLUMN_CANDIDATES:
+            if col_candidate in original.columns and remaining.any():
+                matched = remaining & frames.present(original[col_candidate])
+                if matched.any():
+                    found.append((col_candidate, matched, original[col_candidate]))
+                    remaining = remaining & ~matched
+        
+        return found
+    
+    def _asset_uuids(
+        self,
+        original: pl.DataFrame,
+        user_ids: List[Tuple[str, pl.Series, pl.Series]],
+        sector: str,
+        source: str,
+        seen_ids: SeenIds
+    ) -> Tuple[pl.Series, pl.Series, int]:
+        """
+        asset_uuid() of every row, on whole columns
+        
+        An ID repeated in the upload (e.g. on another sheet) would collapse
+        into the first row: those rows are keyed on their full content
+        instead, unless they are copies of the first row.
+        
+        Returns:
+            Tuple of (uuids, ID column per row (null: no ID), number of rows
+            repeating an ID)
+        """
+        n = original.height
+        if user_ids:
+            id_columns = pl.select(pl.coalesce([
+                pl.when(rows_with_id).then(pl.lit(col_name)) for col_name, rows_with_id, _ in user_ids
+            ])).to_series()
+            id_values = pl.select(pl.coalesce([
+                pl.when(rows_with_id).then(frames.strs(original[col_name])) for col_name, rows_with_id, _ in user_ids
+            ])).to_series()
+        else:
+            id_columns = id_values = pl.Series([None] * n, dtype=pl.String)
+        has_id = id_columns.is_not_null()
+        
+        # Full-row identity: str() of every value (None and '' are left out)
+        identity = pl.DataFrame([
+            pl.select(pl.when(frames.present(original[col_name])).then(frames.strs(original[col_name])))
+            .to_series().alias(col_name)
+            for col_name in original.columns
+        ])
+        fingerprints = identity.select(pl.struct(pl.all()).hash(seed=0)).to_series()
+        
+        keys = pl.select(pl.concat_str([id_columns, id_values], separator='\x1f')).to_series()
+        repeated = (has_id & (seen_ids.first_fingerprints(keys, fingerprints) != fingerprints)).fill_null(False)
+        keyed_on_id = has_id & ~repeated
+        
+        # The json.dumps([sector, source, identity]) of asset_uuid()
+        prefix = json.dumps([sector, source])[:-1] + ', '
+        names = pl.select(pl.concat_str([
+            pl.lit(prefix + '['),
+            frames.json_strings(id_columns), pl.lit(', '), frames.json_strings(id_values),
+            pl.lit(']]')
+        ])).to_series()
+        
+        full = identity.filter(~keyed_on_id)
+        full_names = pl.select(pl.concat_str([
+            pl.lit(prefix + '['),
+            pl.concat_str([
+                pl.concat_str([pl.lit(f"[{json.dumps(col_name)}, "), frames.json_strings(full[col_name]), pl.lit(']')])
+                for col_name in sorted(full.columns)
+            ], separator=', ', ignore_nulls=True),
+            pl.lit(']]')
+        ])).to_series()
+        names = names.scatter(keyed_on_id.not_().arg_true(), full_names)
+        
+        return _uuid5_strings(names), id_columns, int(repeated.sum())
+    
+    async def _enrich_frame(
+        self,
+        rows: pl.DataFrame,
+        original: pl.DataFrame,
         field_mapping: Dict[str, Optional[Dict]],
         component_matches: Dict[str, Dict],
-        sector: str
+        sector: str,
+        source: str = '',
+        seen_ids: Optional[SeenIds] = None
     ) -> List[Dict]:
         """
         Enrich rows with auto-generated fields and matched components
         ACCLIMATE-specific: Uses flat address structure
         
+        Every field is computed on whole columns; rows become dicts only at
+        the end.
+        
         Args:
-            rows: Transformed data rows
-            original_rows: Original data rows before field mapping (for ID tracking)
+            rows: Transformed data rows (apply_mapping())
+            original: Original data rows before field mapping (for ID tracking)
             field_mapping: Field mapping with metadata from auto_map_fields()
             component_matches: Component match results
             sector: Sector to assign to all assets
+            source: Original filename (part of each asset's uuid)
+            seen_ids: User IDs already used in this upload; updated in
+                      place, pass the same instance for every batch
         
         Returns:
             Enriched rows with aliases tracking all transformations
         """
-        enriched = []
-        
-        for idx, row in enumerate(rows):
-            original_row = original_rows[idx]
-            enriched_row = row.copy()
-            
-            # Initialize aliases dict to track all transformations
-            field_aliases = {}
-            component_aliases = {}
-            
-            # Track field mappings (column name changes)
-            for field_name, mapping_info in field_mapping.items():
-                if mapping_info:
-                    user_column = mapping_info['mapped_to']
-                    if user_column != field_name:
-                        field_aliases[field_name] = user_column
-            
-            # Store user's original ID if present (we always generate new)
-            # For multi-sheet Excel, different sheets may have different ID column names
-            # We need to find which column in THIS row actually contains an ID
-            user_provided_id = None
-            user_id_column_name = None
-            
-            # Check the transformed row first
-            if row.get('_id'):
-                user_provided_id = row.get('_id')
-                # Find which original column had this value
-                for col_name, col_value in original_row.items():
-                    if col_value == user_provided_id:
-                        user_id_column_name = col_name
-                        break
-            else:
-                # Transformed row doesn't have _id, so check original row for any ID-like column
-                # Common ID column names in order of preference
-                id_column_candidates = ['eia_plant_id', 'id', '_id', 'uuid', 'asset_id', 'facility_id', 'objectid', 'rec_id']
-                for col_candidate in id_column_candidates:
-                    if col_candidate in original_row:
-                        value = original_row[col_candidate]
-                        if value is not None and value != '':
-                            user_provided_id = value
-                            user_id_column_name = col_candidate
-                            break
-            
-            # Update alias to reflect the actual column name from THIS row
-            if user_id_column_name and user_id_column_name != '_id':
-                field_aliases['_id'] = user_id_column_name
-            
-            # Generate new UUID for all assets to avoid collisions
-            new_id = str(uuid.uuid4())
-            enriched_row['_id'] = new_id
-            
-            # Store user's original ID value in spec_overrides using THEIR column name
-            # This preserves both the column name and value (e.g., "OBJECTID": 1234 or "eia_plant_id": 5678)
-            # This way we can trace back: aliases shows "_id": "OBJECTID", spec_overrides shows "OBJECTID": 1234
-            if user_provided_id is not None and user_provided_id != '':
-                if 'spec_overrides' not in enriched_row:
-                    enriched_row['spec_overrides'] = {}
-                # Use their actual column name
-                enriched_row['spec_overrides'][user_id_column_name] = user_provided_id
-            
-            # Add ALL unmapped fields to spec_overrides (preserve user's custom data)
-            # Get list of columns that were mapped to known fields
-            mapped_columns = set()
-            for field_name, mapping_info in field_mapping.items():
-                if mapping_info:
-                    mapped_columns.add(mapping_info['mapped_to'])
-            
-            # Find unmapped columns from original row
-            for col_name, col_value in original_row.items():
-                if col_name not in mapped_columns:
-                    # This field wasn't mapped to anything - preserve it
-                    # Exclude empty/null values
-                    if col_value is not None and col_value != '':
-                        if 'spec_overrides' not in enriched_row:
-                            enriched_row['spec_overrides'] = {}
-                        # Only add if not already present (e.g., from ID handling above)
-                        if col_name not in enriched_row['spec_overrides']:
-                            enriched_row['spec_overrides'][col_name] = col_value
-            
-            # Parse Critical field to boolean if present (already capitalized by field_mapper)
-            if 'Critical' in row:
-                critical_value = row['Critical']
-                enriched_row['Critical'] = self._parse_boolean(critical_value)
-            
-            # Get user's component type value (before matching)
-            user_component_type = row.get('component_type')
-            
-            if user_component_type and user_component_type in component_matches:
-                match = component_matches[user_component_type]
-                
+        if rows.height == 0:
+            return []
+        if seen_ids is None:
+            seen_ids = SeenIds()
+        
+        def field(name: str) -> Optional[pl.Series]:
+            return rows[name] if name in rows.columns else None
+        
+        # Track field mappings (column name changes)
+        field_aliases = {}
+        for field_name, mapping_info in field_mapping.items():
+            if mapping_info:
+                user_column = mapping_info['mapped_to']
+                if user_column != field_name:
+                    field_aliases[field_name] = user_column
+        
+        # Our own UUID, stable across re-imports of the same file (see asset_uuid)
+        user_ids = self._find_user_ids(rows, original, field_mapping)
+        new_ids, id_columns, repeated_ids = self._asset_uuids(original, user_ids, sector, source, seen_ids)
+        if repeated_ids:
+            logger.warning(f"{repeated_ids} rows repeat an ID already in the upload; keyed on their full content")
+        
+        # Canonical component types; track the mapping in component_aliases
+        # for ALL non-exact matches (alias, fuzzy, mapped variations, etc.)
+        user_components = rows['component_type']
+        components = user_components
+        component_aliases = {}
+        if user_components.dtype == pl.String:
+            canonical_types = {}
+            for user_component_type, match in component_matches.items():
                 if match['matched']:
                     canonical_component_type = match['canonical_name']
-                    match_type = match.get('match_type', 'exact')
-                    
-                    # Set canonical component type for system use
-                    enriched_row['component_type'] = canonical_component_type
+                    canonical_types[user_component_type] = canonical_component_type
                     
-                    # Track component type mapping in component_aliases for ALL non-exact matches
-                    # This includes: alias, fuzzy, mapped variations, etc.
                     # Only skip if it's an exact canonical name match (case-insensitive)
-                    is_exact_match = (match_type == 'exact' and 
+                    is_exact_match = (match.get('match_type', 'exact') == 'exact' and
                                      str(user_component_type).lower().strip() == str(canonical_component_type).lower().strip())
-                    
                     if not is_exact_match:
-                        component_aliases[canonical_component_type] = str(user_component_type)
+                        component_aliases[user_component_type] = {canonical_component_type: str(user_component_type)}
+            components = user_components.replace(canonical_types)
+        
+        # Generate name if not present (component_type_fullID format)
+        generated_names = pl.select(pl.concat_str([frames.strs(components), pl.lit('_'), new_ids])).to_series()
+        names = field('name')
+        if names is None:
+            names = generated_names
+        else:
+            names = _choose(frames.truthy(names), names, generated_names)
+        
+        # Ensure coordinates are floats (validated already)
+        latitudes = frames.floats(rows['latitude'])
+        longitudes = frames.floats(rows['longitude'])
+        
+        # ACCLIMATE-specific: Keep address fields flat at main level, with
+        # empty string defaults if not present
+        address = []
+        for field_name in ['City', 'State', 'County', 'Country', 'Address']:
+            values = field(field_name)
+            if values is None:
+                address.append(pl.lit('').alias(field_name))
+            else:
+                empty = pl.Series([''] * rows.height)
+                address.append(_choose(values.is_not_null(), values, empty).alias(field_name))
+        
+        # Convert Zip - remove .0 suffix but PRESERVE leading zeros (keep as string)
+        # Example: "01234.0" → "01234" (NOT 1234)
+        zip_values = field('Zip')
+        if zip_values is None:
+            zips = pl.lit('')
+        else:
+            str_zips = frames.strs(zip_values).str.strip_chars()
+            zips = (
+                pl.when(frames.truthy(zip_values) & (str_zips != ''))
+                .then(pl.when(str_zips.str.ends_with('.0')).then(str_zips.str.head(-2)).otherwise(str_zips))
+                .otherwise(pl.lit(''))
+            )
+        
+        # Optional fields, only in rows with a value - convert to appropriate types,
+        # keeping the original value where that fails
+        optional = []
+        fallbacks = {}
+        if field('Critical') is not None:
+            optional.append(self._parse_boolean(field('Critical')))
+        
+        for field_name, kind in (('lines', 'int'), ('min_voltage', 'float'), ('max_voltage', 'float')):
+            values = field(field_name)
+            if values is None:
+                continue
+            numbers = frames.floats(values)
+            if kind == 'int':
+                # int(float(value)) (handles "3.0" → 3)
+                numbers = pl.select(
+                    pl.when(numbers.is_finite() & (numbers.abs() < 2.0**63)).then(numbers)
+                ).to_series().cast(pl.Int64)
+            has_value = frames.truthy(values)
+            failed = has_value & numbers.is_null()
+            if failed.any():
+                fallbacks[field_name] = list(zip(failed.arg_true().to_list(), values.filter(failed).to_list()))
+                for value, count in frames.strs(values.filter(failed)).value_counts(sort=True).rows():
+                    logger.warning(f"Could not convert {field_name} to {kind}: {value} ({count} rows)")
+            optional.append(pl.select(pl.when(has_value).then(numbers)).to_series().alias(field_name))
+        
+        # Build final output in specific order for consistency
+        coordinates = pl.concat_list(longitudes, latitudes)
+        out = pl.select(
+            # 1. Core identification fields
+            new_ids.alias('_id'),
+            new_ids.alias('id'),  # Map expects 'id', not '_id'
+            new_ids.alias('uuid'),  # Also add uuid for compatibility
+            components.alias('component_type'),
+            components.alias('facilityTypeName'),  # Map expects this
+            names.alias('name'),
             
-            # Set sector from parameter (user-selected during upload)
-            enriched_row['sector'] = sector
+            # 2. Sector
+            pl.lit(sector).alias('sector'),
             
-            # Add aliases to enriched row with nested structure
-            aliases = {}
-            if field_aliases:
-                aliases['field'] = field_aliases
-            if component_aliases:
-                aliases['component'] = component_aliases
+            # 3. Geographic coordinates (lowercase - matches infrastructure system)
+            latitudes.alias('latitude'),
+            longitudes.alias('longitude'),
             
-            if aliases:
-                enriched_row['aliases'] = aliases
-            
-            # Generate name if not present (component_type_fullID format)
-            if 'name' not in enriched_row or not enriched_row['name']:
-                component = enriched_row.get('component_type', 'Asset')
-                asset_id = enriched_row.get('_id', '')
-                enriched_row['name'] = f"{component}_{asset_id}"
-            
-            # Add import metadata
-            enriched_row['imported_at'] = datetime.now().isoformat()
-            enriched_row['import_source'] = 'user_upload'
-            
-            # Ensure coordinates are floats (field_mapper uses lowercase)
-            if 'latitude' in enriched_row and enriched_row['latitude']:
-                try:
-                    enriched_row['latitude'] = float(enriched_row['latitude'])
-                except (ValueError, TypeError) as e:
-                    logger.error(f"Could not convert latitude to float: {enriched_row['latitude']}")
-                    raise ValueError(f"Invalid latitude value: {enriched_row['latitude']}")
-            
-            if 'longitude' in enriched_row and enriched_row['longitude']:
-                try:
-                    enriched_row['longitude'] = float(enriched_row['longitude'])
-                except (ValueError, TypeError) as e:
-                    logger.error(f"Could not convert longitude to float: {enriched_row['longitude']}")
-                    raise ValueError(f"Invalid longitude value: {enriched_row['longitude']}")
-            
-            # Create both coordinates array and GeoJSON location object
-            if 'latitude' in enriched_row and 'longitude' in enriched_row:
-                # Top-level coordinates array [longitude, latitude]
-                enriched_row['coordinates'] = [
-                    enriched_row['longitude'],
-                    enriched_row['latitude']
-                ]
-                # GeoJSON location object for MongoDB geospatial queries
-                enriched_row['location'] = {
-                    'type': 'Point',
-                    'coordinates': [
-                        enriched_row['longitude'],
-                        enriched_row['latitude']
-                    ]
-                }
+            # 4. Address fields (capitalized)
+            *address,
+            zips.alias('Zip'),
             
-            # ACCLIMATE-specific: Keep address fields flat at main level
-            # Ensure address fields have empty string defaults if not present (already capitalized by field_mapper)
-            address_fields = ['Address', 'City', 'State', 'Zip', 'County', 'Country']
-            for field in address_fields:
-                if field not in enriched_row:
-                    enriched_row[field] = ""
+            # 5. Coordinate arrays and GeoJSON location objects: [longitude, latitude]
+            coordinates.alias('coordinates'),
+            pl.struct(pl.lit('Point').alias('type'), coordinates.alias('coordinates')).alias('location'),
             
-            # Build final output in specific order for consistency
-            ordered_row = {}
+            # 6-7. Critical and optional fields
+            *optional,
             
-            # 1. Core identification fields
-            ordered_row['_id'] = enriched_row['_id']
-            ordered_row['id'] = enriched_row['_id']  # Map expects 'id', not '_id'
-            ordered_row['uuid'] = enriched_row['_id']  # Also add uuid for compatibility
-            ordered_row['component_type'] = enriched_row.get('component_type', '')
-            ordered_row['facilityTypeName'] = enriched_row.get('component_type', '')  # Map expects this
-            ordered_row['name'] = enriched_row.get('name', '')
+            # 8-9. Aliases and spec overrides (filled in per row below)
+            pl.lit(None).alias('aliases'),
+            pl.lit(None).alias('spec_overrides'),
             
-            # 2. Sector
-            ordered_row['sector'] = enriched_row.get('sector', '')
-            
-            # 3. Geographic coordinates (lowercase - matches infrastructure system)
-            ordered_row['latitude'] = enriched_row.get('latitude')
-            ordered_row['longitude'] = enriched_row.get('longitude')
+            # 10. Import metadata
+            pl.lit(datetime.now().isoformat()).alias('imported_at'),
+            pl.lit('user_upload').alias('import_source')
+        )
+        optional_fields = [c for c in ('Critical', 'lines', 'min_voltage', 'max_voltage') if c in out.columns]
+        
+        # Spec overrides: unmapped fields (see unmapped_columns), the user's
+        # original ID value under THEIR column name, then unmapped fields
+        # duplicating a mapped field name
+        unmapped, duplicates = self.field_mapper.unmapped_columns(original.columns, field_mapping)
+        spec = {col_name: original[col_name] for col_name in unmapped}
+        spec_ids = {}
+        for col_name, rows_with_id, id_values in user_ids:
+            if col_name in unmapped:
+                spec[col_name] = _choose(rows_with_id, id_values, spec[col_name])
+            elif col_name not in duplicates:
+                spec_ids[col_name] = _choose(rows_with_id, id_values, spec_ids.get(col_name))
+        spec.update(spec_ids)
+        for col_name in duplicates:
+            values = original[col_name]
+            for id_column, rows_with_id, id_values in user_ids:
+                if id_column == col_name:
+                    values = _choose(rows_with_id, id_values, values)
+            spec[col_name] = _choose(frames.present(values), values, None)
+        spec_overrides = pl.DataFrame(spec) if spec else None
+        
+        # A duplicate column holding the row's ID moves up next to the unmapped fields
+        moved_ids = id_columns.is_in(duplicates).fill_null(False)
+        
+        # Build final output rows
+        enriched = out.to_dicts()
+        
+        for field_name, values in fallbacks.items():
+            for i, value in values:
+                enriched[i][field_name] = value
+        
+        if spec_overrides is not None:
+            spec_rows = spec_overrides.to_dicts()
+            spec_has_none = spec_overrides.select(pl.any_horizontal(pl.all().is_null())).to_series().to_list()
+        moved_ids = moved_ids.to_list()
+        unmapped_set = set(unmapped)
+        optional_has_none = [False] * len(enriched)
+        if optional_fields:
+            optional_has_none = out.select(
+                pl.any_horizontal(pl.col(optional_fields).is_null())
+            ).to_series().to_list()
+        aliases_keys = zip(
+            id_columns.to_list(),
+            user_components.to_list() if component_aliases else [None] * len(enriched)
+        )
+        aliases_by_key = {}
+        
+        for i, (row, aliases_key) in enumerate(zip(enriched, aliases_keys)):
+            # Aliases: field mappings (with the ID column of THIS row) and component type
+            aliases = aliases_by_key.get(aliases_key)
+            if aliases is None:
+                user_id_column_name, user_component_type = aliases_key
+                aliases = {}
+                row_field_aliases = dict(field_aliases)
+                if user_id_column_name and user_id_column_name != '_id':
+                    row_field_aliases['_id'] = user_id_column_name
+                if row_field_aliases:
+                    aliases['field'] = row_field_aliases
+                if user_component_type in component_aliases:
+                    aliases['component'] = component_aliases[user_component_type]
+                aliases_by_key[aliases_key] = aliases
             
-            # 4. Address fields (capitalized)
-            ordered_row['City'] = enriched_row.get('City', '')
-            ordered_row['State'] = enriched_row.get('State', '')
-            ordered_row['County'] = enriched_row.get('County', '')
-            ordered_row['Country'] = enriched_row.get('Country', '')
-            ordered_row['Address'] = enriched_row.get('Address', '')
-            
-            # Convert Zip - remove .0 suffix but PRESERVE leading zeros (keep as string)
-            # Example: "01234.0" → "01234" (NOT 1234)
-            zip_value = enriched_row.get('Zip', '')
-            if zip_value and str(zip_value).strip():
-                str_zip = str(zip_value).strip()
-                # Remove trailing .0 if present (from Excel float conversion)
-                if str_zip.endswith('.0'):
-                    str_zip = str_zip[:-2]
-                ordered_row['Zip'] = str_zip
+            if aliases:
+                row['aliases'] = {kind: dict(values) for kind, values in aliases.items()}
             else:
-                ordered_row['Zip'] = ''
-            
-            # 5. Coordinate arrays and location objects
-            ordered_row['coordinates'] = enriched_row.get('coordinates', [])
-            ordered_row['location'] = enriched_row.get('location', {})
-            
-            # 6. Critical field if present
-            if 'Critical' in enriched_row:
-                ordered_row['Critical'] = enriched_row['Critical']
-            
-            # 7. Optional fields (lowercase) - convert to appropriate types
-            if 'lines' in enriched_row and enriched_row['lines']:
-                try:
-                    # Convert to int (handles "3.0" → 3)
-                    ordered_row['lines'] = int(float(enriched_row['lines']))
-                except (ValueError, TypeError):
-                    logger.warning(f"Could not convert lines to int: {enriched_row['lines']}")
-                    ordered_row['lines'] = enriched_row['lines']
-            
-            if 'min_voltage' in enriched_row and enriched_row['min_voltage']:
-                try:
-                    ordered_row['min_voltage'] = float(enriched_row['min_voltage'])
-                except (ValueError, TypeError):
-                    logger.warning(f"Could not convert min_voltage to float: {enriched_row['min_voltage']}")
-                    ordered_row['min_voltage'] = enriched_row['min_voltage']
-            
-            if 'max_voltage' in enriched_row and enriched_row['max_voltage']:
-                try:
-                    ordered_row['max_voltage'] = float(enriched_row['max_voltage'])
-                except (ValueError, TypeError):
-                    logger.warning(f"Could not convert max_voltage to float: {enriched_row['max_voltage']}")
-                    ordered_row['max_voltage'] = enriched_row['max_voltage']
-            
-            # 8. Aliases
-            if 'aliases' in enriched_row:
-                ordered_row['aliases'] = enriched_row['aliases']
-            
-            # 9. Spec overrides (all unmapped fields + original ID if present)
-            if 'spec_overrides' in enriched_row:
-                ordered_row['spec_overrides'] = enriched_row['spec_overrides']
+                del row['aliases']
             
-            # 10. Import metadata
-            ordered_row['imported_at'] = enriched_row.get('imported_at')
-            ordered_row['import_source'] = enriched_row.get('import_source', 'user_upload')
+            spec = None
+            if spec_overrides is not None:
+                spec = spec_rows[i]
+                if spec_has_none[i]:
+                    spec = {k: v for k, v in spec.items() if v is not None}
+                if moved_ids[i]:
+                    id_column = aliases_key[0]
+                    id_value = spec.pop(id_column)
+                    spec = {
+                        **{k: v for k, v in spec.items() if k in unmapped_set},
+                        id_column: id_value,
+                        **{k: v for k, v in spec.items() if k not in unmapped_set}
+                    }
+            if spec:
+                row['spec_overrides'] = spec
+            else:
+                del row['spec_overrides']
             
-            enriched.append(ordered_row)
+            if optional_has_none[i]:
+                for field_name in optional_fields:
+                    if row[field_name] is None:
+                        del row[field_name]
         
         return enriched
     
@@ -588,14 +1021,21 @@ class AssetImporter:
         """
         Import enriched rows to MongoDB
         
+        Rows are upserted by uuid with unordered bulk writes (see
+        bulk_writes.bulk_replace). A failing row (e.g. a duplicate key)
+        does not stop the rest; rows repeating a uuid (identical rows, see
+        asset_uuid) collapse to the last one and are counted as duplicates.
+        
         Args:
             rows: Enriched and validated rows
             collection_name: Target collection
         
         Returns:
-            Import statistics
+            Import statistics: inserted, updated, duplicate and failed row
+            counts, and the first write errors
         """
         from motor.motor_asyncio import AsyncIOMotorClient
+        from bulk_writes import bulk_replace
         import os
         
         mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017')
@@ -604,31 +1044,89 @@ class AssetImporter:
         collection = db[collection_name]
         
         try:
-            # Insert documents
             if rows:
-                result = await collection.insert_many(rows)
-                inserted_count = len(result.inserted_ids)
-                
-                # Create indexes
-                await collection.create_index('_id')
-                await collection.create_index('component_type')
-                await collection.create_index('location', name='geo_index')
-                
-                logger.info(f"Inserted {inserted_count} documents to {collection_name}")
+                # No-op after the first import into this collection
+                await ensure_import_indexes(db, collection_name)
+            
+            stats = await bulk_replace(collection, rows, key=('uuid',))
+            
+            # _id == uuid, so upserted ids are the new rows (last one per uuid)
+            latest = {row['_id']: row for row in rows}
+            inserted_rows = [latest[_id] for _id in stats.upserted_ids if _id in latest]
+            updated = stats.matched
+            
+            if rows:
+                logger.info(
+                    f"Wrote {len(rows)} rows to {collection_name} in {stats.batches} batches: "
+                    f"{len(inserted_rows)} inserted, {updated} updated, "
+                    f"{stats.collapsed} duplicates, {stats.failed} failed"
+                )
                 
-                return {
-                    'inserted': inserted_count,
-                    'collection': collection_name
-                }
-            else:
-                return {
-                    'inserted': 0,
-                    'collection': collection_name
-                }
+                # Replaced documents may have changed type or location: recompute stats
+                await self._update_collection_stats(db, collection_name, inserted_rows, invalidate=stats.matched > 0)
+            
+            return {
+                'inserted': len(inserted_rows),
+                'updated': updated,
+                'duplicates': stats.collapsed,
+                'failed': stats.failed,
+                'batches': stats.batches,
+                'failed_batches': stats.failed_batches,
+                'errors': stats.errors,
+                'collection': collection_name
+            }
                 
         finally:
             client.close()
     
+    async def _update_collection_stats(
+        self,
+        db,
+        collection_name: str,
+        rows: List[Dict],
+        invalidate: bool = False
+    ):
+        """
+        Fold inserted rows into the collection's materialized stats
+        
+        Falls back to invalidating them if the incremental update fails (or
+        invalidate is set), so /api/get-infrastructure never serves stats
+        that miss this import.
+        """
+        try:
+            from collection_stats import apply_insert_to_stats, invalidate_collection_stats
+        except ImportError:
+            # Running outside the backend (standalone scripts/tests): no stats to maintain
+            return
+        
+        if invalidate:
+            await invalidate_collection_stats(db, collection_name)
+            return
+        
+        try:
+            await apply_insert_to_stats(db, collection_name, rows)
+        except Exception as e:
+            logger.warning(f"Incremental stats update failed for {collection_name}: {e}")
+            await invalidate_collection_stats(db, collection_name)
+    
     def close(self):
         """Close component mapper connection"""
         self.component_mapper.close()
+
+
+def _choose(mask: pl.Series, values: pl.Series, other) -> pl.Series:
+    """values where mask is set, else other (a Series or None), Python values kept as they are"""
+    if isinstance(other, pl.Series):
+        if values.dtype == pl.Null:
+            values = values.cast(other.dtype)
+        python_values = pl.Object in (values.dtype, other.dtype) or values.dtype != other.dtype
+    else:
+        python_values = values.dtype == pl.Object
+    
+    if python_values:
+        # e.g. numbers mixed with default strings
+        others = other.to_list() if isinstance(other, pl.Series) else [other] * len(values)
+        return pl.Series(values.name, [
+            v if m else o for v, m, o in zip(values.to_list(), mask.to_list(), others)
+        ], dtype=pl.Object)
+    return pl.select(pl.when(mask).then(values).otherwise(other)).to_series().alias(values.name)
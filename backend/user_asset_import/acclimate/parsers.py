@@ -7,8 +7,14 @@ import logging
 import io
 import json
 import zipfile
-from typing import List, Dict, Tuple, Optional
+from pathlib import Path
+from typing import Iterator, List, Dict, Tuple, Optional
 import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from .frames import frame_from_rows
 
 logger = logging.getLogger(__name__)
 
@@ -68,43 +74,124 @@ def parse_csv(file_content: bytes, filename: str) -> Tuple[List[Dict], List[str]
     Returns:
         Tuple of (list of row dicts, list of column names)
     """
+    df = read_csv_frame(file_content)
+    return df.to_dicts(), df.columns
+
+
+def read_csv_frame(file_content: bytes) -> pl.DataFrame:
+    """
+    Parse CSV file into a DataFrame
+    
+    Every value is read as a string (no type conversion: type handling is
+    done downstream where we know the field types), stripped, and empty
+    values are null.
+    
+    Args:
+        file_content: Raw CSV bytes
+    
+    Returns:
+        DataFrame of String columns
+    """
     try:
         # Decode as UTF-8 (standard for modern data)
         try:
-            text = file_content.decode('utf-8')
+            file_content.decode('utf-8')
         except UnicodeDecodeError as e:
             raise ValueError(
                 "CSV file is not UTF-8 encoded."
             )
         
-        # Use pandas for robust CSV parsing
-        df = pd.read_csv(
-            io.StringIO(text),
-            dtype=str,  # Read everything as strings initially
-            na_filter=False  # Don't convert empty strings to NaN
-        )
-        
-        # Convert to list of dicts
-        rows = df.to_dict('records')
-        columns = list(df.columns)
+        columns = csv_columns(io.BytesIO(file_content))
+        table = pa_csv.read_csv(io.BytesIO(file_content), convert_options=_csv_convert_options(columns))
+        df = _csv_frame(table)
         
-        # Clean up values - keep everything as strings (no type conversion)
-        # Type handling will be done downstream where we know the field types
-        for row in rows:
-            for key, value in row.items():
-                if value == '' or value is None:
-                    row[key] = None
-                elif isinstance(value, str):
-                    row[key] = value.strip()
-        
-        logger.info(f"Parsed CSV: {len(rows)} rows, {len(columns)} columns")
-        return rows, columns
+        logger.info(f"Parsed CSV: {df.height} rows, {df.width} columns")
+        return df
         
     except Exception as e:
         logger.error(f"Error parsing CSV: {e}")
         raise ValueError(f"Failed to parse CSV file: {str(e)}")
 
 
+def csv_columns(file_path: Path) -> List[str]:
+    """Column names from a CSV file's header (reads only the header)"""
+    try:
+        return pl.read_csv(file_path, n_rows=0, infer_schema=False).columns
+    except Exception as e:
+        logger.error(f"Error reading CSV header: {e}")
+        raise ValueError(f"Failed to parse CSV file: {str(e)}")
+
+
+def csv_unique_values(file_path: Path, column: str) -> List[str]:
+    """
+    Distinct non-empty values of one CSV column
+    
+    Scans the file lazily and only materializes the one column.
+    """
+    values = (
+        pl.scan_csv(file_path, infer_schema=False)
+        .select(pl.col(column).str.strip_chars())
+        .unique()
+        .collect()
+        .to_series()
+    )
+    return [v for v in values.to_list() if v]
+
+
+def iter_csv_frames(
+    file_path: Path,
+    batch_size: int = 50000
+) -> Iterator[pl.DataFrame]:
+    """
+    Parse a CSV file incrementally
+    
+    Batches match read_csv_frame(): every value is a stripped string,
+    empty values are null. Only about one batch is held in memory at a
+    time.
+    
+    Args:
+        file_path: Path to the CSV file
+        batch_size: Rows per batch (approximate: whole parse blocks are kept together)
+    
+    Yields:
+        DataFrames of String columns
+    """
+    columns = csv_columns(file_path)
+    
+    try:
+        reader = pa_csv.open_csv(file_path, convert_options=_csv_convert_options(columns))
+    except Exception as e:
+        logger.error(f"Error opening CSV: {e}")
+        raise ValueError(f"Failed to parse CSV file: {str(e)}")
+    
+    pending = []
+    pending_rows = 0
+    
+    for record_batch in reader:
+        pending.append(record_batch)
+        pending_rows += record_batch.num_rows
+        if pending_rows >= batch_size:
+            yield _csv_frame(pa.Table.from_batches(pending))
+            pending, pending_rows = [], 0
+    
+    if pending_rows:
+        yield _csv_frame(pa.Table.from_batches(pending))
+
+
+def _csv_convert_options(columns: List[str]) -> pa_csv.ConvertOptions:
+    """Arrow CSV options reading every column as a string"""
+    return pa_csv.ConvertOptions(
+        column_types={col: pa.string() for col in columns},    # Everything as strings
+        strings_can_be_null=False
+    )
+
+
+def _csv_frame(table: pa.Table) -> pl.DataFrame:
+    """DataFrame from an Arrow table of strings: values stripped, empty values null"""
+    df = pl.from_arrow(table)
+    return df.with_columns(pl.all().str.strip_chars().replace('', None))
+
+
 def parse_json(file_content: bytes, filename: str) -> Tuple[List[Dict], List[str]]:
     """
     Parse JSON file (array of objects or single object)
@@ -464,3 +551,29 @@ def parse_file(file_content: bytes, filename: str) -> Tuple[List[Dict], List[str
         raise ValueError(f"Unsupported file format: {file_format}")
     
     return rows, columns, file_format
+
+
+def parse_file_frame(file_content: bytes, filename: str) -> Tuple[pl.DataFrame, List[str], str]:
+    """
+    Auto-detect and parse file based on format, into a DataFrame
+    
+    CSV files are read straight into String columns; other formats are
+    parsed as in parse_file() and their rows converted (see
+    frames.frame_from_rows).
+    
+    Args:
+        file_content: Raw file bytes
+        filename: Original filename
+    
+    Returns:
+        Tuple of (DataFrame, list of column names, detected format)
+    """
+    file_format = detect_file_format(filename, file_content)
+    
+    if file_format == 'csv':
+        logger.info(f"Detected format: {file_format} for file: {filename}")
+        df = read_csv_frame(file_content)
+        return df, df.columns, file_format
+    
+    rows, columns, file_format = parse_file(file_content, filename)
+    return frame_from_rows(rows), columns, file_format
@@ -0,0 +1,110 @@
+"""
+Asset Identity Test - Stable asset uuids and how repeated rows are counted
+Runs _enrich_frame and _import_to_mongo without MongoDB (in-memory collection)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directories to path
+# tests/ -> acclimate/ -> user_asset_import/ (need to go up 2 levels), plus backend/
+user_asset_import_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(user_asset_import_root))
+sys.path.insert(0, str(user_asset_import_root.parent))
+
+from acclimate import field_mapper, importer
+from acclimate.frames import frame_from_rows
+from acclimate.importer import AssetImporter, SeenIds
+
+FIELD_MAPPING = {
+    'latitude': {'mapped_to': 'lat'},
+    'longitude': {'mapped_to': 'lon'},
+    'component_type': {'mapped_to': 'component_type'},
+}
+
+
+def _sheet_rows():
+    """Two workbook sheets numbering their rows from 1 (parse_excel puts the sheet in component_type)"""
+    rows = []
+    for sheet in ('Substations', 'Generators'):
+        for i in (1, 2):
+            rows.append({'id': i, 'lat': 30.0 + i, 'lon': -95.0, 'component_type': sheet})
+    return rows
+
+
+def _enrich(rows, **kwargs):
+    original = frame_from_rows(rows)
+    transformed = field_mapper.apply_mapping(original, FIELD_MAPPING)
+    return asyncio.run(AssetImporter(field_mapper)._enrich_frame(
+        transformed, original, FIELD_MAPPING, {}, 'energy_grid', 'assets.xlsx', **kwargs
+    ))
+
+
+def test_same_id_on_two_sheets_keeps_both_rows():
+    enriched = _enrich(_sheet_rows())
+
+    uuids = [row['uuid'] for row in enriched]
+    assert len(set(uuids)) == 4
+    # The first occurrence of an ID keeps the ID-keyed uuid
+    assert uuids[0] == importer.asset_uuid('energy_grid', 'assets.xlsx', _sheet_rows()[0], 'id')
+    # Re-importing the same file yields the same uuids
+    assert [row['uuid'] for row in _enrich(_sheet_rows())] == uuids
+
+
+def test_repeated_ids_across_batches():
+    rows = _sheet_rows()
+    seen_ids = SeenIds()
+    batches = _enrich(rows[:2], seen_ids=seen_ids) + _enrich(rows[2:], seen_ids=seen_ids)
+
+    assert [row['uuid'] for row in batches] == [row['uuid'] for row in _enrich(rows)]
+
+
+def test_identical_rows_are_reported_as_duplicates(monkeypatch):
+    docs = {}
+
+    class Collection:
+        name = 'energy_grid'
+
+        async def bulk_write(self, batch, ordered=True):
+            details = {'nUpserted': 0, 'nMatched': 0, 'nModified': 0, 'upserted': [], 'writeErrors': []}
+            for index, op in enumerate(batch):
+                key = op._filter['uuid']
+                if key in docs:
+                    details['nMatched'] += 1
+                    details['nModified'] += docs[key] != op._doc
+                else:
+                    details['nUpserted'] += 1
+                    details['upserted'].append({'index': index, '_id': op._doc['_id']})
+                docs[key] = op._doc
+            return SimpleNamespace(bulk_api_result=details)
+
+    class Client:
+        def __init__(self, uri):
+            pass
+
+        def __getitem__(self, name):
+            return {'energy_grid': Collection()}
+
+        def close(self):
+            pass
+
+    async def no_op(*args, **kwargs):
+        pass
+
+    import motor.motor_asyncio
+    monkeypatch.setattr(motor.motor_asyncio, 'AsyncIOMotorClient', Client)
+    monkeypatch.setattr(importer, 'ensure_import_indexes', no_op)
+    monkeypatch.setattr(AssetImporter, '_update_collection_stats', no_op)
+
+    rows = _sheet_rows()
+    enriched = _enrich(rows + [rows[0], rows[0]])
+    result = asyncio.run(AssetImporter(field_mapper)._import_to_mongo(enriched, 'energy_grid'))
+
+    # Copies of a row collapse into it: reported as duplicates, not updates
+    assert (result['inserted'], result['updated'], result['duplicates']) == (4, 0, 2)
+
+    result = asyncio.run(AssetImporter(field_mapper)._import_to_mongo(enriched, 'energy_grid'))
+
+    assert (result['inserted'], result['updated'], result['duplicates']) == (0, 4, 2)
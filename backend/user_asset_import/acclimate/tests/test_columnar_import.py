@@ -0,0 +1,147 @@
+"""
+Columnar Import Test - The polars frame pipeline against per-value Python semantics
+Runs process_upload and process_upload_stream without saving (no MongoDB)
+"""
+
+import asyncio
+import json
+import math
+import sys
+import uuid
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+# Add parent directories to path
+# tests/ -> acclimate/ -> user_asset_import/ (need to go up 2 levels)
+user_asset_import_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(user_asset_import_root))
+
+from acclimate import config, field_mapper, frames, importer
+from acclimate.frames import frame_from_rows
+from acclimate.importer import AssetImporter
+
+MIXED = ['1.5', ' 2 ', '1_000', 'nan', 'abc', '', None, 'True', '٣']
+
+REGISTER = (
+    'OBJECTID,Latitude,Longitude,Type,Name,Critical,Lines,Owner\n'
+    '1,39.7,-104.9,Substation,Alpha,yes,3,Acme\n'
+    '2,30.2,-97.7,Xfmr,,maybe,two,\n'
+    '3,61.2,-149.9,Substation,Gamma,,2.0,"Acme, Inc."\n'
+    '1,39.7,-104.9,Substation,Alpha,yes,3,Acme\n'
+).encode()
+
+UPLOAD = dict(filename='register.csv', component_mappings={'Xfmr': 'Transformer'}, save_to_database=False)
+
+
+def _python_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def test_floats_match_float():
+    for values in (MIXED, [1, 2.5, None], [True, False, None]):
+        result = frames.floats(frame_from_rows([{'v': v} for v in values])['v']).to_list()
+        expected = [_python_float(v) for v in values]
+        assert [None if x is None else ('nan' if math.isnan(x) else x) for x in result] == \
+            [None if x is None else ('nan' if math.isnan(x) else x) for x in expected]
+
+
+def test_strs_and_truthy_match_python():
+    for values in (MIXED, [1, 0, None], [1.0, 2.5, None], [True, False, None], [{'a': 1}, [1], None]):
+        column = frame_from_rows([{'v': v} for v in values])['v']
+        assert frames.strs(column).to_list() == [None if v is None else str(v) for v in values]
+        assert frames.truthy(column).to_list() == [bool(v) for v in values]
+        assert frames.present(column).to_list() == [v is not None and v != '' for v in values]
+
+
+def test_equals_follows_python_comparison():
+    a = frame_from_rows([{'v': v} for v in [5, 5.0, float('nan'), 1, None]])['v']
+    b = frame_from_rows([{'v': v} for v in [5.0, 5, float('nan'), True, 1]])['v']
+    assert frames.equals(a, b).to_list() == [True, True, False, True, False]
+
+    strings = pl.Series(['5', '5', None])
+    assert frames.equals(strings, pl.Series([5, 5, 5])).to_list() == [False, False, False]
+    assert frames.equals(strings, pl.Series(['5', '6', None])).to_list() == [True, False, False]
+
+
+def test_json_strings_match_dumps():
+    values = ['plain', 'quote "x"', 'back\\slash', 'Saint-Étienne', 'tab\there', None]
+    assert frames.json_strings(pl.Series(values)).to_list() == [
+        None if v is None else json.dumps(v) for v in values
+    ]
+
+
+def test_uuid5_strings_match_uuid5():
+    names = pl.Series(['', 'a', json.dumps(['energy_grid', 'x.csv', ['id', '1']]), 'Ünïcode'])
+    assert importer._uuid5_strings(names).to_list() == [
+        str(uuid.uuid5(importer.ASSET_UUID_NAMESPACE, name)) for name in names.to_list()
+    ]
+
+
+def test_frame_columns_follow_row_order():
+    df = frame_from_rows([{'a': 1, 'c': 'x'}, {'a': 2, 'b': 2 ** 70, 'c': 'y'}, {'c': 'z', 'd': [1]}])
+    assert df.columns == ['a', 'b', 'c', 'd']
+    assert df['b'].dtype == pl.Object
+    assert df['b'].to_list() == [None, 2 ** 70, None]
+
+
+def test_validation_messages():
+    df = frame_from_rows([
+        {'lat': '39.7', 'lon': '-104.9', 'type': 'Substation'},
+        {'lat': '', 'lon': 'east', 'type': 'Substation'},
+        {'lat': '95', 'lon': '10', 'type': None},
+    ])
+    mapping = {
+        'latitude': {'mapped_to': 'lat'},
+        'longitude': {'mapped_to': 'lon'},
+        'component_type': {'mapped_to': 'type'},
+    }
+    is_valid, errors = field_mapper.validate_required_fields(field_mapper.apply_mapping(df, mapping), mapping)
+
+    assert not is_valid
+    assert errors == [
+        "Row 2: latitude is missing or empty",
+        "Row 2: longitude 'east' cannot be converted to a number",
+        "Row 3: component_type is missing or empty",
+        "Row 3: latitude 95.0 is out of valid range (-90 to 90)",
+    ]
+
+
+@pytest.mark.parametrize("bounding_box", [None, {'min_lat': 35.0, 'max_lat': 45.0, 'min_lon': -110.0, 'max_lon': -100.0}])
+def test_upload_and_stream_agree(tmp_path, bounding_box):
+    path = tmp_path / 'register.csv'
+    path.write_bytes(REGISTER)
+    asset_importer = AssetImporter(field_mapper)
+
+    upload = asyncio.run(asset_importer.process_upload(REGISTER, bounding_box=bounding_box, **UPLOAD))
+    stream = asyncio.run(asset_importer.process_upload_stream(path, bounding_box=bounding_box, batch_size=2, **UPLOAD))
+
+    def without_timestamp(rows):
+        return [{k: v for k, v in row.items() if k != 'imported_at'} for row in rows]
+
+    assert upload['success'] and stream['success']
+    assert without_timestamp(upload['data']) == without_timestamp(stream['data'])
+
+    rows = upload['data']
+    if bounding_box:
+        assert [row['name'] for row in rows] == ['Alpha', 'Alpha']
+        return
+
+    assert len(rows) == 4
+    assert [row['component_type'] for row in rows] == ['Substation', 'Transformer', 'Substation', 'Substation']
+    assert rows[1]['name'] == f"Transformer_{rows[1]['_id']}"
+    assert rows[1]['aliases']['component'] == {'Transformer': 'Xfmr'}
+    assert [row.get('Critical') for row in rows] == [True, False, None, True]
+    assert 'Critical' not in rows[2]
+    assert [row.get('lines') for row in rows] == [3, 'two', 2, 3]
+    assert rows[2]['spec_overrides']['Owner'] == 'Acme, Inc.'
+    assert rows[0]['coordinates'] == [-104.9, 39.7]
+    assert rows[0]['location'] == {'type': 'Point', 'coordinates': [-104.9, 39.7]}
+
+    # A copy of a row keeps its uuid (and collapses into it when saved)
+    assert rows[0]['uuid'] == rows[3]['uuid']
+    assert rows[0]['uuid'] == importer.asset_uuid(config.DEFAULT_SECTOR, 'register.csv', {'OBJECTID': '1'}, 'OBJECTID')